@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Sandy JSONPath Micro-Benchmark
+
+Compares output extraction through jsonpath_ng (cached parse + find) with
+the compiled fast-path accessor on a large snapshot-like payload.
+
+Usage:
+    python benchmarks/jsonpath.py [--items N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from jsonpath_ng import parse as jsonpath_parse
+
+from jsonpath_fast import compile_path
+
+
+PATHS = [
+    "$.title",
+    "$.items[0].id",
+    "$.meta.page.cursor",
+    "$.items[*].title",
+]
+
+
+def build_payload(items: int) -> dict:
+    """Snapshot-like payload: a large list of nested nodes"""
+    return {
+        "title": "Hacker News",
+        "meta": {"page": {"cursor": "abc", "size": items}},
+        "items": [
+            {
+                "id": i,
+                "title": f"Story {i}",
+                "url": f"https://example.com/{i}",
+                "score": i * 3,
+                "author": {"name": f"user{i}", "karma": i},
+                "children": [{"uid": f"{i}_{j}", "role": "link"} for j in range(5)],
+            }
+            for i in range(items)
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JSONPath extraction micro-benchmark")
+    parser.add_argument("--items", type=int, default=10_000, help="List size (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per path (default: 200)")
+    args = parser.parse_args()
+
+    data = build_payload(args.items)
+    print(f"payload: {args.items} items, {args.repeat} iterations per path\n")
+    print(f"{'path':<24}{'jsonpath_ng':>14}{'fast path':>14}{'speedup':>10}")
+
+    for path in PATHS:
+        parsed = jsonpath_parse(path)
+        compiled = compile_path(path)
+
+        def slow():
+            matches = parsed.find(data)
+            return matches[0].value if matches else None
+
+        def fast():
+            return compiled.first(data)[0]
+
+        assert slow() == fast()
+        slow_s = timeit.timeit(slow, number=args.repeat) / args.repeat
+        fast_s = timeit.timeit(fast, number=args.repeat) / args.repeat
+        print(f"{path:<24}{slow_s * 1e6:>12.1f}us{fast_s * 1e6:>12.1f}us{slow_s / fast_s:>9.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
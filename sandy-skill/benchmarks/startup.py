@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Sandy Startup Benchmark
+
+Measures cold-start import cost of play.py with `python -X importtime`.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--module play]
+
+The budget below is enforced by tests/test_startup.py. It is deliberately
+loose (several times the typical cost) so it only trips on regressions such
+as an eagerly imported SDK, not on machine noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+__all__ = [
+    "SCRIPTS_DIR",
+    "HEAVY_MODULES",
+    "STARTUP_BUDGET_MS",
+    "measure_import_time",
+    "imported_modules",
+]
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+# Modules that must not be imported until a scenario actually needs them
+HEAVY_MODULES = (
+    "jsonpath_ng",
+    "mcp",
+    "dotenv",
+    "websockets",
+    "player",
+    "native_tools",
+)
+
+# Cumulative import time budget for `import play` (milliseconds)
+STARTUP_BUDGET_MS = 400.0
+
+
+def _run(code: str, *python_flags: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter with scripts/ on sys.path"""
+    env = {**os.environ, "PYTHONPATH": str(SCRIPTS_DIR), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *python_flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(SCRIPTS_DIR),
+        check=True,
+    )
+
+
+def measure_import_time(module: str = "play") -> float:
+    """
+    Measure cumulative import time of a module in a fresh interpreter
+
+    Returns:
+        Cumulative import time in milliseconds (from -X importtime)
+    """
+    proc = _run(f"import {module}", "-X", "importtime")
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1].strip()) / 1000.0
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def imported_modules(code: str) -> set[str]:
+    """
+    Run code in a fresh interpreter and return top-level modules it imported
+
+    Args:
+        code: Python source to execute before collecting sys.modules
+    """
+    proc = _run(f"{code}\nimport sys\nprint('\\n'.join(sys.modules))")
+    return {name.split(".")[0] for name in proc.stdout.splitlines()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure Sandy cold-start import time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs (default: 5)")
+    parser.add_argument("--module", default="play", help="Module to import (default: play)")
+    args = parser.parse_args()
+
+    timings = [measure_import_time(args.module) for _ in range(args.runs)]
+    heavy = sorted(imported_modules(f"import {args.module}") & set(HEAVY_MODULES))
+
+    print(f"import {args.module}: median {statistics.median(timings):.1f}ms "
+          f"(min {min(timings):.1f}ms, max {max(timings):.1f}ms, runs={args.runs})")
+    print(f"budget: {STARTUP_BUDGET_MS:.0f}ms")
+    print(f"heavy modules loaded: {', '.join(heavy) or '(none)'}")
+    return 0 if statistics.median(timings) <= STARTUP_BUDGET_MS and not heavy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
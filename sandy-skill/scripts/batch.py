@@ -0,0 +1,361 @@
+"""
+Sandy Batch Runner
+
+Plays one scenario once per row of variables, sharded across worker
+processes so CPU-heavy result handling (JSON decoding, JSONPath, CSV
+flattening) scales past a single asyncio loop.
+
+- Rows come from JSONL, CSV (header row) or a JSON array of objects
+- Rows are dealt round-robin to N workers; each worker keeps its own MCP
+  client pool for its whole shard
+- concurrency > 1 plays that many rows at once per worker on the shared
+  pool (pair with per-server limits, e.g. adaptive_concurrency)
+- Records are emitted in row order as soon as every earlier row is done,
+  so output is one ordered JSONL stream regardless of worker timing
+- workers=1 runs in-process (no subprocess)
+- Per-server limits (rate_limit, max_concurrency) are per process, so each
+  worker gets 1/N of them (limits.split_limits)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import multiprocessing
+import queue as queue_module
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+
+__all__ = [
+    # Data classes
+    "BatchStats",
+    # Functions
+    "load_rows",
+    "shard_rows",
+    "run_batch",
+]
+
+
+if TYPE_CHECKING:
+    try:
+        from .config import Config
+        from .scenario import Scenario
+    except ImportError:
+        from config import Config
+        from scenario import Scenario
+
+
+try:
+    from .history import percentile
+except ImportError:
+    from history import percentile
+
+
+# How often the parent checks for dead workers while waiting (seconds)
+_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class BatchStats:
+    """Aggregate statistics of a batch run"""
+    rows: int = 0
+    passed: int = 0
+    failed: int = 0
+    workers: int = 1
+    duration: float = 0.0  # Wall-clock seconds
+    row_durations: list[float] = field(default_factory=list, repr=False)
+    per_worker: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Row duration at percentile p (0-100, nearest rank, as in sandy stats)"""
+        return percentile(self.row_durations, p)
+
+    @property
+    def summary(self) -> str:
+        """Generate summary string"""
+        return (
+            f"Batch: {self.rows} rows, {self.passed} passed, {self.failed} failed "
+            f"in {self.duration:.2f}s ({self.rows_per_second:.1f} rows/s, "
+            f"{self.workers} worker{'s' if self.workers != 1 else ''}); "
+            f"row p50 {self.percentile(50):.2f}s p95 {self.percentile(95):.2f}s"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "passed": self.passed,
+            "failed": self.failed,
+            "workers": self.workers,
+            "duration": round(self.duration, 3),
+            "rows_per_second": round(self.rows_per_second, 2),
+            "row_p50": round(self.percentile(50), 3),
+            "row_p95": round(self.percentile(95), 3),
+            "per_worker": self.per_worker,
+        }
+
+
+def load_rows(path: str | Path) -> list[dict[str, str]]:
+    """
+    Load variable rows from a file
+
+    Format by extension: .jsonl (one object per line), .csv (header row),
+    otherwise a JSON array of objects. Values are converted to strings,
+    like --var values.
+
+    Raises:
+        ValueError: If a row is not an object
+        FileNotFoundError: If the file doesn't exist
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".csv":
+        raw_rows: list[Any] = list(csv.DictReader(io.StringIO(text)))
+    elif path.suffix == ".jsonl":
+        raw_rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        raw_rows = json.loads(text)
+        if not isinstance(raw_rows, list):
+            raise ValueError(f"{path}: expected a JSON array of objects")
+
+    rows: list[dict[str, str]] = []
+    for i, row in enumerate(raw_rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}: row {i + 1} is not an object")
+        rows.append({
+            str(k): v if isinstance(v, str) else json.dumps(v)
+            for k, v in row.items()
+            if v is not None
+        })
+    return rows
+
+
+def shard_rows(rows: list[dict[str, str]], workers: int) -> list[list[tuple[int, dict[str, str]]]]:
+    """Deal (index, row) pairs round-robin into one shard per worker"""
+    shards: list[list[tuple[int, dict[str, str]]]] = [[] for _ in range(max(1, workers))]
+    for index, row in enumerate(rows):
+        shards[index % len(shards)].append((index, row))
+    return [s for s in shards if s]
+
+
+async def _play_shard(
+    worker: int,
+    scenario: Scenario,
+    config: Config,
+    options: dict[str, Any],
+    shard: list[tuple[int, dict[str, str]]],
+    emit: Callable[[dict[str, Any]], None],
+    concurrency: int = 1,
+) -> None:
+    """Play every row of a shard, sharing one client pool"""
+    try:
+        from .player import PlayerOptions, play_scenario
+    except ImportError:
+        from player import PlayerOptions, play_scenario
+
+    base_variables = options.get("variables", {})
+    clients: dict[str, Any] = {}
+
+    async def play_row(index: int, row: dict[str, str]) -> None:
+        player_options = PlayerOptions(**{**options, "variables": {**base_variables, **row}})
+        try:
+            result = await play_scenario(scenario, config, player_options, clients=clients)
+            record = {
+                "index": index,
+                "worker": worker,
+                "variables": row,
+                "success": result.success,
+                "duration": round(result.duration, 3),
+                "failed_step": result.failed_step,
+                "error": result.error,
+                "outputs": result.outputs,
+            }
+        except Exception as e:
+            record = {
+                "index": index,
+                "worker": worker,
+                "variables": row,
+                "success": False,
+                "duration": 0.0,
+                "failed_step": None,
+                "error": str(e),
+                "outputs": {},
+            }
+        emit(record)
+
+    # Each lane takes the next unplayed row until the shard is done
+    rows = iter(shard)
+
+    async def lane() -> None:
+        for index, row in rows:
+            await play_row(index, row)
+
+    try:
+        await asyncio.gather(*(lane() for _ in range(max(1, min(concurrency, len(shard))))))
+    finally:
+        for client in clients.values():
+            try:
+                await client.disconnect()
+            except Exception:
+                pass  # Ignore errors during cleanup
+
+
+def _worker_main(
+    worker: int,
+    scenario: Scenario,
+    config: Config,
+    options: dict[str, Any],
+    shard: list[tuple[int, dict[str, str]]],
+    results: Any,
+    concurrency: int = 1,
+) -> None:
+    """Worker process entry point"""
+    import sys
+
+    # Keep stdout free for the parent's JSONL stream (e.g. sandy__log)
+    sys.stdout = sys.stderr
+
+    def emit(record: dict[str, Any]) -> None:
+        results.put(("record", record))
+
+    try:
+        asyncio.run(_play_shard(worker, scenario, config, options, shard, emit, concurrency))
+    finally:
+        results.put(("done", worker))
+
+
+def run_batch(
+    scenario: Scenario,
+    config: Config,
+    rows: list[dict[str, str]],
+    workers: int = 1,
+    options: dict[str, Any] | None = None,
+    on_record: Callable[[dict[str, Any]], None] | None = None,
+    concurrency: int = 1,
+) -> BatchStats:
+    """
+    Play a scenario once per row, in parallel worker processes
+
+    Args:
+        scenario: Loaded scenario
+        config: MCP configuration
+        rows: Variable rows (merged over options["variables"])
+        workers: Number of worker processes (1 = in-process)
+        options: PlayerOptions keyword arguments (must be picklable)
+        on_record: Called with each row record, in row order
+        concurrency: Rows played at once per worker (sharing its clients)
+
+    Returns:
+        BatchStats for the run
+    """
+    options = dict(options or {})
+    shards = shard_rows(rows, workers)
+    stats = BatchStats(rows=len(rows), workers=len(shards) or 1)
+    start = time.time()
+
+    pending: dict[int, dict[str, Any]] = {}
+    next_index = 0
+
+    def accept(record: dict[str, Any]) -> None:
+        nonlocal next_index
+        pending[record["index"]] = record
+        while next_index in pending:
+            ready = pending.pop(next_index)
+            next_index += 1
+            if ready["success"]:
+                stats.passed += 1
+            else:
+                stats.failed += 1
+            stats.row_durations.append(ready["duration"])
+            stats.per_worker[ready["worker"]] = stats.per_worker.get(ready["worker"], 0) + 1
+            if on_record:
+                on_record(ready)
+
+    if len(shards) <= 1:
+        if shards:
+            asyncio.run(_play_shard(0, scenario, config, options, shards[0], accept, concurrency))
+    else:
+        _run_processes(scenario, config, options, shards, accept, concurrency)
+
+    stats.duration = time.time() - start
+    return stats
+
+
+def _run_processes(
+    scenario: Scenario,
+    config: Config,
+    options: dict[str, Any],
+    shards: list[list[tuple[int, dict[str, str]]]],
+    accept: Callable[[dict[str, Any]], None],
+    concurrency: int = 1,
+) -> None:
+    """Run shards in spawned processes and feed records to accept()"""
+    try:
+        from .limits import split_limits
+    except ImportError:
+        from limits import split_limits
+
+    # Server limits are per process: each worker gets its share
+    config = split_limits(config, len(shards))
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = {
+        worker: context.Process(
+            target=_worker_main,
+            args=(worker, scenario, config, options, shard, results, concurrency),
+            daemon=True,
+        )
+        for worker, shard in enumerate(shards)
+    }
+    for process in processes.values():
+        process.start()
+
+    seen: set[int] = set()
+    finished: set[int] = set()
+
+    def finish(worker: int, reason: str) -> None:
+        """Mark a worker done; rows it never reported fail"""
+        finished.add(worker)
+        for index, row in shards[worker]:
+            if index not in seen:
+                seen.add(index)
+                accept({
+                    "index": index,
+                    "worker": worker,
+                    "variables": row,
+                    "success": False,
+                    "duration": 0.0,
+                    "failed_step": None,
+                    "error": reason,
+                    "outputs": {},
+                })
+
+    try:
+        while len(finished) < len(processes):
+            try:
+                kind, payload = results.get(timeout=_POLL_INTERVAL)
+            except queue_module.Empty:
+                for worker, process in processes.items():
+                    if worker not in finished and not process.is_alive() and results.empty():
+                        finish(worker, f"Worker {worker} exited with code {process.exitcode}")
+                continue
+
+            if kind == "record":
+                seen.add(payload["index"])
+                accept(payload)
+            else:
+                finish(payload, f"Worker {payload} stopped before this row")
+    finally:
+        for process in processes.values():
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
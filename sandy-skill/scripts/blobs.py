@@ -0,0 +1,273 @@
+"""
+Sandy Blob Store
+
+Content-addressed storage for large step results under .sandy/blobs/.
+
+Values over a size threshold are serialized to JSON, hashed (SHA-256) and
+written once to <root>/<sha[:2]>/<sha>.json (or .json.gz when compressed).
+The in-memory StepResult keeps only a BlobRef, so memory stays bounded on
+long scenarios and identical payloads are stored once across runs.
+
+Uncompressed blobs can be memory-mapped for zero-copy reads.
+
+The store only grows: each stored (or reused) blob's mtime is refreshed, and
+prune() removes the least recently used blobs by age or total size
+(`sandy blobs --max-size/--max-age`).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+__all__ = [
+    # Data classes
+    "BlobRef",
+    # Classes
+    "BlobStore",
+    # Functions
+    "default_blob_dir",
+    "load_blob",
+    # Constants
+    "DEFAULT_BLOB_THRESHOLD",
+]
+
+
+# Results whose JSON form is at least this many bytes are spilled (1 MiB)
+DEFAULT_BLOB_THRESHOLD = 1024 * 1024
+
+# Estimated JSON size of numbers, booleans and null
+_SCALAR_SIZE = 8
+
+
+def default_blob_dir() -> Path:
+    """Get the default blob directory (project-local)"""
+    return Path.cwd() / ".sandy" / "blobs"
+
+
+@dataclass
+class BlobRef:
+    """Reference to a value stored in the blob store"""
+    sha256: str
+    size: int  # Uncompressed JSON size in bytes
+    path: str
+    compressed: bool = False
+    blob: bool = True  # Marker for JSON consumers
+
+
+class BlobStore:
+    """
+    Content-addressed store for large JSON values
+
+    Usage:
+        store = BlobStore(threshold=256 * 1024)
+        value = store.spill(result)   # BlobRef if large, value otherwise
+        data = store.load(value)
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        threshold: int = DEFAULT_BLOB_THRESHOLD,
+        compress: bool = False,
+    ):
+        self.root = Path(root) if root else default_blob_dir()
+        self.threshold = threshold
+        self.compress = compress
+
+    def blob_path(self, sha256: str, compressed: bool | None = None) -> Path:
+        """Get the file location for a blob hash"""
+        if compressed is None:
+            compressed = self.compress
+        suffix = ".json.gz" if compressed else ".json"
+        return self.root / sha256[:2] / f"{sha256}{suffix}"
+
+    def spill(self, value: Any, size: int | None = None) -> Any:
+        """
+        Store a value if its JSON form reaches the threshold
+
+        Values are only serialized once they are known to be large: the
+        size is taken from the caller when already measured, otherwise
+        estimated from the value (stopping at the threshold).
+
+        Args:
+            value: JSON-serializable value
+            size: JSON size in bytes, if already known
+
+        Returns:
+            BlobRef for spilled values, the value itself otherwise
+        """
+        if value is None or isinstance(value, BlobRef):
+            return value
+        if size is None:
+            size = _estimate_size(value, self.threshold)
+        if size < self.threshold:
+            return value
+
+        try:
+            data = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        except (TypeError, ValueError):
+            return value
+        return self.put(data)
+
+    def put(self, data: bytes) -> BlobRef:
+        """
+        Store serialized JSON bytes (no-op if the blob already exists)
+
+        Args:
+            data: UTF-8 JSON bytes
+
+        Returns:
+            BlobRef for the stored content
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha256)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(gzip.compress(data, compresslevel=6) if self.compress else data)
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        else:
+            # Reused: keep it from being pruned as least recently used
+            os.utime(path)
+
+        return BlobRef(
+            sha256=sha256,
+            size=len(data),
+            path=str(path),
+            compressed=self.compress,
+        )
+
+    def read_bytes(self, ref: BlobRef | dict[str, Any]) -> bytes:
+        """Read the (decompressed) JSON bytes of a blob"""
+        ref = _as_ref(ref)
+        raw = Path(ref.path).read_bytes()
+        return gzip.decompress(raw) if ref.compressed else raw
+
+    def mmap(self, ref: BlobRef | dict[str, Any]) -> mmap.mmap:
+        """
+        Memory-map an uncompressed blob (read-only)
+
+        Raises:
+            ValueError: If the blob is compressed
+        """
+        ref = _as_ref(ref)
+        if ref.compressed:
+            raise ValueError(f"Compressed blob cannot be memory-mapped: {ref.sha256}")
+        with open(ref.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def load(self, ref: BlobRef | dict[str, Any]) -> Any:
+        """Load and decode the value stored for a reference"""
+        return json.loads(self.read_bytes(ref))
+
+    def usage(self) -> tuple[int, int]:
+        """Get the number of stored blobs and their total size on disk"""
+        files = self._files()
+        return len(files), sum(size for _, _, size in files)
+
+    def prune(self, max_bytes: int | None = None, max_age: float | None = None) -> tuple[int, int]:
+        """
+        Remove least recently used blobs
+
+        Args:
+            max_bytes: Remove the oldest blobs until the store is at most this size
+            max_age: Remove blobs not stored or reused for this many seconds
+
+        Returns:
+            (blobs removed, bytes freed)
+        """
+        files = sorted(self._files(), key=lambda f: f[1])  # Oldest first
+        total = sum(size for _, _, size in files)
+        cutoff = time.time() - max_age if max_age is not None else None
+        removed = freed = 0
+
+        for path, mtime, size in files:
+            expired = cutoff is not None and mtime < cutoff
+            if not expired and (max_bytes is None or total <= max_bytes):
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            freed += size
+
+        return removed, freed
+
+    def _files(self) -> list[tuple[Path, float, int]]:
+        """List (path, mtime, size) of stored blobs"""
+        files = []
+        for path in self.root.glob("*/*.json*"):
+            if ".tmp" in path.name:
+                continue  # Being written by another process
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((path, st.st_mtime, st.st_size))
+        return files
+
+
+def _estimate_size(value: Any, limit: int) -> int:
+    """
+    Estimate the JSON size of a value without serializing it
+
+    Counts string lengths plus quotes and separators, and stops as soon as
+    the estimate reaches limit.
+    """
+    size = 0
+    stack = [value]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2 + len(item)
+            for key, v in item.items():
+                size += len(str(key)) + 3
+                stack.append(v)
+        elif isinstance(item, (list, tuple)):
+            size += 2 + len(item)
+            stack.extend(item)
+        elif isinstance(item, bytes):
+            size += len(item)
+        else:
+            size += _SCALAR_SIZE
+    return size
+
+
+def _as_ref(ref: BlobRef | dict[str, Any]) -> BlobRef:
+    """Accept a BlobRef or its dict form (e.g. from JSON output)"""
+    if isinstance(ref, BlobRef):
+        return ref
+    return BlobRef(
+        sha256=ref["sha256"],
+        size=ref["size"],
+        path=ref["path"],
+        compressed=ref.get("compressed", False),
+    )
+
+
+def load_blob(ref: BlobRef | dict[str, Any]) -> Any:
+    """
+    Convenience function: load the value behind a blob reference
+
+    Args:
+        ref: BlobRef or its dict form
+
+    Returns:
+        Decoded JSON value
+    """
+    return BlobStore(Path(_as_ref(ref).path).parent.parent).load(ref)
@@ -0,0 +1,285 @@
+"""
+Sandy Tool Catalog
+
+Caches MCP tool schemas on disk per server configuration, and checks
+scenarios against them before execution (preflight), so misspelled tools
+and missing/mistyped params fail in milliseconds without spawning servers.
+
+Catalogs live in .sandy/cache/tools/<server>-<config hash>.json. The hash
+covers the server's command, args, env and endpoint, so editing a server's
+config starts a new catalog. Catalogs are filled when a server is first
+connected during a play, or explicitly with `sandy tools --refresh`.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+
+__all__ = [
+    # Data classes
+    "PreflightIssue",
+    # Classes
+    "ToolCatalog",
+    # Functions
+    "preflight",
+    "validate_params",
+    "server_config_hash",
+    "default_catalog_dir",
+    # Constants
+    "CATALOG_VERSION",
+]
+
+
+try:
+    from .scenario import Scenario, parse_tool_name, VAR_PATTERN
+    from .config import Config, ServerConfig, get_server_config
+except ImportError:
+    from scenario import Scenario, parse_tool_name, VAR_PATTERN
+    from config import Config, ServerConfig, get_server_config
+
+
+# Bump when the catalog file layout changes
+CATALOG_VERSION = 1
+
+# ServerConfig fields that select the server (call limits don't)
+_IDENTITY_FIELDS = ("name", "endpoint", "command", "args", "env", "replay")
+
+# JSON Schema type name -> accepted Python types
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+    "null": (type(None),),
+}
+
+
+def default_catalog_dir() -> Path:
+    """Get the default catalog directory (project-local)"""
+    return Path.cwd() / ".sandy" / "cache" / "tools"
+
+
+def server_config_hash(server_config: ServerConfig) -> str:
+    """Stable hash of everything that determines which server is started"""
+    identity = {k: v for k, v in asdict(server_config).items() if k in _IDENTITY_FIELDS}
+    key = json.dumps(identity, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class PreflightIssue:
+    """A problem found before execution"""
+    step: int
+    tool: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"Step {self.step} ({self.tool}): {self.message}"
+
+
+class ToolCatalog:
+    """
+    On-disk cache of MCP tool schemas
+
+    Usage:
+        catalog = ToolCatalog()
+        tools = catalog.get(server_config)          # None if not cached
+        tools = await catalog.refresh(server_config)  # connect and re-fetch
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_catalog_dir()
+        self._loaded: dict[str, dict[str, dict[str, Any]] | None] = {}
+
+    def path_for(self, server_config: ServerConfig) -> Path:
+        """Get the catalog file location for a server config"""
+        return self.cache_dir / f"{server_config.name}-{server_config_hash(server_config)}.json"
+
+    def get(self, server_config: ServerConfig) -> dict[str, dict[str, Any]] | None:
+        """
+        Get cached tools for a server
+
+        Returns:
+            Mapping of tool name -> {"name", "description", "inputSchema"},
+            or None if no catalog is cached
+        """
+        path = self.path_for(server_config)
+        key = str(path)
+        if key not in self._loaded:
+            self._loaded[key] = self._read(path)
+        return self._loaded[key]
+
+    def put(self, server_config: ServerConfig, tools: list[dict[str, Any]]) -> None:
+        """Store the tool list for a server (cache failures are ignored)"""
+        path = self.path_for(server_config)
+        data = {
+            "version": CATALOG_VERSION,
+            "server": server_config.name,
+            "fetched_at": time.time(),
+            "tools": tools,
+        }
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+        self._loaded[str(path)] = {tool["name"]: tool for tool in tools}
+
+    async def refresh(self, server_config: ServerConfig) -> dict[str, dict[str, Any]]:
+        """
+        Connect to the server and re-fetch its tool schemas
+
+        Raises:
+            MCPClientError: If the server cannot be started or reached
+        """
+        try:
+            from .clients import create_client
+        except ImportError:
+            from clients import create_client
+
+        client = await create_client(server_config)
+        await client.connect()
+        try:
+            tools = await client.list_tool_schemas()
+        finally:
+            await client.disconnect()
+
+        self.put(server_config, tools)
+        return {tool["name"]: tool for tool in tools}
+
+    def _read(self, path: Path) -> dict[str, dict[str, Any]] | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION:
+            return None
+        return {tool["name"]: tool for tool in data.get("tools", [])}
+
+
+def _is_template(value: Any) -> bool:
+    """Values with {{...}} are only known at runtime"""
+    return isinstance(value, str) and VAR_PATTERN.search(value) is not None
+
+
+def _type_matches(value: Any, expected: str | list[str]) -> bool:
+    names = expected if isinstance(expected, list) else [expected]
+    for name in names:
+        accepted = _JSON_TYPES.get(name)
+        if accepted is None:
+            return True  # Unknown type keyword, don't guess
+        # bool is an int subclass, but not a JSON number
+        if isinstance(value, bool) and name in ("number", "integer"):
+            continue
+        if isinstance(value, accepted):
+            return True
+    return False
+
+
+def validate_params(params: dict[str, Any], schema: dict[str, Any] | None) -> list[str]:
+    """
+    Check step params against a tool's input schema (top level only)
+
+    Templated values ({{...}}) are not type-checked.
+
+    Args:
+        params: Step params as written in the scenario
+        schema: JSON Schema of the tool input (None = no checks)
+
+    Returns:
+        List of problems (empty if valid)
+    """
+    if not schema or schema.get("type", "object") != "object":
+        return []
+
+    problems: list[str] = []
+    properties: dict[str, Any] = schema.get("properties") or {}
+
+    for name in schema.get("required") or []:
+        if name not in params:
+            problems.append(f"Missing required param '{name}'")
+
+    for name, value in params.items():
+        prop = properties.get(name)
+        if prop is None:
+            if schema.get("additionalProperties") is False:
+                hint = difflib.get_close_matches(name, properties, n=1)
+                suffix = f" (did you mean '{hint[0]}'?)" if hint else ""
+                problems.append(f"Unknown param '{name}'{suffix}")
+            continue
+        if _is_template(value) or not isinstance(prop, dict):
+            continue
+        if "type" in prop and not _type_matches(value, prop["type"]):
+            problems.append(
+                f"Param '{name}' should be {prop['type']}, got {type(value).__name__}"
+            )
+        elif "enum" in prop and value not in prop["enum"]:
+            problems.append(f"Param '{name}' must be one of {prop['enum']}")
+
+    return problems
+
+
+def preflight(scenario: Scenario, config: Config, catalog: ToolCatalog) -> list[PreflightIssue]:
+    """
+    Check every MCP step against cached tool catalogs
+
+    Servers without a cached catalog are only checked for presence in the
+    config; nothing is spawned.
+
+    Args:
+        scenario: Scenario to check
+        config: MCP configuration
+        catalog: Tool catalog
+
+    Returns:
+        List of issues (empty if the scenario passes)
+    """
+    issues: list[PreflightIssue] = []
+
+    for step in scenario.steps:
+        if not step.tool.startswith("mcp__"):
+            continue  # sandy__ / claude__ tools are validated by the scenario loader
+
+        try:
+            server_name, tool_name = parse_tool_name(step.tool)
+        except ValueError as e:
+            issues.append(PreflightIssue(step.step, step.tool, str(e)))
+            continue
+
+        try:
+            server_config = get_server_config(config, server_name)
+        except KeyError:
+            issues.append(PreflightIssue(
+                step.step, step.tool, f"Server '{server_name}' not found in config ({config.source})"
+            ))
+            continue
+
+        tools = catalog.get(server_config)
+        if tools is None:
+            continue
+
+        tool = tools.get(tool_name)
+        if tool is None:
+            hint = difflib.get_close_matches(tool_name, tools, n=1)
+            suffix = f" (did you mean '{hint[0]}'?)" if hint else ""
+            issues.append(PreflightIssue(
+                step.step, step.tool, f"Unknown tool '{tool_name}' on server '{server_name}'{suffix}"
+            ))
+            continue
+
+        for problem in validate_params(step.params, tool.get("inputSchema")):
+            issues.append(PreflightIssue(step.step, step.tool, problem))
+
+    return issues
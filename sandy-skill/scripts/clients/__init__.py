@@ -35,6 +35,7 @@ async def create_client(server_config: "ServerConfig") -> MCPClient:
     Create an MCP client based on server configuration
 
     Transport selection:
+    - replay fixture → replay client (recorded responses, no server)
     - endpoint with ws:// or wss:// → WebSocket client
     - endpoint with http:// → SSE client (not yet implemented)
     - command without endpoint → stdio client
@@ -51,13 +52,21 @@ async def create_client(server_config: "ServerConfig") -> MCPClient:
     """
     server_name = server_config.name
 
+    # Recorded fixture instead of a live server
+    if server_config.replay:
+        try:
+            from .replay_client import ReplayClient
+        except ImportError:
+            from clients.replay_client import ReplayClient
+        return ReplayClient(server_name, server_config.replay, server_config.replay_latency)
+
     # Special case: claude-in-chrome uses Unix socket
     if server_name == "claude-in-chrome":
         try:
             from .socket_client import ClaudeInChromeSocketClient
         except ImportError:
             from clients.socket_client import ClaudeInChromeSocketClient
-        return ClaudeInChromeSocketClient()
+        return ClaudeInChromeSocketClient(tabs=server_config.tabs or 1)
 
     # Determine transport based on config
     if server_config.endpoint:
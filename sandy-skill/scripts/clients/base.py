@@ -6,13 +6,106 @@ Abstract base class for MCP clients with different transports.
 
 from __future__ import annotations
 
+import base64
+import functools
+import hashlib
 import json
+import mimetypes
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+try:
+    from .. import metrics, tracing
+except ImportError:
+    import metrics
+    import tracing
 
-def extract_content_data(content_list: list[Any]) -> Any:
+
+# Base64 characters decoded per write (multiple of 4)
+_BASE64_CHUNK = 4 * 256 * 1024
+
+
+def save_binary_content(data: str, mime: str | None, artifacts_dir: str | Path) -> dict[str, Any]:
+    """
+    Decode base64 content to a file in the artifacts directory.
+
+    The payload is decoded and hashed in fixed-size chunks, so the decoded
+    bytes are never held in memory as a whole. Whitespace (line-wrapped
+    base64) is dropped per chunk, carrying the unaligned tail over. Files
+    are named by content hash, so identical artifacts are written once.
+
+    Args:
+        data: Base64-encoded payload
+        mime: MIME type (used for the file extension)
+        artifacts_dir: Target directory
+
+    Returns:
+        Dict with path, mime, bytes and sha256
+    """
+    directory = Path(artifacts_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    # Unique per call: threads and tasks of one process save concurrently
+    f = tempfile.NamedTemporaryFile("wb", dir=directory, prefix=".artifact.", suffix=".tmp", delete=False)
+    tmp_path = Path(f.name)
+    try:
+        with f:
+            pending = ""
+            for start in range(0, len(data), _BASE64_CHUNK):
+                text = pending + data[start:start + _BASE64_CHUNK]
+                if any(c in text for c in "\r\n\t "):
+                    text = "".join(text.split())
+                aligned = len(text) - len(text) % 4
+                pending = text[aligned:]
+                chunk = base64.b64decode(text[:aligned])
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+            if pending:
+                base64.b64decode(pending)  # Raises for a truncated payload
+
+        sha256 = digest.hexdigest()
+        extension = (mimetypes.guess_extension(mime) if mime else None) or ".bin"
+        path = directory / f"{sha256[:16]}{extension}"
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return {"path": str(path), "mime": mime, "bytes": size, "sha256": sha256}
+
+
+def _mime_type(obj: Any) -> str | None:
+    """MIME type of an SDK content object (field name varies by SDK version)"""
+    return getattr(obj, "mime_type", None) or getattr(obj, "mimeType", None)
+
+
+def _binary_payload(content: Any) -> tuple[str, str | None] | None:
+    """Get (base64 data, mime) of an image/audio/blob content block"""
+    if isinstance(content, dict):
+        if content.get("type") in ("image", "audio") and isinstance(content.get("data"), str):
+            return content["data"], content.get("mimeType")
+        resource = content.get("resource")
+        if content.get("type") == "resource" and isinstance(resource, dict) and "blob" in resource:
+            return resource["blob"], resource.get("mimeType")
+        return None
+
+    content_type = getattr(content, "type", None)
+    if content_type in ("image", "audio") and isinstance(getattr(content, "data", None), str):
+        return content.data, _mime_type(content)
+    resource = getattr(content, "resource", None)
+    if content_type == "resource" and isinstance(getattr(resource, "blob", None), str):
+        return resource.blob, _mime_type(resource)
+    return None
+
+
+def extract_content_data(content_list: list[Any], artifacts_dir: str | Path | None = None) -> Any:
     """
     Extract data from MCP content blocks.
 
@@ -21,6 +114,8 @@ def extract_content_data(content_list: list[Any]) -> Any:
 
     Args:
         content_list: List of MCP content blocks
+        artifacts_dir: If set, image/audio/blob blocks are decoded to files
+            here and replaced by {path, mime, bytes, sha256}
 
     Returns:
         Single item if only one content block, otherwise list of items
@@ -30,7 +125,15 @@ def extract_content_data(content_list: list[Any]) -> Any:
 
     content_data = []
     for content in content_list:
-        if hasattr(content, "text"):
+        binary = _binary_payload(content) if artifacts_dir is not None else None
+        if binary is not None:
+            content_data.append(save_binary_content(binary[0], binary[1], artifacts_dir))
+        elif isinstance(content, dict) and content.get("type") == "text":
+            try:
+                content_data.append(json.loads(content.get("text", "")))
+            except json.JSONDecodeError:
+                content_data.append(content.get("text", ""))
+        elif hasattr(content, "text"):
             # Try to parse as JSON
             try:
                 content_data.append(json.loads(content.text))
@@ -59,6 +162,28 @@ async def list_tools_from_session(session: Any) -> list[str]:
     return [tool.name for tool in result.tools]
 
 
+async def list_tool_schemas_from_session(session: Any) -> list[dict[str, Any]]:
+    """
+    Helper to extract tool names, descriptions and input schemas.
+
+    Args:
+        session: MCP ClientSession with list_tools() method
+
+    Returns:
+        List of {"name", "description", "inputSchema"} dicts
+    """
+    result = await session.list_tools()
+    return [
+        {
+            "name": tool.name,
+            "description": getattr(tool, "description", None),
+            # Field name varies by SDK version
+            "inputSchema": getattr(tool, "input_schema", None) or getattr(tool, "inputSchema", None),
+        }
+        for tool in result.tools
+    ]
+
+
 @dataclass
 class ToolResult:
     """Result from a tool call"""
@@ -78,6 +203,36 @@ class MCPClient(ABC):
     - Socket: Unix domain socket (claude-in-chrome)
     """
 
+    # Where binary content blocks are written (None = keep base64 in results)
+    artifacts_dir: str | Path | None = None
+
+    # Wrappers around an already-instrumented client set this to False
+    instrumented: bool = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Instrument every transport's connect/disconnect/call_tool for metrics
+
+        Only the first concrete definition in the class hierarchy is wrapped;
+        overrides of it are expected to call super(), which is measured.
+        """
+        super().__init_subclass__(**kwargs)
+        if not cls.__dict__.get("instrumented", True):
+            return
+        for name, wrap in (
+            ("connect", _instrument_connect),
+            ("disconnect", _instrument_disconnect),
+            ("call_tool", _instrument_call_tool),
+        ):
+            func = cls.__dict__.get(name)
+            if func is None or getattr(func, "__isabstractmethod__", False):
+                continue
+            if any(getattr(base.__dict__.get(name), "_instrumented", False) for base in cls.__mro__[1:]):
+                continue
+            wrapped = wrap(func)
+            wrapped._instrumented = True
+            setattr(cls, name, wrapped)
+
     @property
     @abstractmethod
     def transport_type(self) -> str:
@@ -129,6 +284,21 @@ class MCPClient(ABC):
         """
         pass
 
+    async def list_tool_schemas(self) -> list[dict[str, Any]]:
+        """
+        List available tools with their input schemas
+
+        Transports without schema support return names only
+        (inputSchema is None).
+
+        Returns:
+            List of {"name", "description", "inputSchema"} dicts
+        """
+        return [
+            {"name": name, "description": None, "inputSchema": None}
+            for name in await self.list_tools()
+        ]
+
     async def __aenter__(self) -> MCPClient:
         """Async context manager entry"""
         await self.connect()
@@ -139,6 +309,91 @@ class MCPClient(ABC):
         await self.disconnect()
 
 
+class SessionClientMixin:
+    """
+    Tool listing for transports built on an MCP SDK ClientSession
+
+    Mix in before MCPClient; expects `_connected` and `_session` attributes.
+    """
+
+    _connected: bool
+    _session: Any
+
+    async def list_tool_schemas(self) -> list[dict[str, Any]]:
+        """
+        List available tools with their input schemas
+
+        Returns:
+            List of {"name", "description", "inputSchema"} dicts
+        """
+        if not self._connected or not self._session:
+            raise MCPToolCallError("Not connected to MCP server")
+
+        return await list_tool_schemas_from_session(self._session)
+
+
+def _instrument_connect(func: Any) -> Any:
+    @functools.wraps(func)
+    async def connect(self: MCPClient) -> None:
+        await func(self)
+        if metrics.REGISTRY.enabled and not getattr(self, "_metrics_connected", False):
+            self._metrics_connected = True
+            metrics.CONNECTIONS.inc(server=self.server_name, transport=self.transport_type)
+    return connect
+
+
+def _instrument_disconnect(func: Any) -> Any:
+    @functools.wraps(func)
+    async def disconnect(self: MCPClient) -> None:
+        try:
+            await func(self)
+        finally:
+            if getattr(self, "_metrics_connected", False):
+                self._metrics_connected = False
+                metrics.CONNECTIONS.dec(server=self.server_name, transport=self.transport_type)
+    return disconnect
+
+
+def _instrument_call_tool(func: Any) -> Any:
+    @functools.wraps(func)
+    async def call_tool(self: MCPClient, tool_name: str, params: dict[str, Any]) -> ToolResult:
+        measure = metrics.REGISTRY.enabled
+        if not measure and tracing.get_tracer() is None:
+            return await func(self, tool_name, params)
+
+        server = self.server_name
+        sent = metrics.payload_size(params)
+        received = 0
+        outcome = "error"
+        if measure:
+            metrics.CALLS_IN_FLIGHT.inc(server=server)
+            metrics.BYTES.inc(sent, server=server, direction="sent")
+        start = time.perf_counter()
+        with tracing.span(
+            "call", kind="client", server=server, tool=tool_name,
+            transport=self.transport_type, bytes_sent=sent,
+        ) as span:
+            try:
+                result = await func(self, tool_name, params)
+                if result.success:
+                    outcome = "success"
+                    received = metrics.payload_size(result.data)
+                    if measure:
+                        metrics.BYTES.inc(received, server=server, direction="received")
+                elif span:
+                    span.error = result.error or "Tool call failed"
+                return result
+            finally:
+                if span:
+                    span.set_attributes(outcome=outcome, bytes_received=received)
+                if measure:
+                    metrics.CALLS_IN_FLIGHT.dec(server=server)
+                    metrics.CALL_DURATION.observe(
+                        time.perf_counter() - start, server=server, tool=tool_name, outcome=outcome
+                    )
+    return call_tool
+
+
 class MCPClientError(Exception):
     """Base exception for MCP client errors"""
     pass
@@ -152,3 +407,29 @@ class MCPConnectionError(MCPClientError):
 class MCPToolCallError(MCPClientError):
     """Raised when a tool call fails"""
     pass
+
+
+# Error text left by a transport whose session or pipe has gone away
+_CONNECTION_LOST = (
+    "not connected",
+    "connection closed",
+    "closedresourceerror",
+    "brokenresourceerror",
+    "endofstream",
+)
+
+
+def is_connection_error(error: BaseException | str | None) -> bool:
+    """
+    Check whether a tool call failed because the transport is gone
+
+    Args:
+        error: Raised exception or ToolResult error text
+
+    Returns:
+        True if the client must reconnect before the next call
+    """
+    if isinstance(error, MCPConnectionError):
+        return True
+    text = str(error or "").lower()
+    return any(marker in text for marker in _CONNECTION_LOST)
@@ -0,0 +1,226 @@
+"""
+Sandy Record/Replay Transport
+
+RecordingClient wraps any MCPClient and writes every tool call - params,
+result and duration - to a JSONL fixture file, replacing the previous
+recording when the client disconnects. ReplayClient serves a
+fixture back with the recorded latency (scaled, 0 = instant), so scenarios
+can be played and benchmarked offline.
+
+Fixture lines (one file per server, see fixture_path):
+    {"type": "tools", "tools": [{"name": ..., "inputSchema": ...}]}
+    {"type": "call", "tool": "query", "params": {...}, "success": true,
+     "data": ..., "error": null, "duration": 0.132}
+
+Replay matches calls on tool and params; repeated identical calls get the
+recorded responses in order (the last one repeats once they run out).
+Calls with no exact match get the next unused response of the same tool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, TextIO
+
+try:
+    from .base import MCPClient, ToolResult, MCPConnectionError
+except ImportError:
+    from clients.base import MCPClient, ToolResult, MCPConnectionError
+
+
+def fixture_path(directory: str | Path, server_name: str) -> Path:
+    """Fixture file of a server within a fixture directory"""
+    return Path(directory) / f"{server_name}.jsonl"
+
+
+def _params_key(tool_name: str, params: dict[str, Any]) -> str:
+    return tool_name + "\0" + json.dumps(params, sort_keys=True, default=str)
+
+
+class RecordingClient(MCPClient):
+    """
+    Records another client's tool calls to a fixture file
+
+    Calls go to a temp file next to the fixture, which replaces the
+    fixture on disconnect, so a re-recording never mixes with the old one.
+
+    Usage:
+        client = RecordingClient(await create_client(config), "fixtures/slack.jsonl")
+    """
+
+    # The wrapped client already records metrics and spans
+    instrumented = False
+
+    def __init__(self, client: MCPClient, path: str | Path):
+        self._client = client
+        self.path = Path(path)
+        self._file: TextIO | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Transport extras (e.g. the claude-in-chrome tab pool)
+        if name == "_client":
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    @property
+    def transport_type(self) -> str:
+        return self._client.transport_type
+
+    @property
+    def server_name(self) -> str:
+        return self._client.server_name
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp", delete=False
+            )
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    async def connect(self) -> None:
+        await self._client.connect()
+
+    async def disconnect(self) -> None:
+        try:
+            await self._client.disconnect()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                os.replace(self._file.name, self.path)
+                self._file = None
+
+    async def call_tool(self, tool_name: str, params: dict[str, Any]) -> ToolResult:
+        start = time.perf_counter()
+        result = await self._client.call_tool(tool_name, params)
+        self._write({
+            "type": "call",
+            "tool": tool_name,
+            "params": params,
+            "success": result.success,
+            "data": result.data,
+            "error": result.error,
+            "duration": round(time.perf_counter() - start, 6),
+        })
+        return result
+
+    async def list_tools(self) -> list[str]:
+        return await self._client.list_tools()
+
+    async def list_tool_schemas(self) -> list[dict[str, Any]]:
+        schemas = await self._client.list_tool_schemas()
+        self._write({"type": "tools", "tools": schemas})
+        return schemas
+
+
+class ReplayClient(MCPClient):
+    """
+    Serves tool calls from a recorded fixture file
+
+    Args:
+        server_name: Server the fixture was recorded from
+        path: Fixture file (JSONL, see module docstring)
+        latency: Multiplier for recorded call durations (1 = real, 0 = instant)
+    """
+
+    def __init__(self, server_name: str, path: str | Path, latency: float = 1.0):
+        self._server_name = server_name
+        self.path = Path(path)
+        self.latency = latency
+        self._tools: list[dict[str, Any]] | None = None
+        self._exact: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        self._by_tool: dict[str, deque[dict[str, Any]]] = {}
+
+    @property
+    def transport_type(self) -> str:
+        return "replay"
+
+    @property
+    def server_name(self) -> str:
+        return self._server_name
+
+    async def connect(self) -> None:
+        """
+        Load the fixture
+
+        Raises:
+            MCPConnectionError: If the fixture is missing or not valid JSONL
+        """
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            raise MCPConnectionError(f"Cannot read replay fixture for {self._server_name}: {e}")
+
+        self._exact.clear()
+        self._last.clear()
+        self._by_tool.clear()
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise MCPConnectionError(f"Invalid replay fixture {self.path}:{number}: {e}")
+            if record.get("type") == "tools":
+                self._tools = record.get("tools") or []
+            elif record.get("type") == "call":
+                record["used"] = False
+                key = _params_key(record["tool"], record.get("params") or {})
+                self._exact.setdefault(key, deque()).append(record)
+                self._by_tool.setdefault(record["tool"], deque()).append(record)
+
+    async def disconnect(self) -> None:
+        pass
+
+    def _take(self, tool_name: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        key = _params_key(tool_name, params)
+        exact = self._exact.get(key)
+        while exact:
+            record = exact.popleft()
+            if not record["used"]:
+                record["used"] = True
+                self._last[key] = record
+                return record
+        if key in self._last:
+            return self._last[key]
+
+        same_tool = self._by_tool.get(tool_name)
+        while same_tool:
+            record = same_tool.popleft()
+            if not record["used"]:
+                record["used"] = True
+                return record
+        return None
+
+    async def call_tool(self, tool_name: str, params: dict[str, Any]) -> ToolResult:
+        record = self._take(tool_name, params)
+        if record is None:
+            return ToolResult(
+                success=False,
+                error=f"No recorded response for {self._server_name}.{tool_name} in {self.path}",
+            )
+        if self.latency > 0 and record.get("duration"):
+            await asyncio.sleep(record["duration"] * self.latency)
+        return ToolResult(
+            success=bool(record.get("success")),
+            data=record.get("data"),
+            error=record.get("error"),
+        )
+
+    async def list_tools(self) -> list[str]:
+        if self._tools is not None:
+            return [tool["name"] for tool in self._tools]
+        return list(self._by_tool)
+
+    async def list_tool_schemas(self) -> list[dict[str, Any]]:
+        if self._tools is not None:
+            return self._tools
+        return await super().list_tool_schemas()
@@ -21,9 +21,9 @@ from pathlib import Path
 from typing import Any
 
 try:
-    from .base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError
+    from .base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data
 except ImportError:
-    from clients.base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError
+    from clients.base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data
 
 
 def get_socket_dir() -> Path:
@@ -37,9 +37,20 @@ class ClaudeInChromeSocketClient(MCPClient):
     MCP Client for claude-in-chrome via Unix socket
 
     Connects to an existing Claude Code --chrome session.
+
+    With tabs > 1, keeps a pool of up to that many tabs (existing tabs are
+    reused first, more are created on demand). Callers lease a tab, pass it
+    as tabId, and release it, so concurrent plays drive separate tabs.
+
+    Usage:
+        tab_id = await client.lease_tab()
+        try:
+            await client.call_tool("navigate", {"url": url, "tabId": tab_id})
+        finally:
+            client.release_tab(tab_id)
     """
 
-    def __init__(self, timeout: float = 30.0):
+    def __init__(self, timeout: float = 30.0, tabs: int = 1):
         self._socket_path: Path | None = None
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
@@ -50,6 +61,12 @@ class ClaudeInChromeSocketClient(MCPClient):
         self._tab_id: int | None = None
         self._read_task: asyncio.Task[None] | None = None
 
+        # Tab pool (tabs > 1)
+        self.tab_pool_size = max(1, tabs)
+        self._pool_tabs: list[int] = []
+        self._free_tabs: asyncio.Queue[int] | None = None
+        self._pool_lock: asyncio.Lock | None = None
+
     @property
     def transport_type(self) -> str:
         return "socket"
@@ -124,6 +141,8 @@ class ClaudeInChromeSocketClient(MCPClient):
         self._reader = None
         self._writer = None
         self._connected = False
+        self._pool_tabs = []
+        self._free_tabs = None
 
         # Cancel pending requests
         for future in self._pending_requests.values():
@@ -154,9 +173,52 @@ class ClaudeInChromeSocketClient(MCPClient):
 
         try:
             result = await self._send_request(tool_name, params)
+            # Non-text results (e.g. screenshots) arrive as raw content blocks
+            if (
+                self.artifacts_dir is not None
+                and isinstance(result, dict)
+                and isinstance(result.get("content"), list)
+            ):
+                result = extract_content_data(result["content"], self.artifacts_dir)
             return ToolResult(success=True, data=result)
         except Exception as e:
-            return ToolResult(success=False, error=str(e))
+            return ToolResult(success=False, error=str(e) or type(e).__name__)
+
+    async def lease_tab(self) -> int:
+        """
+        Lease a tab from the pool, waiting if all tabs are leased
+
+        Returns:
+            tabId to pass with each call
+
+        Raises:
+            MCPConnectionError: If a new tab cannot be created
+        """
+        if not self._connected:
+            raise MCPToolCallError("Not connected to Claude-in-Chrome socket")
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+
+        async with self._pool_lock:
+            if self._free_tabs is None:
+                # First lease: reuse the session tab and other open tabs
+                self._free_tabs = asyncio.Queue()
+                for tab_id in await self._existing_tabs():
+                    if len(self._pool_tabs) < self.tab_pool_size and tab_id not in self._pool_tabs:
+                        self._pool_tabs.append(tab_id)
+                        self._free_tabs.put_nowait(tab_id)
+
+            if self._free_tabs.empty() and len(self._pool_tabs) < self.tab_pool_size:
+                tab_id = await self._new_tab()
+                self._pool_tabs.append(tab_id)
+                return tab_id
+
+        return await self._free_tabs.get()
+
+    def release_tab(self, tab_id: int) -> None:
+        """Return a leased tab to the pool"""
+        if self._free_tabs is not None and tab_id in self._pool_tabs:
+            self._free_tabs.put_nowait(tab_id)
 
     async def list_tools(self) -> list[str]:
         """
@@ -206,33 +268,40 @@ class ClaudeInChromeSocketClient(MCPClient):
 
     async def _create_tab(self) -> None:
         """Get or create a tab for this session"""
-        # First check for existing tabs (don't create if empty)
-        result = await self._send_request("tabs_context_mcp", {"createIfEmpty": False})
+        # Reuse an existing tab if there is one (don't create if empty)
+        existing = await self._existing_tabs()
+        self._tab_id = existing[0] if existing else await self._new_tab()
 
-        # Try to reuse existing tab
+    async def _existing_tabs(self) -> list[int]:
+        """Tab ids of the session's open tabs (session tab first)"""
+        tabs = [self._tab_id] if self._tab_id is not None else []
+        result = await self._send_request("tabs_context_mcp", {"createIfEmpty": False})
         if isinstance(result, dict):
             available_tabs = result.get("availableTabs", [])
-            if available_tabs and isinstance(available_tabs, list) and len(available_tabs) > 0:
-                first_tab = available_tabs[0]
-                if isinstance(first_tab, dict) and "tabId" in first_tab:
-                    self._tab_id = first_tab["tabId"]
-                    return
-
-        # No existing tabs, create new one
+            if isinstance(available_tabs, list):
+                for tab in available_tabs:
+                    if isinstance(tab, dict) and "tabId" in tab and tab["tabId"] not in tabs:
+                        tabs.append(tab["tabId"])
+        return tabs
+
+    async def _new_tab(self) -> int:
+        """Create a tab and return its id"""
         result = await self._send_request("tabs_create_mcp", {})
 
         # Extract tabId from result
+        tab_id = None
         if isinstance(result, dict):
-            self._tab_id = result.get("tabId")
+            tab_id = result.get("tabId")
 
             # Try parsing from content text if not directly available
-            if self._tab_id is None and "content" in result:
+            if tab_id is None and "content" in result:
                 match = re.search(r"Tab ID:\s*(\d+)", str(result["content"]), re.I)
                 if match:
-                    self._tab_id = int(match.group(1))
+                    tab_id = int(match.group(1))
 
-        if self._tab_id is None:
+        if tab_id is None:
             raise MCPConnectionError("Could not extract tabId from response")
+        return tab_id
 
     async def _send_request(self, tool: str, args: dict[str, Any]) -> Any:
         """
@@ -12,12 +12,12 @@ from mcp import ClientSession
 from mcp.client.websocket import websocket_client
 
 try:
-    from .base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data, list_tools_from_session
+    from .base import MCPClient, SessionClientMixin, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data, list_tools_from_session
 except ImportError:
-    from clients.base import MCPClient, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data, list_tools_from_session
+    from clients.base import MCPClient, SessionClientMixin, ToolResult, MCPToolCallError, MCPConnectionError, extract_content_data, list_tools_from_session
 
 
-class WebSocketClient(MCPClient):
+class WebSocketClient(SessionClientMixin, MCPClient):
     """
     MCP Client using WebSocket transport
 
@@ -118,7 +118,7 @@ class WebSocketClient(MCPClient):
 
         try:
             result = await self._session.call_tool(tool_name, params)
-            data = extract_content_data(result.content) if result.content else None
+            data = extract_content_data(result.content, self.artifacts_dir) if result.content else None
 
             # Check if MCP returned an error
             if result.isError:
@@ -128,7 +128,7 @@ class WebSocketClient(MCPClient):
             return ToolResult(success=True, data=data)
 
         except Exception as e:
-            return ToolResult(success=False, error=str(e))
+            return ToolResult(success=False, error=str(e) or type(e).__name__)
 
     async def list_tools(self) -> list[str]:
         """
@@ -0,0 +1,497 @@
+"""
+Sandy Step Condition Engine
+
+Compiles step `condition` strings once into a small AST that is evaluated
+directly against variables and step outputs (no string substitution and
+re-parsing per evaluation).
+
+Grammar (lowest to highest precedence):
+    expr        := or_expr
+    or_expr     := and_expr (("or" | "||") and_expr)*
+    and_expr    := not_expr (("and" | "&&") not_expr)*
+    not_expr    := ("not" | "!") not_expr | comparison
+    comparison  := operand (op operand)?
+    op          := == | != | < | <= | > | >= | in | not in
+    operand     := {{ref}} | "string" | 'string' | number | true | false | null
+                 | len(expr) | [operand, ...] | (expr) | bare_word
+
+Semantics:
+- {{VAR}} / {{step_id.field}} resolve to their raw (typed) values
+- Quoted strings may contain {{...}} references (substituted as text)
+- Bare words (e.g. `{{VAR}} == value`) are string literals, as before;
+  only lowercase `true`, `false` and `null` are literals (`None`, `True`,
+  `none` are strings)
+- Numbers and numeric strings compare numerically ("10" > 9 is true)
+- Otherwise values compare by their text form, so None equals ""
+- Truthiness: None, blank strings, empty lists/dicts, false and 0 are false
+
+This differs from the legacy string evaluation, where a bare reference was
+true for any non-blank text (including "False", "0" and "[]"), and
+`null`/`true`/`false` were plain words. Players with legacy_conditions set
+keep the legacy evaluation for every condition.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable
+
+
+__all__ = [
+    # Classes
+    "Condition",
+    # Exceptions
+    "ConditionSyntaxError",
+    # Functions
+    "compile_condition",
+]
+
+
+# Resolves a reference ("VAR" or "step_id.field") to (value, found)
+Resolver = Callable[[str], "tuple[Any, bool]"]
+
+
+class ConditionSyntaxError(Exception):
+    """Raised when a condition cannot be compiled"""
+    pass
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<ref>\{\{[^}]+\}\})
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>==|!=|<=|>=|&&|\|\||[<>!(),\[\]-])
+      | (?P<word>[A-Za-z_][A-Za-z0-9_.\-]*)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"and", "or", "not", "in", "len"}  # Case-insensitive
+_LITERALS = {"true", "false", "null"}  # Lowercase only
+
+_COMPARISON_OPS = {"==", "!=", "<", "<=", ">", ">=", "in"}
+
+
+# ----------------------------------------------------------------------
+# Value semantics
+# ----------------------------------------------------------------------
+
+def _to_text(value: Any) -> str:
+    """Text form of a value (matches variable substitution in params)"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _to_number(value: Any) -> float | None:
+    """Numeric form of a value, or None if it is not numeric"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _truthy(value: Any) -> bool:
+    """Truthiness used for bare operands and boolean operators"""
+    if isinstance(value, str):
+        return bool(value.strip())
+    return bool(value)
+
+
+def _equals(left: Any, right: Any) -> bool:
+    if type(left) is type(right) and not isinstance(left, str):
+        return left == right
+    left_num, right_num = _to_number(left), _to_number(right)
+    if left_num is not None and right_num is not None:
+        return left_num == right_num
+    if isinstance(left, bool) or isinstance(right, bool):
+        # "True" / "true" / true all match
+        return _to_text(left).strip().lower() == _to_text(right).strip().lower()
+    return _to_text(left).strip() == _to_text(right).strip()
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if op == "==":
+        return _equals(left, right)
+    if op == "!=":
+        return not _equals(left, right)
+    if op == "in":
+        if isinstance(right, list):
+            return any(_equals(left, item) for item in right)
+        if isinstance(right, dict):
+            return _to_text(left) in right
+        return _to_text(left) in _to_text(right)
+
+    left_num, right_num = _to_number(left), _to_number(right)
+    if left_num is not None and right_num is not None:
+        a: Any = left_num
+        b: Any = right_num
+    elif isinstance(left, str) and isinstance(right, str):
+        a, b = left, right
+    else:
+        # Ordering between unrelated types is never true
+        return False
+
+    if op == "<":
+        return a < b
+    if op == "<=":
+        return a <= b
+    if op == ">":
+        return a > b
+    return a >= b
+
+
+def _length(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, list, dict)):
+        return len(value)
+    return len(_to_text(value))
+
+
+# ----------------------------------------------------------------------
+# AST nodes
+# ----------------------------------------------------------------------
+
+class _Node:
+    __slots__ = ()
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        raise NotImplementedError
+
+    def references(self) -> set[str]:
+        return set()
+
+
+class _Literal(_Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        return self.value
+
+
+class _Reference(_Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        value, found = resolve(self.name)
+        return value if found else None
+
+    def references(self) -> set[str]:
+        return {self.name}
+
+
+class _Template(_Node):
+    """Quoted string containing {{...}} references"""
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: list[str | _Reference]):
+        self.parts = parts
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        return "".join(
+            part if isinstance(part, str) else _to_text(part.evaluate(resolve))
+            for part in self.parts
+        )
+
+    def references(self) -> set[str]:
+        return {p.name for p in self.parts if isinstance(p, _Reference)}
+
+
+class _ListLiteral(_Node):
+    __slots__ = ("items",)
+
+    def __init__(self, items: list[_Node]):
+        self.items = items
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        return [item.evaluate(resolve) for item in self.items]
+
+    def references(self) -> set[str]:
+        return set().union(*(item.references() for item in self.items)) if self.items else set()
+
+
+class _Length(_Node):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: _Node):
+        self.operand = operand
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        return _length(self.operand.evaluate(resolve))
+
+    def references(self) -> set[str]:
+        return self.operand.references()
+
+
+class _Not(_Node):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: _Node):
+        self.operand = operand
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        return not _truthy(self.operand.evaluate(resolve))
+
+    def references(self) -> set[str]:
+        return self.operand.references()
+
+
+class _BoolOp(_Node):
+    __slots__ = ("op", "operands")
+
+    def __init__(self, op: str, operands: list[_Node]):
+        self.op = op
+        self.operands = operands
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        if self.op == "and":
+            return all(_truthy(o.evaluate(resolve)) for o in self.operands)
+        return any(_truthy(o.evaluate(resolve)) for o in self.operands)
+
+    def references(self) -> set[str]:
+        return set().union(*(o.references() for o in self.operands))
+
+
+class _Comparison(_Node):
+    __slots__ = ("op", "left", "right", "negate")
+
+    def __init__(self, op: str, left: _Node, right: _Node, negate: bool = False):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.negate = negate
+
+    def evaluate(self, resolve: Resolver) -> Any:
+        result = _compare(self.op, self.left.evaluate(resolve), self.right.evaluate(resolve))
+        return not result if self.negate else result
+
+    def references(self) -> set[str]:
+        return self.left.references() | self.right.references()
+
+
+# ----------------------------------------------------------------------
+# Parser
+# ----------------------------------------------------------------------
+
+def _tokenize(source: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    pos = 0
+    source = source.rstrip()
+    while pos < len(source):
+        match = _TOKEN_PATTERN.match(source, pos)
+        if not match or match.end() == pos:
+            raise ConditionSyntaxError(f"Unexpected character at {pos}: {source[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "word" and text in _LITERALS:
+            kind = "keyword"
+        elif kind == "word" and text.lower() in _KEYWORDS:
+            kind = "keyword"
+            text = text.lower()
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+def _parse_template(raw: str) -> _Node:
+    """Build a literal or template node from a quoted string token"""
+    body = raw[1:-1]
+    body = re.sub(r"\\(.)", r"\1", body)
+    parts: list[str | _Reference] = []
+    last = 0
+    for match in re.finditer(r"\{\{([^}]+)\}\}", body):
+        if match.start() > last:
+            parts.append(body[last:match.start()])
+        parts.append(_Reference(match.group(1).strip()))
+        last = match.end()
+    if not any(isinstance(p, _Reference) for p in parts):
+        return _Literal(body)
+    if last < len(body):
+        parts.append(body[last:])
+    return _Template(parts)
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def accept(self, *texts: str) -> str | None:
+        token = self.peek()
+        if token and token[0] in ("op", "keyword") and token[1] in texts:
+            self.pos += 1
+            return token[1]
+        return None
+
+    def expect(self, text: str) -> None:
+        if not self.accept(text):
+            raise ConditionSyntaxError(f"Expected '{text}'")
+
+    def parse(self) -> _Node:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ConditionSyntaxError(f"Unexpected token: {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self) -> _Node:
+        operands = [self.parse_and()]
+        while self.accept("or", "||"):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else _BoolOp("or", operands)
+
+    def parse_and(self) -> _Node:
+        operands = [self.parse_not()]
+        while self.accept("and", "&&"):
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else _BoolOp("and", operands)
+
+    def parse_not(self) -> _Node:
+        if self.accept("not", "!"):
+            return _Not(self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> _Node:
+        left = self.parse_operand()
+        token = self.peek()
+        if token is None or token[0] not in ("op", "keyword"):
+            return left
+
+        if token[1] == "not":
+            # "not in"
+            nxt = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            if nxt == ("keyword", "in"):
+                self.pos += 2
+                return _Comparison("in", left, self.parse_operand(), negate=True)
+            return left
+
+        if token[1] in _COMPARISON_OPS:
+            self.pos += 1
+            return _Comparison(token[1], left, self.parse_operand())
+        return left
+
+    def parse_operand(self) -> _Node:
+        token = self.peek()
+        if token is None:
+            raise ConditionSyntaxError("Unexpected end of condition")
+        kind, text = token
+        self.pos += 1
+
+        if kind == "ref":
+            return _Reference(text[2:-2].strip())
+        if kind == "string":
+            return _parse_template(text)
+        if kind == "number":
+            return _Literal(float(text) if "." in text else int(text))
+        if kind == "word":
+            return _Literal(text)
+        if kind == "keyword":
+            if text == "true":
+                return _Literal(True)
+            if text == "false":
+                return _Literal(False)
+            if text == "null":
+                return _Literal(None)
+            if text == "len":
+                self.expect("(")
+                operand = self.parse_or()
+                self.expect(")")
+                return _Length(operand)
+        if kind == "op":
+            if text == "(":
+                node = self.parse_or()
+                self.expect(")")
+                return node
+            if text == "[":
+                items: list[_Node] = []
+                if not self.accept("]"):
+                    items.append(self.parse_operand())
+                    while self.accept(","):
+                        items.append(self.parse_operand())
+                    self.expect("]")
+                return _ListLiteral(items)
+            if text == "-":
+                number = self.peek()
+                if number and number[0] == "number":
+                    self.pos += 1
+                    return _Literal(-(float(number[1]) if "." in number[1] else int(number[1])))
+
+        raise ConditionSyntaxError(f"Unexpected token: {text!r}")
+
+
+class Condition:
+    """
+    A compiled step condition
+
+    Usage:
+        condition = compile_condition('{{search.count}} > 0 and {{MODE}} == "full"')
+        if condition.evaluate(player._resolve_variable): ...
+    """
+
+    __slots__ = ("source", "_root")
+
+    def __init__(self, source: str, root: _Node):
+        self.source = source
+        self._root = root
+
+    def __repr__(self) -> str:
+        return f"Condition({self.source!r})"
+
+    def evaluate(self, resolve: Resolver) -> bool:
+        """
+        Evaluate against a reference resolver
+
+        Args:
+            resolve: Callable mapping "VAR" / "step_id.field" to (value, found)
+
+        Returns:
+            Boolean result
+        """
+        return _truthy(self._root.evaluate(resolve))
+
+    @property
+    def references(self) -> set[str]:
+        """Variable and step output references used by the condition"""
+        return self._root.references()
+
+
+def compile_condition(source: str) -> Condition:
+    """
+    Compile a condition string
+
+    Args:
+        source: Condition expression
+
+    Returns:
+        Compiled Condition
+
+    Raises:
+        ConditionSyntaxError: If the condition cannot be parsed
+    """
+    tokens = _tokenize(source)
+    if not tokens:
+        raise ConditionSyntaxError("Empty condition")
+    return Condition(source, _Parser(tokens).parse())
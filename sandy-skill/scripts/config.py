@@ -13,19 +13,26 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable
 
 
 __all__ = [
     # Data classes
     "ServerConfig",
     "Config",
+    "ConfigCandidate",
     # Exceptions
     "ConfigNotFoundError",
     "ConfigParseError",
     # Functions
     "detect_config",
+    "detect_config_cached",
+    "clear_config_cache",
+    "explain_config",
     "get_server_config",
     "load_config_from_path",
 ]
@@ -40,9 +47,24 @@ class ServerConfig:
     args: list[str] | None = None
     env: dict[str, str] | None = None
 
+    # Call limits, shared by all plays in the process (see limits.py)
+    max_concurrency: int | None = None  # Max tool calls in flight
+    rate_limit: float | None = None     # Calls per second (token bucket)
+    rate_burst: int | None = None       # Bucket size (default: ceil(rate_limit))
+    adaptive_concurrency: bool = False  # AIMD in-flight limit (max_concurrency = ceiling)
+
+    # claude-in-chrome: tabs in the pool, one leased per play
+    tabs: int | None = None
+
+    # Serve recorded responses from this fixture instead (clients/replay_client.py)
+    replay: str | None = None
+    replay_latency: float = 1.0  # Recorded duration multiplier (0 = instant)
+
     @property
     def transport_type(self) -> str:
         """Determine transport type"""
+        if self.replay:
+            return "replay"
         if self.endpoint:
             if self.endpoint.startswith("ws://") or self.endpoint.startswith("wss://"):
                 return "websocket"
@@ -55,6 +77,19 @@ class Config:
     """Sandy configuration"""
     servers: dict[str, ServerConfig]
     source: str  # Where config was loaded from
+    # Environment variables expanded into server env values -> value at load time
+    env_refs: dict[str, str | None] = field(default_factory=dict)
+
+
+@dataclass
+class ConfigCandidate:
+    """A config location considered during auto-detection"""
+    label: str
+    path: Path | None
+    exists: bool = False
+    selected: bool = False
+    servers: list[str] = field(default_factory=list)
+    error: str | None = None
 
 
 class ConfigNotFoundError(Exception):
@@ -84,33 +119,42 @@ def detect_config() -> Config:
     Raises:
         ConfigNotFoundError: If no config found
     """
+    for _label, path, loader in _config_candidates():
+        if path is not None and path.exists():
+            return loader(path)
+
+    _raise_not_found()
+
+
+def _config_candidates() -> list[tuple[str, Path | None, Callable[[Path], Config]]]:
+    """
+    List config locations in priority order
+
+    $SANDY_CONFIG, when set, is the only candidate.
+
+    Raises:
+        ConfigNotFoundError: If $SANDY_CONFIG points to a missing file
+    """
     # 1. Environment variable
     if env_path := os.getenv("SANDY_CONFIG"):
         path = Path(env_path)
-        if path.exists():
-            return load_sandy_config(path)
-        raise ConfigNotFoundError(f"SANDY_CONFIG path not found: {env_path}")
-
-    # 2. Project local config
-    local_config = Path.cwd() / ".sandy" / "config.json"
-    if local_config.exists():
-        return load_sandy_config(local_config)
-
-    # 3. Claude Desktop config
-    claude_config = get_claude_desktop_config_path()
-    if claude_config and claude_config.exists():
-        return parse_claude_desktop_config(claude_config)
-
-    # 4. Cursor config
-    cursor_config = Path.home() / ".cursor" / "mcp.json"
-    if cursor_config.exists():
-        return parse_cursor_config(cursor_config)
-
-    # 5. Global Sandy config
-    sandy_global = Path.home() / ".sandy" / "config.json"
-    if sandy_global.exists():
-        return load_sandy_config(sandy_global)
-
+        if not path.exists():
+            raise ConfigNotFoundError(f"SANDY_CONFIG path not found: {env_path}")
+        return [("$SANDY_CONFIG", path, load_sandy_config)]
+
+    return [
+        # 2. Project local config
+        ("project", Path.cwd() / ".sandy" / "config.json", load_sandy_config),
+        # 3. Claude Desktop config
+        ("claude-desktop", get_claude_desktop_config_path(), parse_claude_desktop_config),
+        # 4. Cursor config
+        ("cursor", Path.home() / ".cursor" / "mcp.json", parse_cursor_config),
+        # 5. Global Sandy config
+        ("global", Path.home() / ".sandy" / "config.json", load_sandy_config),
+    ]
+
+
+def _raise_not_found() -> None:
     raise ConfigNotFoundError(
         "No MCP config found. Checked:\n"
         "  - $SANDY_CONFIG environment variable\n"
@@ -121,6 +165,142 @@ def detect_config() -> Config:
     )
 
 
+@dataclass
+class _ResolvedConfig:
+    """In-process cache entry for detect_config_cached"""
+    config: Config
+    fingerprint: tuple[tuple[str, int | None, int | None], ...]
+    checked_at: float
+
+
+# Keyed by (cwd, $SANDY_CONFIG, $HOME)
+_resolved_configs: dict[tuple[str, str, str], _ResolvedConfig] = {}
+
+def _stat_fingerprint(path: Path | None) -> tuple[str, int | None, int | None]:
+    """Cheap change detector for a config candidate"""
+    if path is None:
+        return ("", None, None)
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def detect_config_cached(max_age: float = 0.0) -> Config:
+    """
+    Auto-detect MCP configuration, reusing the previous result when unchanged
+
+    The cache is keyed by the working directory, $SANDY_CONFIG and $HOME.
+    An entry is reused while the candidate files up to the winning source
+    keep their mtime/size and the environment variables the winning config
+    expanded (Config.env_refs) keep their values.
+
+    The cache lives in this process only. sandy schedule and sandy worker
+    call it before every job, so config edits apply to the next job while
+    unchanged configs skip the re-parse; one-shot commands use
+    detect_config.
+
+    Args:
+        max_age: Seconds during which a cached result is returned without
+            re-checking the filesystem (for daemon/batch loops). 0 always
+            re-validates with a stat per candidate.
+
+    Returns:
+        Detected Config object (shared; do not mutate)
+
+    Raises:
+        ConfigNotFoundError: If no config found
+    """
+    key = (os.getcwd(), os.getenv("SANDY_CONFIG", ""), os.getenv("HOME", ""))
+    entry = _resolved_configs.get(key)
+    now = time.monotonic()
+
+    if entry is not None:
+        if max_age > 0 and now - entry.checked_at < max_age:
+            return entry.config
+        if _entry_is_current(entry):
+            entry.checked_at = now
+            return entry.config
+
+    fingerprint: list[tuple[str, int | None, int | None]] = []
+    for _label, path, loader in _config_candidates():
+        stat = _stat_fingerprint(path)
+        fingerprint.append(stat)
+        if stat[1] is None:
+            continue
+
+        config = loader(path)
+        _resolved_configs[key] = _ResolvedConfig(
+            config=config,
+            fingerprint=tuple(fingerprint),
+            checked_at=now,
+        )
+        return config
+
+    _raise_not_found()
+
+
+def _entry_is_current(entry: _ResolvedConfig) -> bool:
+    """Check candidate files and referenced env vars against a cache entry"""
+    for name, value in entry.config.env_refs.items():
+        if os.environ.get(name) != value:
+            return False
+
+    try:
+        candidates = _config_candidates()
+    except ConfigNotFoundError:
+        return False
+
+    for (_label, path, _loader), cached in zip(candidates, entry.fingerprint):
+        if _stat_fingerprint(path) != cached:
+            return False
+    return True
+
+
+def clear_config_cache() -> None:
+    """Drop all cached config resolutions"""
+    _resolved_configs.clear()
+
+
+def explain_config() -> list[ConfigCandidate]:
+    """
+    Report every config candidate and which one wins
+
+    Unlike detect_config, this never raises for missing or invalid files;
+    problems are reported on the candidate.
+
+    Returns:
+        Candidates in priority order (at most one has selected=True)
+    """
+    try:
+        candidates = _config_candidates()
+    except ConfigNotFoundError as e:
+        env_path = os.getenv("SANDY_CONFIG")
+        return [ConfigCandidate(
+            label="$SANDY_CONFIG",
+            path=Path(env_path) if env_path else None,
+            error=str(e),
+        )]
+
+    report: list[ConfigCandidate] = []
+    resolved = False  # detect_config stops at the first existing file
+    for label, path, loader in candidates:
+        candidate = ConfigCandidate(label=label, path=path)
+        candidate.exists = path is not None and path.exists()
+        if candidate.exists:
+            try:
+                config = loader(path)
+                candidate.servers = sorted(config.servers)
+                candidate.selected = not resolved
+            except ConfigParseError as e:
+                candidate.error = str(e)
+            resolved = True
+        report.append(candidate)
+
+    return report
+
+
 def get_claude_desktop_config_path() -> Path | None:
     """Get Claude Desktop config path based on platform"""
     import platform
@@ -166,16 +346,51 @@ def load_sandy_config(path: Path) -> Config:
 def _parse_sandy_format(data: dict, source: str) -> Config:
     """Parse Sandy config from already-loaded data"""
     servers = {}
+    env_refs: dict[str, str | None] = {}
     for name, server_data in data.get("servers", {}).items():
         servers[name] = ServerConfig(
             name=name,
             endpoint=server_data.get("endpoint"),
             command=server_data.get("command"),
             args=server_data.get("args"),
-            env=expand_env_vars(server_data.get("env", {})),
+            env=expand_env_vars(server_data.get("env", {}), env_refs),
+            **_parse_server_options(name, server_data),
         )
 
-    return Config(servers=servers, source=source)
+    return Config(servers=servers, source=source, env_refs=env_refs)
+
+
+def _parse_server_options(name: str, server_data: dict) -> dict:
+    """Read optional per-server call limits, tab pool size and replay fixture"""
+    limits = {}
+    for key, cast in (("max_concurrency", int), ("rate_limit", float), ("rate_burst", int), ("tabs", int)):
+        value = server_data.get(key)
+        if value is not None:
+            try:
+                limits[key] = cast(value)
+            except (TypeError, ValueError):
+                raise ConfigParseError(f"Invalid {key} for server '{name}': {value!r}")
+            if limits[key] <= 0:
+                raise ConfigParseError(f"{key} for server '{name}' must be positive, got {value!r}")
+    adaptive = server_data.get("adaptive_concurrency")
+    if adaptive is not None:
+        if not isinstance(adaptive, bool):
+            raise ConfigParseError(f"adaptive_concurrency for server '{name}' must be true or false")
+        limits["adaptive_concurrency"] = adaptive
+    replay = server_data.get("replay")
+    if replay is not None:
+        if not isinstance(replay, str) or not replay:
+            raise ConfigParseError(f"replay for server '{name}' must be a fixture file path")
+        limits["replay"] = replay
+    latency = server_data.get("replay_latency")
+    if latency is not None:
+        try:
+            limits["replay_latency"] = float(latency)
+        except (TypeError, ValueError):
+            raise ConfigParseError(f"Invalid replay_latency for server '{name}': {latency!r}")
+        if limits["replay_latency"] < 0:
+            raise ConfigParseError(f"replay_latency for server '{name}' must not be negative, got {latency!r}")
+    return limits
 
 
 def _parse_mcp_servers_config(path: Path) -> Config:
@@ -204,15 +419,17 @@ def _parse_mcp_servers_config(path: Path) -> Config:
 def _parse_mcp_servers_format(data: dict, source: str) -> Config:
     """Parse mcpServers config from already-loaded data"""
     servers = {}
+    env_refs: dict[str, str | None] = {}
     for name, server_data in data.get("mcpServers", {}).items():
         servers[name] = ServerConfig(
             name=name,
             command=server_data.get("command"),
             args=server_data.get("args"),
-            env=expand_env_vars(server_data.get("env", {})),
+            env=expand_env_vars(server_data.get("env", {}), env_refs),
+            **_parse_server_options(name, server_data),
         )
 
-    return Config(servers=servers, source=source)
+    return Config(servers=servers, source=source, env_refs=env_refs)
 
 
 # Aliases for compatibility
@@ -220,11 +437,22 @@ parse_claude_desktop_config = _parse_mcp_servers_config
 parse_cursor_config = _parse_mcp_servers_config
 
 
-def expand_env_vars(env_dict: dict[str, str] | None) -> dict[str, str]:
+# Matches $VAR and ${VAR} references in config env values
+_ENV_REF_PATTERN = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def expand_env_vars(
+    env_dict: dict[str, str] | None,
+    refs: dict[str, str | None] | None = None,
+) -> dict[str, str]:
     """
     Expand environment variable references in env dict
 
     Supports ${VAR} syntax
+
+    Args:
+        env_dict: Server env values
+        refs: Filled with each referenced variable -> its current value
     """
     if not env_dict:
         return {}
@@ -234,6 +462,9 @@ def expand_env_vars(env_dict: dict[str, str] | None) -> dict[str, str]:
         if isinstance(value, str):
             # Expand ${VAR} references
             result[key] = os.path.expandvars(value)
+            if refs is not None:
+                for name in _ENV_REF_PATTERN.findall(value):
+                    refs[name] = os.environ.get(name)
         else:
             result[key] = str(value)
 
@@ -255,8 +486,9 @@ def get_server_config(config: Config, server_name: str) -> ServerConfig:
         KeyError: If server not found
     """
     # Special case: claude-in-chrome uses Unix socket, no config needed
+    # (an entry may still set tabs and call limits)
     if server_name == "claude-in-chrome":
-        return ServerConfig(name="claude-in-chrome")
+        return config.servers.get(server_name) or ServerConfig(name="claude-in-chrome")
 
     if server_name not in config.servers:
         available = ", ".join(config.servers.keys()) or "(none)"
@@ -0,0 +1,268 @@
+"""
+Sandy Script Fusion
+
+Fuses runs of consecutive, independent browser script steps into one
+script call that returns an array of per-step results, saving an MCP round
+trip per step. ScenarioPlayer demultiplexes the array back into one
+StepResult (and outputs) per original step.
+
+A step joins a run when it:
+- calls the same script tool as the run (chrome-devtools evaluate_script
+  with only a `function` param, or claude-in-chrome javascript_tool)
+- has no condition and no retry policy
+- has no wait_after, unless it ends the run
+- does not reference an earlier step of the run ({{id.field}})
+- (javascript_tool) has no top-level await or return: fused texts run
+  through indirect eval, where those are syntax errors
+
+Usage:
+    runs = plan_fused_runs(scenario.steps)  # first step number -> run
+    params = build_fused_params(tool, [p1, p2], stops=[True, True])
+    entries = split_fused_result(data, 2)   # [{"ok", "value"|"error", "ms"}]
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+try:
+    from .scenario import Step, VAR_PATTERN
+except ImportError:
+    from scenario import Step, VAR_PATTERN
+
+
+__all__ = [
+    # Exceptions
+    "FusionError",
+    # Functions
+    "is_fusible",
+    "plan_fused_runs",
+    "build_fused_params",
+    "split_fused_result",
+    # Constants
+    "FUSIBLE_TOOLS",
+]
+
+
+# Script tool -> params a step may carry and still be fused
+FUSIBLE_TOOLS: dict[str, frozenset[str]] = {
+    "mcp__chrome-devtools__evaluate_script": frozenset({"function"}),
+    "mcp__claude-in-chrome__javascript_tool": frozenset({"action", "text", "tabId"}),
+}
+
+
+# Script tokens: comments, strings, arrows, words and single characters
+_TOKEN = re.compile(
+    r"\s*(//[^\n]*|/\*.*?(?:\*/|$)|'(?:\\.|[^'\\])*'?|\"(?:\\.|[^\"\\])*\"?|=>|[A-Za-z_$][\w$]*|\S)",
+    re.S,
+)
+# Template literal text up to its closing backtick or next ${
+_TEMPLATE_TEXT = re.compile(r"(?:\\.|[^\\`$]|\$(?!\{))*", re.S)
+# Keywords whose (...) may be followed by a block that is not a function body
+_CONTROL_KEYWORDS = frozenset({"if", "for", "while", "switch", "catch", "with"})
+
+
+class FusionError(Exception):
+    """Raised when a fused call returns something other than per-step results"""
+    pass
+
+
+def is_fusible(step: Step) -> bool:
+    """Whether a step can take part in a fused run (on its own merits)"""
+    allowed = FUSIBLE_TOOLS.get(step.tool)
+    if allowed is None or step.condition or step.on_error == "retry":
+        return False
+    if not step.params or not set(step.params) <= allowed:
+        return False
+    if step.tool.endswith("javascript_tool"):
+        text = step.params.get("text")
+        return (
+            step.params.get("action", "javascript_exec") == "javascript_exec"
+            and isinstance(text, str)
+            and not _top_level_await_or_return(text)
+        )
+    return "function" in step.params
+
+
+def _top_level_await_or_return(source: str) -> bool:
+    """
+    Whether a script body uses await or return outside any function
+
+    A cheap scan (no parser): comments, strings and template text are
+    skipped, and braces after `=>` or a non-control `(...)` count as
+    function bodies. Unclear cases (e.g. an expression-bodied async
+    arrow) count as top-level, which only costs the step its fusion.
+    """
+    stack: list[tuple[str, Any]] = []  # ("(", token before it) | ("{", is function body) | ("${", None)
+    functions = 0  # Function bodies currently open
+    prev = opener = ""  # Previous token; token before the last closed "("
+    in_template = False
+    pos = 0
+
+    while pos < len(source):
+        if in_template:
+            pos = _TEMPLATE_TEXT.match(source, pos).end()
+            in_template = False
+            if source.startswith("${", pos):
+                stack.append(("${", None))
+                pos, prev = pos + 2, "${"
+            else:
+                pos, prev = pos + 1, "`"
+            continue
+
+        match = _TOKEN.match(source, pos)
+        if match is None:
+            break  # Trailing whitespace
+        pos, token = match.end(), match.group(1)
+
+        if token.startswith(("//", "/*")):
+            continue
+        if token == "`":
+            in_template = True
+            continue
+        if token == "(":
+            stack.append(("(", prev))
+        elif token == ")":
+            if stack and stack[-1][0] == "(":
+                opener = stack.pop()[1]
+        elif token == "{":
+            body = prev == "=>" or (
+                prev == ")" and (opener[:1].isalpha() or opener[:1] in "_$") and opener not in _CONTROL_KEYWORDS
+            )
+            stack.append(("{", body))
+            functions += body
+        elif token == "}" and stack:
+            kind, body = stack.pop()
+            if kind == "${":
+                in_template = True
+                continue
+            if kind == "{":
+                functions -= body
+        elif token in ("await", "return") and not functions and prev != ".":
+            return True
+        prev = token
+
+    return False
+
+
+def _references(step: Step) -> set[str]:
+    """Step ids / variable names referenced from a step's params"""
+    refs = set()
+    for var_ref in VAR_PATTERN.findall(json.dumps(step.params)):
+        refs.add(var_ref.split(".", 1)[0].strip())
+    return refs
+
+
+def plan_fused_runs(steps: list[Step]) -> dict[int, list[Step]]:
+    """
+    Find runs of two or more consecutive fusible steps
+
+    Args:
+        steps: Scenario steps in execution order
+
+    Returns:
+        First step number of each run -> the run's steps
+    """
+    runs: dict[int, list[Step]] = {}
+    current: list[Step] = []
+    run_ids: set[str] = set()
+
+    def close() -> None:
+        if len(current) > 1:
+            runs[current[0].step] = list(current)
+
+    for step in steps:
+        joins = (
+            is_fusible(step)
+            and bool(current)
+            and step.tool == current[0].tool
+            and not current[-1].wait_after
+            and step.params.get("tabId") == current[0].params.get("tabId")
+            and not (_references(step) & run_ids)
+        )
+        if not joins:
+            close()
+            current, run_ids = [], set()
+            if not is_fusible(step):
+                continue
+        current.append(step)
+        if step.id:
+            run_ids.add(step.id)
+
+    close()
+    return runs
+
+
+# Runs each step's code in order, timing it and capturing its error;
+# a failed stop-on-error step ends the run like it would unfused.
+_RUNNER = """\
+  const results = [];
+  for (let i = 0; i < steps.length; i++) {
+    const start = performance.now();
+    try {
+      const value = await steps[i]();
+      results.push({ ok: true, value: value === undefined ? null : value, ms: performance.now() - start });
+    } catch (e) {
+      results.push({ ok: false, error: String((e && e.message) || e), ms: performance.now() - start });
+      if (stops[i]) break;
+    }
+  }
+  return results;"""
+
+
+def build_fused_params(tool: str, params_list: list[dict[str, Any]], stops: list[bool]) -> dict[str, Any]:
+    """
+    Build the params of one script call running every step's code
+
+    Args:
+        tool: Script tool of the run (a FUSIBLE_TOOLS key)
+        params_list: Each step's substituted params, in order
+        stops: Per step, whether a failure ends the run (on_error "stop")
+
+    Returns:
+        Params for the fused call
+    """
+    stops_js = json.dumps(stops)
+    if tool.endswith("javascript_tool"):
+        # Script bodies: evaluate each with indirect eval (global scope)
+        sources = ",\n".join(f"    () => (0, eval)({json.dumps(p['text'])})" for p in params_list)
+        text = f"(async () => {{\n  const steps = [\n{sources}\n  ];\n  const stops = {stops_js};\n{_RUNNER}\n}})()"
+        fused: dict[str, Any] = {"action": "javascript_exec", "text": text}
+        if "tabId" in params_list[0]:
+            fused["tabId"] = params_list[0]["tabId"]
+        return fused
+
+    # Function declarations; newlines keep trailing line comments contained
+    functions = ",\n".join(f"    (\n{p['function']}\n)" for p in params_list)
+    return {"function": f"async () => {{\n  const steps = [\n{functions}\n  ];\n  const stops = {stops_js};\n{_RUNNER}\n}}"}
+
+
+def split_fused_result(data: Any, count: int) -> list[dict[str, Any]]:
+    """
+    Validate a fused call's result
+
+    Args:
+        data: Result data of the fused call
+        count: Number of fused steps
+
+    Returns:
+        Per-step entries ({"ok", "value" | "error", "ms"}), possibly fewer
+        than count when a stop-on-error step failed
+
+    Raises:
+        FusionError: If data is not a list of per-step entries
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            pass
+    if (
+        not isinstance(data, list)
+        or not 0 < len(data) <= count
+        or not all(isinstance(entry, dict) and "ok" in entry for entry in data)
+    ):
+        raise FusionError(f"Fused script returned unexpected result: {str(data)[:200]}")
+    return data
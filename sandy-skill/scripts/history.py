@@ -0,0 +1,300 @@
+"""
+Sandy Run History
+
+Records every play (with per-step duration, retries, errors and payload
+sizes) into a local SQLite database, and computes the per-step latency and
+failure statistics behind `sandy stats`.
+
+Plays from play.py, `sandy schedule` and `sandy worker` are recorded;
+`--batch` rows are not (each row would be a run of its own, swamping the
+scenario's statistics; batch output has per-row records instead).
+
+Database: .sandy/history.db
+- runs:  one row per play
+- steps: one row per executed step
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+__all__ = [
+    # Data classes
+    "StepStats",
+    "TrendPoint",
+    # Classes
+    "RunHistory",
+    # Functions
+    "default_history_path",
+    "percentile",
+    "record_run",
+]
+
+
+if TYPE_CHECKING:
+    try:
+        from .player import PlayResult
+    except ImportError:
+        from player import PlayResult
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT NOT NULL,
+    scenario_path TEXT,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    passed_steps INTEGER NOT NULL,
+    total_steps INTEGER NOT NULL,
+    failed_step INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_scenario_started ON runs (scenario, started_at);
+
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    error TEXT,
+    result_bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS steps_run ON steps (run_id);
+"""
+
+
+def default_history_path() -> Path:
+    """Get the default history database (project-local)"""
+    return Path.cwd() / ".sandy" / "history.db"
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0-100) of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(p / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def record_run(result: PlayResult, scenario_path: str | Path | None = None, path: str | Path | None = None) -> int:
+    """
+    Convenience function: store one play result and close the database
+
+    Args:
+        result: PlayResult to record
+        scenario_path: Scenario file the run came from
+        path: History database (default: .sandy/history.db)
+
+    Returns:
+        Run id
+    """
+    history = RunHistory(path)
+    try:
+        return history.record(result, scenario_path=scenario_path)
+    finally:
+        history.close()
+
+
+@dataclass
+class StepStats:
+    """Latency and failure statistics of one step across runs"""
+    step: int
+    tool: str
+    runs: int  # Executions (skipped steps excluded)
+    failures: int
+    skipped: int
+    p50: float
+    p95: float
+    p99: float
+    mean_retries: float
+    mean_bytes: float | None
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+
+@dataclass
+class TrendPoint:
+    """Runs of a scenario in one day"""
+    day: str  # YYYY-MM-DD (local time)
+    runs: int
+    failures: int
+    p50: float
+    p95: float
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+
+class RunHistory:
+    """
+    SQLite store of play results
+
+    Usage:
+        history = RunHistory()
+        history.record(result, scenario_path="hn.json")
+        for stats in history.step_stats("HN Scrape"):
+            print(stats.step, stats.p95)
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else default_history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def record(
+        self,
+        result: PlayResult,
+        scenario_path: str | Path | None = None,
+        started_at: float | None = None,
+    ) -> int:
+        """
+        Store a play result
+
+        Args:
+            result: PlayResult to record
+            scenario_path: Scenario file the run came from
+            started_at: Start time (default: now minus the run duration)
+
+        Returns:
+            Run id
+        """
+        if started_at is None:
+            started_at = time.time() - result.duration
+
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (scenario, scenario_path, started_at, duration, success,"
+                " passed_steps, total_steps, failed_step, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    result.scenario_name,
+                    str(scenario_path) if scenario_path else None,
+                    started_at,
+                    result.duration,
+                    int(result.success),
+                    result.passed_steps,
+                    result.total_steps,
+                    result.failed_step,
+                    result.error,
+                ),
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO steps (run_id, step, tool, duration, success, skipped, retries,"
+                " error, result_bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        step.step,
+                        step.tool,
+                        step.duration,
+                        int(step.success),
+                        int(step.skipped),
+                        step.retries,
+                        step.error,
+                        step.result_bytes,
+                    )
+                    for step in result.step_results
+                ],
+            )
+        return run_id
+
+    def scenarios(self) -> list[tuple[str, int]]:
+        """Recorded scenario names with their run counts"""
+        return self._conn.execute(
+            "SELECT scenario, COUNT(*) FROM runs GROUP BY scenario ORDER BY scenario"
+        ).fetchall()
+
+    def step_stats(self, scenario: str, since: float | None = None) -> list[StepStats]:
+        """
+        Per-step statistics for a scenario
+
+        Args:
+            scenario: Scenario name (metadata.name)
+            since: Only include runs started at or after this timestamp
+
+        Returns:
+            StepStats ordered by step number
+        """
+        rows = self._conn.execute(
+            "SELECT s.step, s.tool, s.duration, s.success, s.skipped, s.retries, s.result_bytes"
+            " FROM steps s JOIN runs r ON r.id = s.run_id"
+            " WHERE r.scenario = ? AND r.started_at >= ?",
+            (scenario, since or 0.0),
+        ).fetchall()
+
+        grouped: dict[tuple[int, str], list[tuple[float, int, int, int, int | None]]] = {}
+        for step, tool, duration, success, skipped, retries, result_bytes in rows:
+            grouped.setdefault((step, tool), []).append((duration, success, skipped, retries, result_bytes))
+
+        stats: list[StepStats] = []
+        for (step, tool), samples in sorted(grouped.items()):
+            executed = [s for s in samples if not s[2]]
+            durations = [s[0] for s in executed]
+            sizes = [s[4] for s in executed if s[4] is not None]
+            stats.append(StepStats(
+                step=step,
+                tool=tool,
+                runs=len(executed),
+                failures=sum(1 for s in executed if not s[1]),
+                skipped=len(samples) - len(executed),
+                p50=percentile(durations, 50),
+                p95=percentile(durations, 95),
+                p99=percentile(durations, 99),
+                mean_retries=sum(s[3] for s in executed) / len(executed) if executed else 0.0,
+                mean_bytes=sum(sizes) / len(sizes) if sizes else None,
+            ))
+        return stats
+
+    def trend(self, scenario: str, since: float | None = None) -> list[TrendPoint]:
+        """
+        Daily run counts, failure rates and duration percentiles
+
+        Args:
+            scenario: Scenario name (metadata.name)
+            since: Only include runs started at or after this timestamp
+
+        Returns:
+            TrendPoints ordered by day
+        """
+        rows = self._conn.execute(
+            "SELECT date(started_at, 'unixepoch', 'localtime'), duration, success"
+            " FROM runs WHERE scenario = ? AND started_at >= ?",
+            (scenario, since or 0.0),
+        ).fetchall()
+
+        days: dict[str, list[tuple[float, int]]] = {}
+        for day, duration, success in rows:
+            days.setdefault(day, []).append((duration, success))
+
+        return [
+            TrendPoint(
+                day=day,
+                runs=len(samples),
+                failures=sum(1 for _, success in samples if not success),
+                p50=percentile([d for d, _ in samples], 50),
+                p95=percentile([d for d, _ in samples], 95),
+            )
+            for day, samples in sorted(days.items())
+        ]
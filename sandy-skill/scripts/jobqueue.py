@@ -0,0 +1,627 @@
+"""
+Sandy Job Queue
+
+Shared queue of scenario jobs consumed by `sandy worker` processes, for
+scaling runs across hosts without external services.
+
+- JobQueue: backend interface
+- SQLiteJobQueue: reference backend (WAL mode; put the file on a volume
+  every host can reach)
+- MemoryJobQueue: in-process stand-in with the same semantics (tests)
+- Worker: leases jobs and plays them with ScenarioPlayer
+
+Semantics:
+- Jobs are leased for a fixed time and kept alive by heartbeats
+- A lease that expires (worker died) puts the job back in the queue, until
+  max_attempts leases have been handed out; then it fails
+- Enqueueing with an idempotency key that already exists returns the
+  existing job instead of adding a duplicate
+- A worker whose lease was lost before it recorded the result reports the
+  job with "lease_lost" in its summary (another worker may run it again)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Literal
+
+
+__all__ = [
+    # Data classes
+    "Job",
+    # Classes
+    "JobQueue",
+    "SQLiteJobQueue",
+    "MemoryJobQueue",
+    "Worker",
+    # Functions
+    "default_queue_path",
+    # Constants
+    "JOB_STATUSES",
+]
+
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+if TYPE_CHECKING:
+    try:
+        from .config import Config
+    except ImportError:
+        from config import Config
+
+
+JOB_STATUSES = ("queued", "leased", "done", "failed")
+
+JobStatus = Literal["queued", "leased", "done", "failed"]
+
+
+def default_queue_path() -> Path:
+    """Get the default queue database (project-local)"""
+    return Path.cwd() / ".sandy" / "queue.db"
+
+
+@dataclass
+class Job:
+    """A queued scenario run"""
+    id: str
+    scenario: str
+    variables: dict[str, str] = field(default_factory=dict)
+    idempotency_key: str | None = None
+    status: JobStatus = "queued"
+    attempts: int = 0  # Leases handed out so far
+    max_attempts: int = 3
+    lease_owner: str | None = None
+    lease_expires: float | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+class JobQueue(ABC):
+    """
+    Job queue backend interface
+
+    Every method is atomic with respect to other workers; lease() never
+    hands the same job to two live workers.
+    """
+
+    @abstractmethod
+    def enqueue(
+        self,
+        scenario: str,
+        variables: dict[str, str] | None = None,
+        idempotency_key: str | None = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        """
+        Add a job (or return the existing job with the same idempotency key)
+        """
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float) -> Job | None:
+        """
+        Take the oldest queued job (expired leases are re-queued first)
+
+        Returns:
+            Leased job, or None if the queue is empty
+        """
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """
+        Extend a lease
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> bool:
+        """Mark a leased job done (False if the lease was lost)"""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = False) -> bool:
+        """
+        Mark a leased job failed, or re-queue it when retry is set and
+        attempts remain (False if the lease was lost)
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        """Get a job by id"""
+        pass
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status"""
+        pass
+
+
+class MemoryJobQueue(JobQueue):
+    """
+    In-process queue with SQLiteJobQueue semantics
+
+    Usage:
+        queue = MemoryJobQueue()
+        queue.enqueue("scenario.json", {"NAME": "x"})
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(
+        self,
+        scenario: str,
+        variables: dict[str, str] | None = None,
+        idempotency_key: str | None = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        with self._lock:
+            if idempotency_key is not None:
+                for job in self._jobs.values():
+                    if job.idempotency_key == idempotency_key:
+                        return replace(job)
+            now = self._clock()
+            job = Job(
+                id=uuid.uuid4().hex,
+                scenario=scenario,
+                variables=dict(variables or {}),
+                idempotency_key=idempotency_key,
+                max_attempts=max_attempts,
+                created_at=now,
+                updated_at=now,
+            )
+            self._jobs[job.id] = job
+            return replace(job)
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Job | None:
+        with self._lock:
+            now = self._clock()
+            self._requeue_expired(now)
+            queued = [j for j in self._jobs.values() if j.status == "queued"]
+            if not queued:
+                return None
+            job = min(queued, key=lambda j: j.created_at)
+            job.status = "leased"
+            job.attempts += 1
+            job.lease_owner = worker_id
+            job.lease_expires = now + lease_seconds
+            job.updated_at = now
+            return replace(job)
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is None:
+                return False
+            now = self._clock()
+            job.lease_expires = now + lease_seconds
+            job.updated_at = now
+            return True
+
+    def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is None:
+                return False
+            job.status = "done"
+            job.result = result
+            job.lease_owner = job.lease_expires = None
+            job.updated_at = self._clock()
+            return True
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = False) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is None:
+                return False
+            job.status = "queued" if retry and job.attempts < job.max_attempts else "failed"
+            job.error = error
+            job.lease_owner = job.lease_expires = None
+            job.updated_at = self._clock()
+            return True
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job else None
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            self._requeue_expired(self._clock())
+            counts = {status: 0 for status in JOB_STATUSES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _held(self, job_id: str, worker_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "leased" or job.lease_owner != worker_id:
+            return None
+        if job.lease_expires is not None and job.lease_expires < self._clock():
+            return None
+        return job
+
+    def _requeue_expired(self, now: float) -> None:
+        for job in self._jobs.values():
+            if job.status == "leased" and job.lease_expires is not None and job.lease_expires < now:
+                job.status = "queued" if job.attempts < job.max_attempts else "failed"
+                if job.status == "failed":
+                    job.error = job.error or f"Lease expired {job.attempts} time(s)"
+                job.lease_owner = job.lease_expires = None
+                job.updated_at = now
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    scenario TEXT NOT NULL,
+    variables TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    SQLite-backed queue (WAL mode)
+
+    Each call opens a short transaction; lease() uses BEGIN IMMEDIATE so
+    concurrent workers serialize on the write lock instead of racing.
+
+    Usage:
+        queue = SQLiteJobQueue(".sandy/queue.db")
+        job = queue.lease("host-1:1234", lease_seconds=60)
+    """
+
+    def __init__(self, path: str | Path | None = None, clock: Callable[[], float] = time.time):
+        self.path = Path(path) if path else default_queue_path()
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._conn, self._lock)
+
+    def enqueue(
+        self,
+        scenario: str,
+        variables: dict[str, str] | None = None,
+        idempotency_key: str | None = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        now = self._clock()
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            if idempotency_key is not None:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+                if row is not None:
+                    return _row_to_job(row)
+            conn.execute(
+                "INSERT INTO jobs (id, scenario, variables, idempotency_key, status, attempts,"
+                " max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', 0, ?, ?, ?)",
+                (job_id, scenario, json.dumps(variables or {}), idempotency_key, max_attempts, now, now),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return _row_to_job(row)
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Job | None:
+        now = self._clock()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,"
+                " lease_expires = ?, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row["id"]),
+            )
+            return _row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        now = self._clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = 'leased'"
+                " AND lease_owner = ? AND lease_expires >= ?",
+                (now + lease_seconds, now, job_id, worker_id, now),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: dict[str, Any]) -> bool:
+        now = self._clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, lease_expires = NULL,"
+                " updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ? AND lease_expires >= ?",
+                (json.dumps(result, default=str), now, job_id, worker_id, now),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = False) -> bool:
+        now = self._clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+                " error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE id = ? AND status = 'leased' AND lease_owner = ? AND lease_expires >= ?",
+                (retry, error, now, job_id, worker_id, now),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Job | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return _row_to_job(row) if row else None
+
+    def counts(self) -> dict[str, int]:
+        with self._transaction() as conn:
+            self._requeue_expired(conn, self._clock())
+            counts = {status: 0 for status in JOB_STATUSES}
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+            return counts
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+            " error = CASE WHEN attempts < max_attempts THEN error"
+            " ELSE COALESCE(error, 'Lease expired ' || attempts || ' time(s)') END,"
+            " lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE status = 'leased' AND lease_expires < ?",
+            (now, now),
+        )
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around one queue operation"""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        scenario=row["scenario"],
+        variables=json.loads(row["variables"]),
+        idempotency_key=row["idempotency_key"],
+        status=row["status"],
+        attempts=row["attempts"],
+        max_attempts=row["max_attempts"],
+        lease_owner=row["lease_owner"],
+        lease_expires=row["lease_expires"],
+        result=json.loads(row["result"]) if row["result"] else None,
+        error=row["error"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+class Worker:
+    """
+    Consumes a job queue, playing each job with ScenarioPlayer
+
+    MCP clients are shared across jobs and closed when the worker stops.
+    When config_loader is given it is called before every job, so config
+    edits apply to the next job (clients already connected are kept).
+
+    Usage:
+        worker = Worker(SQLiteJobQueue(), config)
+        await worker.run()
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        config: Config | None = None,
+        worker_id: str | None = None,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+        runner: Callable[[Job], Any] | None = None,
+        on_complete: Callable[[Job, dict[str, Any]], None] | None = None,
+        record_history: bool = False,
+        config_loader: Callable[[], Config] | None = None,
+    ):
+        self.queue = queue
+        self.config = config
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.on_complete = on_complete
+        self.record_history = record_history
+        self.config_loader = config_loader
+        self._runner = runner or self._play_job
+        self._clients: dict[str, Any] = {}
+        self._stop = asyncio.Event()
+        self.processed = 0
+
+    def stop(self) -> None:
+        """Stop after the current job"""
+        self._stop.set()
+
+    async def run(self, max_jobs: int | None = None, exit_when_empty: bool = False) -> int:
+        """
+        Process jobs until stopped
+
+        Args:
+            max_jobs: Stop after this many jobs
+            exit_when_empty: Stop when no job is available instead of polling
+
+        Returns:
+            Number of jobs processed
+        """
+        try:
+            while not self._stop.is_set():
+                if max_jobs is not None and self.processed >= max_jobs:
+                    break
+
+                job = await asyncio.to_thread(self.queue.lease, self.worker_id, self.lease_seconds)
+                if metrics.REGISTRY.enabled:
+                    counts = await asyncio.to_thread(self.queue.counts)
+                    for status, n in counts.items():
+                        metrics.QUEUE_JOBS.set(n, status=status)
+                if job is None:
+                    if exit_when_empty:
+                        break
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._process(job)
+                self.processed += 1
+        finally:
+            for client in self._clients.values():
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass  # Ignore errors during cleanup
+            self._clients.clear()
+
+        return self.processed
+
+    async def _process(self, job: Job) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            summary = await self._runner(job)
+        except Exception as e:
+            # Infrastructure error (e.g. server unreachable): retry elsewhere
+            summary = {"success": False, "error": str(e)}
+            recorded = await self._record(job, self.queue.fail, job.id, self.worker_id, str(e), True)
+        else:
+            if summary.get("success"):
+                recorded = await self._record(job, self.queue.complete, job.id, self.worker_id, summary)
+            else:
+                # Scenario failures are deterministic; don't retry
+                recorded = await self._record(
+                    job, self.queue.fail, job.id, self.worker_id, summary.get("error") or "Scenario failed"
+                )
+        finally:
+            heartbeat.cancel()
+
+        if not recorded:
+            print(f"Warning: lease on job {job.id} was lost; its result was not recorded", file=sys.stderr)
+            summary = {**summary, "lease_lost": True}
+
+        if self.on_complete:
+            self.on_complete(job, summary)
+
+    async def _heartbeat(self, job: Job) -> None:
+        interval = max(self.lease_seconds / 3, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                held = await asyncio.to_thread(self.queue.heartbeat, job.id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                # e.g. "database is locked": keep trying while the lease lasts
+                print(f"Warning: heartbeat for job {job.id} failed: {e}", file=sys.stderr)
+                continue
+            if not held:
+                return
+
+    async def _record(self, job: Job, update: Callable[..., bool], *args: Any) -> bool:
+        """Record a job's outcome; False if the lease is no longer ours"""
+        try:
+            return await asyncio.to_thread(update, *args)
+        except Exception as e:
+            print(f"Warning: could not record the result of job {job.id}: {e}", file=sys.stderr)
+            return False
+
+    async def _play_job(self, job: Job) -> dict[str, Any]:
+        """Default runner: play the job's scenario with shared clients"""
+        try:
+            from .player import PlayerOptions, play_scenario
+            from .scenario_cache import load_scenario_cached
+        except ImportError:
+            from player import PlayerOptions, play_scenario
+            from scenario_cache import load_scenario_cached
+
+        config = self.config_loader() if self.config_loader else self.config
+        if config is None:
+            raise RuntimeError("Worker needs a config to play scenarios")
+
+        scenario = load_scenario_cached(job.scenario)
+        options = PlayerOptions(variables=dict(job.variables))
+        result = await play_scenario(scenario, config, options, clients=self._clients)
+        if self.record_history:
+            try:
+                from .history import record_run
+            except ImportError:
+                from history import record_run
+            try:
+                await asyncio.to_thread(record_run, result, job.scenario)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Could not record run history: {e}", file=sys.stderr)
+        return {
+            "success": result.success,
+            "passed_steps": result.passed_steps,
+            "total_steps": result.total_steps,
+            "failed_step": result.failed_step,
+            "duration": round(result.duration, 3),
+            "error": result.error,
+            "outputs": result.outputs,
+        }
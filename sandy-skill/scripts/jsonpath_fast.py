@@ -0,0 +1,273 @@
+"""
+Sandy Fast-Path JSONPath
+
+Compiled accessors for the simple JSONPath subset used by nearly all output
+specs, evaluated with plain dict/list indexing instead of jsonpath_ng's
+DatumInPath machinery.
+
+Supported subset:
+- $                  Root
+- .name / ['name']   Dict key (identifier names, or quoted without escapes)
+- [n]                List index (negative allowed)
+- [*]                Every list element
+- .*                 Every dict value
+
+Anything else (filters, slices, recursive descent, unions) is not compiled,
+and callers fall back to jsonpath_ng. Data shapes whose jsonpath_ng
+semantics are unusual (e.g. indexing into a string or number) also fall
+back, so results always match jsonpath_ng.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+
+__all__ = [
+    # Classes
+    "CompiledPath",
+    "FallbackRequired",
+    # Functions
+    "compile_path",
+    "extract_columns",
+]
+
+
+# Segment kinds
+_KEY = 0
+_INDEX = 1
+_LIST_WILDCARD = 2
+_DICT_WILDCARD = 3
+
+# One path segment after the leading "$"
+_SEGMENT_PATTERN = re.compile(
+    r"""
+    \.(?P<name>[A-Za-z_][A-Za-z0-9_]*)       # .name
+    | \.(?P<dict_wild>\*)                   # .*
+    | \[(?P<index>-?\d+)\]                  # [n]
+    | \[(?P<list_wild>\*)\]                 # [*]
+    | \[(?P<quote>['"])(?P<quoted>[^'"\\]*)(?P=quote)\]   # ['name']
+    """,
+    re.VERBOSE,
+)
+
+
+class FallbackRequired(Exception):
+    """Raised when data shape semantics must be resolved by jsonpath_ng"""
+    pass
+
+
+class CompiledPath:
+    """
+    Pre-parsed accessor for a simple JSONPath expression
+
+    Usage:
+        path = compile_path("$.items[*].title")
+        titles = path.find(data)
+    """
+
+    __slots__ = ("expression", "segments", "has_wildcard")
+
+    def __init__(self, expression: str, segments: tuple[tuple[int, Any], ...]):
+        self.expression = expression
+        self.segments = segments
+        self.has_wildcard = any(kind in (_LIST_WILDCARD, _DICT_WILDCARD) for kind, _ in segments)
+
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.expression!r})"
+
+    def first(self, data: Any) -> tuple[Any, bool]:
+        """
+        Get the first match
+
+        Returns:
+            Tuple of (value, found)
+
+        Raises:
+            FallbackRequired: If jsonpath_ng must evaluate this data
+        """
+        if not self.has_wildcard:
+            # Straight-line walk, no intermediate lists
+            current = data
+            for kind, arg in self.segments:
+                if kind == _KEY:
+                    if not isinstance(current, dict) or arg not in current:
+                        return None, False
+                    current = current[arg]
+                else:
+                    if isinstance(current, list):
+                        if -len(current) <= arg < len(current):
+                            current = current[arg]
+                        else:
+                            return None, False
+                    elif current is None or isinstance(current, dict):
+                        return None, False
+                    else:
+                        raise FallbackRequired(self.expression)
+            return current, True
+
+        matches = self.find(data)
+        if matches:
+            return matches[0], True
+        return None, False
+
+    def split_at_wildcard(self) -> tuple[CompiledPath, CompiledPath] | None:
+        """
+        Split at the first [*] into a row source and a per-row accessor
+
+        "$.items[*].author.name" -> ("$.items", "$.author.name")
+
+        Returns:
+            Tuple of (prefix, suffix), or None if the path has no [*]
+        """
+        for i, (kind, _) in enumerate(self.segments):
+            if kind == _LIST_WILDCARD:
+                prefix = self.segments[:i]
+                suffix = self.segments[i + 1:]
+                return (
+                    CompiledPath(_format_segments(prefix), prefix),
+                    CompiledPath(_format_segments(suffix), suffix),
+                )
+        return None
+
+    def find(self, data: Any) -> list[Any]:
+        """
+        Get all matches in document order
+
+        Raises:
+            FallbackRequired: If jsonpath_ng must evaluate this data
+        """
+        current = [data]
+        for kind, arg in self.segments:
+            following: list[Any] = []
+            if kind == _KEY:
+                for value in current:
+                    if isinstance(value, dict) and arg in value:
+                        following.append(value[arg])
+            elif kind == _INDEX:
+                for value in current:
+                    if isinstance(value, list):
+                        if -len(value) <= arg < len(value):
+                            following.append(value[arg])
+                    elif value is not None and not isinstance(value, dict):
+                        raise FallbackRequired(self.expression)
+            elif kind == _LIST_WILDCARD:
+                for value in current:
+                    if isinstance(value, list):
+                        following.extend(value)
+                    elif value is not None:
+                        # jsonpath_ng treats a scalar/dict under [*] as a one-item list
+                        following.append(value)
+            else:  # _DICT_WILDCARD
+                for value in current:
+                    if isinstance(value, dict):
+                        following.extend(value.values())
+                    elif not isinstance(value, list):
+                        raise FallbackRequired(self.expression)
+            current = following
+            if not current:
+                break
+        return current
+
+
+def _format_segments(segments: tuple[tuple[int, Any], ...]) -> str:
+    """Render segments back into a JSONPath expression"""
+    parts = ["$"]
+    for kind, arg in segments:
+        if kind == _KEY:
+            parts.append(f".{arg}" if arg.isidentifier() else f"['{arg}']")
+        elif kind == _INDEX:
+            parts.append(f"[{arg}]")
+        elif kind == _LIST_WILDCARD:
+            parts.append("[*]")
+        else:
+            parts.append(".*")
+    return "".join(parts)
+
+
+def extract_columns(data: Any, columns: dict[str, CompiledPath]) -> dict[str, list[Any]]:
+    """
+    Extract parallel columns from the rows of a list in one pass
+
+    Columns are grouped by row source (the part before the first [*]), each
+    row source is resolved once, and every column of the group is read from
+    each row while it is visited. Missing values become None, so columns of
+    the same group always have equal length.
+
+    Args:
+        data: Document to extract from
+        columns: Mapping of column name -> compiled path containing [*]
+
+    Returns:
+        Mapping of column name -> list of values (one per row)
+
+    Raises:
+        ValueError: If a path has no [*]
+        FallbackRequired: If jsonpath_ng must evaluate this data
+    """
+    groups: dict[tuple[tuple[int, Any], ...], list[tuple[str, CompiledPath]]] = {}
+    prefixes: dict[tuple[tuple[int, Any], ...], CompiledPath] = {}
+    for name, path in columns.items():
+        split = path.split_at_wildcard()
+        if split is None:
+            raise ValueError(f"Column path must contain [*]: {path.expression}")
+        prefix, suffix = split
+        prefixes.setdefault(prefix.segments, prefix)
+        groups.setdefault(prefix.segments, []).append((name, suffix))
+
+    result: dict[str, list[Any]] = {}
+    for key, members in groups.items():
+        rows: list[Any] = []
+        for container in prefixes[key].find(data):
+            if isinstance(container, list):
+                rows.extend(container)
+            elif container is not None:
+                rows.append(container)
+
+        values: list[list[Any]] = [[] for _ in members]
+        for row in rows:
+            for column, (_name, suffix) in zip(values, members):
+                column.append(suffix.first(row)[0])
+
+        for (name, _suffix), column in zip(members, values):
+            result[name] = column
+
+    return result
+
+
+@lru_cache(maxsize=512)
+def compile_path(expression: str) -> CompiledPath | None:
+    """
+    Compile a JSONPath expression if it is in the simple subset
+
+    Args:
+        expression: JSONPath expression (e.g. "$.items[0].id")
+
+    Returns:
+        CompiledPath, or None if jsonpath_ng is required
+    """
+    expr = expression.strip()
+    if not expr.startswith("$"):
+        return None
+
+    segments: list[tuple[int, Any]] = []
+    pos = 1
+    while pos < len(expr):
+        match = _SEGMENT_PATTERN.match(expr, pos)
+        if not match:
+            return None
+        if match.group("name") is not None:
+            segments.append((_KEY, match.group("name")))
+        elif match.group("dict_wild") is not None:
+            segments.append((_DICT_WILDCARD, None))
+        elif match.group("index") is not None:
+            segments.append((_INDEX, int(match.group("index"))))
+        elif match.group("list_wild") is not None:
+            segments.append((_LIST_WILDCARD, None))
+        else:
+            segments.append((_KEY, match.group("quoted")))
+        pos = match.end()
+
+    return CompiledPath(expression, tuple(segments))
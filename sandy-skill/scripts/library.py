@@ -0,0 +1,455 @@
+"""
+Sandy Scenario Library Index
+
+Persistent inverted index over a scenario directory (default: .sandy/scenarios/).
+
+Indexed fields:
+- metadata.name
+- metadata.description
+- Tool names used by steps
+- Variable names (defined and referenced)
+
+The index is refreshed incrementally: only files whose mtime or size changed
+since the last refresh are re-read, so queries stay fast as the library grows.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+__all__ = [
+    # Data classes
+    "IndexedScenario",
+    "ScenarioMatch",
+    "RefreshStats",
+    # Classes
+    "ScenarioIndex",
+    # Functions
+    "find_scenarios",
+    "default_index_path",
+    "tokenize",
+    # Constants
+    "INDEX_VERSION",
+    "DEFAULT_SCENARIOS_DIR",
+]
+
+
+try:
+    from .scenario import VAR_PATTERN
+except ImportError:
+    from scenario import VAR_PATTERN
+
+
+# Bump when the on-disk index layout or tokenization changes
+INDEX_VERSION = 1
+
+# Default scenario library location (project-local)
+DEFAULT_SCENARIOS_DIR = Path(".sandy") / "scenarios"
+
+# Per-field term weights used for ranking
+FIELD_WEIGHTS: dict[str, float] = {
+    "name": 3.0,
+    "tools": 1.5,
+    "variables": 1.0,
+    "description": 1.0,
+}
+
+# Splits on anything that is not a letter or digit (handles mcp__a-b__c_d)
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+@dataclass
+class IndexedScenario:
+    """Index entry for a single scenario file"""
+    path: str  # Relative to the index root
+    mtime_ns: int
+    size: int
+    name: str | None = None
+    description: str | None = None
+    tools: list[str] = field(default_factory=list)
+    variables: list[str] = field(default_factory=list)
+    terms: dict[str, float] = field(default_factory=dict)  # term -> weight
+    invalid: bool = False  # Not a parsable scenario (kept to avoid re-reading)
+
+
+@dataclass
+class ScenarioMatch:
+    """A ranked search result"""
+    path: str  # Absolute path
+    name: str
+    description: str | None
+    score: float
+    tools: list[str] = field(default_factory=list)
+    variables: list[str] = field(default_factory=list)
+
+
+@dataclass
+class RefreshStats:
+    """Counts from an incremental refresh"""
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase search terms
+
+    Tool names are split on separators, so "mcp__chrome-devtools__navigate_page"
+    yields ["mcp", "chrome", "devtools", "navigate", "page"].
+    """
+    return [t for t in _TOKEN_SPLIT.split(text.lower()) if t]
+
+
+def default_index_path(root: str | Path) -> Path:
+    """
+    Get the index file location for a scenario directory
+
+    Indexes live under .sandy/cache/ in the current project, one per root.
+    """
+    resolved = str(Path(root).resolve())
+    digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:12]
+    return Path.cwd() / ".sandy" / "cache" / f"scenario-index-{digest}.json"
+
+
+class ScenarioIndex:
+    """
+    Inverted index over a scenario directory
+
+    Usage:
+        index = ScenarioIndex(".sandy/scenarios")
+        index.refresh()          # incremental, by mtime/size
+        matches = index.search("scrape hn")
+    """
+
+    def __init__(self, root: str | Path, index_path: str | Path | None = None):
+        self.root = Path(root).resolve()
+        self.index_path = Path(index_path) if index_path else default_index_path(self.root)
+        self.documents: dict[str, IndexedScenario] = {}
+        self.postings: dict[str, dict[str, float]] = {}  # term -> {doc path: weight}
+        self._sorted_terms: list[str] | None = None
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """
+        Load the persisted index
+
+        Returns:
+            True if a compatible index was loaded, False otherwise
+        """
+        if not self.index_path.exists():
+            return False
+
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return False
+
+        self.documents = {
+            path: IndexedScenario(path=path, **entry)
+            for path, entry in data.get("documents", {}).items()
+        }
+        self.postings = data.get("postings", {})
+        self._sorted_terms = None
+        self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Persist the index atomically (write temp file, then rename)"""
+        documents = {}
+        for path, doc in self.documents.items():
+            documents[path] = {
+                "mtime_ns": doc.mtime_ns,
+                "size": doc.size,
+                "name": doc.name,
+                "description": doc.description,
+                "tools": doc.tools,
+                "variables": doc.variables,
+                "terms": doc.terms,
+                "invalid": doc.invalid,
+            }
+
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "documents": documents,
+            "postings": self.postings,
+        }
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".tmp{os.getpid()}")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def refresh(self, save: bool = True) -> RefreshStats:
+        """
+        Incrementally bring the index up to date with the scenario directory
+
+        Only files whose mtime or size changed are re-read.
+
+        Args:
+            save: Persist the index if anything changed
+
+        Returns:
+            RefreshStats with added/updated/removed counts
+        """
+        stats = RefreshStats()
+        seen: set[str] = set()
+
+        for rel_path, st in self._scan():
+            seen.add(rel_path)
+            existing = self.documents.get(rel_path)
+            if existing and existing.mtime_ns == st.st_mtime_ns and existing.size == st.st_size:
+                stats.unchanged += 1
+                continue
+
+            doc = self._read_document(rel_path, st)
+            if existing:
+                self._remove_postings(existing)
+                stats.updated += 1
+            else:
+                stats.added += 1
+            self._add_document(doc)
+
+        for rel_path in [p for p in self.documents if p not in seen]:
+            self._remove_postings(self.documents.pop(rel_path))
+            stats.removed += 1
+
+        if stats.changed:
+            self._dirty = True
+            self._sorted_terms = None
+
+        if save and (self._dirty or not self.index_path.exists()):
+            self.save()
+
+        return stats
+
+    def rebuild(self) -> RefreshStats:
+        """Drop the index and re-read every scenario file"""
+        self.documents.clear()
+        self.postings.clear()
+        self._sorted_terms = None
+        return self.refresh()
+
+    def _scan(self) -> list[tuple[str, os.stat_result]]:
+        """Walk the root directory and stat every *.json file"""
+        found: list[tuple[str, os.stat_result]] = []
+        if not self.root.is_dir():
+            return found
+
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith(".json"):
+                    rel_path = Path(entry.path).relative_to(self.root).as_posix()
+                    found.append((rel_path, entry.stat()))
+        return found
+
+    def _read_document(self, rel_path: str, st: os.stat_result) -> IndexedScenario:
+        """Read a scenario file and extract indexable fields"""
+        doc = IndexedScenario(path=rel_path, mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+        try:
+            data = json.loads((self.root / rel_path).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            doc.invalid = True
+            return doc
+
+        if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+            doc.invalid = True
+            return doc
+
+        metadata = data.get("metadata") or {}
+        if isinstance(metadata, dict):
+            doc.name = metadata.get("name")
+            doc.description = metadata.get("description")
+
+        tools: list[str] = []
+        variables: set[str] = set()
+        raw_variables = data.get("variables")
+        if isinstance(raw_variables, dict):
+            variables.update(raw_variables.keys())
+
+        for step in data["steps"]:
+            if not isinstance(step, dict):
+                continue
+            tool = step.get("tool") or step.get("action")
+            if isinstance(tool, str) and tool not in tools:
+                tools.append(tool)
+            params_str = json.dumps(step.get("params", {}))
+            for var_name in VAR_PATTERN.findall(params_str):
+                if "." not in var_name:
+                    variables.add(var_name.strip())
+
+        doc.tools = tools
+        doc.variables = sorted(variables)
+        doc.terms = self._document_terms(doc)
+        return doc
+
+    def _document_terms(self, doc: IndexedScenario) -> dict[str, float]:
+        """Compute weighted term frequencies for a document"""
+        terms: dict[str, float] = {}
+
+        def add(text: str | None, weight: float) -> None:
+            if not text:
+                return
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+
+        add(doc.name, FIELD_WEIGHTS["name"])
+        add(doc.description, FIELD_WEIGHTS["description"])
+        for tool in doc.tools:
+            add(tool, FIELD_WEIGHTS["tools"])
+        for var_name in doc.variables:
+            add(var_name, FIELD_WEIGHTS["variables"])
+
+        # "mcp" appears in nearly every tool name and carries no signal
+        terms.pop("mcp", None)
+        return terms
+
+    def _add_document(self, doc: IndexedScenario) -> None:
+        self.documents[doc.path] = doc
+        for term, weight in doc.terms.items():
+            self.postings.setdefault(term, {})[doc.path] = weight
+
+    def _remove_postings(self, doc: IndexedScenario) -> None:
+        for term in doc.terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc.path, None)
+            if not docs:
+                del self.postings[term]
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10) -> list[ScenarioMatch]:
+        """
+        Rank scenarios against a free-text query
+
+        Each query term matches index terms by prefix ("nav" matches
+        "navigate"). Scores are weighted term frequency times IDF, with a
+        bonus for documents that match every query term.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of matches to return
+
+        Returns:
+            Matches sorted by descending score
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        total_docs = max(1, sum(1 for d in self.documents.values() if not d.invalid))
+        scores: dict[str, float] = {}
+        hits: dict[str, int] = {}
+
+        for query_term in query_terms:
+            term_scores: dict[str, float] = {}
+            for term in self._expand_prefix(query_term):
+                docs = self.postings[term]
+                idf = math.log(1 + total_docs / len(docs))
+                # Exact matches outrank prefix matches
+                exactness = 1.0 if term == query_term else 0.5
+                for path, weight in docs.items():
+                    score = weight * idf * exactness
+                    if score > term_scores.get(path, 0.0):
+                        term_scores[path] = score
+            for path, score in term_scores.items():
+                scores[path] = scores.get(path, 0.0) + score
+                hits[path] = hits.get(path, 0) + 1
+
+        # Documents matching every query term outrank partial matches
+        for path in scores:
+            if hits[path] == len(query_terms):
+                scores[path] *= len(query_terms) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+        matches = []
+        for path, score in ranked[:limit]:
+            doc = self.documents[path]
+            matches.append(ScenarioMatch(
+                path=str(self.root / path),
+                name=doc.name or Path(path).stem,
+                description=doc.description,
+                score=round(score, 4),
+                tools=list(doc.tools),
+                variables=list(doc.variables),
+            ))
+        return matches
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        """Find all index terms starting with prefix"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        result = []
+        for term in terms[start:]:
+            if not term.startswith(prefix):
+                break
+            result.append(term)
+        return result
+
+
+def find_scenarios(
+    query: str,
+    root: str | Path = DEFAULT_SCENARIOS_DIR,
+    limit: int = 10,
+    index_path: str | Path | None = None,
+) -> list[ScenarioMatch]:
+    """
+    Convenience function: load index, refresh incrementally, search
+
+    Args:
+        query: Free-text query
+        root: Scenario directory
+        limit: Maximum number of matches
+        index_path: Override index file location
+
+    Returns:
+        Ranked list of ScenarioMatch
+    """
+    index = ScenarioIndex(root, index_path)
+    index.load()
+    index.refresh()
+    return index.search(query, limit=limit)
+
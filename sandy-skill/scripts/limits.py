@@ -0,0 +1,326 @@
+"""
+Sandy Server Limits
+
+Per-server call limits, shared by every play in the process:
+- max_concurrency: at most N tool calls in flight per server
+- adaptive_concurrency: find the in-flight limit with AIMD instead
+  (max_concurrency becomes the ceiling)
+- rate_limit: token bucket of N calls per second (burst: rate_burst)
+
+Limits are configured on the server entry (see ServerConfig) and enforced
+around each MCP call in ScenarioPlayer. Time spent waiting is reported in
+StepResult.wait_time, so slow steps can be told apart from throttled ones.
+
+Limits are per process. Batch runs with several worker processes give each
+worker an equal share (split_limits), so the configured limits hold for
+the batch as a whole.
+
+    {"servers": {"slack": {"command": "...", "max_concurrency": 2, "rate_limit": 1}}}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import math
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+
+__all__ = [
+    # Classes
+    "TokenBucket",
+    "AdaptiveConcurrency",
+    "ServerLimiter",
+    # Functions
+    "get_limiter",
+    "split_limits",
+    # Constants
+    "DEFAULT_ADAPTIVE_MAX",
+]
+
+
+# Ceiling for adaptive concurrency when max_concurrency isn't set
+DEFAULT_ADAPTIVE_MAX = 32
+
+
+if TYPE_CHECKING:
+    try:
+        from .config import Config, ServerConfig
+    except ImportError:
+        from config import Config, ServerConfig
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+
+    Holds up to `burst` tokens, refilled at `rate` per second. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst and burst > 0 else max(1, math.ceil(rate))
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for it if needed
+
+        Returns:
+            Seconds waited
+        """
+        start = self._clock()
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+        return self._clock() - start
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD in-flight limit
+
+    Starts at `initial` and doubles per round of successful calls (slow
+    start) until the first back-off, then grows by one per round (additive
+    increase). An error, or a call slower than `latency_tolerance` times the
+    smoothed baseline latency, multiplies the limit by `decrease` - at most
+    once per baseline latency, so one burst of failures counts once.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = DEFAULT_ADAPTIVE_MAX,
+        min_limit: int = 1,
+        initial: int = 1,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        name: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(max(self.min_limit, min(initial, self.max_limit)))
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.in_flight = 0
+        self.baseline: float | None = None  # Smoothed healthy latency (seconds)
+        self._clock = clock
+        self._slow_start = True
+        self._last_decrease = float("-inf")
+        self._waiters: deque[asyncio.Future] = deque()
+        self._publish()
+
+    async def acquire(self) -> None:
+        """Wait until a call fits under the current limit"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before cancellation: give the slot back
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float | None = None, ok: bool = True) -> None:
+        """
+        Return a slot and adjust the limit
+
+        Args:
+            latency: Call duration in seconds (None = call never ran, no update)
+            ok: Whether the call succeeded
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            self._update(latency, ok)
+        self._wake()
+
+    def _update(self, latency: float, ok: bool) -> None:
+        spike = self.baseline is not None and latency > self.baseline * self.latency_tolerance
+
+        if ok and not spike:
+            self.baseline = latency if self.baseline is None else self.baseline + 0.1 * (latency - self.baseline)
+            step = 1.0 if self._slow_start else 1.0 / self.limit
+            self.limit = min(float(self.max_limit), self.limit + step)
+        else:
+            if spike and ok:
+                # Let the baseline follow lasting latency changes, slowly
+                self.baseline += 0.02 * (latency - self.baseline)
+            now = self._clock()
+            if now - self._last_decrease >= (self.baseline or 0.0):
+                self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                self._slow_start = False
+                self._last_decrease = now
+        self._publish()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _publish(self) -> None:
+        if metrics.REGISTRY.enabled:
+            metrics.CONCURRENCY_LIMIT.set(int(self.limit), server=self.name)
+
+
+class ServerLimiter:
+    """
+    Concurrency and rate limits for one server
+
+    Usage:
+        limiter = ServerLimiter(max_concurrency=2, rate=5)
+        async with limiter.slot() as waited:
+            await client.call_tool(...)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        adaptive: bool = False,
+        name: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self.adaptive: AdaptiveConcurrency | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        if adaptive:
+            self.adaptive = AdaptiveConcurrency(
+                max_limit=max_concurrency or DEFAULT_ADAPTIVE_MAX, name=name, clock=clock
+            )
+        elif max_concurrency:
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate, burst, clock) if rate else None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """
+        Hold a call slot; yields the seconds spent waiting for it
+
+        With adaptive concurrency, the time inside the block and whether it
+        raised feed the limit.
+        """
+        start = self._clock()
+        if self.adaptive is not None:
+            await self.adaptive.acquire()
+        elif self._semaphore is not None:
+            await self._semaphore.acquire()
+
+        call_start: float | None = None
+        ok = False
+        try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            call_start = self._clock()
+            yield call_start - start
+            ok = True
+        finally:
+            if self.adaptive is not None:
+                latency = self._clock() - call_start if call_start is not None else None
+                self.adaptive.release(latency, ok)
+            elif self._semaphore is not None:
+                self._semaphore.release()
+
+
+# Event loop -> (server name, limits) -> limiter. asyncio primitives belong to
+# one loop, so each loop (e.g. each batch worker) gets its own set.
+_limiters: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple, ServerLimiter]
+] = weakref.WeakKeyDictionary()
+
+
+def get_limiter(server_config: ServerConfig) -> ServerLimiter | None:
+    """
+    Get the process-wide limiter for a server (None if it has no limits)
+
+    Must be called from a running event loop.
+    """
+    if not (server_config.max_concurrency or server_config.rate_limit or server_config.adaptive_concurrency):
+        return None
+
+    key = (
+        server_config.name,
+        server_config.max_concurrency,
+        server_config.rate_limit,
+        server_config.rate_burst,
+        server_config.adaptive_concurrency,
+    )
+    per_loop = _limiters.setdefault(asyncio.get_running_loop(), {})
+    limiter = per_loop.get(key)
+    if limiter is None:
+        limiter = per_loop[key] = ServerLimiter(
+            server_config.max_concurrency,
+            server_config.rate_limit,
+            server_config.rate_burst,
+            adaptive=server_config.adaptive_concurrency,
+            name=server_config.name,
+        )
+    return limiter
+
+
+def split_limits(config: Config, parts: int) -> Config:
+    """
+    Config with each server's limits divided between `parts` processes
+
+    rate_limit and rate_burst are divided evenly; max_concurrency (also the
+    adaptive ceiling) is divided rounding down, but never below 1 - with more
+    processes than max_concurrency the total can exceed it.
+
+    Args:
+        config: Configuration with whole-batch limits
+        parts: Number of worker processes
+
+    Returns:
+        Config with per-process limits (config itself if parts <= 1)
+    """
+    if parts <= 1:
+        return config
+
+    servers = {}
+    for name, server in config.servers.items():
+        changes: dict[str, Any] = {}
+        if server.rate_limit:
+            changes["rate_limit"] = server.rate_limit / parts
+            if server.rate_burst:
+                changes["rate_burst"] = max(1, server.rate_burst // parts)
+        if server.max_concurrency:
+            changes["max_concurrency"] = max(1, server.max_concurrency // parts)
+        elif server.adaptive_concurrency:
+            changes["max_concurrency"] = max(1, DEFAULT_ADAPTIVE_MAX // parts)
+        servers[name] = dataclasses.replace(server, **changes) if changes else server
+    return dataclasses.replace(config, servers=servers)
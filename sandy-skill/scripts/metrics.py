@@ -0,0 +1,320 @@
+"""
+Sandy Metrics
+
+Process-wide counters, gauges and histograms, served in Prometheus text
+exposition format from a small asyncio HTTP endpoint (GET /metrics).
+
+Collection is off until enabled (start_metrics_server() enables it), so
+one-shot plays pay nothing. Once enabled:
+- ScenarioPlayer records step latency (by server/tool/status), retries and plays
+- Every MCPClient transport records call latency, in-flight calls,
+  open connections and bytes sent/received (see clients/base.py)
+- The job queue worker records queue depth per status
+
+Usage:
+    server = await start_metrics_server(port=9464)
+    ...
+    server.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from typing import Any
+
+
+__all__ = [
+    # Classes
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    # Functions
+    "start_metrics_server",
+    "payload_size",
+    "tool_labels",
+    # Constants
+    "REGISTRY",
+    "DEFAULT_BUCKETS",
+]
+
+
+# Seconds; spans fast local tools to slow browser steps
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _label_text(self, key: tuple[str, ...], extra: str = "") -> str:
+        parts = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{self._label_text(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Bucketed observations with sum and count"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # [per-bucket counts..., sum, count]
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, state):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+            inf = self._label_text(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {state[-1]}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics
+
+    Metrics are created once (get-or-create by name) and updated from the
+    asyncio loop; no locking is needed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get(self, cls: type, name: str, help_text: str, labelnames: tuple[str, ...], **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def reset(self) -> None:
+        """Clear all recorded values (metrics stay registered)"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric"""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+STEP_DURATION = REGISTRY.histogram(
+    "sandy_step_duration_seconds", "Scenario step duration", ("server", "tool", "status")
+)
+STEP_RETRIES = REGISTRY.counter(
+    "sandy_step_retries_total", "Step retry attempts", ("server", "tool")
+)
+PLAYS = REGISTRY.counter(
+    "sandy_plays_total", "Completed scenario plays", ("scenario", "status")
+)
+CALL_DURATION = REGISTRY.histogram(
+    "sandy_mcp_call_duration_seconds", "MCP tool call duration", ("server", "tool", "outcome")
+)
+CALLS_IN_FLIGHT = REGISTRY.gauge(
+    "sandy_mcp_calls_in_flight", "MCP tool calls currently running", ("server",)
+)
+CONNECTIONS = REGISTRY.gauge(
+    "sandy_mcp_connections", "Open MCP client connections", ("server", "transport")
+)
+BYTES = REGISTRY.counter(
+    "sandy_mcp_bytes_total", "JSON-encoded MCP payload bytes", ("server", "direction")
+)
+LIMIT_WAIT = REGISTRY.histogram(
+    "sandy_limit_wait_seconds", "Time waiting on server concurrency/rate limits", ("server",)
+)
+CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "sandy_concurrency_limit", "Current adaptive in-flight call limit", ("server",)
+)
+QUEUE_JOBS = REGISTRY.gauge(
+    "sandy_queue_jobs", "Jobs in the queue by status", ("status",)
+)
+
+
+def payload_size(value: Any) -> int:
+    """Approximate wire size of a payload in bytes (JSON-encoded)"""
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def tool_labels(tool: str) -> tuple[str, str]:
+    """Split a scenario tool name into (server, tool) metric labels"""
+    if tool.startswith("mcp__"):
+        server, _, name = tool.removeprefix("mcp__").partition("__")
+        return server, name
+    prefix, _, name = tool.partition("__")
+    return prefix, name or tool
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, registry: MetricsRegistry) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Drain headers
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] in ("/metrics", "/"):
+            status, body = "200 OK", registry.render().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = "404 Not Found", b"Not Found\n", "text/plain"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry | None = None,
+) -> asyncio.AbstractServer:
+    """
+    Serve metrics over HTTP on the running event loop and enable collection
+
+    Args:
+        port: TCP port (0 = pick a free port)
+        host: Bind address (default: localhost only)
+        registry: Registry to serve (default: process-wide REGISTRY)
+
+    Returns:
+        asyncio server (close() to stop)
+    """
+    registry = registry or REGISTRY
+    registry.enabled = True
+    return await asyncio.start_server(lambda r, w: _handle(r, w, registry), host, port)
@@ -0,0 +1,355 @@
+"""
+Sandy Scenario Optimizer
+
+Rewrites a scenario into a faster equivalent and reports every change.
+Passes run in order (see PASSES):
+
+- hoist_conditions: evaluate conditions that don't depend on step outputs
+  (constants, or variables bound with --var); drop the condition when it
+  holds, the step when it doesn't
+- drop_unused: remove read-only steps that capture nothing
+- merge_waits: merge adjacent sandy__wait steps
+- readiness_probes: drop fixed waits directly followed by a readiness probe
+  (wait_for, sandy__wait_for_element, sandy__wait_until), adding the
+  seconds to the probe's timeout so it gives up no earlier than before
+- reorder: move script steps past independent file reads (see
+  MOVABLE_READS) so play.py --fuse-scripts runs them as one call
+
+Remaining fixed waits are reported as hints. Steps are renumbered 1..N;
+the report maps original step numbers to new ones.
+
+Usage:
+    optimized, report = optimize_scenario(json.loads(path.read_text()))
+    print(report.summary)
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, replace
+from typing import Any, Iterable
+
+try:
+    from .scenario import Scenario, Step, parse_scenario, VAR_PATTERN
+    from .conditions import ConditionSyntaxError, compile_condition
+    from .fusion import is_fusible
+except ImportError:
+    from scenario import Scenario, Step, parse_scenario, VAR_PATTERN
+    from conditions import ConditionSyntaxError, compile_condition
+    from fusion import is_fusible
+
+
+__all__ = [
+    # Data classes
+    "Rewrite",
+    "OptimizationReport",
+    # Functions
+    "optimize_scenario",
+    # Constants
+    "PASSES",
+    "READ_ONLY_TOOLS",
+    "PROBE_TOOLS",
+    "MOVABLE_READS",
+]
+
+
+PASSES = ("hoist_conditions", "drop_unused", "merge_waits", "readiness_probes", "reorder")
+
+# Tools that only read state. take_snapshot is not listed: it refreshes the
+# element uids later steps click on.
+READ_ONLY_TOOLS = frozenset({
+    "mcp__chrome-devtools__list_pages",
+    "mcp__chrome-devtools__list_console_messages",
+    "mcp__chrome-devtools__get_console_message",
+    "mcp__chrome-devtools__list_network_requests",
+    "mcp__chrome-devtools__get_network_request",
+    "mcp__claude-in-chrome__tabs_context_mcp",
+    "mcp__claude-in-chrome__read_page",
+    "mcp__claude-in-chrome__get_page_text",
+    "mcp__claude-in-chrome__find",
+    "mcp__claude-in-chrome__read_console_messages",
+    "mcp__claude-in-chrome__read_network_requests",
+    "claude__read",
+    "claude__glob",
+    "claude__grep",
+    "claude__web_fetch",
+})
+
+# Steps that already wait for the page to be ready
+PROBE_TOOLS = frozenset({
+    "mcp__chrome-devtools__wait_for",
+    "sandy__wait_for_element",
+    "sandy__wait_until",
+})
+
+# Reads a script step may move past: they don't touch the browser, so the
+# script can't change what they see
+MOVABLE_READS = frozenset({"claude__read", "claude__glob", "claude__grep"})
+
+_WAIT_TOOL = "sandy__wait"
+
+# Probe timeout param: (unit in seconds, default when the param is unset).
+# wait_for's default is up to the server, so it needs an explicit timeout.
+_PROBE_TIMEOUTS: dict[str, tuple[float, float | None]] = {
+    "mcp__chrome-devtools__wait_for": (0.001, None),
+    "sandy__wait_for_element": (1.0, 10),
+    "sandy__wait_until": (1.0, 30),
+}
+
+
+@dataclass
+class Rewrite:
+    """One change made by a pass"""
+    pass_name: str
+    steps: list[int]  # Original step numbers involved
+    message: str
+    saved: float = 0.0  # Seconds of fixed waiting removed
+
+
+@dataclass
+class OptimizationReport:
+    """What optimize_scenario changed"""
+    original_steps: int
+    optimized_steps: int
+    rewrites: list[Rewrite] = field(default_factory=list)
+    hints: list[str] = field(default_factory=list)  # Left for the author
+    step_map: dict[int, int] = field(default_factory=dict)  # Original -> new number
+
+    @property
+    def saved_wait(self) -> float:
+        """Seconds of fixed waiting removed"""
+        return sum(r.saved for r in self.rewrites)
+
+    @property
+    def summary(self) -> str:
+        return (
+            f"{len(self.rewrites)} rewrites: {self.original_steps} -> {self.optimized_steps} steps, "
+            f"{self.saved_wait:.1f}s of fixed waits removed"
+        )
+
+
+def _references(step: Step) -> set[str]:
+    """Variable names / step ids referenced by a step's params and condition"""
+    text = json.dumps(step.params) + (step.condition or "")
+    return {ref.split(".", 1)[0].strip() for ref in VAR_PATTERN.findall(text)}
+
+
+def _wait_seconds(step: Step) -> float | None:
+    """Duration of a plain sandy__wait step (None for anything else)"""
+    if step.tool != _WAIT_TOOL or step.id or step.output or step.condition:
+        return None
+    value = step.params.get("seconds") or step.params.get("duration") or 0
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def _hoist_conditions(steps: list[Step], variables: dict[str, Any], report: OptimizationReport) -> list[Step]:
+    kept = []
+    for step in steps:
+        if step.condition:
+            try:
+                condition = compile_condition(step.condition)
+            except ConditionSyntaxError:
+                condition = None
+            if condition is not None and condition.references <= set(variables):
+                holds = condition.evaluate(lambda ref: (variables[ref], True))
+                if holds:
+                    step = replace(step, condition=None)
+                    report.rewrites.append(Rewrite(
+                        "hoist_conditions", [step.step], f"condition always true: {condition.source}"
+                    ))
+                else:
+                    report.rewrites.append(Rewrite(
+                        "hoist_conditions", [step.step], f"step never runs: {condition.source}"
+                    ))
+                    continue
+        kept.append(step)
+    return kept
+
+
+def _drop_unused(steps: list[Step], report: OptimizationReport) -> list[Step]:
+    referenced = set().union(*(_references(s) for s in steps)) if steps else set()
+    kept = []
+    for step in steps:
+        if step.tool in READ_ONLY_TOOLS and not step.output and step.id not in referenced:
+            report.rewrites.append(Rewrite(
+                "drop_unused", [step.step], f"{step.tool} result is never used", step.wait_after or 0.0
+            ))
+            continue
+        kept.append(step)
+    return kept
+
+
+def _merge_waits(steps: list[Step], report: OptimizationReport) -> list[Step]:
+    kept: list[Step] = []
+    for step in steps:
+        seconds = _wait_seconds(step)
+        if seconds is not None and not step.wait_after:
+            previous = _wait_seconds(kept[-1]) if kept else None
+            if previous is not None and not kept[-1].wait_after:
+                total = previous + seconds
+                kept[-1] = replace(kept[-1], params={"seconds": total})
+                report.rewrites.append(Rewrite(
+                    "merge_waits", [kept[-1].step, step.step], f"merged into one {total:g}s wait"
+                ))
+                continue
+            if seconds == 0:
+                report.rewrites.append(Rewrite("merge_waits", [step.step], "removed 0s wait"))
+                continue
+        kept.append(step)
+    return kept
+
+
+def _extend_timeout(probe: Step, seconds: float) -> Step | None:
+    """Probe with `seconds` more timeout (None if its timeout isn't known)"""
+    unit, default = _PROBE_TIMEOUTS[probe.tool]
+    timeout = probe.params.get("timeout", default)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or (unit != 1.0 and not timeout):
+        return None
+    extended = timeout + seconds / unit
+    if isinstance(timeout, int) and extended == int(extended):
+        extended = int(extended)
+    return replace(probe, params={**probe.params, "timeout": extended})
+
+
+def _readiness_probes(steps: list[Step], report: OptimizationReport) -> list[Step]:
+    steps = list(steps)
+    kept: list[Step] = []
+    for i, step in enumerate(steps):
+        following = steps[i + 1] if i + 1 < len(steps) else None
+        probe_next = following is not None and following.tool in PROBE_TOOLS and not following.condition
+
+        seconds = _wait_seconds(step)
+        if seconds is not None and step.wait_after:
+            seconds = None  # Not a plain wait
+        removed = seconds if seconds is not None else step.wait_after
+        extended = _extend_timeout(following, removed) if probe_next and removed else None
+
+        if extended is not None and seconds is not None:
+            steps[i + 1] = extended
+            report.rewrites.append(Rewrite(
+                "readiness_probes", [step.step, following.step],
+                f"{seconds:g}s wait folded into {following.tool} timeout", seconds,
+            ))
+            continue
+        if extended is not None:
+            steps[i + 1] = extended
+            report.rewrites.append(Rewrite(
+                "readiness_probes", [step.step, following.step],
+                f"wait_after {step.wait_after:g}s folded into {following.tool} timeout", step.wait_after,
+            ))
+            step = replace(step, wait_after=None)
+        elif probe_next and removed:
+            report.hints.append(
+                f"step {step.step}: fixed {removed:g}s wait before {following.tool}; "
+                f"give the probe an explicit timeout so the wait can be folded into it"
+            )
+        elif step.wait_after or seconds:
+            report.hints.append(
+                f"step {step.step}: fixed {step.wait_after or seconds:g}s wait; "
+                f"a readiness probe (sandy__wait_for_element / sandy__wait_until) would end it early"
+            )
+        kept.append(step)
+    return kept
+
+
+def _movable_past(step: Step, other: Step) -> bool:
+    """Whether a script step can run before an earlier independent step"""
+    return (
+        other.tool in MOVABLE_READS
+        and other.on_error == "skip"  # A failing read must still stop the play before the script
+        and not other.condition
+        and not other.wait_after
+        and not (other.id and other.id in _references(step))
+        and not (step.id and step.id in _references(other))
+    )
+
+
+def _reorder(steps: list[Step], report: OptimizationReport) -> list[Step]:
+    steps = list(steps)
+    for i in range(len(steps)):
+        step = steps[i]
+        if not is_fusible(step):
+            continue
+        j = i - 1
+        while j >= 0 and _movable_past(step, steps[j]):
+            j -= 1
+        if j < 0 or j == i - 1:
+            continue
+        target = steps[j]
+        if (
+            is_fusible(target)
+            and target.tool == step.tool
+            and not target.wait_after
+            and target.params.get("tabId") == step.params.get("tabId")
+            and not (target.id and target.id in _references(step))
+        ):
+            steps.insert(j + 1, steps.pop(i))
+            report.rewrites.append(Rewrite(
+                "reorder", [step.step, target.step], f"moved after step {target.step} to fuse script calls"
+            ))
+    return steps
+
+
+def _step_dict(step: Step) -> dict[str, Any]:
+    data: dict[str, Any] = {"step": step.step}
+    if step.id:
+        data["id"] = step.id
+    data["tool"] = step.tool
+    data["params"] = step.params
+    for name in ("output", "description", "condition", "wait_after", "on_error", "retry"):
+        value = getattr(step, name)
+        if value is not None:
+            data[name] = value
+    return data
+
+
+def optimize_scenario(
+    data: dict[str, Any],
+    variables: dict[str, Any] | None = None,
+    passes: Iterable[str] | None = None,
+) -> tuple[dict[str, Any], OptimizationReport]:
+    """
+    Rewrite a scenario into a faster equivalent
+
+    Args:
+        data: Raw scenario dict (v1.1 or v2.1)
+        variables: Variables to treat as fixed when hoisting conditions
+            (scenario defaults can be overridden at play time, so they aren't)
+        passes: Passes to run (default: all of PASSES)
+
+    Returns:
+        (optimized v2.1 scenario dict, report)
+
+    Raises:
+        ScenarioValidationError: If the scenario is invalid
+        ValueError: For unknown pass names
+    """
+    selected = set(PASSES if passes is None else passes)
+    unknown = selected - set(PASSES)
+    if unknown:
+        raise ValueError(f"Unknown passes: {', '.join(sorted(unknown))}")
+
+    scenario: Scenario = parse_scenario(data)
+    steps = list(scenario.steps)
+    report = OptimizationReport(original_steps=len(steps), optimized_steps=len(steps))
+
+    if "hoist_conditions" in selected:
+        steps = _hoist_conditions(steps, variables or {}, report)
+    if "drop_unused" in selected:
+        steps = _drop_unused(steps, report)
+    if "merge_waits" in selected:
+        steps = _merge_waits(steps, report)
+    if "readiness_probes" in selected:
+        steps = _readiness_probes(steps, report)
+    if "reorder" in selected:
+        steps = _reorder(steps, report)
+
+    report.step_map = {step.step: n for n, step in enumerate(steps, 1)}
+    report.optimized_steps = len(steps)
+    optimized = {
+        **data,
+        "version": "2.1",
+        "steps": [_step_dict(replace(step, step=n)) for n, step in enumerate(steps, 1)],
+    }
+    parse_scenario(optimized)  # Rewrites must leave a valid scenario
+    return optimized, report
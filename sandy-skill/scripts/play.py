@@ -37,6 +37,37 @@ Examples:
 
     # Include results only on failure (recommended for debugging)
     python play.py scenario.json --include-results on_failure
+
+    # One run per CSV row on 8 worker processes, ordered JSONL out
+    python play.py scenario.json --batch rows.csv --workers 8 -o results.jsonl
+
+    # 16 rows in flight per worker (use with per-server adaptive_concurrency)
+    python play.py scenario.json --batch rows.csv --workers 2 --concurrency 16
+
+    # Run consecutive browser script steps as one script call
+    python play.py scenario.json --fuse-scripts
+
+    # Evaluate conditions with the old text comparison ("False", "0" are true)
+    python play.py scenario.json --legacy-conditions
+
+    # Shorten wait_after values to what past runs needed (learned per scenario)
+    python play.py scenario.json --tune-waits
+
+    # Record MCP calls to fixtures, then replay them offline without latency
+    python play.py scenario.json --record fixtures/
+    python play.py scenario.json --replay fixtures/ --replay-latency zero
+
+    # Save screenshots and other binary results as files
+    python play.py scenario.json --artifacts-dir ./artifacts
+
+    # Keep results over 256 KiB as compressed blobs in .sandy/blobs/
+    python play.py scenario.json --include-results true --blob-threshold 262144 --blob-compress
+
+    # Don't record this run in .sandy/history.db (see `sandy stats`)
+    python play.py scenario.json --no-history
+
+    # Append play/step/attempt/call spans as OTLP JSON, under an outer trace
+    python play.py scenario.json --trace trace.jsonl --traceparent "$TRACEPARENT"
 """
 
 from __future__ import annotations
@@ -53,10 +84,11 @@ sys.path.insert(0, str(SCRIPT_DIR))
 # Default scenarios directory (relative to script)
 DEFAULT_SCENARIOS_DIR = SCRIPT_DIR.parent / "assets" / "examples"
 
+# Only lightweight modules at import time; the player (and through it
+# jsonpath_ng, native tools and MCP transports) loads on first use.
 from scenario import load_scenario, get_required_variables, ScenarioValidationError
 from config import detect_config, load_config_from_path, ConfigNotFoundError
-from player import PlayerOptions, play_scenario
-from reporter import create_reporter
+from scenario_cache import load_scenario_cached
 
 
 def parse_args() -> argparse.Namespace:
@@ -129,6 +161,12 @@ def parse_args() -> argparse.Namespace:
         help="Enable debug output",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the parsed-scenario cache in .sandy/cache/",
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -158,6 +196,130 @@ def parse_args() -> argparse.Namespace:
         help="Include MCP raw results: true, false (default), or on_failure",
     )
 
+    parser.add_argument(
+        "--blob-threshold",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Store included results larger than BYTES in .sandy/blobs/ "
+             "and keep a reference (default: off)",
+    )
+
+    parser.add_argument(
+        "--blob-compress",
+        action="store_true",
+        help="Gzip-compress spilled results",
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Play once per row of variables (.jsonl, .csv or JSON array); "
+             "writes one JSONL record per row in row order",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for --batch, each with its own MCP clients (default: 1)",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Rows played at once per --batch worker, sharing its MCP clients (default: 1)",
+    )
+
+    parser.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="Skip checking tools and params against cached tool schemas",
+    )
+
+    parser.add_argument(
+        "--refresh-tools",
+        action="store_true",
+        help="Re-fetch tool schemas of the scenario's servers before preflight",
+    )
+
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record this run in .sandy/history.db",
+    )
+
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Append play/step/attempt/call spans to FILE as OTLP JSON (one document per play)",
+    )
+
+    parser.add_argument(
+        "--traceparent",
+        type=str,
+        default=None,
+        metavar="HEADER",
+        help="W3C traceparent of an outer trace to join (default: $TRACEPARENT)",
+    )
+
+    parser.add_argument(
+        "--artifacts-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Write binary MCP content (images, blobs) to DIR and return "
+             "{path, mime, bytes, sha256} instead of base64",
+    )
+
+    parser.add_argument(
+        "--legacy-conditions",
+        action="store_true",
+        help="Evaluate conditions as text comparisons, as before compiled conditions",
+    )
+
+    parser.add_argument(
+        "--fuse-scripts",
+        action="store_true",
+        help="Run consecutive independent browser script steps as one script call",
+    )
+
+    parser.add_argument(
+        "--tune-waits",
+        action="store_true",
+        help="Shorten wait_after to what past runs needed, learned in .sandy/history.db",
+    )
+
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Record every MCP call to DIR/<server>.jsonl fixtures",
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Serve MCP calls from fixtures in DIR instead of the servers",
+    )
+
+    parser.add_argument(
+        "--replay-latency",
+        choices=["real", "zero"],
+        default="real",
+        help="Replay with the recorded call durations (default) or instantly",
+    )
+
     parser.add_argument(
         "--screenshot-on-failure",
         action="store_true",
@@ -172,7 +334,22 @@ def parse_args() -> argparse.Namespace:
         help="Directory to save failure screenshots (default: ./screenshots)",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.batch:
+        # Batch records carry outputs only (no raw results), and rows play
+        # in separate processes that would share fixtures, learned waits
+        # and the trace file
+        unsupported = {
+            "--record": args.record,
+            "--include-results": args.include_results != "false",
+            "--blob-threshold": args.blob_threshold is not None,
+            "--tune-waits": args.tune_waits,
+            "--trace": args.trace,
+        }
+        for flag, given in unsupported.items():
+            if given:
+                parser.error(f"{flag} cannot be combined with --batch")
+    return args
 
 
 def parse_variables(var_args: list[str] | None) -> dict[str, str]:
@@ -242,6 +419,124 @@ def load_env_file(path: str) -> dict[str, str]:
     return {k: v for k, v in values.items() if v is not None}
 
 
+def replay_config(scenario, config, fixture_dir: str, latency: float):
+    """Config with every MCP server of the scenario served from fixtures"""
+    import dataclasses
+    from config import Config, ServerConfig
+    from scenario import parse_tool_name
+    from clients.replay_client import fixture_path
+
+    names = set(config.servers)
+    for step in scenario.steps:
+        if step.tool.startswith("mcp__"):
+            names.add(parse_tool_name(step.tool)[0])
+        elif step.tool in ("sandy__wait_for_element", "sandy__wait_until"):
+            names.add(step.params.get("mcp_server", "chrome-devtools"))
+
+    servers = {}
+    for name in names:
+        server = config.servers.get(name) or ServerConfig(name=name)
+        servers[name] = dataclasses.replace(
+            server, replay=str(fixture_path(fixture_dir, name)), replay_latency=latency
+        )
+    return Config(servers=servers, source=f"{config.source} (replay: {fixture_dir})")
+
+
+async def refresh_tool_catalog(scenario, config, catalog) -> str | None:
+    """
+    Re-fetch tool schemas for every MCP server used by the scenario
+
+    Returns:
+        Error message, or None on success
+    """
+    from config import get_server_config
+    from scenario import parse_tool_name
+
+    servers: list[str] = []
+    for step in scenario.steps:
+        if step.tool.startswith("mcp__"):
+            server_name, _ = parse_tool_name(step.tool)
+            if server_name not in servers:
+                servers.append(server_name)
+
+    for server_name in servers:
+        try:
+            await catalog.refresh(get_server_config(config, server_name))
+        except KeyError:
+            continue  # Reported by preflight
+        except Exception as e:
+            return f"{server_name}: {e}"
+    return None
+
+
+def record_run(result, scenario_path: Path) -> None:
+    """Store a play result in the run history (failures only warn)"""
+    import sqlite3
+    from history import record_run as record_history
+
+    try:
+        record_history(result, scenario_path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Could not record run history: {e}", file=sys.stderr)
+
+
+async def run_batch_command(args, scenario, config, variables, rows, tool_catalog=None) -> int:
+    """
+    Play the scenario once per batch row and write ordered JSONL records
+
+    Records go to --output (or stdout); the summary goes to stderr.
+    """
+    import contextlib
+    import json
+    from batch import run_batch
+
+    options = {
+        "variables": variables,
+        "start": args.start,
+        "end": args.end,
+        "dry_run": args.dry_run,
+        "debug": args.debug,
+        "artifacts_dir": args.artifacts_dir,
+        "tool_catalog": tool_catalog,
+        "fuse_scripts": args.fuse_scripts,
+        "legacy_conditions": args.legacy_conditions,
+        "screenshot_on_failure": args.screenshot_on_failure,
+        "screenshot_dir": args.screenshot_dir,
+    }
+
+    # Each worker process gets 1/N of the server limits, but at least 1 slot
+    workers = min(args.workers, len(rows))
+    for name, server in config.servers.items():
+        if workers > 1 and server.max_concurrency and server.max_concurrency < workers:
+            print(
+                f"Warning: {name} max_concurrency {server.max_concurrency} is below --workers {workers}; "
+                f"each worker still gets 1 concurrent call",
+                file=sys.stderr,
+            )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    def write_record(record: dict) -> None:
+        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+
+    try:
+        # Player prints (e.g. sandy__log) must not mix into the record stream
+        with contextlib.redirect_stdout(sys.stderr):
+            stats = await asyncio.to_thread(
+                run_batch, scenario, config, rows, args.workers, options, write_record, args.concurrency
+            )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if args.json:
+        print(json.dumps(stats.to_dict()), file=sys.stderr)
+    else:
+        print(stats.summary, file=sys.stderr)
+    return 0 if stats.failed == 0 else 1
+
+
 async def main() -> int:
     """Main entry point"""
     args = parse_args()
@@ -253,9 +548,12 @@ async def main() -> int:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    # Load scenario
+    # Load scenario (through the parsed-scenario cache unless disabled)
     try:
-        scenario = load_scenario(scenario_path)
+        if args.no_cache:
+            scenario = load_scenario(scenario_path)
+        else:
+            scenario = load_scenario_cached(scenario_path)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
@@ -270,8 +568,14 @@ async def main() -> int:
         else:
             config = detect_config()
     except (ConfigNotFoundError, FileNotFoundError) as e:
-        print(f"Config Error: {e}", file=sys.stderr)
-        return 1
+        if not args.replay:
+            print(f"Config Error: {e}", file=sys.stderr)
+            return 1
+        from config import Config
+        config = Config(servers={}, source="replay")
+
+    if args.replay:
+        config = replay_config(scenario, config, args.replay, 0.0 if args.replay_latency == "zero" else 1.0)
 
     # Collect variables
     variables: dict[str, str] = {}
@@ -283,13 +587,56 @@ async def main() -> int:
     # From command line
     variables.update(parse_variables(args.variables))
 
+    # Batch rows (each row's variables override the ones above)
+    rows: list[dict[str, str]] | None = None
+    if args.batch:
+        from batch import load_rows
+
+        try:
+            rows = load_rows(args.batch)
+        except (OSError, ValueError) as e:
+            print(f"Batch Error: {e}", file=sys.stderr)
+            return 1
+
     # Check required variables
     required = get_required_variables(scenario)
-    missing = [v for v in required if v not in variables and v not in scenario.variables]
-    if missing:
-        print(f"Error: Missing required variables: {', '.join(missing)}", file=sys.stderr)
-        print("Use --var KEY=VALUE to provide them", file=sys.stderr)
-        return 1
+    for row_number, row in enumerate(rows or [{}], 1):
+        missing = [v for v in required if v not in variables and v not in row and v not in scenario.variables]
+        if missing:
+            where = f" (batch row {row_number})" if rows is not None else ""
+            print(f"Error: Missing required variables{where}: {', '.join(missing)}", file=sys.stderr)
+            print("Use --var KEY=VALUE to provide them", file=sys.stderr)
+            return 1
+
+    # Preflight: check tools and params against cached schemas (no spawning)
+    tool_catalog = None
+    if not args.no_preflight:
+        from catalog import ToolCatalog, preflight
+
+        tool_catalog = ToolCatalog()
+        if args.refresh_tools:
+            refresh_error = await refresh_tool_catalog(scenario, config, tool_catalog)
+            if refresh_error:
+                print(f"Tool Refresh Error: {refresh_error}", file=sys.stderr)
+                return 1
+
+        issues = preflight(scenario, config, tool_catalog)
+        if issues and args.dry_run:
+            # A dry run calls no servers, so the plan is still worth showing
+            for issue in issues:
+                print(f"Warning: Preflight: {issue}", file=sys.stderr)
+        elif issues:
+            print("Preflight Error:", file=sys.stderr)
+            for issue in issues:
+                print(f"  - {issue}", file=sys.stderr)
+            print("Use --refresh-tools if the server changed, or --no-preflight to skip", file=sys.stderr)
+            return 1
+
+    if rows is not None:
+        return await run_batch_command(args, scenario, config, variables, rows, tool_catalog)
+
+    from player import PlayerOptions, play_scenario
+    from reporter import create_reporter
 
     # Setup reporter
     output_file = None
@@ -311,6 +658,20 @@ async def main() -> int:
             include_results = "on_failure"
         # else: default False
 
+        # Spill large kept results to the blob store (opt-in)
+        blob_threshold: int | None = args.blob_threshold
+        if blob_threshold is not None and blob_threshold <= 0:
+            blob_threshold = None
+
+        # Record real runs for `sandy stats`
+        record_history = not (args.no_history or args.dry_run)
+
+        # Learned waits (real runs only)
+        wait_tuner = None
+        if args.tune_waits and not args.dry_run:
+            from waits import WaitTuner
+            wait_tuner = WaitTuner(scenario.metadata.name)
+
         # Setup player options
         options = PlayerOptions(
             variables=variables,
@@ -319,6 +680,14 @@ async def main() -> int:
             dry_run=args.dry_run,
             debug=args.debug,
             include_results=include_results,
+            blob_threshold=blob_threshold,
+            blob_compress=args.blob_compress,
+            artifacts_dir=args.artifacts_dir,
+            tool_catalog=tool_catalog,
+            fuse_scripts=args.fuse_scripts,
+            legacy_conditions=args.legacy_conditions,
+            wait_tuner=wait_tuner,
+            record_dir=args.record,
             screenshot_on_failure=args.screenshot_on_failure,
             screenshot_dir=args.screenshot_dir,
             on_step_start=None if args.json else reporter.step_start,
@@ -337,6 +706,12 @@ async def main() -> int:
             print("-" * 60)
             print()
 
+        if args.trace:
+            import os
+            from tracing import OTLPFileExporter, configure
+
+            configure(OTLPFileExporter(args.trace), args.traceparent or os.environ.get("TRACEPARENT"))
+
         # Execute scenario
         try:
             result = await play_scenario(scenario, config, options)
@@ -346,6 +721,12 @@ async def main() -> int:
                 import traceback
                 traceback.print_exc()
             return 1
+        finally:
+            if wait_tuner is not None:
+                wait_tuner.close()
+
+        if record_history:
+            record_run(result, scenario_path)
 
         # Print result
         if args.json:
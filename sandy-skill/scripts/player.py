@@ -12,12 +12,10 @@ import csv
 import json
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Literal
-
-from jsonpath_ng import parse as jsonpath_parse
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 
 __all__ = [
@@ -29,24 +27,51 @@ __all__ = [
     "ScenarioPlayer",
     # Functions
     "play_scenario",
+    # Constants
+    "POLL_INTERVAL",
 ]
 
 
 @lru_cache(maxsize=128)
 def _cached_jsonpath_parse(path: str):
-    """Cache parsed JSONPath expressions"""
+    """Cache parsed JSONPath expressions (jsonpath_ng is imported on first use)"""
+    from jsonpath_ng import parse as jsonpath_parse
     return jsonpath_parse(path)
 
 try:
-    from .scenario import Scenario, Step, parse_tool_name, VAR_PATTERN
+    from .scenario import Scenario, Step, load_scenario, parse_tool_name, VAR_PATTERN
     from .config import Config, get_server_config
-    from .clients import MCPClient, create_client
-    from .native_tools import ClaudeTools
+    from .jsonpath_fast import CompiledPath, FallbackRequired, compile_path, extract_columns
+    from .conditions import Condition, ConditionSyntaxError, compile_condition
+    from .fusion import build_fused_params, plan_fused_runs, split_fused_result
+    from . import limits, metrics, tracing
 except ImportError:
-    from scenario import Scenario, Step, parse_tool_name, VAR_PATTERN
+    from scenario import Scenario, Step, load_scenario, parse_tool_name, VAR_PATTERN
     from config import Config, get_server_config
-    from clients import MCPClient, create_client
-    from native_tools import ClaudeTools
+    from jsonpath_fast import CompiledPath, FallbackRequired, compile_path, extract_columns
+    from conditions import Condition, ConditionSyntaxError, compile_condition
+    from fusion import build_fused_params, plan_fused_runs, split_fused_result
+    import limits
+    import metrics
+    import tracing
+
+# blobs, sinks and waits are imported where used (gzip/mmap, sqlite3)
+if TYPE_CHECKING:
+    try:
+        from .clients import MCPClient
+        from .catalog import ToolCatalog
+        from .blobs import BlobStore
+        from .sinks import SQLiteSink
+        from .waits import WaitTuner
+    except ImportError:
+        from clients import MCPClient
+        from catalog import ToolCatalog
+        from blobs import BlobStore
+        from sinks import SQLiteSink
+        from waits import WaitTuner
+
+
+POLL_INTERVAL = 0.25  # Seconds between polls of the step after a tuned wait
 
 
 @dataclass
@@ -57,11 +82,13 @@ class StepResult:
     success: bool
     duration: float
     params: dict[str, Any] = field(default_factory=dict)  # Actual params used
-    result: Any = None  # MCP tool raw result
+    result: Any = None  # MCP tool raw result (BlobRef if spilled to the blob store)
     description: str | None = None
     error: str | None = None
     retries: int = 0
     skipped: bool = False
+    wait_time: float = 0.0  # Seconds spent waiting on server limits (included in duration)
+    result_bytes: int | None = None  # Raw result size (when measured, see measure_payloads)
 
 
 @dataclass
@@ -112,6 +139,40 @@ class PlayerOptions:
     # - "on_failure": Only include results when step fails
     include_results: bool | Literal["on_failure"] = False
 
+    # Large result spilling (only applies to results kept by include_results)
+    # - blob_threshold: JSON size in bytes at which results go to the blob store
+    #   (None = keep everything in memory)
+    blob_threshold: int | None = None
+    blob_dir: str | None = None  # Default: .sandy/blobs
+    blob_compress: bool = False
+
+    # Binary MCP content (images, blobs) is written here and results carry
+    # {path, mime, bytes, sha256} instead of base64 (None = keep base64)
+    artifacts_dir: str | None = None
+
+    # Record each raw result's JSON size in StepResult.result_bytes
+    # (before include_results clears it; used by run history). Always on
+    # while metrics or tracing are, which serialize results anyway
+    measure_payloads: bool = False
+
+    # Evaluate every condition with the pre-compiler string comparison
+    # (see conditions.py for how the two differ)
+    legacy_conditions: bool = False
+
+    # Run consecutive independent browser script steps as one script call
+    # (see fusion.py); results are still reported per step
+    fuse_scripts: bool = False
+
+    # Record every MCP call to <record_dir>/<server>.jsonl for replay
+    # (see clients/replay_client.py)
+    record_dir: str | None = None
+
+    # Learned wait_after values (see waits.py); None = always wait the full time
+    wait_tuner: WaitTuner | None = None
+
+    # Tool schema cache; filled for servers connected without a cached catalog
+    tool_catalog: ToolCatalog | None = None
+
     # Debug: Auto-capture screenshot on step failure (requires chrome-devtools MCP)
     screenshot_on_failure: bool = False
     screenshot_dir: str = "./screenshots"
@@ -147,6 +208,7 @@ class ScenarioPlayer:
         scenario: Scenario,
         config: Config,
         options: PlayerOptions | None = None,
+        clients: dict[str, MCPClient] | None = None,
     ):
         self.scenario = scenario
         self.config = config
@@ -158,8 +220,61 @@ class ScenarioPlayer:
         # Step outputs for runtime references
         self.step_outputs: dict[str, dict[str, Any]] = {}
 
-        # MCP clients (lazy-loaded per server)
-        self._clients: dict[str, MCPClient] = {}
+        # MCP clients (lazy-loaded per server). A caller-provided dict is
+        # shared across players and left open; the caller closes it.
+        self._owns_clients = clients is None
+        self._clients: dict[str, MCPClient] = {} if clients is None else clients
+
+        # Output JSONPath accessors, compiled once per scenario
+        # (None = outside the fast-path subset, use jsonpath_ng)
+        self._output_paths: dict[str, CompiledPath | None] = {}
+        for step in scenario.steps:
+            for spec in (step.output or {}).values():
+                path, _mode = _output_path_and_mode(spec)
+                if path != "$" and path not in self._output_paths:
+                    self._output_paths[path] = compile_path(path)
+
+        # Content-addressed store for large kept results
+        self._blob_store: BlobStore | None = None
+        if self.options.blob_threshold is not None:
+            try:
+                from .blobs import BlobStore
+            except ImportError:
+                from blobs import BlobStore
+            self._blob_store = BlobStore(
+                self.options.blob_dir,
+                threshold=self.options.blob_threshold,
+                compress=self.options.blob_compress,
+            )
+
+        # Browser tabs leased from pooled clients for this play (server -> tabId).
+        # Sub-scenarios share the caller's leases, which the caller releases.
+        self._tab_leases: dict[str, int] = {}
+        self._owns_tabs = True
+
+        # Scenario files being played by sandy__call_scenario callers
+        self._call_stack: tuple[Path, ...] = ()
+
+        # sandy__sqlite databases, open until the play ends (resolved path -> sink).
+        # Sub-scenarios share the caller's.
+        self._sqlite: dict[Path, SQLiteSink] = {}
+
+        # Fused script runs (first step number -> steps) and the results
+        # they produced for steps that haven't been reached yet
+        self._fused_runs: dict[int, list[Step]] = {}
+        if self.options.fuse_scripts and not self.options.default_delay:
+            self._fused_runs = plan_fused_runs(scenario.steps)
+        self._prefetched: dict[int, StepResult] = {}
+
+        # Waits shortened by the wait tuner so far: (step, seconds waited)
+        self._shortened_waits: list[tuple[Step, float]] = []
+
+        # Step conditions, compiled once per scenario
+        # (None = not parseable, use legacy string evaluation)
+        self._conditions: dict[str, Condition | None] = {}
+        for step in scenario.steps:
+            if step.condition and not self.options.legacy_conditions:
+                self._compiled_condition(step.condition)
 
     async def execute(self) -> PlayResult:
         """
@@ -172,12 +287,28 @@ class ScenarioPlayer:
         Returns:
             PlayResult with execution details
         """
+        with tracing.span("play", scenario=self.scenario.metadata.name) as span:
+            result = await self._execute_steps()
+            if span:
+                span.set_attributes(
+                    success=result.success,
+                    passed_steps=result.passed_steps,
+                    total_steps=result.total_steps,
+                    failed_step=result.failed_step,
+                )
+                span.error = result.error if not result.success else None
+            return result
+
+    async def _execute_steps(self) -> PlayResult:
+        """Run the step loop (see execute)"""
         start_time = time.time()
         results: list[StepResult] = []
         failed_step: int | None = None
+        # Shortened wait before this step: (step waited after, seconds, wait start)
+        tuned_wait: tuple[Step, float, float] | None = None
 
         try:
-            for step in self.scenario.steps:
+            for index, step in enumerate(self.scenario.steps):
                 # Skip steps before start point
                 if self.options.start and step.step < self.options.start:
                     continue
@@ -197,8 +328,32 @@ class ScenarioPlayer:
                         step.description or step.tool
                     )
 
-                result = await self._execute_step(step)
-                result.duration = time.time() - step_start
+                with tracing.span("step", step=step.step, tool=step.tool) as span:
+                    if tuned_wait is not None:
+                        result = await self._execute_after_tuned_wait(step, *tuned_wait)
+                        tuned_wait = None
+                    else:
+                        result = await self._execute_step(step)
+                    # Fused steps arrive with their own in-page duration
+                    if not result.duration:
+                        result.duration = time.time() - step_start
+
+                    if self.options.measure_payloads or span or metrics.REGISTRY.enabled:
+                        result.result_bytes = metrics.payload_size(result.result)
+                    if span:
+                        span.set_attributes(
+                            success=result.success,
+                            skipped=result.skipped,
+                            retries=result.retries,
+                            wait_time=result.wait_time or None,
+                            result_bytes=result.result_bytes,
+                        )
+                        span.error = None if result.success else result.error
+
+                if metrics.REGISTRY.enabled:
+                    server, tool = metrics.tool_labels(step.tool)
+                    status = "skipped" if result.skipped else "success" if result.success else "failure"
+                    metrics.STEP_DURATION.observe(result.duration, server=server, tool=tool, status=status)
 
                 # Apply include_results policy
                 self._apply_result_policy(result)
@@ -211,6 +366,8 @@ class ScenarioPlayer:
 
                 # Handle failure
                 if not result.success and not result.skipped:
+                    # A shortened wait may have let an earlier read see an unready page
+                    self._back_off_waits()
                     on_error = step.on_error or "stop"
                     if on_error == "stop":
                         failed_step = step.step
@@ -218,18 +375,37 @@ class ScenarioPlayer:
                     # "skip" continues to next step
 
                 # Wait after step
-                if step.wait_after:
+                following = self.scenario.steps[index + 1] if index + 1 < len(self.scenario.steps) else None
+                if step.wait_after and self._tunes_wait(following):
+                    wait = self.options.wait_tuner.wait_for(step)
+                    if self.options.debug:
+                        print(f"  [TUNED] wait {wait:.2f}s (configured {step.wait_after}s)")
+                    tuned_wait = (step, wait, time.time())
+                    await asyncio.sleep(wait)
+                elif step.wait_after:
                     await asyncio.sleep(step.wait_after)
                 elif self.options.default_delay > 0:
                     await asyncio.sleep(self.options.default_delay)
 
         finally:
-            # Close all clients
-            await self._close_clients()
+            if self._owns_tabs:
+                self._release_tabs()
+            if not self._call_stack:
+                self._close_sqlite()
+
+            # Close all clients (shared clients stay open for the owner)
+            if self._owns_clients:
+                await self._close_clients()
 
         duration = time.time() - start_time
         passed = sum(1 for r in results if r.success)
         completed = [r.step for r in results if r.success]
+        success = failed_step is None and passed == len(results)
+
+        if metrics.REGISTRY.enabled:
+            metrics.PLAYS.inc(
+                scenario=self.scenario.metadata.name, status="success" if success else "failure"
+            )
 
         # Build context and error for debugging
         context: dict[str, Any] = {}
@@ -243,7 +419,7 @@ class ScenarioPlayer:
 
         return PlayResult(
             scenario_name=self.scenario.metadata.name,
-            success=failed_step is None and passed == len(results),
+            success=success,
             total_steps=len(self.scenario.steps),
             passed_steps=passed,
             failed_step=failed_step,
@@ -255,8 +431,80 @@ class ScenarioPlayer:
             error=error,
         )
 
-    async def _execute_step(self, step: Step) -> StepResult:
-        """Execute a single step"""
+    def _tunes_wait(self, following: Step | None) -> bool:
+        """Whether the wait before `following` may be shortened by the wait tuner"""
+        if self.options.wait_tuner is None:
+            return False
+        try:
+            from .waits import TUNABLE_TOOLS
+        except ImportError:
+            from waits import TUNABLE_TOOLS
+
+        return (
+            not self.options.dry_run
+            and following is not None
+            and following.tool in TUNABLE_TOOLS
+            and not (self.options.end and following.step > self.options.end)
+            and following.step not in self._fused_runs
+        )
+
+    async def _execute_after_tuned_wait(
+        self,
+        step: Step,
+        waited_step: Step,
+        waited: float,
+        wait_start: float,
+    ) -> StepResult:
+        """
+        Execute a step after a shortened wait
+
+        The step (a readiness probe, see waits.TUNABLE_TOOLS) is polled every
+        POLL_INTERVAL with single attempts until it succeeds; once the
+        configured wait has passed it gets a normal attempt (retry policy,
+        failure screenshot), as it would have without tuning. The tuner
+        learns how long it needed.
+        """
+        configured = waited_step.wait_after or 0
+        polls = 0
+        while True:
+            attempt_start = time.time()
+            final = attempt_start - wait_start >= configured
+            result = await self._execute_step(step, poll=not final)
+            remaining = configured - (time.time() - wait_start)
+            if result.skipped:
+                # Whatever comes next still gets the full wait
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                return result
+            if result.success or final:
+                break
+            if remaining > 0:
+                await asyncio.sleep(min(POLL_INTERVAL, remaining))
+            polls += 1
+
+        if result.success:
+            needed = attempt_start - wait_start if polls else None
+            self.options.wait_tuner.observe(waited_step, waited, needed)
+            if attempt_start - wait_start < configured:
+                self._shortened_waits.append((waited_step, waited))
+        result.retries += polls
+        return result
+
+    def _back_off_waits(self) -> None:
+        """Restore the configured waits shortened earlier in this play"""
+        for waited_step, waited in self._shortened_waits:
+            self.options.wait_tuner.back_off(waited_step, waited)
+        self._shortened_waits.clear()
+
+    async def _execute_step(self, step: Step, poll: bool = False) -> StepResult:
+        """
+        Execute a single step
+
+        Args:
+            step: Step to run
+            poll: Readiness poll after a tuned wait: a single attempt
+                (no retry policy, no failure screenshot)
+        """
         # Substitute variables in params early for recording
         substituted_params = self._substitute_variables(step.params)
 
@@ -284,6 +532,15 @@ class ScenarioPlayer:
                 print(f"    params: {json.dumps(substituted_params, indent=2)}")
             return step_result
 
+        # Fused script runs: the first step runs the whole run
+        if step.step in self._fused_runs:
+            await self._execute_fused(self._fused_runs[step.step])
+        if step.step in self._prefetched:
+            step_result = self._prefetched.pop(step.step)
+            if not step_result.success and self.options.screenshot_on_failure:
+                await self._capture_failure_screenshot(step)
+            return step_result
+
         # Handle Sandy internal tools (no MCP call)
         if step.tool.startswith("sandy__"):
             return await self._execute_internal_tool(step, substituted_params, step_result)
@@ -296,7 +553,7 @@ class ScenarioPlayer:
         max_retries = 1
         retry_delay = 0.5
         retry_condition = None
-        if step.on_error == "retry":
+        if step.on_error == "retry" and not poll:
             retry_config = step.retry or {}
             max_retries = retry_config.get("count", 3)
             retry_delay = retry_config.get("delay", 500) / 1000.0
@@ -305,7 +562,8 @@ class ScenarioPlayer:
         # Execute with retries
         for attempt in range(1, max_retries + 1):
             try:
-                data = await self._call_tool(step, substituted_params)
+                with tracing.span("attempt", attempt=attempt):
+                    data = await self._call_tool(step, substituted_params, step_result)
                 step_result.success = True
                 step_result.result = data
 
@@ -331,16 +589,25 @@ class ScenarioPlayer:
                     break
 
                 if attempt < max_retries:
+                    step_result.retries = attempt
+                    if metrics.REGISTRY.enabled:
+                        server, tool = metrics.tool_labels(step.tool)
+                        metrics.STEP_RETRIES.inc(server=server, tool=tool)
                     await asyncio.sleep(retry_delay)
 
         # Capture screenshot on failure (if enabled)
-        if not step_result.success and self.options.screenshot_on_failure:
+        if not step_result.success and self.options.screenshot_on_failure and not poll:
             await self._capture_failure_screenshot(step)
 
         return step_result
 
-    async def _call_tool(self, step: Step, params: dict[str, Any]) -> Any:
-        """Call the MCP tool for a step"""
+    async def _call_tool(
+        self,
+        step: Step,
+        params: dict[str, Any],
+        step_result: StepResult | None = None,
+    ) -> Any:
+        """Call the MCP tool for a step (within the server's call limits)"""
         # Parse tool name to get server and tool
         server_name, tool_name = parse_tool_name(step.tool)
 
@@ -351,11 +618,34 @@ class ScenarioPlayer:
             print(f"  Calling {server_name}.{tool_name}")
             print(f"    params: {json.dumps(params, indent=2)}")
 
-        # Call tool
-        tool_result = await client.call_tool(tool_name, params)
+        # Pooled browser clients: this play drives its own tab
+        if getattr(client, "tab_pool_size", 1) > 1 and "tabId" not in params:
+            params = {**params, "tabId": await self._lease_tab(server_name, client)}
 
-        if not tool_result.success:
-            raise Exception(tool_result.error or "Tool call failed")
+        # Call tool
+        server_config = self.config.servers.get(server_name)
+        limiter = limits.get_limiter(server_config) if server_config else None
+        try:
+            if limiter is None:
+                tool_result = await client.call_tool(tool_name, params)
+            else:
+                async with limiter.slot() as waited:
+                    if step_result is not None:
+                        step_result.wait_time += waited
+                    if metrics.REGISTRY.enabled:
+                        metrics.LIMIT_WAIT.observe(waited, server=server_name)
+                    if self.options.debug and waited > 0:
+                        print(f"    waited {waited:.2f}s for {server_name} limits")
+                    tool_result = await client.call_tool(tool_name, params)
+                    if not tool_result.success:
+                        # Raise inside the slot so adaptive limits see the failure
+                        raise Exception(tool_result.error or "Tool call failed")
+
+            if not tool_result.success:
+                raise Exception(tool_result.error or "Tool call failed")
+        except Exception as e:
+            await self._drop_dead_client(server_name, client, e)
+            raise
 
         if self.options.debug:
             data_str = json.dumps(tool_result.data, indent=2, default=str)
@@ -365,6 +655,64 @@ class ScenarioPlayer:
 
         return tool_result.data
 
+    async def _execute_fused(self, run: list[Step]) -> None:
+        """
+        Run a fused script run in one call and prefetch each step's result
+
+        Steps past the end option are left to run on their own. A failed
+        call fails every step of the run (their scripts may have run).
+        """
+        if self.options.end:
+            run = [s for s in run if s.step <= self.options.end]
+        if len(run) < 2:
+            return
+
+        params_list = [self._substitute_variables(s.params) for s in run]
+        results = [
+            StepResult(
+                step=s.step,
+                tool=s.tool,
+                success=False,
+                duration=0,
+                params=params,
+                description=s.description,
+            )
+            for s, params in zip(run, params_list)
+        ]
+        stops = [(s.on_error or "stop") == "stop" for s in run]
+        fused_step = Step(step=run[0].step, tool=run[0].tool, params={})
+        fused_params = build_fused_params(run[0].tool, params_list, stops)
+
+        if self.options.debug:
+            print(f"  [FUSED] steps {run[0].step}-{run[-1].step} in one call")
+
+        start = time.time()
+        try:
+            with tracing.span("attempt", attempt=1, fused_steps=len(run)):
+                data = await self._call_tool(fused_step, fused_params, results[0])
+            entries = split_fused_result(data, len(run))
+        except Exception as e:
+            for step_result in results:
+                step_result.error = f"Fused script call failed: {e}"
+                self._prefetched[step_result.step] = step_result
+            return
+        elapsed = time.time() - start
+
+        for s, step_result, entry in zip(run, results, entries):
+            step_result.duration = float(entry.get("ms") or 0) / 1000
+            if entry["ok"]:
+                step_result.success = True
+                step_result.result = entry.get("value")
+                if s.id and s.output:
+                    self._extract_output(s.id, s.output, step_result.result)
+            else:
+                step_result.error = entry.get("error") or "Script failed"
+            self._prefetched[s.step] = step_result
+
+        # The first step carries the round trip not spent in page scripts
+        in_page = sum(r.duration for r in results[1:len(entries)])
+        results[0].duration = max(elapsed - in_page, results[0].duration)
+
     async def _execute_internal_tool(
         self,
         step: Step,
@@ -377,6 +725,8 @@ class ScenarioPlayer:
         Supported tools:
         - sandy__wait: Wait for specified duration (params: seconds or duration)
         - sandy__log: Log a message (debug)
+        - sandy__call_scenario: Run another scenario inline (params: scenario, variables)
+        - sandy__sqlite: Insert rows into a SQLite table (params: path, table, data, keys)
         """
         tool_name = step.tool.removeprefix("sandy__")
 
@@ -480,6 +830,29 @@ class ScenarioPlayer:
                 else:
                     raise TimeoutError(f"Condition '{expression}' not met within {timeout}s")
 
+            elif tool_name == "sqlite":
+                file_path = params.get("path")
+                table = params.get("table")
+
+                if not file_path or not table:
+                    raise ValueError("'path' and 'table' parameters are required")
+
+                sink = await self._sqlite_sink(file_path)
+                # Off the event loop: writes may wait up to 30s for other writers
+                result = await asyncio.to_thread(sink.insert, table, params.get("data") or [], params.get("keys"))
+                if self.options.debug:
+                    print(f"  [INTERNAL] sqlite: {result}")
+                step_result.success = True
+                step_result.result = result
+
+            elif tool_name == "call_scenario":
+                outputs = await self._call_scenario(params)
+                step_result.success = True
+                step_result.result = outputs
+
+                if step.id and step.output:
+                    self._extract_output(step.id, step.output, outputs)
+
             else:
                 step_result.success = False
                 step_result.error = f"Unknown internal tool: {step.tool}"
@@ -490,6 +863,57 @@ class ScenarioPlayer:
 
         return step_result
 
+    async def _call_scenario(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Play another scenario inline on this play's clients and tabs
+
+        Args:
+            params: {scenario: path, variables: {...}}
+
+        Returns:
+            The sub-scenario's outputs (step id -> extracted fields)
+
+        Raises:
+            ValueError: If 'scenario' is missing or the call is recursive
+            Exception: If the sub-scenario fails
+        """
+        scenario_path = params.get("scenario")
+        if not scenario_path:
+            raise ValueError("'scenario' parameter is required")
+
+        path = Path(scenario_path).resolve()
+        if path in self._call_stack:
+            chain = " -> ".join(p.name for p in (*self._call_stack, path))
+            raise ValueError(f"Recursive scenario call: {chain}")
+
+        child_scenario = _load_child_scenario(path)
+        options = replace(
+            self.options,
+            variables=params.get("variables") or {},
+            start=None,
+            end=None,
+            include_results=False,
+            measure_payloads=False,
+            wait_tuner=None,  # Learned per top-level scenario
+            on_step_start=None,
+            on_step_complete=None,
+        )
+        child = ScenarioPlayer(child_scenario, self.config, options, clients=self._clients)
+        child._tab_leases = self._tab_leases
+        child._owns_tabs = False
+        child._call_stack = (*self._call_stack, path)
+        child._sqlite = self._sqlite
+
+        if self.options.debug:
+            print(f"  [INTERNAL] call_scenario: {child_scenario.metadata.name}")
+
+        result = await child.execute()
+        if not result.success:
+            raise Exception(
+                f"Scenario '{child_scenario.metadata.name}' failed at step {result.failed_step}: {result.error}"
+            )
+        return result.outputs
+
     async def _execute_claude_tool(
         self,
         step: Step,
@@ -509,6 +933,11 @@ class ScenarioPlayer:
         - claude__web_fetch: Fetch URL contents
         - claude__notebook_edit: Edit Jupyter notebooks
         """
+        try:
+            from .native_tools import ClaudeTools
+        except ImportError:
+            from native_tools import ClaudeTools
+
         tool_name = step.tool.removeprefix("claude__")
 
         if self.options.debug:
@@ -536,6 +965,27 @@ class ScenarioPlayer:
 
         return step_result
 
+    async def _sqlite_sink(self, file_path: str) -> SQLiteSink:
+        """Get the play's open connection to a SQLite database"""
+        path = Path(file_path).resolve()
+        if path not in self._sqlite:
+            try:
+                from .sinks import SQLiteSink
+            except ImportError:
+                from sinks import SQLiteSink
+            sink = await asyncio.to_thread(SQLiteSink, path)
+            if path in self._sqlite:
+                sink.close()  # Opened meanwhile by a sub-scenario sharing the dict
+            else:
+                self._sqlite[path] = sink
+        return self._sqlite[path]
+
+    def _close_sqlite(self) -> None:
+        """Close the play's SQLite databases"""
+        for sink in self._sqlite.values():
+            sink.close()
+        self._sqlite.clear()
+
     def _append_to_file(self, file_path: str, fmt: str, data: Any) -> dict[str, Any]:
         """
         Append data to file in specified format
@@ -615,13 +1065,71 @@ class ScenarioPlayer:
     async def _get_client(self, server_name: str) -> MCPClient:
         """Get or create MCP client for server"""
         if server_name not in self._clients:
+            try:
+                from .clients import create_client
+            except ImportError:
+                from clients import create_client
+
             server_config = get_server_config(self.config, server_name)
             client = await create_client(server_config)
+            client.artifacts_dir = self.options.artifacts_dir
+            if self.options.record_dir:
+                try:
+                    from .clients.replay_client import RecordingClient, fixture_path
+                except ImportError:
+                    from clients.replay_client import RecordingClient, fixture_path
+                client = RecordingClient(client, fixture_path(self.options.record_dir, server_name))
             await client.connect()
+
+            # Another player sharing the dict may have connected meanwhile
+            if server_name in self._clients:
+                await client.disconnect()
+                return self._clients[server_name]
             self._clients[server_name] = client
 
+            # Record tool schemas for preflight on later runs
+            catalog = self.options.tool_catalog
+            if catalog is not None and catalog.get(server_config) is None:
+                try:
+                    catalog.put(server_config, await client.list_tool_schemas())
+                except Exception as e:
+                    if self.options.debug:
+                        print(f"  [DEBUG] Could not list tools for {server_name}: {e}")
+
         return self._clients[server_name]
 
+    async def _drop_dead_client(self, server_name: str, client: MCPClient, error: Exception) -> None:
+        """Forget a client whose transport is gone, so the next call reconnects"""
+        try:
+            from .clients.base import is_connection_error
+        except ImportError:
+            from clients.base import is_connection_error
+
+        if not is_connection_error(error) or self._clients.get(server_name) is not client:
+            return
+        del self._clients[server_name]
+        self._tab_leases.pop(server_name, None)
+        if self.options.debug:
+            print(f"  [DEBUG] Lost connection to {server_name}, reconnecting on next call")
+        try:
+            await client.disconnect()
+        except Exception:
+            pass  # The transport is already broken
+
+    async def _lease_tab(self, server_name: str, client: Any) -> int:
+        """Lease a tab for this play on first use (held until the play ends)"""
+        if server_name not in self._tab_leases:
+            self._tab_leases[server_name] = await client.lease_tab()
+        return self._tab_leases[server_name]
+
+    def _release_tabs(self) -> None:
+        """Return leased tabs to their clients' pools"""
+        for server_name, tab_id in self._tab_leases.items():
+            client = self._clients.get(server_name)
+            if client is not None:
+                client.release_tab(tab_id)
+        self._tab_leases.clear()
+
     async def _close_clients(self) -> None:
         """Close all MCP clients"""
         # Note: Sequential closing required due to MCP SDK's anyio cancel scope
@@ -752,7 +1260,7 @@ class ScenarioPlayer:
     def _extract_output(
         self,
         step_id: str,
-        output_spec: dict[str, str],
+        output_spec: dict[str, str | dict[str, str]],
         data: Any,
     ) -> None:
         """
@@ -760,40 +1268,131 @@ class ScenarioPlayer:
 
         Args:
             step_id: Step identifier for storing output
-            output_spec: Mapping of name -> JSONPath
+            output_spec: Mapping of name -> JSONPath, or name -> {path, mode}
+                with mode "first" (default), "all", "count" or "column"
             data: Tool result data
         """
         extracted: dict[str, Any] = {}
+        columns: dict[str, CompiledPath] = {}
 
-        for name, path in output_spec.items():
-            if path == "$":
+        for name, spec in output_spec.items():
+            path, mode = _output_path_and_mode(spec)
+            if path == "$" and mode == "first":
                 # Full result
                 extracted[name] = data
+            elif mode == "first":
+                extracted[name] = self._find_first(path, data)
+            elif mode == "column":
+                compiled = self._compiled_path(path)
+                if compiled is not None and compiled.split_at_wildcard() is not None:
+                    columns[name] = compiled
+                else:
+                    extracted[name] = self._extract_column(path, data)
             else:
-                # JSONPath extraction (cached)
-                try:
-                    expr = _cached_jsonpath_parse(path)
-                    matches = expr.find(data)
-                    if matches:
-                        extracted[name] = matches[0].value
-                    else:
-                        extracted[name] = None
-                except Exception:
-                    extracted[name] = None
+                matches = self._find_all(path, data)
+                extracted[name] = len(matches) if mode == "count" else matches
 
-        self.step_outputs[step_id] = extracted
+        if columns:
+            # All columns over the same list are read in a single pass
+            try:
+                extracted.update(extract_columns(data, columns))
+            except FallbackRequired:
+                for name, compiled in columns.items():
+                    extracted[name] = self._extract_column(compiled.expression, data)
+
+        # Keep the declared field order
+        self.step_outputs[step_id] = {name: extracted[name] for name in output_spec}
 
         if self.options.debug:
             print(f"  Extracted outputs for '{step_id}': {extracted}")
 
+    def _compiled_path(self, path: str) -> CompiledPath | None:
+        """Get the fast-path accessor for a JSONPath (compiled once)"""
+        if path in self._output_paths:
+            return self._output_paths[path]
+        compiled = self._output_paths[path] = compile_path(path)
+        return compiled
+
+    def _find_all(self, path: str, data: Any) -> list[Any]:
+        """Get every JSONPath match (empty if no match or invalid path)"""
+        compiled = self._compiled_path(path)
+        if compiled is not None:
+            try:
+                return compiled.find(data)
+            except FallbackRequired:
+                pass
+
+        try:
+            return [m.value for m in _cached_jsonpath_parse(path).find(data)]
+        except Exception:
+            return []
+
+    def _extract_column(self, path: str, data: Any) -> list[Any]:
+        """
+        Get one value per row of the path's first [*] list, None where missing
+
+        Slow path for column outputs extract_columns can't evaluate; rows and
+        their values are found separately so columns stay aligned.
+        """
+        prefix, wildcard, suffix = path.partition("[*]")
+        if not wildcard:
+            return self._find_all(path, data)
+
+        rows: list[Any] = []
+        for container in self._find_all(prefix, data):
+            if isinstance(container, list):
+                rows.extend(container)
+            elif container is not None:
+                rows.append(container)
+        return [self._find_first("$" + suffix, row) for row in rows]
+
+    def _find_first(self, path: str, data: Any) -> Any:
+        """
+        Get the first JSONPath match (None if no match or invalid path)
+
+        Simple paths use the compiled fast-path accessor; everything else
+        goes through jsonpath_ng (parse cached).
+        """
+        compiled = self._compiled_path(path)
+        if compiled is not None:
+            try:
+                value, _found = compiled.first(data)
+                return value
+            except FallbackRequired:
+                pass
+
+        try:
+            matches = _cached_jsonpath_parse(path).find(data)
+            return matches[0].value if matches else None
+        except Exception:
+            return None
+
+    def _compiled_condition(self, condition: str) -> Condition | None:
+        """Get the compiled condition, compiling on first use"""
+        if condition in self._conditions:
+            return self._conditions[condition]
+        try:
+            compiled: Condition | None = compile_condition(condition)
+        except ConditionSyntaxError:
+            compiled = None
+        self._conditions[condition] = compiled
+        return compiled
+
     def _evaluate_condition(self, condition: str) -> bool:
         """
         Evaluate a condition expression
 
-        Simple implementation supporting:
+        Conditions are compiled once (see conditions.py) and evaluated
+        against raw variable and step output values. Expressions the
+        compiler rejects (or every condition, with legacy_conditions) use
+        the legacy string evaluation:
         - {{step_id.field}} != ""
         - {{VAR}} == "value"
         """
+        compiled = None if self.options.legacy_conditions else self._compiled_condition(condition)
+        if compiled is not None:
+            return compiled.evaluate(self._resolve_variable)
+
         # Substitute variables first
         evaluated = self._substitute_string(condition)
 
@@ -816,27 +1415,48 @@ class ScenarioPlayer:
         - False (default): Clear result to save tokens (outputs are preserved)
         - True: Keep full MCP raw result
         - "on_failure": Only keep result when step failed
+
+        Kept results over blob_threshold are replaced by a BlobRef.
         """
         include = self.options.include_results
 
-        if include is True:
-            # Keep result as is
+        if include is True or (include == "on_failure" and not result.success):
+            if self._blob_store is not None:
+                result.result = self._blob_store.spill(result.result, result.result_bytes)
             return
 
-        if include == "on_failure":
-            # Keep result only if step failed
-            if result.success:
-                result.result = None
-            return
-
-        # Default (False): Clear result to save tokens
+        # Default (False), or "on_failure" with a passing step:
+        # clear result to save tokens
         result.result = None
 
 
+# Sub-scenarios parsed by sandy__call_scenario: path -> (mtime_ns, size, scenario)
+_child_scenarios: dict[Path, tuple[int, int, Scenario]] = {}
+
+
+def _load_child_scenario(path: Path) -> Scenario:
+    """Load a sub-scenario, parsing it again only when the file changes"""
+    st = path.stat()
+    cached = _child_scenarios.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    scenario = load_scenario(path)
+    _child_scenarios[path] = (st.st_mtime_ns, st.st_size, scenario)
+    return scenario
+
+
+def _output_path_and_mode(spec: str | dict[str, str]) -> tuple[str, str]:
+    """Normalize an output spec to (path, mode)"""
+    if isinstance(spec, dict):
+        return spec.get("path", "$"), spec.get("mode", "first")
+    return spec, "first"
+
+
 async def play_scenario(
     scenario: Scenario,
     config: Config,
     options: PlayerOptions | None = None,
+    clients: dict[str, MCPClient] | None = None,
 ) -> PlayResult:
     """
     Convenience function to play a scenario
@@ -845,9 +1465,10 @@ async def play_scenario(
         scenario: Loaded scenario
         config: MCP configuration
         options: Player options
+        clients: Shared client dict (left open; default: private, closed after the play)
 
     Returns:
         PlayResult with execution details
     """
-    player = ScenarioPlayer(scenario, config, options)
+    player = ScenarioPlayer(scenario, config, options, clients)
     return await player.execute()
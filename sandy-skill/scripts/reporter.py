@@ -9,7 +9,7 @@ from __future__ import annotations
 import json
 import sys
 from dataclasses import asdict
-from typing import TextIO
+from typing import TYPE_CHECKING, TextIO
 
 
 __all__ = [
@@ -18,10 +18,11 @@ __all__ = [
 ]
 
 
-try:
-    from .player import PlayResult, StepResult
-except ImportError:
-    from player import PlayResult, StepResult
+if TYPE_CHECKING:
+    try:
+        from .player import PlayResult, StepResult
+    except ImportError:
+        from player import PlayResult, StepResult
 
 
 class Reporter:
@@ -76,7 +77,10 @@ class Reporter:
         else:
             status = self._color(" FAILED", self.RED)
 
-        duration = self._color(f" ({result.duration:.2f}s)", self.GRAY)
+        if result.wait_time > 0.005:
+            duration = self._color(f" ({result.duration:.2f}s, {result.wait_time:.2f}s throttled)", self.GRAY)
+        else:
+            duration = self._color(f" ({result.duration:.2f}s)", self.GRAY)
         self.output.write(f"{status}{duration}\n")
 
         # Show error in verbose mode
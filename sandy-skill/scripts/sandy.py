@@ -0,0 +1,847 @@
+#!/usr/bin/env python3
+"""
+Sandy CLI
+
+Library and maintenance commands (scenario execution lives in play.py).
+
+Usage:
+    python sandy.py <command> [options]
+
+Commands:
+    find      Search the scenario library by name, description, tools, variables
+    config    Show the resolved MCP config (--explain: every candidate source)
+    tools     Show cached tool catalogs (--refresh: re-fetch from the servers)
+    schedule  Run scenarios from .sandy/schedule.json in one long-lived process
+    enqueue   Add a scenario job to the shared queue (.sandy/queue.db)
+    worker    Consume the job queue (run on as many hosts as needed)
+    jobs      Show job counts per status
+    stats     Per-step latency percentiles and failure rates from run history
+    optimize  Rewrite a scenario into a faster equivalent, with a report
+    blobs     Show or prune the result blob store (.sandy/blobs/)
+
+Examples:
+    # Find scenarios in .sandy/scenarios/
+    python sandy.py find "scrape hacker news"
+
+    # Search another directory, JSON output
+    python sandy.py find "supabase query" --dir assets/examples --json
+
+    # Which config file wins, and why
+    python sandy.py config --explain
+
+    # Re-fetch tool schemas used for preflight checks
+    python sandy.py tools supabase --refresh
+
+    # Show next run times, then run the schedule
+    python sandy.py schedule --list
+    python sandy.py schedule
+
+    # Queue jobs, then consume them from any host sharing the queue file
+    python sandy.py enqueue scrape.json --var URL=https://example.com --key scrape-2026-01-01
+    python sandy.py worker --queue /shared/sandy/queue.db
+
+    # Expose Prometheus metrics while running
+    python sandy.py worker --metrics-port 9464
+
+    # Step p50/p95/p99 and failure rates over the last week
+    python sandy.py stats scrape.json --days 7
+
+    # Report possible rewrites, then write the optimized scenario
+    python sandy.py optimize scrape.json
+    python sandy.py optimize scrape.json -o scrape.fast.json --var MODE=full
+
+    # Keep the blob store under 500 MB, dropping blobs unused for 30 days
+    python sandy.py blobs --max-size 500000000 --max-age 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Add scripts directory to path for imports
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+# Seconds a long-lived schedule/worker reuses the auto-detected config
+# before re-checking the candidate files for the next job
+CONFIG_MAX_AGE = 5.0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="sandy",
+        description="Sandy - scenario library and maintenance commands",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.required = True
+
+    # find
+    find_parser = subparsers.add_parser(
+        "find",
+        help="Search the scenario library",
+        description="Ranked search over scenario name, description, tool and variable names",
+    )
+    find_parser.add_argument("query", type=str, help="Free-text query")
+    find_parser.add_argument(
+        "--dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Scenario directory (default: .sandy/scenarios)",
+    )
+    find_parser.add_argument(
+        "--limit", "-n",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Maximum number of results (default: 10)",
+    )
+    find_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the index and re-read every scenario",
+    )
+    find_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    find_parser.set_defaults(handler=cmd_find)
+
+    # config
+    config_parser = subparsers.add_parser(
+        "config",
+        help="Show the resolved MCP config",
+        description="Show which MCP config source is used and its servers",
+    )
+    config_parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="List every candidate location in priority order",
+    )
+    config_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    config_parser.set_defaults(handler=cmd_config)
+
+    # tools
+    tools_parser = subparsers.add_parser(
+        "tools",
+        help="Show or refresh cached tool catalogs",
+        description="Tool schemas cached per server config, used by play.py preflight",
+    )
+    tools_parser.add_argument(
+        "servers",
+        nargs="*",
+        metavar="SERVER",
+        help="Servers to show (default: all configured servers)",
+    )
+    tools_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="MCP config file (default: auto-detect)",
+    )
+    tools_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Connect to the servers and re-fetch their tool schemas",
+    )
+    tools_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    tools_parser.set_defaults(handler=cmd_tools)
+
+    # schedule
+    schedule_parser = subparsers.add_parser(
+        "schedule",
+        help="Run scheduled scenarios",
+        description="Run cron-scheduled scenarios, reusing MCP clients across runs",
+    )
+    schedule_parser.add_argument(
+        "--file",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Schedule file (default: .sandy/schedule.json)",
+    )
+    schedule_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="MCP config file (default: auto-detect)",
+    )
+    schedule_parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Show jobs and their next run times, then exit",
+    )
+    schedule_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics",
+    )
+    schedule_parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Append spans of every play to FILE as OTLP JSON",
+    )
+    schedule_parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record runs in .sandy/history.db",
+    )
+    schedule_parser.set_defaults(handler=cmd_schedule)
+
+    # enqueue
+    enqueue_parser = subparsers.add_parser(
+        "enqueue",
+        help="Add a scenario job to the queue",
+        description="Add a scenario run to the shared job queue",
+    )
+    enqueue_parser.add_argument("scenario", type=str, help="Scenario JSON file")
+    enqueue_parser.add_argument(
+        "--var",
+        action="append",
+        dest="variables",
+        metavar="KEY=VALUE",
+        help="Set variable (repeatable)",
+    )
+    enqueue_parser.add_argument(
+        "--key",
+        type=str,
+        default=None,
+        metavar="KEY",
+        help="Idempotency key (an existing job with this key is returned instead)",
+    )
+    enqueue_parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Leases before the job fails (default: 3)",
+    )
+    enqueue_parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Queue database (default: .sandy/queue.db)",
+    )
+    enqueue_parser.set_defaults(handler=cmd_enqueue)
+
+    # worker
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="Consume the job queue",
+        description="Lease jobs from the queue and play them, reusing MCP clients",
+    )
+    worker_parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Queue database (default: .sandy/queue.db)",
+    )
+    worker_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="MCP config file (default: auto-detect)",
+    )
+    worker_parser.add_argument(
+        "--lease",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Lease duration, renewed by heartbeats (default: 60)",
+    )
+    worker_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Exit after N jobs",
+    )
+    worker_parser.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Exit when the queue is empty instead of polling",
+    )
+    worker_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics",
+    )
+    worker_parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Append spans of every play to FILE as OTLP JSON",
+    )
+    worker_parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record jobs in .sandy/history.db",
+    )
+    worker_parser.set_defaults(handler=cmd_worker)
+
+    # jobs
+    jobs_parser = subparsers.add_parser(
+        "jobs",
+        help="Show job counts per status",
+        description="Show queued, leased, done and failed job counts",
+    )
+    jobs_parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Queue database (default: .sandy/queue.db)",
+    )
+    jobs_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    jobs_parser.set_defaults(handler=cmd_jobs)
+
+    # stats
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="Show per-step latency and failure statistics",
+        description="Per-step p50/p95/p99 duration, failure rate, retries and "
+                    "payload size, plus a daily trend, from .sandy/history.db",
+    )
+    stats_parser.add_argument(
+        "scenario",
+        nargs="?",
+        default=None,
+        help="Scenario name or scenario file (omit to list recorded scenarios)",
+    )
+    stats_parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Only include runs from the last N days",
+    )
+    stats_parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="History database (default: .sandy/history.db)",
+    )
+    stats_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    # optimize
+    optimize_parser = subparsers.add_parser(
+        "optimize",
+        help="Rewrite a scenario into a faster equivalent",
+        description="Merge and drop fixed waits, remove unused reads, hoist static "
+                    "conditions and group script steps for --fuse-scripts",
+    )
+    optimize_parser.add_argument("scenario", type=str, help="Scenario JSON file")
+    optimize_parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write the optimized scenario to FILE (default: report only)",
+    )
+    optimize_parser.add_argument(
+        "--var",
+        action="append",
+        dest="variables",
+        metavar="KEY=VALUE",
+        help="Treat a variable as fixed when hoisting conditions (repeatable)",
+    )
+    optimize_parser.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        metavar="PASS",
+        help="Skip a pass: hoist_conditions, drop_unused, merge_waits, "
+             "readiness_probes, reorder (repeatable)",
+    )
+    optimize_parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    optimize_parser.set_defaults(handler=cmd_optimize)
+
+    # blobs
+    blobs_parser = subparsers.add_parser(
+        "blobs",
+        help="Show or prune the result blob store",
+        description="Show the size of .sandy/blobs/ and remove the least "
+                    "recently used blobs by total size or age",
+    )
+    blobs_parser.add_argument(
+        "--dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Blob directory (default: .sandy/blobs)",
+    )
+    blobs_parser.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Remove the oldest blobs until the store is at most BYTES",
+    )
+    blobs_parser.add_argument(
+        "--max-age",
+        type=float,
+        default=None,
+        metavar="DAYS",
+        help="Remove blobs not stored or reused in the last DAYS days",
+    )
+    blobs_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    blobs_parser.set_defaults(handler=cmd_blobs)
+
+    return parser.parse_args(argv)
+
+
+def cmd_find(args: argparse.Namespace) -> int:
+    """Search the scenario library"""
+    from library import ScenarioIndex, DEFAULT_SCENARIOS_DIR
+
+    index = ScenarioIndex(args.dir or DEFAULT_SCENARIOS_DIR)
+    if args.rebuild or not index.load():
+        index.rebuild()
+    else:
+        index.refresh()
+
+    matches = index.search(args.query, limit=args.limit)
+
+    if args.json:
+        print(json.dumps([asdict(m) for m in matches], indent=2, ensure_ascii=False))
+        return 0
+
+    if not matches:
+        print(f"No scenarios matching '{args.query}' in {index.root}")
+        return 1
+
+    for match in matches:
+        print(f"{match.score:8.2f}  {match.name}")
+        print(f"          {match.path}")
+        if match.description:
+            print(f"          {match.description}")
+    return 0
+
+
+def cmd_config(args: argparse.Namespace) -> int:
+    """Show the resolved config and, with --explain, every candidate"""
+    from config import explain_config
+
+    candidates = explain_config()
+    winner = next((c for c in candidates if c.selected), None)
+
+    if args.json:
+        data = [
+            {**asdict(c), "path": str(c.path) if c.path else None}
+            for c in (candidates if args.explain else [c for c in candidates if c.selected])
+        ]
+        print(json.dumps(data, indent=2))
+        return 0 if winner else 1
+
+    if args.explain:
+        for i, candidate in enumerate(candidates, 1):
+            if candidate.selected:
+                status = "USED"
+            elif candidate.error:
+                status = "ERROR"
+            elif candidate.exists:
+                status = "shadowed"
+            else:
+                status = "missing"
+            print(f"{i}. [{status:>8}] {candidate.label:<15} {candidate.path or '(n/a on this platform)'}")
+            if candidate.error:
+                print(f"              {candidate.error}")
+        print()
+
+    if winner is None:
+        print("No usable MCP config found", file=sys.stderr)
+        return 1
+
+    print(f"Config: {winner.path} ({winner.label})")
+    print(f"Servers: {', '.join(winner.servers) or '(none)'}")
+    return 0
+
+
+def cmd_tools(args: argparse.Namespace) -> int:
+    """Show cached tool catalogs, optionally refreshing them first"""
+    import asyncio
+    from catalog import ToolCatalog
+    from config import ConfigNotFoundError, detect_config, get_server_config, load_config_from_path
+
+    try:
+        config = load_config_from_path(args.config) if args.config else detect_config()
+    except (ConfigNotFoundError, FileNotFoundError) as e:
+        print(f"Config Error: {e}", file=sys.stderr)
+        return 1
+
+    names = args.servers or list(config.servers)
+    catalog = ToolCatalog()
+    exit_code = 0
+    report: dict[str, list[str] | None] = {}
+
+    for name in names:
+        try:
+            server_config = get_server_config(config, name)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        if args.refresh:
+            try:
+                asyncio.run(catalog.refresh(server_config))
+            except Exception as e:
+                print(f"Error: {name}: {e}", file=sys.stderr)
+                exit_code = 1
+
+        tools = catalog.get(server_config)
+        report[name] = sorted(tools) if tools is not None else None
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return exit_code
+
+    for name, tools in report.items():
+        if tools is None:
+            print(f"{name}: (not cached)")
+        else:
+            print(f"{name}: {len(tools)} tools")
+            for tool in tools:
+                print(f"    {tool}")
+    return exit_code
+
+
+def _configure_tracing(path: str | None) -> None:
+    """Export spans to an OTLP JSON file (joins $TRACEPARENT if set)"""
+    if path:
+        import os
+        from tracing import OTLPFileExporter, configure
+
+        configure(OTLPFileExporter(path), os.environ.get("TRACEPARENT"))
+
+
+async def _with_metrics(main, port: int | None):
+    """Run a coroutine, serving Prometheus metrics meanwhile if a port is given"""
+    server = None
+    if port is not None:
+        from metrics import start_metrics_server
+
+        server = await start_metrics_server(port)
+        print(f"Metrics: http://127.0.0.1:{port}/metrics", flush=True)
+    try:
+        return await main
+    finally:
+        if server is not None:
+            server.close()
+
+
+def cmd_schedule(args: argparse.Namespace) -> int:
+    """List or run the scenario schedule"""
+    import asyncio
+    import time
+    from datetime import datetime
+    from scheduler import Scheduler, ScheduleError, load_schedule
+
+    try:
+        jobs = load_schedule(args.file)
+    except (ScheduleError, FileNotFoundError) as e:
+        print(f"Schedule Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.list:
+        now = datetime.now()
+        for job in jobs:
+            try:
+                next_run = job.cron.next_after(now).strftime("%Y-%m-%d %H:%M") if job.enabled else "disabled"
+            except ScheduleError as e:
+                next_run = f"never ({e})"
+            print(f"{job.name:<24} {job.cron.expression:<18} {job.overlap:<9} next: {next_run}")
+            print(f"{'':<24} {job.scenario}")
+        return 0
+
+    from config import ConfigNotFoundError, detect_config_cached, load_config_from_path
+
+    try:
+        config = load_config_from_path(args.config) if args.config else detect_config_cached()
+    except (ConfigNotFoundError, FileNotFoundError) as e:
+        print(f"Config Error: {e}", file=sys.stderr)
+        return 1
+    config_loader = None if args.config else lambda: detect_config_cached(max_age=CONFIG_MAX_AGE)
+
+    def on_complete(job, result) -> None:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(result, Exception):
+            print(f"[{stamp}] {job.name}: ERROR {result}", flush=True)
+        else:
+            print(f"[{stamp}] {job.name}: {result.summary}", flush=True)
+
+    _configure_tracing(args.trace)
+    try:
+        scheduler = Scheduler(
+            jobs, config, on_complete=on_complete, record_history=not args.no_history, config_loader=config_loader
+        )
+    except ScheduleError as e:
+        print(f"Schedule Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Scheduler started: {len(scheduler.states)} job(s), config {config.source}", flush=True)
+    try:
+        asyncio.run(_with_metrics(scheduler.run(), args.metrics_port))
+    except KeyboardInterrupt:
+        print("\nScheduler stopped", file=sys.stderr)
+    return 0
+
+
+def cmd_enqueue(args: argparse.Namespace) -> int:
+    """Add a job to the queue"""
+    from jobqueue import SQLiteJobQueue
+
+    scenario_path = Path(args.scenario).resolve()
+    if not scenario_path.exists():
+        print(f"Error: Scenario file not found: {scenario_path}", file=sys.stderr)
+        return 1
+
+    variables: dict[str, str] = {}
+    for var in args.variables or []:
+        if "=" in var:
+            key, value = var.split("=", 1)
+            variables[key.strip()] = value.strip()
+
+    queue = SQLiteJobQueue(args.queue)
+    job = queue.enqueue(str(scenario_path), variables, args.key, args.max_attempts)
+    print(f"{job.id} {job.status}")
+    return 0
+
+
+def cmd_worker(args: argparse.Namespace) -> int:
+    """Consume the job queue"""
+    import asyncio
+    import time
+    from config import ConfigNotFoundError, detect_config_cached, load_config_from_path
+    from jobqueue import SQLiteJobQueue, Worker
+
+    try:
+        config = load_config_from_path(args.config) if args.config else detect_config_cached()
+    except (ConfigNotFoundError, FileNotFoundError) as e:
+        print(f"Config Error: {e}", file=sys.stderr)
+        return 1
+    config_loader = None if args.config else lambda: detect_config_cached(max_age=CONFIG_MAX_AGE)
+
+    def on_complete(job, summary) -> None:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        status = "PASSED" if summary.get("success") else f"FAILED: {summary.get('error')}"
+        if summary.get("lease_lost"):
+            status += " (lease lost, not recorded)"
+        print(f"[{stamp}] {job.id} {Path(job.scenario).name} (attempt {job.attempts}): {status}", flush=True)
+
+    _configure_tracing(args.trace)
+    queue = SQLiteJobQueue(args.queue)
+    worker = Worker(
+        queue,
+        config,
+        lease_seconds=args.lease,
+        on_complete=on_complete,
+        record_history=not args.no_history,
+        config_loader=config_loader,
+    )
+    print(f"Worker {worker.worker_id} consuming {queue.path}", flush=True)
+    try:
+        asyncio.run(_with_metrics(
+            worker.run(max_jobs=args.max_jobs, exit_when_empty=args.exit_when_empty), args.metrics_port
+        ))
+    except KeyboardInterrupt:
+        print("\nWorker stopped", file=sys.stderr)
+    finally:
+        queue.close()
+    return 0
+
+
+def cmd_jobs(args: argparse.Namespace) -> int:
+    """Show job counts per status"""
+    from jobqueue import SQLiteJobQueue
+
+    queue = SQLiteJobQueue(args.queue)
+    counts = queue.counts()
+    queue.close()
+
+    if args.json:
+        print(json.dumps(counts))
+    else:
+        print("  ".join(f"{status}: {n}" for status, n in counts.items()))
+    return 0
+
+
+def _scenario_name(arg: str) -> str:
+    """Scenario name for a stats argument: file path -> metadata.name"""
+    path = Path(arg)
+    if path.suffix == ".json" and path.is_file():
+        from scenario import ScenarioValidationError, load_scenario
+
+        try:
+            return load_scenario(path).metadata.name
+        except ScenarioValidationError:
+            pass
+    return arg
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Show per-step statistics from run history"""
+    import time
+    from history import RunHistory
+
+    db_path = Path(args.db) if args.db else None
+    if db_path and not db_path.exists():
+        print(f"Error: History database not found: {db_path}", file=sys.stderr)
+        return 1
+
+    history = RunHistory(db_path)
+    try:
+        if args.scenario is None:
+            scenarios = history.scenarios()
+            if args.json:
+                print(json.dumps({name: runs for name, runs in scenarios}))
+            elif not scenarios:
+                print("No runs recorded")
+            else:
+                for name, runs in scenarios:
+                    print(f"{runs:6d}  {name}")
+            return 0
+
+        name = _scenario_name(args.scenario)
+        since = time.time() - args.days * 86400 if args.days else None
+        steps = history.step_stats(name, since)
+        trend = history.trend(name, since)
+    finally:
+        history.close()
+
+    if args.json:
+        print(json.dumps({
+            "scenario": name,
+            "steps": [
+                {**asdict(s), "failure_rate": round(s.failure_rate, 4)} for s in steps
+            ],
+            "trend": [
+                {**asdict(t), "failure_rate": round(t.failure_rate, 4)} for t in trend
+            ],
+        }, indent=2))
+        return 0
+
+    if not trend:
+        print(f"No runs recorded for '{name}'")
+        return 1
+
+    print(f"{name}: {sum(t.runs for t in trend)} runs")
+    print()
+    print(f"{'STEP':>4}  {'TOOL':<40} {'RUNS':>5} {'FAIL%':>6} {'P50':>8} {'P95':>8} {'P99':>8} {'RETRY':>6} {'BYTES':>9}")
+    for s in steps:
+        size = f"{s.mean_bytes:9.0f}" if s.mean_bytes is not None else f"{'-':>9}"
+        print(
+            f"{s.step:>4}  {s.tool[:40]:<40} {s.runs:>5} {s.failure_rate * 100:>5.1f}% "
+            f"{s.p50:>7.2f}s {s.p95:>7.2f}s {s.p99:>7.2f}s {s.mean_retries:>6.2f} {size}"
+        )
+    print()
+    print(f"{'DAY':<10}  {'RUNS':>5} {'FAIL%':>6} {'P50':>8} {'P95':>8}")
+    for t in trend:
+        print(f"{t.day:<10}  {t.runs:>5} {t.failure_rate * 100:>5.1f}% {t.p50:>7.2f}s {t.p95:>7.2f}s")
+    return 0
+
+
+def cmd_optimize(args: argparse.Namespace) -> int:
+    """Rewrite a scenario and report the changes"""
+    from optimizer import PASSES, optimize_scenario
+    from scenario import ScenarioValidationError
+
+    scenario_path = Path(args.scenario)
+    if not scenario_path.exists():
+        print(f"Error: Scenario file not found: {scenario_path}", file=sys.stderr)
+        return 1
+
+    variables: dict[str, str] = {}
+    for var in args.variables or []:
+        if "=" in var:
+            key, value = var.split("=", 1)
+            variables[key.strip()] = value.strip()
+
+    try:
+        data = json.loads(scenario_path.read_text(encoding="utf-8"))
+        optimized, report = optimize_scenario(
+            data, variables, [p for p in PASSES if p not in args.skip]
+        )
+    except (json.JSONDecodeError, ScenarioValidationError) as e:
+        print(f"Error: Invalid scenario: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(optimized, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    if args.json:
+        print(json.dumps({
+            **asdict(report),
+            "saved_wait": report.saved_wait,
+            "output": args.output,
+        }, indent=2))
+        return 0
+
+    for rewrite in report.rewrites:
+        steps = ", ".join(str(n) for n in rewrite.steps)
+        saved = f" (-{rewrite.saved:g}s)" if rewrite.saved else ""
+        print(f"  {rewrite.pass_name:<17} step {steps}: {rewrite.message}{saved}")
+    for hint in report.hints:
+        print(f"  {'hint':<17} {hint}")
+    if report.rewrites or report.hints:
+        print()
+    print(report.summary)
+    if args.output:
+        print(f"Wrote {args.output}")
+    elif report.rewrites:
+        print("Use -o FILE to write the optimized scenario")
+    return 0
+
+
+def cmd_blobs(args: argparse.Namespace) -> int:
+    """Show or prune the blob store"""
+    from blobs import BlobStore
+
+    store = BlobStore(args.dir)
+    removed = freed = 0
+    if args.max_size is not None or args.max_age is not None:
+        max_age = args.max_age * 86400 if args.max_age is not None else None
+        removed, freed = store.prune(args.max_size, max_age)
+    count, total = store.usage()
+
+    if args.json:
+        print(json.dumps({
+            "path": str(store.root),
+            "blobs": count,
+            "bytes": total,
+            "removed": removed,
+            "freed": freed,
+        }))
+        return 0
+
+    if removed:
+        print(f"Removed {removed} blobs ({freed} bytes)")
+    print(f"{store.root}: {count} blobs, {total} bytes")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point"""
+    args = parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,13 +27,27 @@ __all__ = [
     # Functions
     "load_scenario",
     "parse_scenario",
+    "parse_scenario_bytes",
     "get_required_variables",
     "parse_tool_name",
     # Constants
     "VAR_PATTERN",
+    "PARSER_VERSION",
+    "OUTPUT_MODES",
 ]
 
 
+# Bump whenever parsing/validation output changes (invalidates scenario caches)
+PARSER_VERSION = 2
+
+# Output extraction modes for {"path": ..., "mode": ...} output specs
+# - first: First match (default, same as a plain JSONPath string)
+# - all: List of every match
+# - count: Number of matches
+# - column: One value per row of the [*] list (None where missing)
+OUTPUT_MODES = ("first", "all", "count", "column")
+
+
 # Pre-compiled regex pattern for variable detection
 # Matches {{VAR}} and {{step_id.field}} patterns
 VAR_PATTERN = re.compile(r"\{\{([^}]+)\}\}")
@@ -55,7 +69,7 @@ class Step:
     tool: str
     params: dict[str, Any]
     id: str | None = None
-    output: dict[str, str] | None = None
+    output: dict[str, str | dict[str, str]] | None = None  # name -> JSONPath or {path, mode}
     description: str | None = None
     wait_after: float | None = None  # Delay in seconds after step completion
     on_error: str | None = None  # "stop", "skip", "retry"
@@ -96,10 +110,25 @@ def load_scenario(file_path: str | Path) -> Scenario:
     if not path.exists():
         raise FileNotFoundError(f"Scenario file not found: {path}")
 
+    return parse_scenario_bytes(path.read_bytes())
+
+
+def parse_scenario_bytes(content: bytes) -> Scenario:
+    """
+    Decode, validate and parse raw scenario file content
+
+    Args:
+        content: UTF-8 encoded scenario JSON
+
+    Returns:
+        Parsed Scenario object
+
+    Raises:
+        ScenarioValidationError: If content is not valid JSON or scenario is invalid
+    """
     try:
-        content = path.read_text(encoding="utf-8")
-        data = json.loads(content)
-    except json.JSONDecodeError as e:
+        data = json.loads(content.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         raise ScenarioValidationError(f"Invalid JSON in scenario file: {e}")
 
     return parse_scenario(data)
@@ -273,6 +302,8 @@ def validate_step(step: dict[str, Any], index: int, step_ids: set[str]) -> None:
             )
         if not isinstance(step["output"], dict):
             raise ScenarioValidationError(f"Step {step_num}: 'output' must be an object")
+        for name, spec in step["output"].items():
+            validate_output_spec(spec, f"Step {step_num}: output '{name}'")
 
     # on_error validation
     if "on_error" in step:
@@ -289,6 +320,40 @@ def validate_step(step: dict[str, Any], index: int, step_ids: set[str]) -> None:
             raise ScenarioValidationError(f"Step {step_num}: 'retry' must be an object")
 
 
+def validate_output_spec(spec: Any, label: str) -> None:
+    """
+    Validate a single output spec
+
+    Accepts a JSONPath string, or {"path": "...", "mode": "first|all|count|column"}.
+    Column mode requires a path with a [*] wildcard.
+    """
+    if isinstance(spec, str):
+        return
+
+    if not isinstance(spec, dict):
+        raise ScenarioValidationError(f"{label} must be a JSONPath string or an object")
+
+    path = spec.get("path")
+    if not isinstance(path, str) or not path:
+        raise ScenarioValidationError(f"{label} missing 'path'")
+
+    mode = spec.get("mode", "first")
+    if mode not in OUTPUT_MODES:
+        raise ScenarioValidationError(f"{label} 'mode' must be one of {set(OUTPUT_MODES)}")
+
+    if mode == "column":
+        try:
+            from .jsonpath_fast import compile_path
+        except ImportError:
+            from jsonpath_fast import compile_path
+
+        compiled = compile_path(path)
+        if compiled is None or compiled.split_at_wildcard() is None:
+            raise ScenarioValidationError(
+                f"{label} column mode requires a simple path with [*] (e.g. $.items[*].title)"
+            )
+
+
 def get_required_variables(scenario: Scenario) -> list[str]:
     """
     Get list of variables that need to be provided
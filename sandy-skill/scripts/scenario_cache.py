@@ -0,0 +1,232 @@
+"""
+Sandy Parsed-Scenario Cache
+
+Stores validated, parsed scenarios under .sandy/cache/scenarios/ as JSON,
+so repeated loads skip validation and v1.1 conversion. Entries are plain
+data (never pickle), since the project directory may be writable by others.
+
+Cache entries are keyed by resolved path and validated against:
+- Cache format and parser version (scenario.PARSER_VERSION)
+- File size and mtime
+- SHA-256 of the file content
+
+The mtime shortcut is only trusted when the file was last modified well
+before the entry was written; otherwise the content hash decides.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+
+__all__ = [
+    # Classes
+    "ScenarioCache",
+    # Functions
+    "load_scenario_cached",
+    "default_cache_dir",
+    # Constants
+    "CACHE_FORMAT_VERSION",
+]
+
+
+try:
+    from .scenario import Scenario, ScenarioMetadata, Step, PARSER_VERSION, parse_scenario_bytes
+except ImportError:
+    from scenario import Scenario, ScenarioMetadata, Step, PARSER_VERSION, parse_scenario_bytes
+
+
+# Bump when the cache entry layout changes
+CACHE_FORMAT_VERSION = 2
+
+# Files modified this close to the cache write time are re-hashed on read,
+# since coarse filesystem timestamps can hide a same-second rewrite.
+_MTIME_TRUST_WINDOW_NS = 2_000_000_000
+
+
+def default_cache_dir() -> Path:
+    """Get the default cache directory (project-local)"""
+    return Path.cwd() / ".sandy" / "cache" / "scenarios"
+
+
+def _version_stamp() -> str:
+    """Version stamp that invalidates entries across cache/parser changes"""
+    return f"{CACHE_FORMAT_VERSION}:{PARSER_VERSION}"
+
+
+def _scenario_from_dict(data: dict[str, Any]) -> Scenario:
+    """Rebuild a parsed Scenario from its cached asdict() form"""
+    return Scenario(
+        version=data["version"],
+        metadata=ScenarioMetadata(**data["metadata"]),
+        steps=[Step(**step) for step in data["steps"]],
+        variables=data["variables"],
+    )
+
+
+@dataclass
+class _CacheEntry:
+    """On-disk cache entry"""
+    stamp: str
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    written_ns: int
+    scenario: Scenario
+
+
+class ScenarioCache:
+    """
+    Content-addressed cache of parsed scenarios
+
+    Usage:
+        cache = ScenarioCache()
+        scenario = cache.load("scenario.json")
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, scenario_path: Path) -> Path:
+        """Get the cache file location for a scenario path"""
+        digest = hashlib.sha256(str(scenario_path).encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, file_path: str | Path) -> Scenario:
+        """
+        Load a scenario, using the cache when the file is unchanged
+
+        Args:
+            file_path: Path to the scenario JSON file
+
+        Returns:
+            Parsed Scenario object
+
+        Raises:
+            ScenarioValidationError: If scenario is invalid
+            FileNotFoundError: If file doesn't exist
+        """
+        path = Path(file_path).resolve()
+
+        if not path.exists():
+            raise FileNotFoundError(f"Scenario file not found: {path}")
+
+        st = path.stat()
+        entry_path = self.entry_path(path)
+        entry = self._read_entry(entry_path, path)
+
+        # Fast path: unchanged size/mtime, and the file predates the entry
+        if (
+            entry is not None
+            and entry.mtime_ns == st.st_mtime_ns
+            and entry.size == st.st_size
+            and entry.written_ns - st.st_mtime_ns > _MTIME_TRUST_WINDOW_NS
+        ):
+            self.hits += 1
+            return entry.scenario
+
+        content = path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        if entry is not None and entry.sha256 == sha256:
+            # Content unchanged (e.g. touched); refresh stored mtime
+            self.hits += 1
+            self._write_entry(entry_path, path, st, sha256, entry.scenario)
+            return entry.scenario
+
+        self.misses += 1
+        scenario = parse_scenario_bytes(content)
+        self._write_entry(entry_path, path, st, sha256, scenario)
+        return scenario
+
+    def invalidate(self, file_path: str | Path) -> None:
+        """Remove the cache entry for a scenario file"""
+        entry_path = self.entry_path(Path(file_path).resolve())
+        entry_path.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """
+        Remove all cache entries
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        if self.cache_dir.is_dir():
+            for entry_path in self.cache_dir.glob("*.json"):
+                entry_path.unlink(missing_ok=True)
+                removed += 1
+            # Entries of the pickle-based format 1
+            for entry_path in self.cache_dir.glob("*.pickle"):
+                entry_path.unlink(missing_ok=True)
+        return removed
+
+    def _read_entry(self, entry_path: Path, scenario_path: Path) -> _CacheEntry | None:
+        """Read and validate a cache entry; drop it if unusable"""
+        try:
+            with open(entry_path, "rb") as f:
+                data = json.loads(f.read())
+            if data.get("stamp") != _version_stamp() or data.get("path") != str(scenario_path):
+                raise ValueError("stale entry")
+            data["scenario"] = _scenario_from_dict(data["scenario"])
+            return _CacheEntry(**data)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt, stale or written by an incompatible version
+            entry_path.unlink(missing_ok=True)
+            return None
+
+    def _write_entry(
+        self,
+        entry_path: Path,
+        scenario_path: Path,
+        st: os.stat_result,
+        sha256: str,
+        scenario: Scenario,
+    ) -> None:
+        """Write a cache entry atomically; cache failures never fail the load"""
+        entry = _CacheEntry(
+            stamp=_version_stamp(),
+            path=str(scenario_path),
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            sha256=sha256,
+            written_ns=time.time_ns(),
+            scenario=scenario,
+        )
+        tmp_path = entry_path.with_suffix(f".tmp{os.getpid()}")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except (OSError, TypeError, ValueError):
+            # TypeError/ValueError: params that don't round-trip through JSON
+            tmp_path.unlink(missing_ok=True)
+
+
+def load_scenario_cached(
+    file_path: str | Path,
+    cache_dir: str | Path | None = None,
+) -> Scenario:
+    """
+    Convenience function: load a scenario through the on-disk cache
+
+    Args:
+        file_path: Path to the scenario JSON file
+        cache_dir: Cache directory (default: .sandy/cache/scenarios)
+
+    Returns:
+        Parsed Scenario object
+    """
+    return ScenarioCache(cache_dir).load(file_path)
@@ -0,0 +1,436 @@
+"""
+Sandy Scheduler
+
+Runs scenarios on cron schedules in one long-lived process, so recurring
+runs reuse connected MCP clients instead of paying process and server cold
+start on every tick.
+
+Schedule file (.sandy/schedule.json):
+    {
+      "jobs": [
+        {
+          "name": "hn-scrape",
+          "scenario": ".sandy/scenarios/hn.json",
+          "cron": "*/15 * * * *",
+          "variables": {"LIMIT": "30"},
+          "overlap": "skip",
+          "jitter": 30
+        }
+      ]
+    }
+
+Cron syntax: minute hour day-of-month month day-of-week, with *, lists
+(1,15), ranges (1-5), steps (*/10, 0-30/5) and @hourly/@daily/@weekly/
+@monthly/@yearly. Day-of-week 0 and 7 are Sunday. As in cron, when both
+day fields are restricted a day matches if either does.
+
+Overlap policies (when a job fires while its previous run is active):
+- skip: drop the tick (default)
+- queue: run again once the active run finishes (ticks coalesce)
+- parallel: start another run alongside
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal
+
+
+__all__ = [
+    # Data classes
+    "ScheduledJob",
+    # Classes
+    "CronExpression",
+    "Scheduler",
+    # Exceptions
+    "ScheduleError",
+    # Functions
+    "load_schedule",
+    "default_schedule_path",
+    # Constants
+    "OVERLAP_POLICIES",
+]
+
+
+if TYPE_CHECKING:
+    try:
+        from .config import Config
+        from .player import PlayResult
+    except ImportError:
+        from config import Config
+        from player import PlayResult
+
+
+OVERLAP_POLICIES = ("skip", "queue", "parallel")
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# (name, min, max) for each cron field
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+# How far ahead next_after() searches before giving up (e.g. "0 0 30 2 *")
+_MAX_SEARCH_DAYS = 366 * 5
+
+
+class ScheduleError(ValueError):
+    """Raised when a schedule file or cron expression is invalid"""
+    pass
+
+
+def default_schedule_path() -> Path:
+    """Get the default schedule file (project-local)"""
+    return Path.cwd() / ".sandy" / "schedule.json"
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ScheduleError(f"Invalid step in {name} field: {text!r}")
+            step = int(step_text)
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            if not (start_text.isdigit() and end_text.isdigit()):
+                raise ScheduleError(f"Invalid range in {name} field: {text!r}")
+            start, end = int(start_text), int(end_text)
+        elif part.isdigit():
+            start = int(part)
+            # "5/15" means 5, 20, 35, ...
+            end = high if step > 1 else start
+        else:
+            raise ScheduleError(f"Invalid {name} field: {text!r}")
+
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ScheduleError(f"{name} out of range {low}-{high}: {text!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """
+    Parsed 5-field cron expression
+
+    Usage:
+        cron = CronExpression("*/15 9-17 * * 1-5")
+        fire_at = cron.next_after(datetime.now())
+    """
+
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays",
+                 "_any_day", "_any_weekday")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        text = _ALIASES.get(expression.strip().lower(), expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ScheduleError(f"Cron expression needs 5 fields: {expression!r}")
+
+        parsed = [_parse_field(part, *spec) for part, spec in zip(parts, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 is Sunday too; datetime.weekday() is Monday=0, cron is Sunday=0
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        Get the first matching minute strictly after a time
+
+        Raises:
+            ScheduleError: If the expression never matches
+        """
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        hours = sorted(self.hours)
+        minutes = sorted(self.minutes)
+
+        for _ in range(_MAX_SEARCH_DAYS):
+            if self._day_matches(day):
+                for hour in hours:
+                    if day.date() == start.date() and hour < start.hour:
+                        continue
+                    for minute in minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+
+        raise ScheduleError(f"Cron expression never matches: {self.expression!r}")
+
+
+@dataclass
+class ScheduledJob:
+    """A scenario registered with a cron schedule"""
+    name: str
+    scenario: str
+    cron: CronExpression
+    variables: dict[str, str] = field(default_factory=dict)
+    overlap: Literal["skip", "queue", "parallel"] = "skip"
+    jitter: float = 0.0  # Seconds of random delay added to each fire time
+    enabled: bool = True
+
+
+def load_schedule(path: str | Path | None = None) -> list[ScheduledJob]:
+    """
+    Load jobs from a schedule file
+
+    Args:
+        path: Schedule file (default: .sandy/schedule.json)
+
+    Returns:
+        List of jobs (disabled jobs included)
+
+    Raises:
+        ScheduleError: If the file is invalid
+        FileNotFoundError: If the file doesn't exist
+    """
+    path = Path(path) if path else default_schedule_path()
+    if not path.exists():
+        raise FileNotFoundError(f"Schedule file not found: {path}")
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ScheduleError(f"Invalid JSON in {path}: {e}") from e
+
+    jobs: list[ScheduledJob] = []
+    names: set[str] = set()
+    for i, raw in enumerate(data.get("jobs", []) if isinstance(data, dict) else []):
+        label = raw.get("name") or f"jobs[{i}]"
+        for key in ("name", "scenario", "cron"):
+            if not raw.get(key):
+                raise ScheduleError(f"{label}: missing '{key}'")
+        if raw["name"] in names:
+            raise ScheduleError(f"{label}: duplicate job name")
+        names.add(raw["name"])
+
+        overlap = raw.get("overlap", "skip")
+        if overlap not in OVERLAP_POLICIES:
+            raise ScheduleError(f"{label}: overlap must be one of {', '.join(OVERLAP_POLICIES)}")
+
+        scenario_path = Path(raw["scenario"])
+        if not scenario_path.is_absolute():
+            # Relative to the project root (.sandy/..)
+            base = path.parent.parent if path.parent.name == ".sandy" else path.parent
+            scenario_path = base / scenario_path
+
+        jobs.append(ScheduledJob(
+            name=raw["name"],
+            scenario=str(scenario_path),
+            cron=CronExpression(raw["cron"]),
+            variables={k: str(v) for k, v in raw.get("variables", {}).items()},
+            overlap=overlap,
+            jitter=float(raw.get("jitter", 0)),
+            enabled=raw.get("enabled", True),
+        ))
+    return jobs
+
+
+@dataclass
+class _JobState:
+    """Runtime state of a job"""
+    job: ScheduledJob
+    next_fire: datetime
+    running: int = 0
+    queued: bool = False
+    runs: int = 0
+    skipped: int = 0
+
+
+class Scheduler:
+    """
+    Long-lived cron scheduler sharing MCP clients across runs
+
+    When config_loader is given it is called before every play, so config
+    edits apply to the next run (clients already connected are kept).
+
+    Usage:
+        scheduler = Scheduler(load_schedule(), config)
+        await scheduler.run()
+    """
+
+    def __init__(
+        self,
+        jobs: list[ScheduledJob],
+        config: Config | None = None,
+        runner: Callable[[ScheduledJob], Awaitable[Any]] | None = None,
+        on_complete: Callable[[ScheduledJob, Any], None] | None = None,
+        now: Callable[[], datetime] = datetime.now,
+        sleep: Callable[[float], Awaitable[None]] | None = None,
+        rng: random.Random | None = None,
+        record_history: bool = False,
+        config_loader: Callable[[], Config] | None = None,
+    ):
+        self.config = config
+        self.on_complete = on_complete
+        self.record_history = record_history
+        self.config_loader = config_loader
+        self._runner = runner or self._play_job
+        self._now = now
+        self._sleep = sleep or self._wait_or_stop
+        self._rng = rng or random.Random()
+        self._clients: dict[str, Any] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stop = asyncio.Event()
+
+        start = self._now()
+        self.states = {
+            job.name: _JobState(job=job, next_fire=self._schedule(job, start))
+            for job in jobs
+            if job.enabled
+        }
+
+    def _schedule(self, job: ScheduledJob, after: datetime) -> datetime:
+        fire = job.cron.next_after(after)
+        if job.jitter > 0:
+            fire += timedelta(seconds=self._rng.uniform(0, job.jitter))
+        return fire
+
+    def stop(self) -> None:
+        """Ask run() to return after the current wait"""
+        self._stop.set()
+
+    async def run(self, max_ticks: int | None = None) -> None:
+        """
+        Fire jobs until stop() is called (or max_ticks fire times pass)
+
+        Active runs are awaited and shared clients closed before returning.
+        """
+        ticks = 0
+        try:
+            while self.states and not self._stop.is_set():
+                if max_ticks is not None and ticks >= max_ticks:
+                    break
+
+                state = min(self.states.values(), key=lambda s: s.next_fire)
+                delay = (state.next_fire - self._now()).total_seconds()
+                if delay > 0:
+                    await self._sleep(delay)
+                    continue
+
+                fired_at = state.next_fire
+                state.next_fire = self._schedule(state.job, max(fired_at, self._now()))
+                self._fire(state)
+                ticks += 1
+                # Let started runs begin before the next wait
+                await asyncio.sleep(0)
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self._close_clients()
+
+    async def _wait_or_stop(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _fire(self, state: _JobState) -> None:
+        """Start a run, applying the job's overlap policy"""
+        if state.running and state.job.overlap == "skip":
+            state.skipped += 1
+            return
+        if state.running and state.job.overlap == "queue":
+            state.queued = True
+            return
+        self._start(state)
+
+    def _start(self, state: _JobState) -> None:
+        state.running += 1
+        task = asyncio.create_task(self._run_job(state))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, state: _JobState) -> None:
+        try:
+            result: Any = await self._runner(state.job)
+        except Exception as e:
+            result = e
+        finally:
+            state.running -= 1
+            state.runs += 1
+
+        if self.on_complete:
+            self.on_complete(state.job, result)
+
+        if state.queued and not state.running:
+            state.queued = False
+            self._start(state)
+
+    async def _play_job(self, job: ScheduledJob) -> PlayResult:
+        """Default runner: play the scenario with shared clients"""
+        try:
+            from .player import PlayerOptions, play_scenario
+            from .scenario_cache import load_scenario_cached
+        except ImportError:
+            from player import PlayerOptions, play_scenario
+            from scenario_cache import load_scenario_cached
+
+        config = self.config_loader() if self.config_loader else self.config
+        if config is None:
+            raise ScheduleError("Scheduler needs a config to play scenarios")
+
+        scenario = load_scenario_cached(job.scenario)
+        options = PlayerOptions(variables=dict(job.variables))
+        result = await play_scenario(scenario, config, options, clients=self._clients)
+        if self.record_history:
+            import sqlite3
+            try:
+                from .history import record_run
+            except ImportError:
+                from history import record_run
+            try:
+                await asyncio.to_thread(record_run, result, job.scenario)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Could not record run history: {e}", file=sys.stderr)
+        return result
+
+    async def _close_clients(self) -> None:
+        for client in self._clients.values():
+            try:
+                await client.disconnect()
+            except Exception:
+                pass  # Ignore errors during cleanup
+        self._clients.clear()
@@ -0,0 +1,182 @@
+"""
+Sandy SQLite Sink
+
+Batched row inserts for sandy__sqlite. One connection per database file is
+kept open for the whole play (WAL journal, synchronous=NORMAL), and each
+batch is a single executemany in one transaction.
+
+- The table is created from the first batch: one column per row key, typed
+  from the first non-null value (INTEGER, REAL or TEXT)
+- Keys first seen in later batches are added as columns
+- With upsert keys, rows with the same key values are updated in place
+  (a unique index on the keys is created if missing). Only the columns a
+  row has are updated: a column missing from the row keeps its stored value
+- Nested values (dicts, lists) are stored as JSON text
+
+insert() blocks on disk I/O (and on other writers, up to 30s); async
+callers run it in a thread. The connection may be used from any thread.
+
+Usage:
+    sink = SQLiteSink("data/products.db")
+    sink.insert("products", rows, keys=["sku"])
+    sink.close()
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+
+__all__ = [
+    # Classes
+    "SQLiteSink",
+]
+
+
+def _quote(name: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_type(value: Any) -> str:
+    if isinstance(value, (bool, int)):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    return str(value)
+
+
+class SQLiteSink:
+    """
+    Open SQLite database for batched inserts
+
+    Args:
+        path: Database file (parent directories are created)
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._columns: dict[str, list[str]] = {}  # Known columns per table
+        self._unique: set[tuple[str, tuple[str, ...]]] = set()  # (table, keys) indexed
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def insert(
+        self,
+        table: str,
+        rows: list[dict[str, Any]] | dict[str, Any],
+        keys: list[str] | str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Insert (or upsert) a batch of rows
+
+        Args:
+            table: Table name (created from the first batch if missing)
+            rows: Row dicts (a single dict is one row)
+            keys: Upsert key column(s) (default: plain insert)
+
+        Returns:
+            {"path", "table", "rows"}
+
+        Raises:
+            ValueError: If a row is not a dict or a key column is missing
+        """
+        if isinstance(rows, dict):
+            rows = [rows]
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("'data' must be an object or an array of objects")
+        keys = [keys] if isinstance(keys, str) else list(keys or [])
+
+        if rows:
+            columns: dict[str, Any] = {}
+            for row in rows:
+                for name, value in row.items():
+                    if columns.get(name) is None:
+                        columns[name] = value
+            missing = [k for k in keys if k not in columns]
+            if missing:
+                raise ValueError(f"Upsert keys not in data: {', '.join(missing)}")
+
+            # Upserts must not write NULL over columns a row doesn't have, so
+            # consecutive rows with the same columns share one statement
+            if keys:
+                batches = [(list(names), list(group)) for names, group in groupby(rows, key=tuple)]
+            else:
+                batches = [(list(columns), rows)]
+
+            with self._lock, self._conn:
+                self._ensure_table(table, columns)
+                if keys:
+                    self._ensure_unique(table, keys)
+                for names, batch in batches:
+                    self._conn.executemany(
+                        self._insert_sql(table, names, keys),
+                        ([_sql_value(row.get(name)) for name in names] for row in batch),
+                    )
+
+        return {"path": str(self.path), "table": table, "rows": len(rows)}
+
+    def _ensure_table(self, table: str, columns: dict[str, Any]) -> None:
+        """Create the table or add new columns"""
+        known = self._columns.get(table)
+        if known is None:
+            known = [row[1] for row in self._conn.execute(f"PRAGMA table_info({_quote(table)})")]
+            if not known:
+                definition = ", ".join(f"{_quote(n)} {_column_type(v)}" for n, v in columns.items())
+                self._conn.execute(f"CREATE TABLE {_quote(table)} ({definition})")
+                known = list(columns)
+            self._columns[table] = known
+
+        for name, value in columns.items():
+            if name not in known:
+                self._conn.execute(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {_column_type(value)}"
+                )
+                known.append(name)
+
+    def _ensure_unique(self, table: str, keys: list[str]) -> None:
+        """Create the unique index ON CONFLICT needs for the keys"""
+        if (table, tuple(keys)) in self._unique:
+            return
+        index = _quote(f"{table}__{'_'.join(keys)}__key")
+        self._conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {_quote(table)} "
+            f"({', '.join(_quote(k) for k in keys)})"
+        )
+        self._unique.add((table, tuple(keys)))
+
+    def _insert_sql(self, table: str, names: list[str], keys: list[str]) -> str:
+        sql = (
+            f"INSERT INTO {_quote(table)} ({', '.join(_quote(n) for n in names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})"
+        )
+        if keys:
+            updates = [n for n in names if n not in keys]
+            conflict = ", ".join(_quote(k) for k in keys)
+            if updates:
+                assignments = ", ".join(f"{_quote(n)} = excluded.{_quote(n)}" for n in updates)
+                sql += f" ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+            else:
+                sql += f" ON CONFLICT ({conflict}) DO NOTHING"
+        return sql
@@ -0,0 +1,280 @@
+"""
+Sandy Tracing
+
+Spans for play -> step -> retry attempt -> MCP call, exported as OTLP/JSON
+(one ExportTraceServiceRequest document per line, as written by the
+OpenTelemetry collector's file exporter) or kept in memory.
+
+Tracing is off until configure() installs a tracer; span() is then a no-op.
+The current span lives in a context variable, so concurrent plays on one
+event loop get separate parents. An outer orchestrator can pass a W3C
+traceparent ("00-<trace id>-<span id>-01") so Sandy's spans join its trace.
+
+Usage:
+    configure(OTLPFileExporter("trace.jsonl"), traceparent=os.environ.get("TRACEPARENT"))
+    with span("play", scenario="HN Scrape") as s:
+        ...
+        if s:
+            s.set_attributes(success=True)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+
+__all__ = [
+    # Data classes
+    "Span",
+    # Classes
+    "Tracer",
+    "InMemoryCollector",
+    "OTLPFileExporter",
+    # Functions
+    "configure",
+    "get_tracer",
+    "span",
+    "current_traceparent",
+    "parse_traceparent",
+    "otlp_document",
+]
+
+
+_TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP enum values
+_KINDS = {"internal": 1, "server": 2, "client": 3}
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """
+    Parse a W3C traceparent header
+
+    Returns:
+        (trace_id, parent_span_id), or None if missing or malformed
+    """
+    if not value:
+        return None
+    match = _TRACEPARENT_PATTERN.match(value.strip().lower())
+    if not match or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # OTLP/JSON encodes int64 as string
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None = None
+    kind: str = "internal"
+    start_ns: int = 0
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    root_id: str = ""  # Outermost local span (export unit)
+
+    @property
+    def duration(self) -> float:
+        """Seconds (0 while open)"""
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns else 0.0
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent for propagating this span as a parent"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def to_otlp(self) -> dict[str, Any]:
+        status: dict[str, Any] = {"code": _STATUS_ERROR if self.error else _STATUS_OK}
+        if self.error:
+            status["message"] = self.error
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": _KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": _attribute_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": status,
+        }
+
+
+def otlp_document(spans: list[Span], service_name: str = "sandy") -> dict[str, Any]:
+    """Wrap spans in an OTLP ExportTraceServiceRequest"""
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}],
+            },
+            "scopeSpans": [{
+                "scope": {"name": "sandy"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }],
+    }
+
+
+class InMemoryCollector:
+    """Keeps finished spans in memory (tests, embedding)"""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    def find(self, name: str) -> list[Span]:
+        return [s for s in self.spans if s.name == name]
+
+
+class OTLPFileExporter:
+    """Appends one OTLP/JSON document per finished local trace to a file"""
+
+    def __init__(self, path: str | Path, service_name: str = "sandy"):
+        self.path = Path(path)
+        self.service_name = service_name
+
+    def export(self, spans: list[Span]) -> None:
+        line = json.dumps(otlp_document(spans, self.service_name), default=str)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass  # Tracing must never fail a run
+
+
+_current_span: ContextVar[Span | None] = ContextVar("sandy_current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans and hands each finished local trace to an exporter
+
+    Spans are buffered per outermost local span and exported together when
+    it ends (e.g. one document per play).
+    """
+
+    def __init__(self, exporter: Any, traceparent: str | None = None):
+        self.exporter = exporter
+        self.remote_parent = parse_traceparent(traceparent)
+        self._pending: dict[str, list[Span]] = {}
+
+    def start_span(self, name: str, kind: str = "internal", **attributes: Any) -> Span:
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id, root_id = parent.trace_id, parent.span_id, parent.root_id
+        elif self.remote_parent is not None:
+            trace_id, parent_id = self.remote_parent
+            root_id = ""
+        else:
+            trace_id, parent_id, root_id = os.urandom(16).hex(), None, ""
+
+        new_span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent_id,
+            kind=kind,
+            start_ns=time.time_ns(),
+        )
+        new_span.root_id = root_id or new_span.span_id
+        new_span.set_attributes(**attributes)
+        return new_span
+
+    def end_span(self, finished: Span) -> None:
+        finished.end_ns = time.time_ns()
+        self._pending.setdefault(finished.root_id, []).append(finished)
+        if finished.root_id == finished.span_id:
+            spans = self._pending.pop(finished.root_id)
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                pass  # Tracing must never fail a run
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span]:
+        current = self.start_span(name, kind, **attributes)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = current.error or (str(e) or type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(current)
+
+
+_tracer: Tracer | None = None
+
+
+def configure(exporter: Any | None, traceparent: str | None = None) -> Tracer | None:
+    """
+    Install the process-wide tracer (None disables tracing)
+
+    Args:
+        exporter: Object with export(spans) (OTLPFileExporter, InMemoryCollector)
+        traceparent: W3C traceparent of an outer orchestrator's span
+
+    Returns:
+        The installed tracer
+    """
+    global _tracer
+    _tracer = Tracer(exporter, traceparent) if exporter is not None else None
+    return _tracer
+
+
+def get_tracer() -> Tracer | None:
+    """Get the process-wide tracer (None when tracing is off)"""
+    return _tracer
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span | None]:
+    """Span on the process-wide tracer; yields None when tracing is off"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.span(name, kind, **attributes) as current:
+        yield current
+
+
+def current_traceparent() -> str | None:
+    """traceparent of the current span, for propagating to other processes"""
+    current = _current_span.get()
+    if current is not None:
+        return current.traceparent
+    if _tracer is not None and _tracer.remote_parent is not None:
+        trace_id, span_id = _tracer.remote_parent
+        return f"00-{trace_id}-{span_id}-01"
+    return None
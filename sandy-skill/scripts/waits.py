@@ -0,0 +1,207 @@
+"""
+Sandy Wait Tuning
+
+Learns how much of each fixed `wait_after` a scenario actually needs
+(opt-in: play.py --tune-waits).
+
+Only waits followed by a readiness probe are tuned (see TUNABLE_TOOLS): a
+probe has no side effects, so it can safely be attempted early, and its
+success means the page is ready. Reads (page text, snapshots, file reads)
+succeed on a page that isn't ready yet, returning partial data, so waits
+before them are never shortened. While tuning, a step's wait is shortened and the following
+step is polled every player.POLL_INTERVAL (once per poll, without its retry policy)
+until it succeeds or the configured wait has passed; the attempt at the
+original time is a normal one. How long the following step needed before
+succeeding is recorded:
+
+- Success on the first attempt: the wait shrinks (x SHRINK), but never
+  below MARGIN x the p95 of needed times seen so far, or MIN_FRACTION of
+  the configured wait while nothing has been needed yet
+- Success after a failed attempt (the wait was too short): the wait backs
+  off to MARGIN x the p95 of needed times
+- Any step failing later in the same play (the probe may not cover all of
+  the page): every wait shortened earlier in the play goes back to its
+  configured value (back_off)
+
+State is kept per (scenario, step) in .sandy/history.db (table
+wait_tuning), and reset when the step's configured wait changes.
+
+Usage:
+    tuner = WaitTuner("HN Scrape")
+    wait = tuner.wait_for(step)                  # <= step.wait_after
+    tuner.observe(step, wait, needed=None)       # Next step succeeded at once
+    tuner.close()
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    from .history import default_history_path, percentile
+    from .optimizer import PROBE_TOOLS
+except ImportError:
+    from history import default_history_path, percentile
+    from optimizer import PROBE_TOOLS
+
+
+__all__ = [
+    # Data classes
+    "TunedWait",
+    # Classes
+    "WaitTuner",
+    # Constants
+    "SHRINK",
+    "MARGIN",
+    "MIN_FRACTION",
+    "TUNABLE_TOOLS",
+]
+
+
+if TYPE_CHECKING:
+    try:
+        from .scenario import Step
+    except ImportError:
+        from scenario import Step
+
+
+SHRINK = 0.5          # Wait multiplier after a first-attempt success
+MARGIN = 1.25         # Headroom over the p95 needed time
+MIN_FRACTION = 0.25   # Lowest share of the configured wait before anything was needed
+_WINDOW = 20          # Needed times kept per step
+
+# Steps that may follow a tuned wait: safe to attempt more than once, and
+# only succeed once the page is ready
+TUNABLE_TOOLS = PROBE_TOOLS
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wait_tuning (
+    scenario TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    configured REAL NOT NULL,
+    wait REAL NOT NULL,
+    needed TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    backoffs INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scenario, step)
+);
+"""
+
+
+@dataclass
+class TunedWait:
+    """Learned wait of one step"""
+    step: int
+    configured: float  # The step's wait_after
+    wait: float  # Wait to use next
+    needed: list[float] = field(default_factory=list)  # Recent time-to-ready (seconds)
+    runs: int = 0
+    backoffs: int = 0
+
+    @property
+    def floor(self) -> float:
+        """Lowest wait the observed needed times allow"""
+        if not self.needed:
+            return self.configured * MIN_FRACTION
+        return min(self.configured, percentile(self.needed, 95) * MARGIN)
+
+
+class WaitTuner:
+    """
+    Per-scenario learned waits, persisted in SQLite
+
+    Usage:
+        tuner = WaitTuner("HN Scrape")
+        options = PlayerOptions(wait_tuner=tuner)
+    """
+
+    def __init__(self, scenario: str, path: str | Path | None = None):
+        self.scenario = scenario
+        self.path = Path(path) if path else default_history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        self.waits: dict[int, TunedWait] = {}
+        rows = self._conn.execute(
+            "SELECT step, configured, wait, needed, runs, backoffs FROM wait_tuning WHERE scenario = ?",
+            (scenario,),
+        )
+        for step, configured, wait, needed, runs, backoffs in rows:
+            self.waits[step] = TunedWait(step, configured, wait, json.loads(needed), runs, backoffs)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def _state(self, step: int, configured: float) -> TunedWait:
+        state = self.waits.get(step)
+        if state is None or state.configured != configured:
+            state = self.waits[step] = TunedWait(step, configured, configured)
+        return state
+
+    def wait_for(self, step: Step) -> float:
+        """
+        Wait to use after a step
+
+        Returns:
+            Seconds, at most step.wait_after
+        """
+        configured = float(step.wait_after or 0)
+        return min(configured, self._state(step.step, configured).wait)
+
+    def observe(self, step: Step, waited: float, needed: float | None) -> None:
+        """
+        Record how the step after a tuned wait went
+
+        Args:
+            step: Step whose wait_after was tuned
+            waited: Seconds actually waited
+            needed: Seconds from the end of `step` until the following step's
+                successful attempt started, or None if its first attempt
+                (after `waited`) succeeded
+        """
+        state = self._state(step.step, float(step.wait_after or 0))
+        state.runs += 1
+        if needed is None:
+            state.wait = max(state.floor, waited * SHRINK)
+        else:
+            state.needed = (state.needed + [needed])[-_WINDOW:]
+            state.backoffs += 1
+            state.wait = max(state.floor, min(state.configured, needed * MARGIN))
+        self._save(state)
+
+    def back_off(self, step: Step, waited: float) -> None:
+        """
+        Undo a shortened wait after a later step of the play failed
+
+        The wait returns to its configured value, and the last wait known
+        to work (before the shrink to `waited`) is recorded as needed.
+
+        Args:
+            step: Step whose wait_after was shortened
+            waited: Seconds actually waited
+        """
+        state = self._state(step.step, float(step.wait_after or 0))
+        state.needed = (state.needed + [min(state.configured, waited / SHRINK)])[-_WINDOW:]
+        state.backoffs += 1
+        state.wait = state.configured
+        self._save(state)
+
+    def _save(self, state: TunedWait) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO wait_tuning VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.scenario, state.step, state.configured, state.wait,
+                json.dumps(state.needed), state.runs, state.backoffs, time.time(),
+            ),
+        )
+        self._conn.commit()
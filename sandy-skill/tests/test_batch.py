@@ -0,0 +1,153 @@
+"""
+Tests for batch.py
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from batch import BatchStats, load_rows, run_batch, shard_rows
+from config import Config
+from scenario import parse_scenario
+
+
+def make_scenario(steps=None):
+    """Helper to build a scenario that needs no MCP server"""
+    return parse_scenario({
+        "version": "2.1",
+        "metadata": {"name": "Batch"},
+        "variables": {"NAME": ""},
+        "steps": steps or [{"step": 1, "tool": "sandy__wait", "params": {"seconds": 0}}],
+    })
+
+
+class TestLoadRows:
+    """Tests for load_rows function"""
+
+    def test_jsonl(self, tmp_path):
+        """Should load one object per line, stringifying values"""
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"NAME": "a", "N": 1}\n\n{"NAME": "b", "FLAGS": [1]}\n')
+
+        assert load_rows(path) == [{"NAME": "a", "N": "1"}, {"NAME": "b", "FLAGS": "[1]"}]
+
+    def test_csv(self, tmp_path):
+        """Should load CSV rows by header"""
+        path = tmp_path / "rows.csv"
+        path.write_text("NAME,URL\na,http://x\nb,http://y\n")
+
+        assert load_rows(path) == [{"NAME": "a", "URL": "http://x"}, {"NAME": "b", "URL": "http://y"}]
+
+    def test_csv_quoted_newline(self, tmp_path):
+        """Should keep newlines inside quoted CSV fields"""
+        path = tmp_path / "rows.csv"
+        path.write_text('NAME,BODY\na,"line 1\nline 2"\nb,x\n')
+
+        assert load_rows(path) == [{"NAME": "a", "BODY": "line 1\nline 2"}, {"NAME": "b", "BODY": "x"}]
+
+    def test_json_array(self, tmp_path):
+        """Should load a JSON array of objects"""
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps([{"NAME": "a"}]))
+
+        assert load_rows(path) == [{"NAME": "a"}]
+
+    def test_invalid_row(self, tmp_path):
+        """Should reject non-object rows"""
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps([{"NAME": "a"}, 5]))
+
+        with pytest.raises(ValueError):
+            load_rows(path)
+
+
+class TestShardRows:
+    """Tests for shard_rows function"""
+
+    def test_round_robin(self):
+        """Should deal rows round-robin with their indices"""
+        rows = [{"i": str(i)} for i in range(5)]
+        shards = shard_rows(rows, 2)
+
+        assert [[i for i, _ in s] for s in shards] == [[0, 2, 4], [1, 3]]
+
+    def test_more_workers_than_rows(self):
+        """Should not create empty shards"""
+        assert len(shard_rows([{}, {}], 8)) == 2
+
+
+class TestBatchStats:
+    """Tests for BatchStats"""
+
+    def test_percentiles(self):
+        """Should use nearest-rank percentiles"""
+        stats = BatchStats(rows=4, row_durations=[0.4, 0.1, 0.3, 0.2])
+        assert stats.percentile(50) == 0.2
+        assert stats.percentile(95) == 0.4
+
+    def test_percentiles_match_history(self):
+        """Should rank like sandy stats (history.percentile)"""
+        from history import percentile
+
+        durations = [i / 10 for i in range(1, 11)]
+        stats = BatchStats(rows=10, row_durations=durations)
+        assert stats.percentile(50) == percentile(durations, 50) == 0.5
+
+
+class TestRunBatch:
+    """Tests for run_batch function"""
+
+    def test_in_process(self):
+        """Should play every row in order with row variables"""
+        rows = [{"NAME": f"n{i}"} for i in range(5)]
+        records = []
+
+        stats = run_batch(make_scenario(), Config(servers={}, source="test"), rows, on_record=records.append)
+
+        assert [r["index"] for r in records] == [0, 1, 2, 3, 4]
+        assert [r["variables"]["NAME"] for r in records] == ["n0", "n1", "n2", "n3", "n4"]
+        assert stats.passed == 5
+        assert stats.failed == 0
+        assert stats.per_worker == {0: 5}
+
+    def test_failures_counted(self):
+        """Should record failed rows without stopping the batch"""
+        scenario = make_scenario([
+            {"step": 1, "tool": "sandy__append_file", "params": {"data": "{{NAME}}"}},
+        ])
+        records = []
+
+        stats = run_batch(scenario, Config(servers={}, source="test"), [{"NAME": "a"}, {"NAME": "b"}],
+                          on_record=records.append)
+
+        assert stats.failed == 2
+        assert "path" in records[0]["error"]
+
+    def test_workers_ordered_output(self):
+        """Should merge records from worker processes back into row order"""
+        rows = [{"NAME": f"n{i}"} for i in range(9)]
+        records = []
+
+        stats = run_batch(make_scenario(), Config(servers={}, source="test"), rows, workers=3,
+                          on_record=records.append)
+
+        assert [r["index"] for r in records] == list(range(9))
+        assert stats.workers == 3
+        assert stats.per_worker == {0: 3, 1: 3, 2: 3}
+        assert stats.passed == 9
+
+    def test_concurrency_overlaps_rows(self):
+        """Should play rows concurrently and still emit in row order"""
+        scenario = make_scenario([{"step": 1, "tool": "sandy__wait", "params": {"seconds": 0.05}}])
+        rows = [{"NAME": f"n{i}"} for i in range(8)]
+        records = []
+
+        stats = run_batch(scenario, Config(servers={}, source="test"), rows, concurrency=8,
+                          on_record=records.append)
+
+        assert [r["index"] for r in records] == list(range(8))
+        assert stats.passed == 8
+        assert stats.duration < 0.3  # Sequential would take 0.4s
@@ -0,0 +1,140 @@
+"""
+Tests for blobs.py
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from blobs import BlobRef, BlobStore, load_blob
+
+
+class TestBlobStore:
+    """Tests for BlobStore"""
+
+    def test_small_value_not_spilled(self, tmp_path):
+        """Should return values under the threshold unchanged"""
+        store = BlobStore(tmp_path, threshold=100)
+        value = {"text": "short"}
+
+        assert store.spill(value) is value
+        assert not any(tmp_path.iterdir())
+
+    def test_large_value_spilled(self, tmp_path):
+        """Should store large values and return a reference"""
+        store = BlobStore(tmp_path, threshold=100)
+        value = {"text": "x" * 500}
+
+        ref = store.spill(value)
+
+        assert isinstance(ref, BlobRef)
+        assert ref.size == len(json.dumps(value).encode())
+        assert Path(ref.path).parent.parent == tmp_path
+        assert Path(ref.path).name == f"{ref.sha256}.json"
+        assert store.load(ref) == value
+
+    def test_deduplicates(self, tmp_path):
+        """Should store identical payloads once"""
+        store = BlobStore(tmp_path, threshold=10)
+
+        first = store.spill(["same"] * 20)
+        second = BlobStore(tmp_path, threshold=10).spill(["same"] * 20)
+
+        assert first.path == second.path
+        assert len(list(tmp_path.rglob("*.json"))) == 1
+
+    def test_compressed(self, tmp_path):
+        """Should gzip blobs when compression is enabled"""
+        store = BlobStore(tmp_path, threshold=10, compress=True)
+        value = "y" * 10_000
+
+        ref = store.spill(value)
+
+        assert ref.compressed is True
+        assert ref.path.endswith(".json.gz")
+        assert Path(ref.path).stat().st_size < 1000
+        assert store.load(ref) == value
+
+    def test_mmap(self, tmp_path):
+        """Should memory-map uncompressed blobs"""
+        store = BlobStore(tmp_path, threshold=10)
+        ref = store.spill("z" * 100)
+
+        with store.mmap(ref) as mapped:
+            assert mapped[:2] == b'"z'
+            assert len(mapped) == ref.size
+
+    def test_mmap_compressed_rejected(self, tmp_path):
+        """Should refuse to memory-map compressed blobs"""
+        store = BlobStore(tmp_path, threshold=10, compress=True)
+        ref = store.spill("z" * 100)
+
+        with pytest.raises(ValueError):
+            store.mmap(ref)
+
+    def test_load_blob_from_dict(self, tmp_path):
+        """Should load a reference in its JSON (dict) form"""
+        from dataclasses import asdict
+
+        ref = BlobStore(tmp_path, threshold=10).spill({"k": "v" * 50})
+
+        assert load_blob(json.loads(json.dumps(asdict(ref)))) == {"k": "v" * 50}
+
+    def test_known_size_used(self, tmp_path):
+        """Should trust a size measured by the caller"""
+        store = BlobStore(tmp_path, threshold=100)
+
+        assert store.spill({"text": "x" * 500}, size=50) == {"text": "x" * 500}
+        assert isinstance(store.spill({"text": "short"}, size=500), BlobRef)
+
+    def test_nested_value_estimated(self, tmp_path):
+        """Should spill large nested values without a known size"""
+        store = BlobStore(tmp_path, threshold=1000)
+        value = {"rows": [{"id": i, "name": f"item {i}"} for i in range(100)]}
+
+        assert isinstance(store.spill(value), BlobRef)
+        assert store.spill({"rows": value["rows"][:5]}) == {"rows": value["rows"][:5]}
+
+
+class TestPrune:
+    """Tests for BlobStore.prune"""
+
+    def make_store(self, tmp_path):
+        """Store three blobs of equal size, oldest first"""
+        store = BlobStore(tmp_path, threshold=10)
+        refs = [store.spill(letter * 100) for letter in "abc"]
+        for age, ref in zip((300, 200, 100), refs):
+            stamp = os.path.getmtime(ref.path) - age
+            os.utime(ref.path, (stamp, stamp))
+        return store, refs
+
+    def test_max_bytes(self, tmp_path):
+        """Should remove the oldest blobs until under the size limit"""
+        store, refs = self.make_store(tmp_path)
+
+        removed, freed = store.prune(max_bytes=2 * refs[0].size)
+
+        assert (removed, freed) == (1, refs[0].size)
+        assert [Path(ref.path).exists() for ref in refs] == [False, True, True]
+
+    def test_max_age(self, tmp_path):
+        """Should remove blobs older than the age limit"""
+        store, refs = self.make_store(tmp_path)
+
+        store.prune(max_age=150)
+
+        assert [Path(ref.path).exists() for ref in refs] == [False, False, True]
+        assert store.usage() == (1, refs[2].size)
+
+    def test_reuse_refreshes_age(self, tmp_path):
+        """Should keep blobs that were stored again recently"""
+        store, refs = self.make_store(tmp_path)
+
+        store.spill("a" * 100)
+        store.prune(max_age=150)
+
+        assert [Path(ref.path).exists() for ref in refs] == [True, False, True]
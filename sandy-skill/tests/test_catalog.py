@@ -0,0 +1,195 @@
+"""
+Tests for catalog.py
+"""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from catalog import ToolCatalog, preflight, server_config_hash, validate_params
+from config import Config, ServerConfig
+from scenario import parse_scenario
+
+
+QUERY_TOOL = {
+    "name": "query",
+    "description": "Run SQL",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "sql": {"type": "string"},
+            "limit": {"type": "integer"},
+            "format": {"type": "string", "enum": ["json", "csv"]},
+        },
+        "required": ["sql"],
+        "additionalProperties": False,
+    },
+}
+
+
+def make_scenario(*steps):
+    """Helper to build a scenario from (tool, params) pairs"""
+    return parse_scenario({
+        "version": "2.1",
+        "metadata": {"name": "Test"},
+        "steps": [
+            {"step": i + 1, "tool": tool, "params": params}
+            for i, (tool, params) in enumerate(steps)
+        ],
+    })
+
+
+@pytest.fixture
+def config():
+    return Config(
+        servers={"supabase": ServerConfig(name="supabase", command="npx", args=["supabase-mcp"])},
+        source="test",
+    )
+
+
+@pytest.fixture
+def catalog(tmp_path, config):
+    catalog = ToolCatalog(tmp_path)
+    catalog.put(config.servers["supabase"], [QUERY_TOOL])
+    return catalog
+
+
+class TestToolCatalog:
+    """Tests for ToolCatalog"""
+
+    def test_roundtrip(self, tmp_path, config):
+        """Should persist catalogs across instances"""
+        ToolCatalog(tmp_path).put(config.servers["supabase"], [QUERY_TOOL])
+
+        tools = ToolCatalog(tmp_path).get(config.servers["supabase"])
+
+        assert tools == {"query": QUERY_TOOL}
+
+    def test_keyed_by_config(self, tmp_path, config):
+        """Should not reuse a catalog after the server config changes"""
+        ToolCatalog(tmp_path).put(config.servers["supabase"], [QUERY_TOOL])
+        changed = ServerConfig(name="supabase", command="npx", args=["supabase-mcp@2"])
+
+        assert server_config_hash(changed) != server_config_hash(config.servers["supabase"])
+        assert ToolCatalog(tmp_path).get(changed) is None
+
+    def test_version_mismatch(self, tmp_path, config):
+        """Should ignore catalogs written by another version"""
+        catalog = ToolCatalog(tmp_path)
+        catalog.put(config.servers["supabase"], [QUERY_TOOL])
+        path = catalog.path_for(config.servers["supabase"])
+        data = json.loads(path.read_text())
+        data["version"] = -1
+        path.write_text(json.dumps(data))
+
+        assert ToolCatalog(tmp_path).get(config.servers["supabase"]) is None
+
+    def test_refresh(self, tmp_path, config, monkeypatch):
+        """Should fetch schemas through a client and store them"""
+        import clients
+
+        class FakeClient:
+            async def connect(self):
+                pass
+
+            async def disconnect(self):
+                pass
+
+            async def list_tool_schemas(self):
+                return [QUERY_TOOL]
+
+        async def fake_create_client(server_config):
+            return FakeClient()
+
+        monkeypatch.setattr(clients, "create_client", fake_create_client)
+        catalog = ToolCatalog(tmp_path)
+
+        tools = asyncio.run(catalog.refresh(config.servers["supabase"]))
+
+        assert "query" in tools
+        assert ToolCatalog(tmp_path).get(config.servers["supabase"]) is not None
+
+
+class TestValidateParams:
+    """Tests for validate_params function"""
+
+    def test_valid(self):
+        """Should accept matching params"""
+        assert validate_params({"sql": "select 1", "limit": 5}, QUERY_TOOL["inputSchema"]) == []
+
+    def test_missing_required(self):
+        """Should report missing required params"""
+        assert validate_params({}, QUERY_TOOL["inputSchema"]) == ["Missing required param 'sql'"]
+
+    def test_unknown_param_with_hint(self):
+        """Should report unknown params with a suggestion"""
+        problems = validate_params({"sql": "x", "limt": 5}, QUERY_TOOL["inputSchema"])
+        assert problems == ["Unknown param 'limt' (did you mean 'limit'?)"]
+
+    def test_type_and_enum(self):
+        """Should check types and enums of literal values"""
+        problems = validate_params(
+            {"sql": "x", "limit": "5", "format": "xml"}, QUERY_TOOL["inputSchema"]
+        )
+        assert len(problems) == 2
+
+    def test_bool_is_not_integer(self):
+        """Should not accept booleans for integer params"""
+        assert validate_params({"sql": "x", "limit": True}, QUERY_TOOL["inputSchema"])
+
+    def test_templates_not_type_checked(self):
+        """Should skip type checks for {{...}} values"""
+        assert validate_params({"sql": "x", "limit": "{{LIMIT}}"}, QUERY_TOOL["inputSchema"]) == []
+
+    def test_no_schema(self):
+        """Should accept anything without a schema"""
+        assert validate_params({"anything": 1}, None) == []
+
+
+class TestPreflight:
+    """Tests for preflight function"""
+
+    def test_passes(self, config, catalog):
+        """Should report nothing for a valid scenario"""
+        scenario = make_scenario(
+            ("mcp__supabase__query", {"sql": "select 1"}),
+            ("sandy__append_file", {"path": "out.jsonl", "data": "x"}),
+        )
+        assert preflight(scenario, config, catalog) == []
+
+    def test_misspelled_tool(self, config, catalog):
+        """Should report unknown tools with a suggestion"""
+        scenario = make_scenario(("mcp__supabase__querry", {"sql": "select 1"}))
+
+        issues = preflight(scenario, config, catalog)
+
+        assert len(issues) == 1
+        assert issues[0].step == 1
+        assert "did you mean 'query'" in issues[0].message
+
+    def test_unknown_server(self, config, catalog):
+        """Should report servers missing from the config"""
+        scenario = make_scenario(("mcp__github__create_issue", {}))
+
+        issues = preflight(scenario, config, catalog)
+
+        assert "not found in config" in issues[0].message
+
+    def test_uncached_server_skipped(self, tmp_path, config):
+        """Should not check tools of servers without a cached catalog"""
+        scenario = make_scenario(("mcp__supabase__anything", {}))
+        assert preflight(scenario, config, ToolCatalog(tmp_path / "empty")) == []
+
+    def test_param_problems(self, config, catalog):
+        """Should report param problems per step"""
+        scenario = make_scenario(("mcp__supabase__query", {"limit": 1}))
+
+        issues = preflight(scenario, config, catalog)
+
+        assert [str(i) for i in issues] == [
+            "Step 1 (mcp__supabase__query): Missing required param 'sql'"
+        ]
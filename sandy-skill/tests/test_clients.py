@@ -0,0 +1,193 @@
+"""
+Tests for clients/base.py
+"""
+
+import asyncio
+import base64
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from clients.base import (
+    MCPClient,
+    MCPConnectionError,
+    MCPToolCallError,
+    SessionClientMixin,
+    extract_content_data,
+    is_connection_error,
+    save_binary_content,
+)
+
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4000
+
+
+def image_block(data=PNG_BYTES, mime="image/png"):
+    """Helper to build an SDK-style image content block"""
+    return SimpleNamespace(type="image", data=base64.b64encode(data).decode(), mime_type=mime)
+
+
+class TestSaveBinaryContent:
+    """Tests for save_binary_content function"""
+
+    def test_decodes_to_file(self, tmp_path):
+        """Should decode base64 to a hash-named file"""
+        info = save_binary_content(base64.b64encode(PNG_BYTES).decode(), "image/png", tmp_path)
+
+        assert info["bytes"] == len(PNG_BYTES)
+        assert info["sha256"] == hashlib.sha256(PNG_BYTES).hexdigest()
+        assert info["mime"] == "image/png"
+        assert info["path"].endswith(".png")
+        assert Path(info["path"]).read_bytes() == PNG_BYTES
+
+    def test_wrapped_base64(self, tmp_path):
+        """Should accept line-wrapped base64"""
+        encoded = base64.encodebytes(PNG_BYTES).decode()
+        info = save_binary_content(encoded, None, tmp_path)
+
+        assert Path(info["path"]).read_bytes() == PNG_BYTES
+        assert info["path"].endswith(".bin")
+
+    def test_whitespace_after_first_chunk(self, tmp_path):
+        """Should drop whitespace anywhere, not just in the first decoded chunk"""
+        from clients.base import _BASE64_CHUNK
+
+        payload = PNG_BYTES * 2
+        encoded = base64.b64encode(payload).decode()
+        assert len(encoded) > 2 * _BASE64_CHUNK
+        for offset in (_BASE64_CHUNK + 10, 2 * _BASE64_CHUNK - 1):
+            encoded = encoded[:offset] + "\n" + encoded[offset:]
+
+        info = save_binary_content(encoded, None, tmp_path)
+
+        assert Path(info["path"]).read_bytes() == payload
+
+    def test_deduplicates(self, tmp_path):
+        """Should write identical content to the same file"""
+        encoded = base64.b64encode(PNG_BYTES).decode()
+        first = save_binary_content(encoded, "image/png", tmp_path)
+        second = save_binary_content(encoded, "image/png", tmp_path)
+
+        assert first["path"] == second["path"]
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_concurrent_saves(self, tmp_path):
+        """Should not mix up payloads saved from several threads at once"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        payloads = [bytes([i]) * 2_000_000 for i in range(8)]
+        with ThreadPoolExecutor(8) as pool:
+            infos = list(pool.map(
+                lambda p: save_binary_content(base64.b64encode(p).decode(), None, tmp_path), payloads
+            ))
+
+        for payload, info in zip(payloads, infos):
+            assert Path(info["path"]).read_bytes() == payload
+        assert len(list(tmp_path.iterdir())) == len(payloads)
+
+
+class TestExtractContentData:
+    """Tests for extract_content_data function"""
+
+    def test_image_kept_as_base64_by_default(self):
+        """Should return base64 data when no artifacts dir is set"""
+        block = image_block()
+        assert extract_content_data([block]) == block.data
+
+    def test_image_written_to_artifacts_dir(self, tmp_path):
+        """Should replace image blocks with file info"""
+        text = SimpleNamespace(type="text", text='{"ok": true}')
+        result = extract_content_data([text, image_block()], tmp_path)
+
+        assert result[0] == {"ok": True}
+        assert result[1]["bytes"] == len(PNG_BYTES)
+        assert Path(result[1]["path"]).parent == tmp_path
+
+    def test_embedded_blob_resource(self, tmp_path):
+        """Should write embedded blob resources"""
+        resource = SimpleNamespace(blob=base64.b64encode(b"pdf").decode(), mime_type="application/pdf")
+        block = SimpleNamespace(type="resource", resource=resource)
+
+        result = extract_content_data([block], tmp_path)
+
+        assert result["mime"] == "application/pdf"
+        assert Path(result["path"]).read_bytes() == b"pdf"
+
+    def test_dict_blocks(self, tmp_path):
+        """Should handle raw JSON content blocks (socket transport)"""
+        blocks = [
+            {"type": "text", "text": "Screenshot taken"},
+            {"type": "image", "data": base64.b64encode(b"jpg").decode(), "mimeType": "image/jpeg"},
+        ]
+
+        result = extract_content_data(blocks, tmp_path)
+
+        assert result[0] == "Screenshot taken"
+        assert result[1]["mime"] == "image/jpeg"
+        assert result[1]["bytes"] == 3
+
+
+class TestIsConnectionError:
+    """Tests for is_connection_error"""
+
+    @pytest.mark.parametrize("error", [
+        MCPConnectionError("Failed to connect"),
+        Exception("Not connected to MCP server"),
+        "Socket not connected",
+        "Connection closed",
+        "ClosedResourceError",
+    ])
+    def test_connection_lost(self, error):
+        """Should treat lost transports as connection errors"""
+        assert is_connection_error(error) is True
+
+    @pytest.mark.parametrize("error", [Exception("Element not found"), "Tool call failed", None])
+    def test_tool_errors(self, error):
+        """Should not treat tool failures as connection errors"""
+        assert is_connection_error(error) is False
+
+
+class TestSessionClientMixin:
+    """Tests for SessionClientMixin"""
+
+    class SessionClient(SessionClientMixin, MCPClient):
+        transport_type = "test"
+        server_name = "test"
+
+        def __init__(self, session):
+            self._session = session
+            self._connected = session is not None
+
+        async def connect(self):
+            pass
+
+        async def disconnect(self):
+            pass
+
+        async def call_tool(self, tool_name, params):
+            pass
+
+        async def list_tools(self):
+            return []
+
+    def test_schemas_from_session(self):
+        """Should list tool schemas from the client's session"""
+        tool = SimpleNamespace(name="query", description="Run SQL", inputSchema={"type": "object"})
+
+        class Session:
+            async def list_tools(self):
+                return SimpleNamespace(tools=[tool])
+
+        schemas = asyncio.run(self.SessionClient(Session()).list_tool_schemas())
+
+        assert schemas == [{"name": "query", "description": "Run SQL", "inputSchema": {"type": "object"}}]
+
+    def test_not_connected(self):
+        """Should raise when there is no session"""
+        with pytest.raises(MCPToolCallError):
+            asyncio.run(self.SessionClient(None).list_tool_schemas())
@@ -0,0 +1,137 @@
+"""
+Tests for conditions.py
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from conditions import ConditionSyntaxError, compile_condition
+
+
+def make_resolver(values):
+    """Helper to build a resolver over a flat dict of references"""
+    def resolve(ref):
+        if ref in values:
+            return values[ref], True
+        return None, False
+    return resolve
+
+
+def evaluate(source, **values):
+    """Helper to compile and evaluate a condition"""
+    return compile_condition(source).evaluate(make_resolver(values))
+
+
+class TestComparisons:
+    """Tests for comparison operators"""
+
+    def test_string_equality(self):
+        """Should compare strings, quoted or bare"""
+        assert evaluate('{{MODE}} == "full"', MODE="full") is True
+        assert evaluate("{{MODE}} == full", MODE="full") is True
+        assert evaluate("{{MODE}} != 'full'", MODE="fast") is True
+
+    def test_numeric_comparison(self):
+        """Should compare numbers and numeric strings numerically"""
+        assert evaluate("{{count}} > 9", count=10) is True
+        assert evaluate("{{LIMIT}} >= 10", LIMIT="10") is True
+        assert evaluate("{{LIMIT}} == 10.0", LIMIT="10") is True
+        assert evaluate("{{count}} < -1", count=0) is False
+
+    def test_lexicographic_string_ordering(self):
+        """Should order non-numeric strings lexicographically"""
+        assert evaluate('{{name}} < "b"', name="apple") is True
+
+    def test_unrelated_types_not_ordered(self):
+        """Should return false when ordering unrelated types"""
+        assert evaluate("{{items}} > 1", items=[1, 2]) is False
+
+    def test_bool_and_null(self):
+        """Should match booleans case-insensitively and null as empty"""
+        assert evaluate("{{flag}} == true", flag=True) is True
+        assert evaluate("{{flag}} == true", flag="True") is True
+        assert evaluate("{{missing}} == null") is True
+        assert evaluate('{{value}} == ""', value=None) is True
+
+    def test_literals_lowercase_only(self):
+        """Should treat None / none / True as bare words, not literals"""
+        assert evaluate("{{x}} == none", x="none") is True
+        assert evaluate("{{x}} == None", x="None") is True
+        assert evaluate("{{x}} == None") is False
+        assert evaluate("{{x}} == True", x=True) is True
+
+    def test_in_operator(self):
+        """Should test membership in lists, dicts and strings"""
+        assert evaluate('"b" in {{items}}', items=["a", "b"]) is True
+        assert evaluate('"id" in {{row}}', row={"id": 1}) is True
+        assert evaluate('"err" in {{message}}', message="an error") is True
+        assert evaluate('{{MODE}} in ["fast", "full"]', MODE="full") is True
+        assert evaluate('{{MODE}} not in ["fast", "full"]', MODE="slow") is True
+
+
+class TestBooleanLogic:
+    """Tests for and/or/not and truthiness"""
+
+    def test_and_or(self):
+        """Should combine comparisons with and/or"""
+        assert evaluate("{{a}} == 1 and {{b}} == 2", a=1, b=2) is True
+        assert evaluate("{{a}} == 1 && {{b}} == 3", a=1, b=2) is False
+        assert evaluate("{{a}} == 5 or {{b}} == 2", a=1, b=2) is True
+        assert evaluate("{{a}} == 5 || {{b}} == 5", a=1, b=2) is False
+
+    def test_precedence_and_parentheses(self):
+        """Should bind and tighter than or, with parentheses overriding"""
+        assert evaluate("{{a}} or {{b}} and {{c}}", a=1, b=0, c=0) is True
+        assert evaluate("({{a}} or {{b}}) and {{c}}", a=1, b=0, c=0) is False
+
+    def test_not(self):
+        """Should negate operands"""
+        assert evaluate("not {{items}}", items=[]) is True
+        assert evaluate("!{{value}}", value="x") is False
+
+    def test_truthiness(self):
+        """Should treat empty values as false"""
+        assert evaluate("{{v}}", v="  ") is False
+        assert evaluate("{{v}}", v={}) is False
+        assert evaluate("{{v}}", v=0) is False
+        assert evaluate("{{v}}") is False
+        assert evaluate("{{v}}", v="something") is True
+
+
+class TestFunctionsAndTemplates:
+    """Tests for len() and quoted templates"""
+
+    def test_len(self):
+        """Should measure lists, dicts, strings and null"""
+        assert evaluate("len({{items}}) == 3", items=[1, 2, 3]) is True
+        assert evaluate("len({{text}}) > 2", text="abc") is True
+        assert evaluate("len({{missing}}) == 0") is True
+
+    def test_template_string(self):
+        """Should substitute references inside quoted strings"""
+        assert evaluate('{{url}} == "https://{{HOST}}/api"', url="https://x.io/api", HOST="x.io") is True
+
+
+class TestCompile:
+    """Tests for compile_condition"""
+
+    def test_references(self):
+        """Should report referenced variables"""
+        condition = compile_condition('{{a.b}} > 1 and "{{C}}" in {{d}}')
+        assert condition.references == {"a.b", "C", "d"}
+
+    @pytest.mark.parametrize("source", [
+        "",
+        "{{a}} ==",
+        "({{a}} == 1",
+        "{{a}} == 1 2",
+        "{{a}} = 1",
+        "len {{a}}",
+    ])
+    def test_syntax_errors(self, source):
+        """Should reject malformed conditions"""
+        with pytest.raises(ConditionSyntaxError):
+            compile_condition(source)
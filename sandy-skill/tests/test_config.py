@@ -22,6 +22,9 @@ from config import (
     ServerConfig,
     ConfigNotFoundError,
     ConfigParseError,
+    detect_config_cached,
+    clear_config_cache,
+    explain_config,
 )
 
 
@@ -260,3 +263,139 @@ class TestServerConfigTransportType:
         """Should return websocket for wss endpoint"""
         config = ServerConfig(name="test", endpoint="wss://localhost:9222")
         assert config.transport_type == "websocket"
+
+    def test_replay_transport(self):
+        """Should return replay when a fixture is set, whatever else is configured"""
+        config = ServerConfig(name="test", command="test-cmd", replay="fixtures/test.jsonl")
+        assert config.transport_type == "replay"
+
+
+@pytest.fixture
+def isolated_env(tmp_path, monkeypatch):
+    """Run with an empty HOME and cwd so only test configs are visible"""
+    home = tmp_path / "home"
+    project = tmp_path / "project"
+    home.mkdir()
+    project.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.delenv("SANDY_CONFIG", raising=False)
+    monkeypatch.chdir(project)
+    clear_config_cache()
+    yield home, project
+    clear_config_cache()
+
+
+def write_config(path, servers):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"servers": servers}))
+
+
+class TestDetectConfigCached:
+    """Tests for detect_config_cached function"""
+
+    def test_reuses_result(self, isolated_env):
+        """Should return the same Config while files are unchanged"""
+        home, project = isolated_env
+        write_config(project / ".sandy" / "config.json", {"a": {"command": "x"}})
+
+        first = detect_config_cached()
+        assert detect_config_cached() is first
+
+    def test_file_change_invalidates(self, isolated_env):
+        """Should re-resolve when the winning file changes"""
+        home, project = isolated_env
+        config_path = project / ".sandy" / "config.json"
+        write_config(config_path, {"a": {"command": "x"}})
+        detect_config_cached()
+
+        write_config(config_path, {"b": {"command": "yy"}})
+        os.utime(config_path, ns=(1, 1))
+
+        assert set(detect_config_cached().servers) == {"b"}
+
+    def test_higher_priority_file_appears(self, isolated_env):
+        """A new higher-priority candidate should win"""
+        home, project = isolated_env
+        write_config(home / ".sandy" / "config.json", {"global": {"command": "x"}})
+        assert set(detect_config_cached().servers) == {"global"}
+
+        write_config(project / ".sandy" / "config.json", {"local": {"command": "x"}})
+        assert set(detect_config_cached().servers) == {"local"}
+
+    def test_env_change_invalidates(self, isolated_env, monkeypatch):
+        """Should re-expand when a referenced env var changes"""
+        home, project = isolated_env
+        write_config(project / ".sandy" / "config.json", {
+            "a": {"command": "x", "env": {"TOKEN": "${MY_TOKEN}"}}
+        })
+        monkeypatch.setenv("MY_TOKEN", "one")
+        assert detect_config_cached().servers["a"].env == {"TOKEN": "one"}
+
+        monkeypatch.setenv("MY_TOKEN", "two")
+        assert detect_config_cached().servers["a"].env == {"TOKEN": "two"}
+
+    def test_env_refs_recorded_on_parse(self, isolated_env, monkeypatch):
+        """Should record the env vars the config expanded, and only those"""
+        home, project = isolated_env
+        write_config(project / ".sandy" / "config.json", {
+            "a": {"command": "x", "args": ["$NOT_ENV"], "env": {"TOKEN": "${MY_TOKEN}", "URL": "$MY_URL/api"}}
+        })
+        monkeypatch.setenv("MY_TOKEN", "one")
+        monkeypatch.delenv("MY_URL", raising=False)
+
+        assert detect_config_cached().env_refs == {"MY_TOKEN": "one", "MY_URL": None}
+
+    def test_max_age_skips_revalidation(self, isolated_env):
+        """Within max_age the cached result is returned without checks"""
+        home, project = isolated_env
+        config_path = project / ".sandy" / "config.json"
+        write_config(config_path, {"a": {"command": "x"}})
+        first = detect_config_cached()
+
+        config_path.unlink()
+        assert detect_config_cached(max_age=60) is first
+
+    def test_not_found(self, isolated_env):
+        """Should raise when nothing is configured"""
+        with pytest.raises(ConfigNotFoundError):
+            detect_config_cached()
+
+
+class TestExplainConfig:
+    """Tests for explain_config function"""
+
+    def test_reports_winner_and_shadowed(self, isolated_env):
+        """Should mark the first existing candidate as selected"""
+        home, project = isolated_env
+        write_config(project / ".sandy" / "config.json", {"local": {"command": "x"}})
+        write_config(home / ".sandy" / "config.json", {"global": {"command": "x"}})
+
+        candidates = explain_config()
+        by_label = {c.label: c for c in candidates}
+
+        assert by_label["project"].selected is True
+        assert by_label["project"].servers == ["local"]
+        assert by_label["global"].exists is True
+        assert by_label["global"].selected is False
+        assert by_label["cursor"].exists is False
+
+    def test_sandy_config_env(self, isolated_env, tmp_path, monkeypatch):
+        """$SANDY_CONFIG should be the only candidate"""
+        config_path = tmp_path / "custom.json"
+        write_config(config_path, {"a": {"command": "x"}})
+        monkeypatch.setenv("SANDY_CONFIG", str(config_path))
+
+        candidates = explain_config()
+        assert [c.label for c in candidates] == ["$SANDY_CONFIG"]
+        assert candidates[0].selected is True
+
+    def test_invalid_winner_reported(self, isolated_env):
+        """A broken first candidate should be reported, not skipped"""
+        home, project = isolated_env
+        (project / ".sandy").mkdir()
+        (project / ".sandy" / "config.json").write_text("{broken")
+        write_config(home / ".sandy" / "config.json", {"global": {"command": "x"}})
+
+        candidates = explain_config()
+        assert candidates[0].error is not None
+        assert not any(c.selected for c in candidates)
@@ -0,0 +1,247 @@
+"""
+Tests for fusion.py
+"""
+
+import asyncio
+import json
+import shutil
+import subprocess
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from scenario import parse_scenario
+from player import ScenarioPlayer, PlayerOptions
+from fusion import FusionError, build_fused_params, plan_fused_runs, split_fused_result
+
+
+EVAL = "mcp__chrome-devtools__evaluate_script"
+
+
+def make_scenario(steps):
+    return parse_scenario({
+        "version": "2.1",
+        "metadata": {"name": "Fusion"},
+        "steps": steps,
+    })
+
+
+def script_step(n, code, **extra):
+    return {"step": n, "tool": EVAL, "params": {"function": code}, **extra}
+
+
+class TestPlanFusedRuns:
+    """Tests for plan_fused_runs"""
+
+    def test_consecutive_scripts_fused(self):
+        """Should fuse consecutive independent script steps"""
+        scenario = make_scenario([
+            {"step": 1, "tool": "mcp__chrome-devtools__navigate_page", "params": {"url": "https://x"}},
+            script_step(2, "() => 1"),
+            script_step(3, "() => 2"),
+            script_step(4, "() => 3"),
+        ])
+
+        runs = plan_fused_runs(scenario.steps)
+
+        assert list(runs) == [2]
+        assert [s.step for s in runs[2]] == [2, 3, 4]
+
+    def test_single_script_not_fused(self):
+        """Should not report runs of one step"""
+        scenario = make_scenario([
+            script_step(1, "() => 1"),
+            {"step": 2, "tool": "mcp__chrome-devtools__click", "params": {"uid": "a"}},
+            script_step(3, "() => 2"),
+        ])
+
+        assert plan_fused_runs(scenario.steps) == {}
+
+    def test_data_dependency_splits_run(self):
+        """Should start a new run at a step reading an earlier step of the run"""
+        scenario = make_scenario([
+            script_step(1, "() => 1", id="a", output={"v": "$"}),
+            script_step(2, "() => 2"),
+            script_step(3, "() => {{a.v}} + 1"),
+            script_step(4, "() => 4"),
+        ])
+
+        runs = plan_fused_runs(scenario.steps)
+
+        assert {k: [s.step for s in v] for k, v in runs.items()} == {1: [1, 2], 3: [3, 4]}
+
+    def test_wait_after_ends_run(self):
+        """Should end a run at a step with wait_after"""
+        scenario = make_scenario([
+            script_step(1, "() => 1"),
+            script_step(2, "() => 2", wait_after=1.0),
+            script_step(3, "() => 3"),
+        ])
+
+        runs = plan_fused_runs(scenario.steps)
+
+        assert [s.step for s in runs[1]] == [1, 2]
+
+    def test_condition_retry_and_args_excluded(self):
+        """Should leave conditional, retrying and argument-taking steps alone"""
+        scenario = make_scenario([
+            script_step(1, "() => 1", condition="{{X}} == 'y'"),
+            script_step(2, "() => 2", on_error="retry"),
+            {"step": 3, "tool": EVAL, "params": {"function": "(el) => el.id", "args": [{"uid": "a"}]}},
+            script_step(4, "() => 4"),
+        ])
+
+        assert plan_fused_runs(scenario.steps) == {}
+
+    @pytest.mark.parametrize("text, fused", [
+        ("document.title", True),
+        ("[...links].map(a => { return a.href })", True),
+        ("(async () => { await ready })()", True),
+        ("'return' + `${x}`", True),
+        ("await fetch('/api')", False),
+        ("return document.title", False),
+        ("if (done) { return 1 }", False),
+        ("`${await x}`", False),
+    ])
+    def test_top_level_await_or_return_excluded(self, text, fused):
+        """Should not fuse javascript_tool texts with top-level await or return"""
+        tool = "mcp__claude-in-chrome__javascript_tool"
+        scenario = make_scenario([
+            {"step": 1, "tool": tool, "params": {"action": "javascript_exec", "text": "location.href"}},
+            {"step": 2, "tool": tool, "params": {"action": "javascript_exec", "text": text}},
+        ])
+
+        assert bool(plan_fused_runs(scenario.steps)) is fused
+
+
+class TestBuildFusedParams:
+    """Tests for build_fused_params and split_fused_result"""
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+    def test_fused_function_runs(self):
+        """Should return per-step results, continuing past a failed skip step"""
+        params = build_fused_params(EVAL, [
+            {"function": "() => 1 + 1 // trailing comment"},
+            {"function": "async () => { throw new Error('boom') }"},
+            {"function": "() => ({ a: [1, 2] })"},
+            {"function": "() => 'never'"},
+        ], stops=[True, False, True, True])
+
+        program = f"({params['function']})().then(r => console.log(JSON.stringify(r)))"
+        output = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout
+        entries = split_fused_result(json.loads(output), 4)
+
+        assert [e["ok"] for e in entries] == [True, False, True, True]
+        assert entries[0]["value"] == 2
+        assert entries[1]["error"] == "boom"
+        assert entries[2]["value"] == {"a": [1, 2]}
+
+    def test_javascript_tool_params(self):
+        """Should build one javascript_exec call on the steps' tab"""
+        params = build_fused_params("mcp__claude-in-chrome__javascript_tool", [
+            {"action": "javascript_exec", "text": "document.title", "tabId": 7},
+            {"action": "javascript_exec", "text": "location.href", "tabId": 7},
+        ], stops=[True, True])
+
+        assert params["action"] == "javascript_exec"
+        assert params["tabId"] == 7
+        assert json.dumps("document.title") in params["text"]
+
+    def test_malformed_result_rejected(self):
+        """Should raise FusionError for results that aren't per-step entries"""
+        with pytest.raises(FusionError):
+            split_fused_result({"ok": True}, 2)
+        with pytest.raises(FusionError):
+            split_fused_result([{"ok": True}] * 3, 2)
+
+
+class TestFusedPlay:
+    """Tests for ScenarioPlayer with fuse_scripts"""
+
+    class MockConfig:
+        servers = {}
+        source = "test"
+
+    class MockClient:
+        def __init__(self, data):
+            self.data = data
+            self.calls = []
+
+        async def call_tool(self, tool_name, params):
+            self.calls.append((tool_name, params))
+
+            class Result:
+                success = True
+                data = self.data
+                error = None
+            return Result()
+
+        async def disconnect(self):
+            pass
+
+    def play(self, steps, data, **options):
+        client = self.MockClient(data)
+
+        async def run_test():
+            player = ScenarioPlayer(
+                make_scenario(steps), self.MockConfig(), PlayerOptions(fuse_scripts=True, **options)
+            )
+            player._clients["chrome-devtools"] = client
+            return await player.execute()
+
+        return asyncio.run(run_test()), client
+
+    def test_results_demultiplexed(self):
+        """Should make one call and report each step with its own result and outputs"""
+        result, client = self.play(
+            [
+                script_step(1, "() => document.title", id="title", output={"text": "$"}),
+                script_step(2, "() => [1, 2]", id="nums", output={"first": "$[0]"}),
+            ],
+            [{"ok": True, "value": "Home", "ms": 3}, {"ok": True, "value": [1, 2], "ms": 5}],
+            include_results=True,
+        )
+
+        assert len(client.calls) == 1
+        assert result.success is True
+        assert [r.step for r in result.step_results] == [1, 2]
+        assert result.step_results[1].result == [1, 2]
+        assert result.step_results[1].duration == pytest.approx(0.005)
+        assert result.outputs == {"title": {"text": "Home"}, "nums": {"first": 1}}
+
+    def test_failed_step_stops_play(self):
+        """Should fail the step whose script threw, like an unfused call"""
+        result, _ = self.play(
+            [script_step(1, "() => 1"), script_step(2, "() => x.y"), script_step(3, "() => 3")],
+            [{"ok": True, "value": 1, "ms": 1}, {"ok": False, "error": "x is not defined", "ms": 1}],
+        )
+
+        assert result.success is False
+        assert result.failed_step == 2
+        assert result.error == "x is not defined"
+        assert len(result.step_results) == 2
+
+    def test_malformed_result_fails_run(self):
+        """Should fail the run's steps without re-running their scripts"""
+        result, client = self.play(
+            [script_step(1, "() => 1", on_error="skip"), script_step(2, "() => 2", on_error="skip")],
+            "not a list",
+        )
+
+        assert len(client.calls) == 1
+        assert [r.success for r in result.step_results] == [False, False]
+        assert "Fused script call failed" in result.step_results[0].error
+
+    def test_end_option_limits_run(self):
+        """Should not run fused steps past the end option"""
+        result, client = self.play(
+            [script_step(1, "() => 1"), script_step(2, "() => 2"), script_step(3, "() => 3")],
+            [{"ok": True, "value": 1, "ms": 1}, {"ok": True, "value": 2, "ms": 1}],
+            end=2,
+        )
+
+        assert result.success is True
+        assert len(client.calls) == 1
+        assert "() => 3" not in client.calls[0][1]["function"]
@@ -0,0 +1,132 @@
+"""
+Tests for history.py
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from history import RunHistory, percentile
+from player import PlayResult, StepResult
+
+
+def make_result(durations, failed=None, name="Scrape", retries=0, result_bytes=None):
+    """PlayResult with one step per duration; step `failed` fails"""
+    steps = [
+        StepResult(
+            step=i,
+            tool=f"mcp__srv__tool{i}",
+            success=i != failed,
+            duration=d,
+            error="boom" if i == failed else None,
+            retries=retries,
+            result_bytes=result_bytes,
+        )
+        for i, d in enumerate(durations, 1)
+    ]
+    return PlayResult(
+        scenario_name=name,
+        success=failed is None,
+        total_steps=len(steps),
+        passed_steps=sum(1 for s in steps if s.success),
+        failed_step=failed,
+        duration=sum(durations),
+        step_results=steps,
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = RunHistory(tmp_path / "history.db")
+    yield history
+    history.close()
+
+
+class TestPercentile:
+    """Tests for nearest-rank percentile"""
+
+    def test_percentiles(self):
+        """Should pick nearest-rank values"""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 99) == 3.0
+
+    def test_empty(self):
+        """Should return 0 for no samples"""
+        assert percentile([], 50) == 0.0
+
+
+class TestRunHistory:
+    """Tests for recording runs and computing stats"""
+
+    def test_step_stats(self, history):
+        """Should compute per-step percentiles and failure rates"""
+        for i in range(1, 11):
+            history.record(make_result([i * 0.1, 1.0], failed=2 if i <= 2 else None, retries=1))
+
+        stats = history.step_stats("Scrape")
+
+        assert [s.step for s in stats] == [1, 2]
+        assert stats[0].runs == 10
+        assert stats[0].p50 == pytest.approx(0.5)
+        assert stats[0].p95 == pytest.approx(1.0)
+        assert stats[0].failure_rate == 0.0
+        assert stats[1].failures == 2
+        assert stats[1].failure_rate == pytest.approx(0.2)
+        assert stats[1].mean_retries == 1.0
+        assert stats[1].mean_bytes is None
+
+    def test_skipped_steps_excluded(self, history):
+        """Should not count skipped steps as executions"""
+        result = make_result([0.5])
+        result.step_results[0].skipped = True
+        history.record(result)
+        history.record(make_result([2.0], result_bytes=100))
+
+        stats = history.step_stats("Scrape")[0]
+
+        assert stats.runs == 1
+        assert stats.skipped == 1
+        assert stats.p50 == 2.0
+        assert stats.mean_bytes == 100
+
+    def test_since_and_scenarios(self, history):
+        """Should filter by start time and list scenarios"""
+        history.record(make_result([5.0]), started_at=1000.0)
+        history.record(make_result([1.0]), started_at=2000.0)
+        history.record(make_result([1.0], name="Other"), started_at=2000.0)
+
+        assert history.step_stats("Scrape", since=1500.0)[0].p99 == 1.0
+        assert history.scenarios() == [("Other", 1), ("Scrape", 2)]
+        assert history.step_stats("Missing") == []
+
+    def test_trend(self, history):
+        """Should group runs per day"""
+        day = 1_700_000_000.0
+        history.record(make_result([1.0]), started_at=day)
+        history.record(make_result([3.0], failed=1), started_at=day + 60)
+        history.record(make_result([2.0]), started_at=day + 3 * 86400)
+
+        trend = history.trend("Scrape")
+
+        assert len(trend) == 2
+        assert trend[0].runs == 2
+        assert trend[0].failure_rate == 0.5
+        assert trend[1].p50 == 2.0
+
+    def test_reopen(self, tmp_path):
+        """Should persist runs across connections"""
+        path = tmp_path / "history.db"
+        first = RunHistory(path)
+        run_id = first.record(make_result([1.0]))
+        first.close()
+
+        second = RunHistory(path)
+        assert run_id == 1
+        assert second.step_stats("Scrape")[0].runs == 1
+        second.close()
+
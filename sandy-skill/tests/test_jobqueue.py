@@ -0,0 +1,321 @@
+"""
+Tests for jobqueue.py
+"""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from jobqueue import MemoryJobQueue, SQLiteJobQueue, Worker
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_queue(request, tmp_path):
+    """Factory for both backends, sharing one clock"""
+    queues = []
+
+    def factory(clock):
+        if request.param == "memory":
+            queue = MemoryJobQueue(clock=clock)
+        else:
+            queue = SQLiteJobQueue(tmp_path / "queue.db", clock=clock)
+            queues.append(queue)
+        return queue
+
+    yield factory
+    for queue in queues:
+        queue.close()
+
+
+class TestJobQueue:
+    """Tests for queue semantics (both backends)"""
+
+    def test_fifo_lease(self, make_queue):
+        """Should lease the oldest queued job once"""
+        clock = FakeClock()
+        queue = make_queue(clock)
+        first = queue.enqueue("a.json", {"N": "1"})
+        clock.now += 1
+        queue.enqueue("b.json")
+
+        job = queue.lease("w1", 30)
+
+        assert job.id == first.id
+        assert job.variables == {"N": "1"}
+        assert job.status == "leased"
+        assert job.attempts == 1
+        assert queue.lease("w2", 30).scenario == "b.json"
+        assert queue.lease("w3", 30) is None
+
+    def test_idempotency_key(self, make_queue):
+        """Should return the existing job for a repeated key"""
+        queue = make_queue(FakeClock())
+        first = queue.enqueue("a.json", idempotency_key="k1")
+        second = queue.enqueue("a.json", idempotency_key="k1")
+
+        assert first.id == second.id
+        assert queue.counts()["queued"] == 1
+
+    def test_complete(self, make_queue):
+        """Should store the result of a completed job"""
+        queue = make_queue(FakeClock())
+        job = queue.enqueue("a.json")
+        queue.lease("w1", 30)
+
+        assert queue.complete(job.id, "w1", {"success": True}) is True
+        assert queue.get(job.id).status == "done"
+        assert queue.get(job.id).result == {"success": True}
+
+    def test_expired_lease_requeued(self, make_queue):
+        """Should hand a dead worker's job to another worker"""
+        clock = FakeClock()
+        queue = make_queue(clock)
+        job = queue.enqueue("a.json")
+        queue.lease("dead", 30)
+
+        clock.now += 31
+        leased = queue.lease("w2", 30)
+
+        assert leased.id == job.id
+        assert leased.attempts == 2
+        # The dead worker lost its lease
+        assert queue.complete(job.id, "dead", {}) is False
+        assert queue.heartbeat(job.id, "dead", 30) is False
+
+    def test_heartbeat_extends_lease(self, make_queue):
+        """Should keep a lease alive with heartbeats"""
+        clock = FakeClock()
+        queue = make_queue(clock)
+        job = queue.enqueue("a.json")
+        queue.lease("w1", 30)
+
+        clock.now += 20
+        assert queue.heartbeat(job.id, "w1", 30) is True
+        clock.now += 20
+
+        assert queue.lease("w2", 30) is None
+        assert queue.complete(job.id, "w1", {}) is True
+
+    def test_max_attempts(self, make_queue):
+        """Should fail a job whose leases keep expiring"""
+        clock = FakeClock()
+        queue = make_queue(clock)
+        job = queue.enqueue("a.json", max_attempts=2)
+
+        for _ in range(2):
+            assert queue.lease("w", 10) is not None
+            clock.now += 11
+
+        assert queue.lease("w", 10) is None
+        failed = queue.get(job.id)
+        assert failed.status == "failed"
+        assert "expired" in failed.error
+
+    def test_fail_with_retry(self, make_queue):
+        """Should re-queue on retryable failure while attempts remain"""
+        queue = make_queue(FakeClock())
+        job = queue.enqueue("a.json", max_attempts=2)
+
+        queue.lease("w", 10)
+        queue.fail(job.id, "w", "connection refused", retry=True)
+        assert queue.get(job.id).status == "queued"
+
+        queue.lease("w", 10)
+        queue.fail(job.id, "w", "connection refused", retry=True)
+        assert queue.get(job.id).status == "failed"
+
+    def test_counts(self, make_queue):
+        """Should count jobs per status"""
+        queue = make_queue(FakeClock())
+        queue.enqueue("a.json")
+        queue.enqueue("b.json")
+        queue.lease("w", 10)
+
+        assert queue.counts() == {"queued": 1, "leased": 1, "done": 0, "failed": 0}
+
+
+class TestSQLiteJobQueue:
+    """Tests specific to the SQLite backend"""
+
+    def test_wal_mode(self, tmp_path):
+        """Should open the database in WAL mode"""
+        queue = SQLiteJobQueue(tmp_path / "queue.db")
+        mode = queue._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        queue.close()
+        assert mode == "wal"
+
+    def test_shared_between_connections(self, tmp_path):
+        """Should never lease a job twice across connections"""
+        first = SQLiteJobQueue(tmp_path / "queue.db")
+        second = SQLiteJobQueue(tmp_path / "queue.db")
+        for i in range(10):
+            first.enqueue(f"{i}.json")
+
+        leased = []
+        while True:
+            job = first.lease("a", 30) or second.lease("b", 30)
+            if job is None:
+                break
+            leased.append(job.id)
+
+        first.close()
+        second.close()
+        assert len(leased) == len(set(leased)) == 10
+
+
+class TestWorker:
+    """Tests for Worker"""
+
+    def test_processes_jobs(self):
+        """Should complete successful jobs and fail unsuccessful ones"""
+        queue = MemoryJobQueue()
+        ok = queue.enqueue("ok.json")
+        bad = queue.enqueue("bad.json")
+
+        async def runner(job):
+            if job.scenario == "ok.json":
+                return {"success": True}
+            return {"success": False, "error": "step 2 failed"}
+
+        worker = Worker(queue, runner=runner, worker_id="w1")
+        processed = asyncio.run(worker.run(exit_when_empty=True))
+
+        assert processed == 2
+        assert queue.get(ok.id).status == "done"
+        assert queue.get(bad.id).status == "failed"
+        assert queue.get(bad.id).error == "step 2 failed"
+
+    def test_runner_exception_retried(self):
+        """Should re-queue jobs whose runner raised"""
+        queue = MemoryJobQueue()
+        job = queue.enqueue("a.json", max_attempts=2)
+        attempts = []
+
+        async def runner(job):
+            attempts.append(job.attempts)
+            if len(attempts) == 1:
+                raise ConnectionError("server down")
+            return {"success": True}
+
+        asyncio.run(Worker(queue, runner=runner).run(exit_when_empty=True))
+
+        assert attempts == [1, 2]
+        assert queue.get(job.id).status == "done"
+
+    def test_heartbeats_keep_long_jobs(self):
+        """Should renew the lease while a job runs"""
+        queue = MemoryJobQueue()
+        job = queue.enqueue("slow.json")
+
+        async def runner(job):
+            await asyncio.sleep(0.25)
+            return {"success": True}
+
+        worker = Worker(queue, runner=runner, lease_seconds=0.1)
+        asyncio.run(worker.run(exit_when_empty=True))
+
+        assert queue.get(job.id).status == "done"
+        assert queue.get(job.id).attempts == 1
+
+    def test_heartbeat_errors_retried(self):
+        """Should keep heartbeating after a failed heartbeat"""
+        queue = MemoryJobQueue()
+        job = queue.enqueue("slow.json")
+        heartbeat = queue.heartbeat
+        calls = []
+
+        def flaky_heartbeat(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return heartbeat(*args)
+        queue.heartbeat = flaky_heartbeat
+
+        async def runner(job):
+            await asyncio.sleep(0.25)
+            return {"success": True}
+
+        worker = Worker(queue, runner=runner, lease_seconds=0.15)
+        asyncio.run(worker.run(exit_when_empty=True))
+
+        assert len(calls) > 1
+        assert queue.get(job.id).status == "done"
+
+    def test_lost_lease_reported(self, capsys):
+        """Should report a result that could not be recorded"""
+        queue = MemoryJobQueue()
+        queue.enqueue("a.json")
+        queue.complete = lambda *args: False
+        summaries = []
+
+        async def runner(job):
+            return {"success": True}
+
+        worker = Worker(queue, runner=runner, on_complete=lambda job, summary: summaries.append(summary))
+        asyncio.run(worker.run(exit_when_empty=True))
+
+        assert summaries == [{"success": True, "lease_lost": True}]
+        assert "lease on job" in capsys.readouterr().err
+
+    def test_jobs_recorded_in_history(self, tmp_path, monkeypatch):
+        """Should record played jobs in the run history"""
+        from config import Config
+        from history import RunHistory
+
+        monkeypatch.chdir(tmp_path)
+        scenario = tmp_path / "wait.json"
+        scenario.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Wait"},
+            "steps": [{"step": 1, "tool": "sandy__wait", "params": {"duration": 0}}],
+        }))
+        queue = MemoryJobQueue()
+        queue.enqueue(str(scenario))
+
+        worker = Worker(queue, Config(servers={}, source="test"), record_history=True)
+        asyncio.run(worker.run(exit_when_empty=True))
+
+        history = RunHistory(tmp_path / ".sandy" / "history.db")
+        try:
+            assert history.scenarios() == [("Wait", 1)]
+        finally:
+            history.close()
+
+    def test_config_loader_called_per_job(self, tmp_path):
+        """Should resolve the config through config_loader before every job"""
+        from config import Config
+
+        scenario = tmp_path / "wait.json"
+        scenario.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Wait"},
+            "steps": [{"step": 1, "tool": "sandy__wait", "params": {"duration": 0}}],
+        }))
+        queue = MemoryJobQueue()
+        queue.enqueue(str(scenario))
+        queue.enqueue(str(scenario))
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return Config(servers={}, source="test")
+
+        worker = Worker(queue, config_loader=loader)
+        asyncio.run(worker.run(exit_when_empty=True))
+
+        assert len(loads) == 2
+        assert queue.counts()["done"] == 2
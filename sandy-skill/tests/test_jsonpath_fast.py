@@ -0,0 +1,120 @@
+"""
+Tests for jsonpath_fast.py
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from jsonpath_ng import parse as jsonpath_parse
+
+from jsonpath_fast import compile_path, extract_columns, FallbackRequired
+
+
+PATHS = [
+    "$.a", "$.a.b", "$[0]", "$[-1]", "$[5]", "$[*]", "$.*",
+    "$.items[*].title", "$.items[0].id", "$['a b']", '$["x"]',
+    "$.a[*]", "$.a[*].b", "$[*].id", "$.items[*].tags[0]",
+]
+
+DOCUMENTS = [
+    None, 5, "abc", [], {},
+    {"a": None}, {"a": {"b": [1, 2]}}, {"a": [{"b": 1}, {"c": 2}, {"b": None}]},
+    {"a": {"x": 1, "y": 2}}, {"a b": 1, "x": 2}, [1, 2, 3], [{"id": 7}, {"id": 8}],
+    {"items": [{"title": "t1", "id": 1, "tags": ["x"]}, {"title": "t2", "tags": []}, {"id": 3}]},
+    {"items": {"title": "solo"}},
+]
+
+
+class TestCompilePath:
+    """Tests for compile_path function"""
+
+    @pytest.mark.parametrize("path", PATHS)
+    def test_simple_paths_compile(self, path):
+        """Simple subset should compile"""
+        assert compile_path(path) is not None
+
+    @pytest.mark.parametrize("path", [
+        "$..id", "$.items[?(@.id > 1)]", "$.items[0:2]", "$.items[0,1]", "items", "$.a-b",
+    ])
+    def test_complex_paths_not_compiled(self, path):
+        """Anything outside the subset should be left to jsonpath_ng"""
+        assert compile_path(path) is None
+
+
+def reference_find(path, data):
+    """jsonpath_ng matches, or None if jsonpath_ng itself raises"""
+    try:
+        return [m.value for m in jsonpath_parse(path).find(data)]
+    except Exception:
+        return None
+
+
+class TestMatchesJsonpathNg:
+    """Compiled accessors must return exactly what jsonpath_ng returns"""
+
+    @pytest.mark.parametrize("path", PATHS)
+    @pytest.mark.parametrize("data", DOCUMENTS, ids=lambda d: repr(d)[:20])
+    def test_find_equivalent(self, path, data):
+        expected = reference_find(path, data)
+        compiled = compile_path(path)
+        try:
+            assert compiled.find(data) == expected
+        except FallbackRequired:
+            pass
+
+    @pytest.mark.parametrize("path", PATHS)
+    @pytest.mark.parametrize("data", DOCUMENTS, ids=lambda d: repr(d)[:20])
+    def test_first_equivalent(self, path, data):
+        matches = reference_find(path, data)
+        compiled = compile_path(path)
+        try:
+            value, found = compiled.first(data)
+        except FallbackRequired:
+            return
+        assert found == bool(matches)
+        assert value == (matches[0] if matches else None)
+
+    def test_string_index_falls_back(self):
+        """Indexing into a string is left to jsonpath_ng"""
+        with pytest.raises(FallbackRequired):
+            compile_path("$[0]").first("abc")
+
+
+class TestExtractColumns:
+    """Tests for extract_columns function"""
+
+    def test_split_at_wildcard(self):
+        """Should split into row source and per-row accessor"""
+        prefix, suffix = compile_path("$.items[*].author.name").split_at_wildcard()
+        assert prefix.expression == "$.items"
+        assert suffix.expression == "$.author.name"
+
+    def test_parallel_columns(self):
+        """Columns over the same list should align row by row"""
+        data = {"items": [{"t": 1, "u": "a"}, {"t": 2}, {"u": "c"}]}
+        columns = extract_columns(data, {
+            "t": compile_path("$.items[*].t"),
+            "u": compile_path("$.items[*].u"),
+        })
+        assert columns == {"t": [1, 2, None], "u": ["a", None, "c"]}
+
+    def test_separate_row_sources(self):
+        """Columns over different lists are grouped independently"""
+        data = {"a": [{"x": 1}], "b": [{"y": 2}, {"y": 3}]}
+        columns = extract_columns(data, {
+            "x": compile_path("$.a[*].x"),
+            "y": compile_path("$.b[*].y"),
+        })
+        assert columns == {"x": [1], "y": [2, 3]}
+
+    def test_missing_row_source(self):
+        """A missing list yields empty columns"""
+        assert extract_columns({}, {"x": compile_path("$.a[*].x")}) == {"x": []}
+
+    def test_requires_wildcard(self):
+        """Paths without [*] are rejected"""
+        with pytest.raises(ValueError):
+            extract_columns({}, {"x": compile_path("$.a")})
@@ -0,0 +1,176 @@
+"""
+Tests for library.py
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from library import ScenarioIndex, find_scenarios, tokenize
+
+
+def write_scenario(path, name, description="", tools=None, variables=None):
+    """Helper to write a minimal scenario file"""
+    tools = tools or ["mcp__t__t"]
+    data = {
+        "version": "2.1",
+        "metadata": {"name": name, "description": description},
+        "variables": variables or {},
+        "steps": [
+            {"step": i + 1, "tool": tool, "params": {}}
+            for i, tool in enumerate(tools)
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+class TestTokenize:
+    """Tests for tokenize function"""
+
+    def test_splits_tool_names(self):
+        """Should split MCP tool names on separators"""
+        assert tokenize("mcp__chrome-devtools__navigate_page") == [
+            "mcp", "chrome", "devtools", "navigate", "page"
+        ]
+
+    def test_lowercases(self):
+        """Should lowercase terms"""
+        assert tokenize("HN Scrape") == ["hn", "scrape"]
+
+
+class TestScenarioIndex:
+    """Tests for ScenarioIndex"""
+
+    @pytest.fixture
+    def library(self, tmp_path):
+        root = tmp_path / "scenarios"
+        write_scenario(
+            root / "hn.json", "HN Scrape to DB", "Scrape Hacker News top stories",
+            tools=["mcp__chrome-devtools__navigate_page", "mcp__supabase__query"],
+            variables={"TARGET_URL": ""},
+        )
+        write_scenario(
+            root / "issue.json", "Create GitHub Issue", "Open an issue",
+            tools=["mcp__github__create_issue"],
+        )
+        write_scenario(root / "nested" / "slack.json", "Notify Slack", tools=["mcp__slack__post_message"])
+        return root
+
+    def test_search_by_name(self, library, tmp_path):
+        """Should rank by name match"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        matches = index.search("scrape")
+        assert matches[0].name == "HN Scrape to DB"
+
+    def test_search_by_tool_and_variable(self, library, tmp_path):
+        """Should match tool and variable names"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        assert index.search("supabase")[0].name == "HN Scrape to DB"
+        assert index.search("target_url")[0].name == "HN Scrape to DB"
+        assert index.search("github")[0].name == "Create GitHub Issue"
+
+    def test_prefix_match(self, library, tmp_path):
+        """Should match query terms by prefix"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        assert index.search("navig")[0].name == "HN Scrape to DB"
+
+    def test_all_terms_outrank_partial(self, library, tmp_path):
+        """Documents matching every query term should rank first"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        matches = index.search("issue github")
+        assert matches[0].name == "Create GitHub Issue"
+
+    def test_indexes_subdirectories(self, library, tmp_path):
+        """Should index nested directories"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        assert index.search("slack")[0].path.endswith("slack.json")
+
+    def test_no_match(self, library, tmp_path):
+        """Should return empty list when nothing matches"""
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        index.refresh()
+
+        assert index.search("nonexistent") == []
+
+    def test_persist_and_reload(self, library, tmp_path):
+        """Should reload a saved index without re-reading files"""
+        index_path = tmp_path / "index.json"
+        ScenarioIndex(library, index_path).refresh()
+
+        index = ScenarioIndex(library, index_path)
+        assert index.load() is True
+        stats = index.refresh()
+
+        assert stats.unchanged == 3
+        assert not stats.changed
+        assert index.search("slack")[0].name == "Notify Slack"
+
+    def test_incremental_refresh(self, library, tmp_path):
+        """Should pick up added, modified and removed files"""
+        index_path = tmp_path / "index.json"
+        index = ScenarioIndex(library, index_path)
+        index.refresh()
+
+        write_scenario(library / "new.json", "Weather Report")
+        write_scenario(library / "issue.json", "Close GitHub Issue", "Close an issue and add more text")
+        os.utime(library / "issue.json", ns=(1, 1))
+        (library / "nested" / "slack.json").unlink()
+
+        stats = index.refresh()
+
+        assert stats.added == 1
+        assert stats.updated == 1
+        assert stats.removed == 1
+        assert index.search("weather")[0].name == "Weather Report"
+        assert index.search("close")[0].name == "Close GitHub Issue"
+        assert index.search("slack") == []
+
+    def test_invalid_file_skipped(self, library, tmp_path):
+        """Should skip unparsable files without failing"""
+        (library / "broken.json").write_text("{not json")
+        index = ScenarioIndex(library, tmp_path / "index.json")
+        stats = index.refresh()
+
+        assert stats.added == 4
+        assert index.documents["broken.json"].invalid is True
+
+    def test_version_mismatch_not_loaded(self, library, tmp_path):
+        """Should ignore an index written by another version"""
+        index_path = tmp_path / "index.json"
+        ScenarioIndex(library, index_path).refresh()
+
+        data = json.loads(index_path.read_text())
+        data["version"] = -1
+        index_path.write_text(json.dumps(data))
+
+        assert ScenarioIndex(library, index_path).load() is False
+
+
+class TestFindScenarios:
+    """Tests for find_scenarios function"""
+
+    def test_find(self, tmp_path):
+        """Should build the index on first use and return matches"""
+        root = tmp_path / "scenarios"
+        write_scenario(root / "a.json", "Query Database", tools=["mcp__supabase__query"])
+
+        matches = find_scenarios("database", root=root, index_path=tmp_path / "index.json")
+
+        assert len(matches) == 1
+        assert matches[0].path == str((root / "a.json").resolve())
+        assert (tmp_path / "index.json").exists()
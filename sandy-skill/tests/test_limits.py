@@ -0,0 +1,284 @@
+"""
+Tests for limits.py
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from limits import AdaptiveConcurrency, ServerLimiter, TokenBucket, get_limiter, split_limits
+from catalog import server_config_hash
+from clients.base import MCPClient, ToolResult
+from config import Config, ConfigParseError, ServerConfig, load_config_from_path
+from scenario import parse_scenario
+from player import ScenarioPlayer
+
+
+class SlowClient(MCPClient):
+    """Tracks peak concurrency of call_tool"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def transport_type(self):
+        return "fake"
+
+    @property
+    def server_name(self):
+        return "srv"
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def call_tool(self, tool_name, params):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        return ToolResult(success=True, data={"ok": True})
+
+    async def list_tools(self):
+        return ["echo"]
+
+
+class TestTokenBucket:
+    """Tests for token bucket pacing"""
+
+    def test_burst_then_paced(self):
+        """Should allow a burst, then pace calls at the rate"""
+        async def run_test():
+            bucket = TokenBucket(rate=20, burst=2)
+            start = time.monotonic()
+            waits = [await bucket.acquire() for _ in range(4)]
+            return waits, time.monotonic() - start
+
+        waits, elapsed = asyncio.run(run_test())
+
+        assert waits[0] == pytest.approx(0, abs=0.01)
+        assert waits[1] == pytest.approx(0, abs=0.01)
+        assert elapsed >= 0.09  # Two tokens at 20/s
+        assert waits[3] > 0
+
+    def test_default_burst(self):
+        """Should default burst to ceil(rate), at least 1"""
+        assert TokenBucket(rate=2.5).burst == 3
+        assert TokenBucket(rate=0.5).burst == 1
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestServerLimiter:
+    """Tests for concurrency limits"""
+
+    def test_max_concurrency(self):
+        """Should cap calls in flight"""
+        async def run_test():
+            limiter = ServerLimiter(max_concurrency=2)
+            client = SlowClient()
+
+            async def call():
+                async with limiter.slot():
+                    await client.call_tool("echo", {})
+
+            await asyncio.gather(*(call() for _ in range(6)))
+            return client.peak
+
+        assert asyncio.run(run_test()) == 2
+
+    def test_get_limiter(self):
+        """Should share one limiter per server and loop"""
+        async def run_test():
+            limited = ServerConfig(name="srv", command="x", max_concurrency=1)
+            return get_limiter(limited), get_limiter(limited), get_limiter(ServerConfig(name="free"))
+
+        first, second, none = asyncio.run(run_test())
+
+        assert first is second
+        assert none is None
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveConcurrency:
+    """Tests for the AIMD controller"""
+
+    def test_slow_start_then_additive(self):
+        """Should double per round, then grow by one per round after a back-off"""
+        clock = FakeClock()
+        aimd = AdaptiveConcurrency(max_limit=64, clock=clock)
+        for _ in range(7):
+            aimd.in_flight += 1
+            aimd.release(0.1)
+        assert aimd.limit == 8
+
+        aimd.in_flight += 1
+        aimd.release(0.1, ok=False)
+        assert aimd.limit == 4
+
+        for _ in range(4):
+            aimd.in_flight += 1
+            aimd.release(0.1)
+        assert 4.9 < aimd.limit < 5.1
+
+    def test_latency_spike_and_cooldown(self):
+        """Should back off on slow calls, once per baseline latency"""
+        clock = FakeClock()
+        aimd = AdaptiveConcurrency(initial=16, clock=clock)
+        aimd.in_flight = 3
+        aimd.release(0.1)
+        aimd.release(1.0)
+        assert aimd.limit == pytest.approx(8.5)
+        aimd.release(1.0, ok=False)  # Same round: no second cut
+        assert aimd.limit == pytest.approx(8.5)
+
+        clock.now += 1
+        aimd.in_flight = 1
+        aimd.release(None, ok=False)  # Call never ran: no update
+        assert aimd.limit == pytest.approx(8.5)
+
+    def test_bounds(self):
+        """Should stay within min and max limits"""
+        aimd = AdaptiveConcurrency(max_limit=2, clock=FakeClock())
+        for _ in range(5):
+            aimd.in_flight += 1
+            aimd.release(0.1)
+        assert aimd.limit == 2
+
+        for i in range(5):
+            aimd._last_decrease = float("-inf")
+            aimd.in_flight += 1
+            aimd.release(0.1, ok=False)
+        assert aimd.limit == 1
+
+    def test_limits_in_flight(self):
+        """Should queue callers beyond the current limit"""
+        async def run_test():
+            limiter = ServerLimiter(max_concurrency=4, adaptive=True)
+            client = SlowClient()
+
+            async def call():
+                async with limiter.slot():
+                    await client.call_tool("echo", {})
+
+            await asyncio.gather(*(call() for _ in range(12)))
+            return client.peak, limiter.adaptive.limit
+
+        peak, limit = asyncio.run(run_test())
+
+        assert 1 < peak <= 4
+        assert limit == 4
+
+    def test_failure_inside_slot(self):
+        """Should count exceptions raised in the slot as errors"""
+        async def run_test():
+            limiter = ServerLimiter(adaptive=True)
+            limiter.adaptive.limit = 8.0
+            with pytest.raises(RuntimeError):
+                async with limiter.slot():
+                    raise RuntimeError("429")
+            return limiter.adaptive
+
+        aimd = asyncio.run(run_test())
+
+        assert aimd.limit == 4
+        assert aimd.in_flight == 0
+
+
+class TestConfigLimits:
+    """Tests for limit settings in config files"""
+
+    def test_parse(self, tmp_path):
+        """Should read limits from server entries"""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"servers": {
+            "slack": {"command": "npx", "max_concurrency": 2, "rate_limit": "1.5", "rate_burst": 3,
+                      "adaptive_concurrency": True},
+            "plain": {"command": "npx"},
+        }}))
+
+        config = load_config_from_path(path)
+
+        assert config.servers["slack"].max_concurrency == 2
+        assert config.servers["slack"].rate_limit == 1.5
+        assert config.servers["slack"].rate_burst == 3
+        assert config.servers["slack"].adaptive_concurrency is True
+        assert config.servers["plain"].rate_limit is None
+
+    def test_invalid(self, tmp_path):
+        """Should reject non-positive limits"""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"servers": {"slack": {"command": "npx", "rate_limit": 0}}}))
+
+        with pytest.raises(ConfigParseError, match="slack"):
+            load_config_from_path(path)
+
+    def test_catalog_hash_ignores_limits(self):
+        """Should keep cached tool catalogs when only limits change"""
+        plain = ServerConfig(name="srv", command="npx")
+        limited = ServerConfig(name="srv", command="npx", max_concurrency=4, rate_limit=2)
+        assert server_config_hash(plain) == server_config_hash(limited)
+
+
+    def test_split_between_workers(self):
+        """Should give each worker process an equal share of the limits"""
+        config = Config(servers={
+            "slack": ServerConfig(name="slack", command="npx", max_concurrency=4, rate_limit=1, rate_burst=4),
+            "db": ServerConfig(name="db", command="db", max_concurrency=2),
+            "fs": ServerConfig(name="fs", command="fs"),
+        }, source="test")
+
+        split = split_limits(config, 4)
+
+        slack = split.servers["slack"]
+        assert (slack.max_concurrency, slack.rate_limit, slack.rate_burst) == (1, 0.25, 1)
+        assert split.servers["db"].max_concurrency == 1
+        assert split.servers["fs"] is config.servers["fs"]
+        assert split_limits(config, 1) is config
+
+
+class TestPlayerLimits:
+    """Tests for limits enforced across plays"""
+
+    def test_shared_limit_and_wait_time(self):
+        """Should limit concurrent plays together and report wait time"""
+        config = Config(
+            servers={"srv": ServerConfig(name="srv", command="x", max_concurrency=1)},
+            source="test",
+        )
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Demo"},
+            "steps": [{"step": 1, "tool": "mcp__srv__echo", "params": {}}],
+        })
+        client = SlowClient()
+
+        async def run_test():
+            clients = {"srv": client}
+            players = [ScenarioPlayer(scenario, config, clients=clients) for _ in range(3)]
+            return await asyncio.gather(*(p.execute() for p in players))
+
+        results = asyncio.run(run_test())
+
+        assert all(r.success for r in results)
+        assert client.peak == 1
+        waits = sorted(r.step_results[0].wait_time for r in results)
+        assert waits[0] == pytest.approx(0, abs=0.01)
+        assert waits[2] >= 0.03
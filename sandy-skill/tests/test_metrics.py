@@ -0,0 +1,233 @@
+"""
+Tests for metrics.py
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import metrics
+from metrics import MetricsRegistry, payload_size, start_metrics_server, tool_labels
+from clients.base import MCPClient, ToolResult
+from scenario import parse_scenario
+from player import ScenarioPlayer
+
+
+class FakeClient(MCPClient):
+    """Minimal transport for instrumentation tests"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    @property
+    def transport_type(self):
+        return "fake"
+
+    @property
+    def server_name(self):
+        return "srv"
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def call_tool(self, tool_name, params):
+        if self.fail:
+            raise RuntimeError("down")
+        return ToolResult(success=True, data={"ok": True})
+
+    async def list_tools(self):
+        return ["echo"]
+
+
+@pytest.fixture
+def enabled():
+    """Enable the process-wide registry for one test"""
+    metrics.REGISTRY.reset()
+    metrics.REGISTRY.enabled = True
+    yield metrics.REGISTRY
+    metrics.REGISTRY.enabled = False
+    metrics.REGISTRY.reset()
+
+
+class TestRegistry:
+    """Tests for metric types and text exposition"""
+
+    def test_counter_and_gauge(self):
+        """Should render labelled values"""
+        registry = MetricsRegistry()
+        counter = registry.counter("c_total", "A counter", ("server",))
+        gauge = registry.gauge("g", "A gauge")
+        counter.inc(server="a")
+        counter.inc(2, server="a")
+        gauge.set(5)
+        gauge.dec()
+
+        text = registry.render()
+
+        assert "# TYPE c_total counter" in text
+        assert 'c_total{server="a"} 3' in text
+        assert "g 4" in text
+
+    def test_histogram_buckets(self):
+        """Should render cumulative buckets, sum and count"""
+        registry = MetricsRegistry()
+        hist = registry.histogram("h_seconds", "A histogram", ("tool",), buckets=(0.1, 1.0))
+        hist.observe(0.05, tool="x")
+        hist.observe(0.5, tool="x")
+        hist.observe(5, tool="x")
+
+        text = registry.render()
+
+        assert 'h_seconds_bucket{tool="x",le="0.1"} 1' in text
+        assert 'h_seconds_bucket{tool="x",le="1"} 2' in text
+        assert 'h_seconds_bucket{tool="x",le="+Inf"} 3' in text
+        assert 'h_seconds_sum{tool="x"} 5.55' in text
+        assert 'h_seconds_count{tool="x"} 3' in text
+
+    def test_escape_and_get_or_create(self):
+        """Should escape label values and reuse metrics by name"""
+        registry = MetricsRegistry()
+        counter = registry.counter("c_total", "A counter", ("name",))
+        assert registry.counter("c_total", "A counter", ("name",)) is counter
+        with pytest.raises(ValueError):
+            registry.gauge("c_total", "Not a gauge")
+
+        counter.inc(name='say "hi"\n')
+        assert 'c_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+    def test_helpers(self):
+        """Should split tool names and measure payloads"""
+        assert tool_labels("mcp__chrome-devtools__navigate_page") == ("chrome-devtools", "navigate_page")
+        assert tool_labels("sandy__wait") == ("sandy", "wait")
+        assert payload_size(None) == 0
+        assert payload_size("héllo") == 6
+        assert payload_size({"a": 1}) == len('{"a": 1}')
+
+
+class TestClientInstrumentation:
+    """Tests for the MCPClient base class hooks"""
+
+    def test_disabled_records_nothing(self):
+        """Should not record while collection is disabled"""
+        metrics.REGISTRY.reset()
+        asyncio.run(FakeClient().call_tool("echo", {}))
+        assert metrics.CALL_DURATION.count(server="srv", tool="echo", outcome="success") == 0
+
+    def test_call_metrics(self, enabled):
+        """Should record latency, bytes and outcome per call"""
+        async def run_test():
+            client = FakeClient()
+            await client.connect()
+            assert metrics.CONNECTIONS.value(server="srv", transport="fake") == 1
+            await client.call_tool("echo", {"q": 1})
+            await client.disconnect()
+            await client.disconnect()  # Second disconnect is not counted
+
+            with pytest.raises(RuntimeError):
+                await FakeClient(fail=True).call_tool("echo", {})
+
+        asyncio.run(run_test())
+
+        assert metrics.CALL_DURATION.count(server="srv", tool="echo", outcome="success") == 1
+        assert metrics.CALL_DURATION.count(server="srv", tool="echo", outcome="error") == 1
+        assert metrics.BYTES.value(server="srv", direction="sent") == len('{"q": 1}') + 2
+        assert metrics.BYTES.value(server="srv", direction="received") == len('{"ok": true}')
+        assert metrics.CALLS_IN_FLIGHT.value(server="srv") == 0
+        assert metrics.CONNECTIONS.value(server="srv", transport="fake") == 0
+
+    def test_super_calling_subclass_counted_once(self, enabled):
+        """Should count a call once when a subclass override calls super()"""
+        class LoggingClient(FakeClient):
+            async def call_tool(self, tool_name, params):
+                return await super().call_tool(tool_name, params)
+
+        asyncio.run(LoggingClient().call_tool("echo", {}))
+
+        assert metrics.CALL_DURATION.count(server="srv", tool="echo", outcome="success") == 1
+        assert metrics.BYTES.value(server="srv", direction="received") == len('{"ok": true}')
+
+
+class TestPlayerInstrumentation:
+    """Tests for ScenarioPlayer step metrics"""
+
+    def test_step_metrics(self, enabled):
+        """Should record step latency by status and completed plays"""
+        class MockConfig:
+            servers = {}
+            source = "test"
+
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Demo"},
+            "steps": [
+                {"step": 1, "tool": "sandy__wait", "params": {"seconds": 0}},
+                {"step": 2, "tool": "sandy__log", "params": {}, "condition": "false"},
+            ],
+        })
+
+        result = asyncio.run(ScenarioPlayer(scenario, MockConfig()).execute())
+
+        assert result.success
+        assert metrics.STEP_DURATION.count(server="sandy", tool="wait", status="success") == 1
+        assert metrics.STEP_DURATION.count(server="sandy", tool="log", status="skipped") == 1
+        assert metrics.PLAYS.value(scenario="Demo", status="success") == 1
+
+    def test_result_size_only_while_enabled(self):
+        """Should measure result sizes only while metrics are on"""
+        class MockConfig:
+            servers = {}
+            source = "test"
+
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Demo"},
+            "steps": [{"step": 1, "tool": "sandy__wait", "params": {"seconds": 0}}],
+        })
+
+        def play():
+            return asyncio.run(ScenarioPlayer(scenario, MockConfig()).execute()).step_results[0]
+
+        assert play().result_bytes is None
+        metrics.REGISTRY.enabled = True
+        try:
+            assert play().result_bytes is not None
+        finally:
+            metrics.REGISTRY.enabled = False
+            metrics.REGISTRY.reset()
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint"""
+
+    def test_serves_metrics(self, enabled):
+        """Should answer GET /metrics with the text exposition"""
+        async def run_test():
+            metrics.PLAYS.inc(scenario="Demo", status="success")
+            server = await start_metrics_server(0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async def get(path):
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                    await writer.drain()
+                    data = await reader.read()
+                    writer.close()
+                    return data.decode()
+
+                return await get("/metrics"), await get("/other")
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        body, missing = asyncio.run(run_test())
+
+        assert body.startswith("HTTP/1.1 200 OK")
+        assert "text/plain; version=0.0.4" in body
+        assert 'sandy_plays_total{scenario="Demo",status="success"} 1' in body
+        assert missing.startswith("HTTP/1.1 404")
@@ -0,0 +1,174 @@
+"""
+Tests for optimizer.py
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from optimizer import optimize_scenario
+from scenario import ScenarioValidationError
+
+
+EVAL = "mcp__chrome-devtools__evaluate_script"
+
+
+def scenario(steps, variables=None):
+    return {
+        "version": "2.1",
+        "metadata": {"name": "Optimize"},
+        "variables": variables or {},
+        "steps": steps,
+    }
+
+
+def tools(optimized):
+    return [s["tool"] for s in optimized["steps"]]
+
+
+class TestPasses:
+    """Tests for the individual rewrite passes"""
+
+    def test_adjacent_waits_merged(self):
+        """Should merge adjacent sandy__wait steps into one"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__chrome-devtools__click", "params": {"uid": "a"}},
+            {"step": 2, "tool": "sandy__wait", "params": {"seconds": 1}},
+            {"step": 3, "tool": "sandy__wait", "params": {"duration": 0.5}},
+        ]))
+
+        assert optimized["steps"][1] == {"step": 2, "tool": "sandy__wait", "params": {"seconds": 1.5}}
+        assert len(optimized["steps"]) == 2
+        assert report.rewrites[0].pass_name == "merge_waits"
+
+    def test_wait_before_probe_folded(self):
+        """Should fold fixed waits before a readiness probe into its timeout"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__chrome-devtools__navigate_page", "params": {"url": "u"}, "wait_after": 2.0},
+            {"step": 2, "tool": "sandy__wait_for_element", "params": {"selector": "#app"}},
+            {"step": 3, "tool": "sandy__wait", "params": {"seconds": 10}},
+            {"step": 4, "tool": "sandy__wait_until", "params": {"expression": "window.ok", "timeout": 2}},
+            {"step": 5, "tool": "sandy__wait", "params": {"seconds": 3}},
+            {"step": 6, "tool": "mcp__chrome-devtools__wait_for", "params": {"text": "Done", "timeout": 5000}},
+        ]))
+
+        assert "wait_after" not in optimized["steps"][0]
+        assert "sandy__wait" not in tools(optimized)
+        assert [s["params"]["timeout"] for s in optimized["steps"][1:]] == [12, 12, 8000]
+        assert report.saved_wait == 15.0
+
+    def test_wait_before_unknown_timeout_hinted(self):
+        """Should keep a wait before a probe whose timeout is the server default"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "sandy__wait", "params": {"seconds": 3}},
+            {"step": 2, "tool": "mcp__chrome-devtools__wait_for", "params": {"text": "Done"}},
+        ]))
+
+        assert tools(optimized) == ["sandy__wait", "mcp__chrome-devtools__wait_for"]
+        assert report.rewrites == []
+        assert "explicit timeout" in report.hints[0]
+
+    def test_other_waits_hinted(self):
+        """Should keep fixed waits without a probe and report them as hints"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__chrome-devtools__navigate_page", "params": {"url": "u"}, "wait_after": 2.0},
+            {"step": 2, "tool": "mcp__chrome-devtools__take_snapshot", "params": {}},
+        ]))
+
+        assert optimized["steps"][0]["wait_after"] == 2.0
+        assert report.rewrites == []
+        assert report.hints and report.hints[0].startswith("step 1:")
+
+    def test_unused_reads_dropped(self):
+        """Should drop read-only steps that capture nothing, keeping referenced ones"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__chrome-devtools__list_pages", "params": {}},
+            {"step": 2, "id": "page", "tool": "mcp__claude-in-chrome__get_page_text", "params": {},
+             "output": {"text": "$"}},
+            {"step": 3, "tool": "mcp__chrome-devtools__take_snapshot", "params": {}},
+        ]))
+
+        assert tools(optimized) == ["mcp__claude-in-chrome__get_page_text", "mcp__chrome-devtools__take_snapshot"]
+        assert report.step_map == {2: 1, 3: 2}
+
+    def test_static_conditions_hoisted(self):
+        """Should resolve conditions on fixed variables and leave runtime ones"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__a__x", "params": {}, "condition": "{{MODE}} == 'full'"},
+            {"step": 2, "tool": "mcp__a__y", "params": {}, "condition": "{{MODE}} == 'quick'"},
+            {"step": 3, "tool": "mcp__a__z", "params": {}, "condition": "{{search.count}} > 0"},
+        ], variables={"MODE": "quick"}), variables={"MODE": "full"})
+
+        assert [(s["tool"], s.get("condition")) for s in optimized["steps"]] == [
+            ("mcp__a__x", None),
+            ("mcp__a__z", "{{search.count}} > 0"),
+        ]
+        assert len(report.rewrites) == 2
+
+    def test_defaults_not_hoisted(self):
+        """Should not hoist on scenario defaults, which --var can override"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": "mcp__a__x", "params": {}, "condition": "{{MODE}} == 'full'"},
+        ], variables={"MODE": "quick"}))
+
+        assert optimized["steps"][0]["condition"] == "{{MODE}} == 'full'"
+        assert report.rewrites == []
+
+    def test_scripts_grouped_for_fusion(self):
+        """Should move a script step past independent file reads to join a script run"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": EVAL, "params": {"function": "() => 1"}},
+            {"step": 2, "id": "f", "tool": "claude__read", "params": {"file_path": "a.txt"}, "output": {"c": "$"},
+             "on_error": "skip"},
+            {"step": 3, "tool": EVAL, "params": {"function": "() => 2"}},
+        ]))
+
+        assert tools(optimized) == [EVAL, EVAL, "claude__read"]
+        assert report.step_map == {1: 1, 3: 2, 2: 3}
+
+    @pytest.mark.parametrize("read", [
+        {"tool": "claude__read", "params": {"file_path": "a.txt"}},
+        {"tool": "mcp__claude-in-chrome__get_page_text", "params": {}, "on_error": "skip"},
+    ])
+    def test_script_not_moved_past_stopping_or_browser_read(self, read):
+        """Should not move a script past a read that can stop the play or sees the page"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": EVAL, "params": {"function": "() => 1"}},
+            {"step": 2, "id": "f", **read, "output": {"c": "$"}},
+            {"step": 3, "tool": EVAL, "params": {"function": "() => 2"}},
+        ]))
+
+        assert tools(optimized)[2] == EVAL
+        assert report.rewrites == []
+
+    def test_dependent_script_not_moved(self):
+        """Should not move a script step past a step it reads from"""
+        optimized, report = optimize_scenario(scenario([
+            {"step": 1, "tool": EVAL, "params": {"function": "() => 1"}},
+            {"step": 2, "id": "f", "tool": "claude__read", "params": {"file_path": "a.txt"}, "output": {"c": "$"}},
+            {"step": 3, "tool": EVAL, "params": {"function": "() => '{{f.c}}'"}},
+        ]))
+
+        assert tools(optimized) == [EVAL, "claude__read", EVAL]
+        assert report.rewrites == []
+
+    def test_skipped_passes(self):
+        """Should only run the selected passes and reject unknown ones"""
+        data = scenario([
+            {"step": 1, "tool": "sandy__wait", "params": {"seconds": 1}},
+            {"step": 2, "tool": "sandy__wait", "params": {"seconds": 1}},
+        ])
+
+        optimized, _ = optimize_scenario(data, passes=["reorder"])
+        assert len(optimized["steps"]) == 2
+
+        with pytest.raises(ValueError):
+            optimize_scenario(data, passes=["inline_everything"])
+
+    def test_invalid_scenario(self):
+        """Should raise ScenarioValidationError for invalid input"""
+        with pytest.raises(ScenarioValidationError):
+            optimize_scenario({"version": "2.1", "steps": [{"step": 1}]})
+
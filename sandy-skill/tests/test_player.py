@@ -181,11 +181,98 @@ class TestOutputExtraction:
 
         assert player.step_outputs["step1"]["missing"] is None
 
+    def test_extract_complex_path_falls_back(self):
+        """Paths outside the fast-path subset should use jsonpath_ng"""
+        player = self.create_player()
+
+        data = {"a": {"b": {"id": 5}}}
+        player._extract_output("step1", {"deep_id": "$..id"}, data)
+
+        assert player.step_outputs["step1"]["deep_id"] == 5
+
+    def test_extract_string_index_falls_back(self):
+        """Data shapes the fast path defers should match jsonpath_ng"""
+        player = self.create_player()
+
+        player._extract_output("step1", {"first_char": "$.name[0]"}, {"name": "abc"})
+
+        assert player.step_outputs["step1"]["first_char"] == "a"
+
+    def test_extract_all_mode(self):
+        """mode=all should return every match"""
+        player = self.create_player()
+
+        data = {"items": [{"title": "a"}, {"x": 1}, {"title": "c"}]}
+        player._extract_output("step1", {"titles": {"path": "$.items[*].title", "mode": "all"}}, data)
+
+        assert player.step_outputs["step1"]["titles"] == ["a", "c"]
+
+    def test_extract_count_mode(self):
+        """mode=count should return the number of matches"""
+        player = self.create_player()
+
+        data = {"items": [{"id": 1}, {"id": 2}, {"id": 3}]}
+        player._extract_output("step1", {"n": {"path": "$.items[*]", "mode": "count"}}, data)
+
+        assert player.step_outputs["step1"]["n"] == 3
+
+    def test_extract_column_mode_aligned(self):
+        """mode=column should produce parallel columns with None for gaps"""
+        player = self.create_player()
+
+        data = {"items": [
+            {"title": "a", "url": "u1"},
+            {"title": "b"},
+            {"title": "c", "url": "u3"},
+        ]}
+        player._extract_output("step1", {
+            "titles": {"path": "$.items[*].title", "mode": "column"},
+            "urls": {"path": "$.items[*].url", "mode": "column"},
+            "first": "$.items[0].title",
+        }, data)
+
+        outputs = player.step_outputs["step1"]
+        assert outputs["titles"] == ["a", "b", "c"]
+        assert outputs["urls"] == ["u1", None, "u3"]
+        assert outputs["first"] == "a"
+        assert list(outputs) == ["titles", "urls", "first"]
+
+    def test_extract_column_mode_fallback_aligned(self):
+        """mode=column should keep None padding when jsonpath_ng evaluates the rows"""
+        player = self.create_player()
+
+        # Indexing into a string makes the fast path fall back
+        data = {"items": [
+            {"name": "a", "code": "xyz"},
+            {"name": "b"},
+            {"name": "c", "code": ["q"]},
+        ]}
+        player._extract_output("step1", {
+            "codes": {"path": "$.items[*].code[0]", "mode": "column"},
+            "names": {"path": "$.items[*].name", "mode": "column"},
+            "ids": {"path": "$.items[*]..id", "mode": "column"},
+        }, data)
+
+        outputs = player.step_outputs["step1"]
+        assert outputs["names"] == ["a", "b", "c"]
+        assert len(outputs["codes"]) == 3
+        assert outputs["codes"][1:] == [None, "q"]
+        assert outputs["ids"] == [None, None, None]
+
+    def test_extract_all_mode_complex_path(self):
+        """mode=all should also work through the jsonpath_ng fallback"""
+        player = self.create_player()
+
+        data = {"a": {"id": 1, "b": {"id": 2}}}
+        player._extract_output("step1", {"ids": {"path": "$..id", "mode": "all"}}, data)
+
+        assert sorted(player.step_outputs["step1"]["ids"]) == [1, 2]
+
 
 class TestConditionEvaluation:
     """Tests for condition evaluation"""
 
-    def create_player(self, variables=None, step_outputs=None):
+    def create_player(self, variables=None, step_outputs=None, options=None):
         """Helper to create a player"""
         scenario = parse_scenario({
             "version": "2.1",
@@ -198,7 +285,7 @@ class TestConditionEvaluation:
             servers = {}
             source = "test"
 
-        player = ScenarioPlayer(scenario, MockConfig(), PlayerOptions())
+        player = ScenarioPlayer(scenario, MockConfig(), options or PlayerOptions())
         if step_outputs:
             player.step_outputs = step_outputs
         return player
@@ -234,6 +321,46 @@ class TestConditionEvaluation:
         # Empty string after substitution evaluates to falsy
         assert player._evaluate_condition("{{step1.value}}") is False
 
+    def test_typed_comparison(self):
+        """Should compare step output values numerically"""
+        player = self.create_player(
+            variables={"MIN": "5"},
+            step_outputs={"search": {"count": 12, "items": ["a", "b"]}},
+        )
+        assert player._evaluate_condition("{{search.count}} > {{MIN}}") is True
+        assert player._evaluate_condition("len({{search.items}}) == 2 and {{search.count}} < 20") is True
+        assert player._evaluate_condition('"c" in {{search.items}}') is False
+
+    def test_conditions_compiled_once(self):
+        """Should compile step conditions when the player is created"""
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Test"},
+            "steps": [{"step": 1, "tool": "mcp__t__t", "params": {}, "condition": "{{A}} == 1"}]
+        })
+
+        class MockConfig:
+            servers = {}
+            source = "test"
+
+        player = ScenarioPlayer(scenario, MockConfig(), PlayerOptions())
+        assert player._conditions["{{A}} == 1"] is not None
+
+    def test_legacy_conditions_option(self):
+        """Should evaluate every condition as text with legacy_conditions"""
+        outputs = {"step1": {"flag": False, "count": 0, "name": "null"}}
+        compiled = self.create_player(step_outputs=outputs)
+        legacy = self.create_player(step_outputs=outputs, options=PlayerOptions(legacy_conditions=True))
+
+        for condition in ("{{step1.flag}}", "{{step1.count}}", "{{step1.name}} == null"):
+            assert compiled._evaluate_condition(condition) is False
+            assert legacy._evaluate_condition(condition) is True
+
+    def test_legacy_fallback(self):
+        """Should fall back to string evaluation for unparseable conditions"""
+        player = self.create_player(variables={"VAR": "a = b"})
+        assert player._evaluate_condition("{{VAR}} == a = b") is True
+
 
 class TestStepResult:
     """Tests for StepResult dataclass"""
@@ -396,6 +523,32 @@ class TestIncludeResultsPolicy:
 
         assert result.result == {"error_data": "details"}
 
+    def test_large_result_spilled_to_blob_store(self, tmp_path):
+        """Should replace kept results over blob_threshold with a BlobRef"""
+        from blobs import BlobRef, load_blob
+
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Test"},
+            "steps": [{"step": 1, "tool": "mcp__t__t", "params": {}}]
+        })
+
+        class MockConfig:
+            servers = {}
+            source = "test"
+
+        options = PlayerOptions(include_results=True, blob_threshold=100, blob_dir=str(tmp_path))
+        player = ScenarioPlayer(scenario, MockConfig(), options)
+
+        large = StepResult(step=1, tool="mcp__t__t", success=True, duration=1.0, result={"text": "x" * 500})
+        small = StepResult(step=1, tool="mcp__t__t", success=True, duration=1.0, result={"text": "x"})
+        player._apply_result_policy(large)
+        player._apply_result_policy(small)
+
+        assert isinstance(large.result, BlobRef)
+        assert load_blob(large.result) == {"text": "x" * 500}
+        assert small.result == {"text": "x"}
+
 
 class TestAppendFile:
     """Tests for sandy__append_file internal tool"""
@@ -900,3 +1053,285 @@ class TestWaitUntil:
             assert result.success is True
 
         asyncio.run(run_test())
+
+
+class TestSharedClients:
+    """Tests for caller-provided client dicts"""
+
+    def create_scenario(self):
+        return parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Test"},
+            "steps": [{"step": 1, "tool": "mcp__mock__echo", "params": {"text": "hi"}}]
+        })
+
+    class MockConfig:
+        servers = {}
+        source = "test"
+
+    class MockClient:
+        def __init__(self):
+            self.calls = 0
+            self.disconnected = False
+
+        async def call_tool(self, tool_name, params):
+            self.calls += 1
+
+            class Result:
+                success = True
+                data = params
+                error = None
+            return Result()
+
+        async def disconnect(self):
+            self.disconnected = True
+
+    def test_shared_clients_left_open(self):
+        """Should reuse shared clients across plays without closing them"""
+        client = self.MockClient()
+        clients = {"mock": client}
+
+        async def run_test():
+            for _ in range(2):
+                player = ScenarioPlayer(self.create_scenario(), self.MockConfig(), PlayerOptions(), clients)
+                result = await player.execute()
+                assert result.success is True
+
+        asyncio.run(run_test())
+
+        assert client.calls == 2
+        assert client.disconnected is False
+        assert clients == {"mock": client}
+
+    def test_private_clients_closed(self):
+        """Should close clients it created itself"""
+        client = self.MockClient()
+
+        async def run_test():
+            player = ScenarioPlayer(self.create_scenario(), self.MockConfig(), PlayerOptions())
+            player._clients["mock"] = client
+            await player.execute()
+
+        asyncio.run(run_test())
+
+        assert client.disconnected is True
+
+    def test_dead_shared_client_evicted(self):
+        """Should drop and disconnect a shared client whose transport failed"""
+        client = self.MockClient()
+
+        async def call_tool(tool_name, params):
+            raise Exception("Not connected to MCP server")
+        client.call_tool = call_tool
+        clients = {"mock": client}
+
+        async def run_test():
+            player = ScenarioPlayer(self.create_scenario(), self.MockConfig(), PlayerOptions(), clients)
+            return await player.execute()
+
+        result = asyncio.run(run_test())
+
+        assert result.success is False
+        assert client.disconnected is True
+        assert clients == {}
+
+    def test_tool_error_keeps_shared_client(self):
+        """Should keep a shared client after an ordinary tool error"""
+        client = self.MockClient()
+
+        async def call_tool(tool_name, params):
+            class Result:
+                success = False
+                data = None
+                error = "Element not found"
+            return Result()
+        client.call_tool = call_tool
+        clients = {"mock": client}
+
+        async def run_test():
+            player = ScenarioPlayer(self.create_scenario(), self.MockConfig(), PlayerOptions(), clients)
+            return await player.execute()
+
+        result = asyncio.run(run_test())
+
+        assert result.success is False
+        assert client.disconnected is False
+        assert clients == {"mock": client}
+
+
+class TestCallScenario:
+    """Tests for sandy__call_scenario internal tool"""
+
+    class MockConfig:
+        servers = {}
+        source = "test"
+
+    class MockClient:
+        def __init__(self):
+            self.calls = []
+            self.disconnected = False
+
+        async def call_tool(self, tool_name, params):
+            self.calls.append(params)
+
+            class Result:
+                success = params.get("text") != "fail"
+                data = {"echo": params.get("text")}
+                error = None if success else "Echo failed"
+            return Result()
+
+        async def disconnect(self):
+            self.disconnected = True
+
+    def write_child(self, path, text="{{NAME}}"):
+        path.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Login"},
+            "variables": {"NAME": "default"},
+            "steps": [
+                {"step": 1, "id": "login", "tool": "mcp__mock__echo", "params": {"text": text},
+                 "output": {"user": "$.echo"}},
+            ],
+        }))
+
+    def play(self, steps, client):
+        scenario = parse_scenario({"version": "2.1", "metadata": {"name": "Parent"}, "steps": steps})
+
+        async def run_test():
+            player = ScenarioPlayer(scenario, self.MockConfig(), PlayerOptions())
+            player._clients["mock"] = client
+            return await player.execute()
+
+        return asyncio.run(run_test())
+
+    def test_variables_in_outputs_out(self, tmp_path):
+        """Should pass variables in and make the child's outputs extractable"""
+        child = tmp_path / "login.json"
+        self.write_child(child)
+        client = self.MockClient()
+
+        result = self.play([
+            {"step": 1, "id": "auth", "tool": "sandy__call_scenario",
+             "params": {"scenario": str(child), "variables": {"NAME": "alice"}},
+             "output": {"user": "$.login.user"}},
+            {"step": 2, "tool": "mcp__mock__echo", "params": {"text": "hi {{auth.user}}"}},
+        ], client)
+
+        assert result.success is True
+        assert result.outputs["auth"] == {"user": "alice"}
+        assert [c["text"] for c in client.calls] == ["alice", "hi alice"]
+
+    def test_shares_parent_clients(self, tmp_path):
+        """Should run on the parent's clients and leave them open for it"""
+        child = tmp_path / "login.json"
+        self.write_child(child)
+        client = self.MockClient()
+
+        result = self.play([
+            {"step": 1, "tool": "sandy__call_scenario", "params": {"scenario": str(child)}},
+            {"step": 2, "tool": "sandy__call_scenario", "params": {"scenario": str(child)}},
+        ], client)
+
+        assert result.success is True
+        assert [c["text"] for c in client.calls] == ["default", "default"]
+        assert client.disconnected is True  # Closed once, by the parent
+
+    def test_child_cached(self, tmp_path):
+        """Should parse an unchanged child once and reload it after edits"""
+        import player as player_module
+
+        child = tmp_path / "login.json"
+        self.write_child(child)
+        path = child.resolve()
+
+        first = player_module._load_child_scenario(path)
+        assert player_module._load_child_scenario(path) is first
+
+        self.write_child(child, text="changed {{NAME}}")
+        assert player_module._load_child_scenario(path).steps[0].params["text"] == "changed {{NAME}}"
+
+    def test_child_failure(self, tmp_path):
+        """Should fail the step with the child's failing step and error"""
+        child = tmp_path / "login.json"
+        self.write_child(child, text="fail")
+
+        result = self.play([
+            {"step": 1, "tool": "sandy__call_scenario", "params": {"scenario": str(child)}},
+        ], self.MockClient())
+
+        assert result.success is False
+        assert "Scenario 'Login' failed at step 1: Echo failed" in result.error
+
+    def test_recursive_call(self, tmp_path):
+        """Should reject a scenario that calls itself"""
+        loop = tmp_path / "loop.json"
+        loop.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Loop"},
+            "steps": [{"step": 1, "tool": "sandy__call_scenario", "params": {"scenario": str(loop)}}],
+        }))
+
+        result = self.play([
+            {"step": 1, "tool": "sandy__call_scenario", "params": {"scenario": str(loop)}},
+        ], self.MockClient())
+
+        assert result.success is False
+        assert "Recursive scenario call: loop.json -> loop.json" in result.error
+
+    def test_missing_scenario_param(self):
+        """Should fail when 'scenario' is missing"""
+        result = self.play([{"step": 1, "tool": "sandy__call_scenario", "params": {}}], self.MockClient())
+
+        assert result.success is False
+        assert "'scenario' parameter is required" in result.error
+
+
+class TestSQLite:
+    """Tests for sandy__sqlite internal tool"""
+
+    class MockConfig:
+        servers = {}
+        source = "test"
+
+    def test_rows_from_step_output(self, tmp_path):
+        """Should insert a list output and close the database when the play ends"""
+        import sqlite3
+
+        db = tmp_path / "items.db"
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Store"},
+            "variables": {"DB": str(db)},
+            "steps": [
+                {"step": 1, "tool": "sandy__sqlite",
+                 "params": {"path": "{{DB}}", "table": "items", "data": "{{ITEMS}}", "keys": ["id"]}},
+                {"step": 2, "tool": "sandy__sqlite",
+                 "params": {"path": "{{DB}}", "table": "items", "data": {"id": 1, "name": "one!"}, "keys": "id"}},
+            ],
+        })
+        items = [{"id": 1, "name": "one"}, {"id": 2, "name": "two"}]
+        player = ScenarioPlayer(
+            scenario, self.MockConfig(), PlayerOptions(variables={"ITEMS": items}, include_results=True)
+        )
+
+        result = asyncio.run(player.execute())
+
+        assert result.success is True
+        assert result.step_results[0].result["rows"] == 2
+        assert player._sqlite == {}  # Closed when the play ended
+        conn = sqlite3.connect(db)
+        assert conn.execute("SELECT id, name FROM items ORDER BY id").fetchall() == [(1, "one!"), (2, "two")]
+        conn.close()
+
+    def test_missing_params(self):
+        """Should fail when 'path' or 'table' is missing"""
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Store"},
+            "steps": [{"step": 1, "tool": "sandy__sqlite", "params": {"data": []}}],
+        })
+
+        result = asyncio.run(ScenarioPlayer(scenario, self.MockConfig(), PlayerOptions()).execute())
+
+        assert result.success is False
+        assert "'path' and 'table' parameters are required" in result.error
@@ -0,0 +1,224 @@
+"""
+Tests for clients/replay_client.py
+"""
+
+import asyncio
+import json
+import pytest
+import time
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from clients import create_client
+from clients.base import MCPClient, MCPConnectionError, ToolResult
+from clients.replay_client import RecordingClient, ReplayClient, fixture_path
+from config import Config, ServerConfig
+from scenario import parse_scenario
+from player import ScenarioPlayer, PlayerOptions
+
+
+class FakeServer(MCPClient):
+    """In-memory server answering echo and counter calls"""
+
+    def __init__(self):
+        self.count = 0
+        self.disconnected = False
+
+    @property
+    def transport_type(self):
+        return "stdio"
+
+    @property
+    def server_name(self):
+        return "fake"
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        self.disconnected = True
+
+    async def call_tool(self, tool_name, params):
+        await asyncio.sleep(0.05)
+        if tool_name == "count":
+            self.count += 1
+            return ToolResult(success=True, data={"count": self.count})
+        if tool_name == "fail":
+            return ToolResult(success=False, error="nope")
+        return ToolResult(success=True, data=params)
+
+    async def list_tools(self):
+        return ["echo", "count", "fail"]
+
+
+def write_fixture(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+
+def call(tool, params, data, duration=0.0, success=True):
+    return {"type": "call", "tool": tool, "params": params, "success": success,
+            "data": data, "error": None if success else "failed", "duration": duration}
+
+
+class TestRecordingClient:
+    """Tests for RecordingClient"""
+
+    def test_records_calls(self, tmp_path):
+        """Should pass calls through and write them to the fixture"""
+        path = tmp_path / "fake.jsonl"
+
+        async def run_test():
+            inner = FakeServer()
+            client = RecordingClient(inner, path)
+            await client.connect()
+            first = await client.call_tool("echo", {"text": "hi"})
+            await client.call_tool("fail", {})
+            await client.list_tool_schemas()
+            await client.disconnect()
+            return first, inner
+
+        first, inner = asyncio.run(run_test())
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+
+        assert first.data == {"text": "hi"}
+        assert inner.disconnected is True
+        assert records[0]["tool"] == "echo" and records[0]["data"] == {"text": "hi"}
+        assert records[0]["duration"] >= 0.05
+        assert records[1]["success"] is False and records[1]["error"] == "nope"
+        assert [t["name"] for t in records[2]["tools"]] == ["echo", "count", "fail"]
+
+    def test_rerecord_replaces_fixture(self, tmp_path):
+        """Should replace the previous recording so replay serves the new one"""
+        path = tmp_path / "fake.jsonl"
+
+        async def record(count):
+            server = FakeServer()
+            server.count = count
+            client = RecordingClient(server, path)
+            await client.connect()
+            await client.call_tool("count", {})
+            await client.disconnect()
+
+        async def replay():
+            client = ReplayClient("fake", path, 0.0)
+            await client.connect()
+            return await client.call_tool("count", {})
+
+        asyncio.run(record(0))
+        asyncio.run(record(5))
+
+        assert asyncio.run(replay()).data == {"count": 6}
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestReplayClient:
+    """Tests for ReplayClient"""
+
+    def replay(self, path, calls, latency=0.0):
+        async def run_test():
+            client = ReplayClient("fake", path, latency)
+            await client.connect()
+            return [await client.call_tool(tool, params) for tool, params in calls]
+
+        return asyncio.run(run_test())
+
+    def test_exact_match_in_order(self, tmp_path):
+        """Should serve identical calls their recorded responses in order, then repeat the last"""
+        path = tmp_path / "fake.jsonl"
+        write_fixture(path, [call("count", {}, {"count": 1}), call("count", {}, {"count": 2})])
+
+        results = self.replay(path, [("count", {}), ("count", {}), ("count", {})])
+
+        assert [r.data for r in results] == [{"count": 1}, {"count": 2}, {"count": 2}]
+
+    def test_params_select_response(self, tmp_path):
+        """Should match on params regardless of key order, falling back to the same tool"""
+        path = tmp_path / "fake.jsonl"
+        write_fixture(path, [
+            call("echo", {"a": 1, "b": 2}, "first"),
+            call("echo", {"a": 3}, "second"),
+            call("echo", {"a": 4}, "third"),
+        ])
+
+        results = self.replay(path, [("echo", {"a": 3}), ("echo", {"b": 2, "a": 1}), ("echo", {"a": 9})])
+
+        assert [r.data for r in results] == ["second", "first", "third"]
+
+    def test_unrecorded_call_fails(self, tmp_path):
+        """Should fail calls with no recorded response"""
+        path = tmp_path / "fake.jsonl"
+        write_fixture(path, [call("echo", {}, "x", success=False)])
+
+        missing, recorded = self.replay(path, [("other", {}), ("echo", {})])
+
+        assert missing.success is False and "No recorded response" in missing.error
+        assert recorded.success is False and recorded.error == "failed"
+
+    def test_latency(self, tmp_path):
+        """Should sleep the recorded duration unless latency is zero"""
+        path = tmp_path / "fake.jsonl"
+        write_fixture(path, [call("echo", {}, "x", duration=0.2)])
+
+        start = time.perf_counter()
+        self.replay(path, [("echo", {})], latency=0.0)
+        instant = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.replay(path, [("echo", {})], latency=1.0)
+        real = time.perf_counter() - start
+
+        assert instant < 0.1
+        assert real >= 0.2
+
+    def test_missing_fixture(self, tmp_path):
+        """Should raise MCPConnectionError when the fixture doesn't exist"""
+        with pytest.raises(MCPConnectionError):
+            asyncio.run(ReplayClient("fake", tmp_path / "none.jsonl").connect())
+
+    def test_selected_by_create_client(self, tmp_path):
+        """Should create a replay client for servers with a replay fixture"""
+        config = ServerConfig(name="fake", command="fake-server", replay=str(tmp_path / "fake.jsonl"), replay_latency=0)
+
+        client = asyncio.run(create_client(config))
+
+        assert isinstance(client, ReplayClient)
+        assert client.latency == 0
+
+
+class TestRecordReplayPlay:
+    """Tests for recording a play and replaying it offline"""
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        """Should replay a recorded play with the same results and outputs"""
+        async def fake_create_client(server_config):
+            return FakeServer()
+
+        monkeypatch.setattr("clients.create_client", fake_create_client)
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Round trip"},
+            "steps": [
+                {"step": 1, "tool": "mcp__fake__echo", "params": {"text": "hi"}},
+                {"step": 2, "id": "c", "tool": "mcp__fake__count", "params": {}, "output": {"n": "$.count"}},
+            ],
+        })
+
+        async def record():
+            config = Config(servers={"fake": ServerConfig(name="fake", command="fake-server")}, source="test")
+            return await ScenarioPlayer(scenario, config, PlayerOptions(record_dir=str(tmp_path))).execute()
+
+        async def replay():
+            fixture = str(fixture_path(tmp_path, "fake"))
+            config = Config(servers={"fake": ServerConfig(name="fake", replay=fixture, replay_latency=0)}, source="test")
+            return await ScenarioPlayer(scenario, config, PlayerOptions()).execute()
+
+        recorded = asyncio.run(record())
+        monkeypatch.undo()
+        replayed = asyncio.run(replay())
+
+        assert recorded.success is True
+        assert replayed.success is True
+        assert replayed.outputs == recorded.outputs == {"c": {"n": 1}}
+        assert replayed.duration < recorded.duration
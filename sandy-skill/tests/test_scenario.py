@@ -183,6 +183,41 @@ class TestValidateScenario:
         })
 
 
+class TestOutputSpecValidation:
+    """Tests for output spec objects ({path, mode})"""
+
+    def scenario_with_output(self, output):
+        return {
+            "version": "2.1",
+            "metadata": {"name": "Test"},
+            "steps": [{"step": 1, "id": "s", "tool": "mcp__t__t", "params": {}, "output": output}],
+        }
+
+    def test_valid_modes(self):
+        """Should accept all supported modes"""
+        validate_scenario(self.scenario_with_output({
+            "a": "$.x",
+            "b": {"path": "$.items[*].id", "mode": "all"},
+            "c": {"path": "$.items[*]", "mode": "count"},
+            "d": {"path": "$.items[*].title", "mode": "column"},
+        }))
+
+    def test_invalid_mode(self):
+        """Should reject unknown modes"""
+        with pytest.raises(ScenarioValidationError, match="mode"):
+            validate_scenario(self.scenario_with_output({"a": {"path": "$.x", "mode": "many"}}))
+
+    def test_missing_path(self):
+        """Should reject object specs without path"""
+        with pytest.raises(ScenarioValidationError, match="path"):
+            validate_scenario(self.scenario_with_output({"a": {"mode": "all"}}))
+
+    def test_column_requires_wildcard(self):
+        """Column mode needs a [*] row source"""
+        with pytest.raises(ScenarioValidationError, match="column"):
+            validate_scenario(self.scenario_with_output({"a": {"path": "$.x", "mode": "column"}}))
+
+
 class TestParseToolName:
     """Tests for parse_tool_name function"""
 
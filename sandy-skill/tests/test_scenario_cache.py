@@ -0,0 +1,149 @@
+"""
+Tests for scenario_cache.py
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import scenario_cache
+from scenario import ScenarioValidationError
+from scenario_cache import ScenarioCache, load_scenario_cached
+
+
+def scenario_data(name="Test"):
+    return {
+        "version": "2.1",
+        "metadata": {"name": name},
+        "variables": {"VAR": "x"},
+        "steps": [{"step": 1, "id": "s1", "tool": "mcp__t__t", "params": {"a": "{{VAR}}"}}],
+    }
+
+
+def write_old(path, data):
+    """Write a scenario file with an mtime well in the past"""
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+
+class TestScenarioCache:
+    """Tests for ScenarioCache"""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Should parse on first load and serve from cache afterwards"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        cache = ScenarioCache(tmp_path / "cache")
+
+        first = cache.load(path)
+        second = ScenarioCache(tmp_path / "cache").load(path)
+
+        assert cache.misses == 1
+        assert first == second
+        assert second.steps[0].params == {"a": "{{VAR}}"}
+
+    def test_fast_path_skips_parse(self, tmp_path, monkeypatch):
+        """Unchanged old files should not be re-parsed"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        ScenarioCache(tmp_path / "cache").load(path)
+
+        def fail(content):
+            raise AssertionError("should not parse")
+        monkeypatch.setattr(scenario_cache, "parse_scenario_bytes", fail)
+
+        cache = ScenarioCache(tmp_path / "cache")
+        assert cache.load(path).metadata.name == "Test"
+        assert cache.hits == 1
+
+    def test_content_change_invalidates(self, tmp_path):
+        """Should re-parse when content changes even with same mtime"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data("Before"))
+        ScenarioCache(tmp_path / "cache").load(path)
+
+        # Same size and mtime, different content
+        write_old(path, scenario_data("After!"))
+
+        # Entry was written "now", but force the hash check by making the
+        # entry look freshly written relative to the file
+        cache = ScenarioCache(tmp_path / "cache")
+        entry_path = cache.entry_path(path.resolve())
+        entry = json.loads(entry_path.read_text())
+        entry["written_ns"] = entry["mtime_ns"]
+        entry_path.write_text(json.dumps(entry))
+
+        assert cache.load(path).metadata.name == "After!"
+        assert cache.misses == 1
+
+    def test_recent_edit_is_rehashed(self, tmp_path):
+        """Should detect edits to recently modified files"""
+        path = tmp_path / "s.json"
+        path.write_text(json.dumps(scenario_data("One")))
+        cache = ScenarioCache(tmp_path / "cache")
+        cache.load(path)
+
+        path.write_text(json.dumps(scenario_data("Two")))
+        assert cache.load(path).metadata.name == "Two"
+
+    def test_version_mismatch_invalidates(self, tmp_path, monkeypatch):
+        """Entries from another parser version should be discarded"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        ScenarioCache(tmp_path / "cache").load(path)
+
+        monkeypatch.setattr(scenario_cache, "PARSER_VERSION", 999)
+        cache = ScenarioCache(tmp_path / "cache")
+        cache.load(path)
+        assert cache.misses == 1
+
+    def test_corrupt_entry_recovers(self, tmp_path):
+        """Corrupt cache files should be ignored and rewritten"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        cache = ScenarioCache(tmp_path / "cache")
+        cache.load(path)
+        cache.entry_path(path.resolve()).write_bytes(b"garbage")
+
+        assert cache.load(path).metadata.name == "Test"
+        assert cache.misses == 2
+
+    def test_invalid_scenario_not_cached(self, tmp_path):
+        """Validation errors should propagate and leave no entry"""
+        path = tmp_path / "s.json"
+        path.write_text(json.dumps({"version": "2.1"}))
+        cache = ScenarioCache(tmp_path / "cache")
+
+        with pytest.raises(ScenarioValidationError):
+            cache.load(path)
+        assert not cache.entry_path(path.resolve()).exists()
+
+    def test_missing_file(self, tmp_path):
+        """Should raise FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            load_scenario_cached(tmp_path / "missing.json", cache_dir=tmp_path / "cache")
+
+    def test_clear(self, tmp_path):
+        """Should remove all entries"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        cache = ScenarioCache(tmp_path / "cache")
+        cache.load(path)
+
+        assert cache.clear() == 1
+        assert list((tmp_path / "cache").iterdir()) == []
+
+    def test_entry_is_plain_json(self, tmp_path):
+        """Should store entries as JSON data, never as pickle"""
+        path = tmp_path / "s.json"
+        write_old(path, scenario_data())
+        cache = ScenarioCache(tmp_path / "cache")
+        cache.load(path)
+
+        entry = json.loads(cache.entry_path(path.resolve()).read_text())
+        assert entry["scenario"]["steps"][0]["params"] == {"a": "{{VAR}}"}
+
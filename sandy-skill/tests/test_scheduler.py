@@ -0,0 +1,255 @@
+"""
+Tests for scheduler.py
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from scheduler import CronExpression, ScheduledJob, Scheduler, ScheduleError, load_schedule
+
+
+class FakeClock:
+    """Clock that advances only when the scheduler sleeps"""
+
+    def __init__(self, start):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    async def sleep(self, delay):
+        self.current += timedelta(seconds=delay)
+        await asyncio.sleep(0)
+
+
+class TestCronExpression:
+    """Tests for CronExpression"""
+
+    def test_every_minute(self):
+        """Should fire on the next minute boundary"""
+        cron = CronExpression("* * * * *")
+        assert cron.next_after(datetime(2026, 1, 1, 10, 0, 30)) == datetime(2026, 1, 1, 10, 1)
+
+    def test_steps_and_ranges(self):
+        """Should handle */n and ranges"""
+        cron = CronExpression("*/15 9-17 * * *")
+        assert cron.next_after(datetime(2026, 1, 1, 9, 46)) == datetime(2026, 1, 1, 10, 0)
+        assert cron.next_after(datetime(2026, 1, 1, 17, 50)) == datetime(2026, 1, 2, 9, 0)
+
+    def test_weekdays(self):
+        """Should honour day-of-week (0 and 7 are Sunday)"""
+        # 2026-01-02 is a Friday
+        assert CronExpression("0 8 * * 1-5").next_after(datetime(2026, 1, 2, 9, 0)) == datetime(2026, 1, 5, 8, 0)
+        assert CronExpression("0 8 * * 7").next_after(datetime(2026, 1, 2, 9, 0)) == datetime(2026, 1, 4, 8, 0)
+
+    def test_day_of_month_or_weekday(self):
+        """Should match either day field when both are restricted"""
+        cron = CronExpression("0 0 15 * 1")
+        # Monday 2026-01-05 comes before the 15th
+        assert cron.next_after(datetime(2026, 1, 2)) == datetime(2026, 1, 5)
+
+    def test_aliases(self):
+        """Should accept @daily-style aliases"""
+        assert CronExpression("@daily").next_after(datetime(2026, 3, 1, 12, 0)) == datetime(2026, 3, 2)
+        assert CronExpression("@monthly").next_after(datetime(2026, 3, 1, 12, 0)) == datetime(2026, 4, 1)
+
+    def test_leap_day(self):
+        """Should find rare dates"""
+        assert CronExpression("0 0 29 2 *").next_after(datetime(2026, 3, 1)) == datetime(2028, 2, 29)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *"])
+    def test_invalid(self, expression):
+        """Should reject malformed expressions"""
+        with pytest.raises(ScheduleError):
+            CronExpression(expression)
+
+    def test_never_matches(self):
+        """Should raise for impossible dates"""
+        with pytest.raises(ScheduleError):
+            CronExpression("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+
+
+class TestLoadSchedule:
+    """Tests for load_schedule function"""
+
+    def test_load(self, tmp_path):
+        """Should load jobs and resolve scenario paths from the project root"""
+        sandy_dir = tmp_path / ".sandy"
+        sandy_dir.mkdir()
+        (sandy_dir / "schedule.json").write_text(json.dumps({"jobs": [{
+            "name": "hn",
+            "scenario": ".sandy/scenarios/hn.json",
+            "cron": "*/5 * * * *",
+            "variables": {"LIMIT": 30},
+            "overlap": "queue",
+            "jitter": 10,
+        }]}))
+
+        jobs = load_schedule(sandy_dir / "schedule.json")
+
+        assert len(jobs) == 1
+        assert jobs[0].scenario == str(tmp_path / ".sandy" / "scenarios" / "hn.json")
+        assert jobs[0].variables == {"LIMIT": "30"}
+        assert jobs[0].overlap == "queue"
+
+    @pytest.mark.parametrize("job", [
+        {"scenario": "a.json", "cron": "* * * * *"},
+        {"name": "a", "scenario": "a.json", "cron": "bad"},
+        {"name": "a", "scenario": "a.json", "cron": "* * * * *", "overlap": "sometimes"},
+    ])
+    def test_invalid(self, tmp_path, job):
+        """Should reject invalid jobs"""
+        path = tmp_path / "schedule.json"
+        path.write_text(json.dumps({"jobs": [job]}))
+        with pytest.raises(ScheduleError):
+            load_schedule(path)
+
+    def test_missing_file(self, tmp_path):
+        """Should raise FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            load_schedule(tmp_path / "schedule.json")
+
+
+class TestScheduler:
+    """Tests for Scheduler"""
+
+    def make_job(self, overlap="skip", jitter=0.0):
+        return ScheduledJob(
+            name="job",
+            scenario="job.json",
+            cron=CronExpression("* * * * *"),
+            overlap=overlap,
+            jitter=jitter,
+        )
+
+    def run_scheduler(self, job, ticks):
+        """Fire `ticks` ticks while the first run stays active"""
+        clock = FakeClock(datetime(2026, 1, 1, 0, 0))
+        started = []
+
+        async def run_test():
+            release = asyncio.Event()
+
+            async def runner(job):
+                started.append(clock.now())
+                await release.wait()
+                return "done"
+
+            scheduler = Scheduler([job], runner=runner, now=clock.now, sleep=clock.sleep)
+            fire = scheduler._fire
+            fired = []
+
+            def counting_fire(state):
+                fire(state)
+                fired.append(state)
+                if len(fired) == ticks:
+                    release.set()
+
+            scheduler._fire = counting_fire
+            await scheduler.run(max_ticks=ticks)
+            return scheduler
+
+        scheduler = asyncio.run(run_test())
+        return scheduler.states["job"], started
+
+    def test_skip(self):
+        """Should drop ticks while a run is active"""
+        state, started = self.run_scheduler(self.make_job("skip"), ticks=3)
+        assert len(started) == 1
+        assert state.skipped == 2
+
+    def test_queue(self):
+        """Should run once more after the active run (ticks coalesce)"""
+        state, started = self.run_scheduler(self.make_job("queue"), ticks=3)
+        assert len(started) == 2
+        assert state.runs == 2
+
+    def test_parallel(self):
+        """Should start a run on every tick"""
+        state, started = self.run_scheduler(self.make_job("parallel"), ticks=3)
+        assert len(started) == 3
+
+    def test_jitter_delays_fire_time(self):
+        """Should add up to `jitter` seconds to fire times"""
+        import random
+
+        clock = FakeClock(datetime(2026, 1, 1, 0, 0))
+        scheduler = Scheduler(
+            [self.make_job(jitter=30)], runner=None, now=clock.now, sleep=clock.sleep, rng=random.Random(1)
+        )
+        fire = scheduler.states["job"].next_fire
+
+        assert datetime(2026, 1, 1, 0, 1) < fire < datetime(2026, 1, 1, 0, 1, 30)
+
+    def test_on_complete(self):
+        """Should report each run result, including exceptions"""
+        clock = FakeClock(datetime(2026, 1, 1, 0, 0))
+        results = []
+
+        async def runner(job):
+            raise RuntimeError("boom")
+
+        async def run_test():
+            scheduler = Scheduler(
+                [self.make_job()], runner=runner, now=clock.now, sleep=clock.sleep,
+                on_complete=lambda job, result: results.append(result),
+            )
+            await scheduler.run(max_ticks=2)
+
+        asyncio.run(run_test())
+
+        assert len(results) == 2
+        assert isinstance(results[0], RuntimeError)
+
+    def test_runs_recorded_in_history(self, tmp_path, monkeypatch):
+        """Should record scheduled plays in the run history"""
+        from config import Config
+        from history import RunHistory
+
+        monkeypatch.chdir(tmp_path)
+        scenario = tmp_path / "wait.json"
+        scenario.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Wait"},
+            "steps": [{"step": 1, "tool": "sandy__wait", "params": {"duration": 0}}],
+        }))
+        job = ScheduledJob(name="wait", scenario=str(scenario), cron=CronExpression("* * * * *"))
+
+        scheduler = Scheduler([job], Config(servers={}, source="test"), record_history=True)
+        result = asyncio.run(scheduler._play_job(job))
+
+        assert result.success is True
+        history = RunHistory(tmp_path / ".sandy" / "history.db")
+        try:
+            assert history.scenarios() == [("Wait", 1)]
+        finally:
+            history.close()
+
+    def test_config_loader_called_per_play(self, tmp_path):
+        """Should resolve the config through config_loader before every play"""
+        from config import Config
+
+        scenario = tmp_path / "wait.json"
+        scenario.write_text(json.dumps({
+            "version": "2.1",
+            "metadata": {"name": "Wait"},
+            "steps": [{"step": 1, "tool": "sandy__wait", "params": {"duration": 0}}],
+        }))
+        job = ScheduledJob(name="wait", scenario=str(scenario), cron=CronExpression("* * * * *"))
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return Config(servers={}, source=f"load {len(loads)}")
+
+        scheduler = Scheduler([job], config_loader=loader)
+        asyncio.run(scheduler._play_job(job))
+        asyncio.run(scheduler._play_job(job))
+
+        assert len(loads) == 2
@@ -0,0 +1,107 @@
+"""
+Tests for sinks.py
+"""
+
+import sqlite3
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from sinks import SQLiteSink
+
+
+def select(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestSQLiteSink:
+    """Tests for SQLiteSink"""
+
+    def test_table_created_from_first_batch(self, tmp_path):
+        """Should create typed columns from the first batch and insert every row"""
+        path = tmp_path / "data" / "shop.db"
+        sink = SQLiteSink(path)
+
+        result = sink.insert("products", [
+            {"sku": "a", "price": None, "stock": 3},
+            {"sku": "b", "price": 9.5, "tags": ["x", "y"]},
+        ])
+        sink.close()
+
+        assert result == {"path": str(path), "table": "products", "rows": 2}
+        columns = {name: kind for _, name, kind, *_ in select(path, "PRAGMA table_info(products)")}
+        assert columns == {"sku": "TEXT", "price": "REAL", "stock": "INTEGER", "tags": "TEXT"}
+        assert select(path, "SELECT sku, price, stock, tags FROM products ORDER BY sku") == [
+            ("a", None, 3, None),
+            ("b", 9.5, None, '["x", "y"]'),
+        ]
+
+    def test_wal_mode(self, tmp_path):
+        """Should open the database in WAL mode"""
+        path = tmp_path / "shop.db"
+        sink = SQLiteSink(path)
+        sink.insert("t", {"a": 1})
+        sink.close()
+
+        assert select(path, "PRAGMA journal_mode") == [("wal",)]
+
+    def test_new_columns_added(self, tmp_path):
+        """Should add columns first seen in a later batch"""
+        path = tmp_path / "shop.db"
+        sink = SQLiteSink(path)
+        sink.insert("t", [{"a": 1}])
+        sink.insert("t", [{"a": 2, "b": "new"}])
+        sink.close()
+
+        assert select(path, "SELECT a, b FROM t ORDER BY a") == [(1, None), (2, "new")]
+
+    def test_upsert_keys(self, tmp_path):
+        """Should update rows with the same key values instead of duplicating them"""
+        path = tmp_path / "shop.db"
+        sink = SQLiteSink(path)
+        sink.insert("products", [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}], keys="sku")
+        sink.insert("products", [{"sku": "a", "price": 1.5}], keys=["sku"])
+        sink.close()
+
+        assert select(path, "SELECT sku, price FROM products ORDER BY sku") == [("a", 1.5), ("b", 2.0)]
+
+    def test_upsert_keeps_missing_columns(self, tmp_path):
+        """Should not overwrite stored values with NULL for columns a row lacks"""
+        path = tmp_path / "shop.db"
+        sink = SQLiteSink(path)
+        sink.insert("products", [{"sku": "a", "price": 1.0, "stock": 3}], keys="sku")
+        sink.insert("products", [{"sku": "b", "price": 2.0, "stock": 5}, {"sku": "a", "stock": 4}], keys="sku")
+        sink.close()
+
+        assert select(path, "SELECT sku, price, stock FROM products ORDER BY sku") == [
+            ("a", 1.0, 4),
+            ("b", 2.0, 5),
+        ]
+
+    def test_used_from_another_thread(self, tmp_path):
+        """Should accept inserts from a worker thread"""
+        import asyncio
+
+        path = tmp_path / "shop.db"
+        sink = SQLiteSink(path)
+        asyncio.run(asyncio.to_thread(sink.insert, "t", {"a": 1}))
+        sink.close()
+
+        assert select(path, "SELECT a FROM t") == [(1,)]
+
+    def test_invalid_data(self, tmp_path):
+        """Should reject non-object rows and upsert keys missing from the data"""
+        sink = SQLiteSink(tmp_path / "shop.db")
+
+        with pytest.raises(ValueError):
+            sink.insert("t", ["a", "b"])
+        with pytest.raises(ValueError):
+            sink.insert("t", [{"a": 1}], keys=["id"])
+        assert sink.insert("t", [])["rows"] == 0
+        sink.close()
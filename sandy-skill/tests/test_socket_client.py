@@ -0,0 +1,112 @@
+"""
+Tests for clients/socket_client.py
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from clients.socket_client import ClaudeInChromeSocketClient
+from config import Config, ServerConfig, get_server_config
+from scenario import parse_scenario
+from player import ScenarioPlayer
+
+
+class FakeChrome(ClaudeInChromeSocketClient):
+    """Socket client with the extension replaced by an in-memory fake"""
+
+    def __init__(self, tabs=1, open_tabs=(7,)):
+        super().__init__(tabs=tabs)
+        self.open_tabs = list(open_tabs)
+        self.next_tab = 100
+        self.calls = []
+
+    async def connect(self):
+        self._connected = True
+        await self._create_tab()
+
+    async def disconnect(self):
+        self._connected = False
+
+    async def _send_request(self, tool, args):
+        self.calls.append((tool, args))
+        if tool == "tabs_context_mcp":
+            return {"availableTabs": [{"tabId": t} for t in self.open_tabs]}
+        if tool == "tabs_create_mcp":
+            self.next_tab += 1
+            self.open_tabs.append(self.next_tab)
+            return {"content": f"Created tab. Tab ID: {self.next_tab}"}
+        await asyncio.sleep(0.01)
+        return {"tab": args.get("tabId")}
+
+
+class TestTabPool:
+    """Tests for tab leasing"""
+
+    def test_single_tab_session(self):
+        """Should pin calls to the session tab by default"""
+        async def run_test():
+            client = FakeChrome()
+            await client.connect()
+            return await client.call_tool("navigate", {"url": "x"})
+
+        result = asyncio.run(run_test())
+
+        assert result.data == {"tab": 7}
+
+    def test_reuse_then_create(self):
+        """Should reuse open tabs, create more up to the pool size, then wait"""
+        async def run_test():
+            client = FakeChrome(tabs=3)
+            await client.connect()
+            leased = [await client.lease_tab() for _ in range(3)]
+
+            waiter = asyncio.create_task(client.lease_tab())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            client.release_tab(leased[1])
+            return leased, await waiter, client.calls
+
+        leased, after_release, calls = asyncio.run(run_test())
+
+        assert leased == [7, 101, 102]
+        assert after_release == 101
+        assert sum(1 for tool, _ in calls if tool == "tabs_create_mcp") == 2
+
+    def test_concurrent_plays_use_separate_tabs(self):
+        """Should lease one tab per play and inject it as tabId"""
+        config = Config(servers={"claude-in-chrome": ServerConfig(name="claude-in-chrome", tabs=2)}, source="test")
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Tabs"},
+            "steps": [
+                {"step": 1, "id": "a", "tool": "mcp__claude-in-chrome__navigate", "params": {"url": "x"},
+                 "output": {"tab": "$.tab"}},
+                {"step": 2, "id": "b", "tool": "mcp__claude-in-chrome__get_page_text", "params": {},
+                 "output": {"tab": "$.tab"}},
+            ],
+        })
+
+        async def run_test():
+            client = FakeChrome(tabs=2)
+            await client.connect()
+            clients = {"claude-in-chrome": client}
+            players = [ScenarioPlayer(scenario, config, clients=clients) for _ in range(2)]
+            results = await asyncio.gather(*(p.execute() for p in players))
+            return results, client
+
+        results, client = asyncio.run(run_test())
+
+        tabs = [(r.outputs["a"]["tab"], r.outputs["b"]["tab"]) for r in results]
+        assert sorted(t[0] for t in tabs) == [7, 101]
+        assert all(a == b for a, b in tabs)
+        assert client._free_tabs.qsize() == 2  # Returned after the plays
+
+    def test_config_tabs(self):
+        """Should read tabs from a claude-in-chrome config entry"""
+        config = Config(servers={"claude-in-chrome": ServerConfig(name="claude-in-chrome", tabs=4)}, source="t")
+        assert get_server_config(config, "claude-in-chrome").tabs == 4
+        assert get_server_config(Config(servers={}, source="t"), "claude-in-chrome").tabs is None
@@ -0,0 +1,64 @@
+"""
+Tests for play.py cold-start cost (lazy imports and import time budget)
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from startup import (
+    HEAVY_MODULES,
+    STARTUP_BUDGET_MS,
+    imported_modules,
+    measure_import_time,
+)
+
+
+def play_snippet(steps, dry_run):
+    """Build code that plays a scenario in-process with a mock config"""
+    scenario = {"version": "2.1", "metadata": {"name": "Startup"}, "steps": steps}
+    return (
+        "import asyncio, json\n"
+        "from scenario import parse_scenario\n"
+        "from config import Config\n"
+        "from player import PlayerOptions, play_scenario\n"
+        f"scenario = parse_scenario(json.loads({json.dumps(scenario)!r}))\n"
+        f"result = asyncio.run(play_scenario(scenario, Config(servers={{}}, source='test'), PlayerOptions(dry_run={dry_run})))\n"
+        "assert result.success, result.error\n"
+    )
+
+
+class TestLazyImports:
+    """Heavy dependencies must load only when a scenario needs them"""
+
+    def test_import_play_is_light(self):
+        """Importing play.py should not load the player, SDKs or dotenv"""
+        loaded = imported_modules("import play")
+        assert loaded.isdisjoint(HEAVY_MODULES), loaded & set(HEAVY_MODULES)
+
+    def test_dry_run_skips_transports(self):
+        """A dry run should not load MCP, JSONPath or native tools"""
+        steps = [{"step": 1, "id": "s", "tool": "mcp__t__t", "params": {}, "output": {"v": "$.a"}}]
+        loaded = imported_modules(play_snippet(steps, dry_run=True))
+        assert loaded.isdisjoint({"mcp", "jsonpath_ng", "native_tools", "dotenv", "sqlite3", "gzip"})
+
+    def test_claude_only_scenario_skips_mcp(self, tmp_path):
+        """An all-claude__ scenario should not load the MCP SDK"""
+        target = tmp_path / "f.txt"
+        target.write_text("hello")
+        steps = [{"step": 1, "tool": "claude__read", "params": {"file_path": str(target)}}]
+        loaded = imported_modules(play_snippet(steps, dry_run=False))
+        assert "native_tools" in loaded
+        assert loaded.isdisjoint({"mcp", "jsonpath_ng", "websockets", "sqlite3", "gzip"})
+
+
+class TestStartupBudget:
+    """Import time regression budget"""
+
+    def test_import_time_within_budget(self):
+        """Median cold import of play.py should stay within budget"""
+        timings = sorted(measure_import_time("play") for _ in range(3))
+        assert timings[1] <= STARTUP_BUDGET_MS, f"{timings[1]:.1f}ms > {STARTUP_BUDGET_MS}ms"
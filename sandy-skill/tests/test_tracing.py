@@ -0,0 +1,192 @@
+"""
+Tests for tracing.py
+"""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import tracing
+from tracing import InMemoryCollector, OTLPFileExporter, Tracer, parse_traceparent
+from clients.base import MCPClient, ToolResult
+from scenario import parse_scenario
+from player import ScenarioPlayer
+
+
+PARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class FlakyClient(MCPClient):
+    """Fails the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+
+    @property
+    def transport_type(self):
+        return "fake"
+
+    @property
+    def server_name(self):
+        return "srv"
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def call_tool(self, tool_name, params):
+        if self.failures:
+            self.failures -= 1
+            return ToolResult(success=False, error="busy")
+        return ToolResult(success=True, data={"ok": True})
+
+    async def list_tools(self):
+        return ["echo"]
+
+
+@pytest.fixture
+def collector():
+    """Install an in-memory tracer for one test"""
+    collector = InMemoryCollector()
+    tracing.configure(collector)
+    yield collector
+    tracing.configure(None)
+
+
+class TestTraceparent:
+    """Tests for W3C traceparent parsing"""
+
+    def test_valid(self):
+        """Should return trace and parent span ids"""
+        assert parse_traceparent(PARENT) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+
+    def test_invalid(self):
+        """Should reject malformed or all-zero ids"""
+        assert parse_traceparent(None) is None
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+
+
+class TestTracer:
+    """Tests for span nesting and export"""
+
+    def test_nesting_and_export_per_root(self, collector):
+        """Should parent nested spans and export once the root ends"""
+        with tracing.span("outer") as outer:
+            with tracing.span("inner", kind="client", n=1) as inner:
+                pass
+            assert collector.spans == []
+
+        assert [s.name for s in collector.spans] == ["inner", "outer"]
+        assert inner.parent_span_id == outer.span_id
+        assert inner.trace_id == outer.trace_id
+        assert outer.parent_span_id is None
+        assert inner.attributes == {"n": 1}
+
+    def test_error_status(self, collector):
+        """Should mark spans that raise as errors"""
+        with pytest.raises(ValueError):
+            with tracing.span("boom"):
+                raise ValueError("bad")
+
+        assert collector.spans[0].error == "bad"
+        assert collector.spans[0].to_otlp()["status"] == {"code": 2, "message": "bad"}
+
+    def test_remote_parent(self):
+        """Should join an outer trace"""
+        collector = InMemoryCollector()
+        tracer = Tracer(collector, traceparent=PARENT)
+
+        with tracer.span("play"):
+            pass
+
+        span = collector.spans[0]
+        assert span.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert span.parent_span_id == "00f067aa0ba902b7"
+
+    def test_disabled(self):
+        """Should yield None without a tracer"""
+        tracing.configure(None)
+        with tracing.span("x") as span:
+            assert span is None
+        assert tracing.current_traceparent() is None
+
+    def test_concurrent_tasks(self, collector):
+        """Should keep separate parents per asyncio task"""
+        async def play(name):
+            with tracing.span(name):
+                await asyncio.sleep(0.01)
+                with tracing.span(f"{name}-child"):
+                    await asyncio.sleep(0.01)
+
+        async def run_test():
+            await asyncio.gather(play("a"), play("b"))
+
+        asyncio.run(run_test())
+
+        by_name = {s.name: s for s in collector.spans}
+        assert by_name["a-child"].parent_span_id == by_name["a"].span_id
+        assert by_name["b-child"].parent_span_id == by_name["b"].span_id
+        assert by_name["a"].trace_id != by_name["b"].trace_id
+
+    def test_file_exporter(self, tmp_path):
+        """Should append one OTLP document per root span"""
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(OTLPFileExporter(path))
+        for _ in range(2):
+            with tracer.span("play", scenario="Demo", steps=2):
+                pass
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        doc = json.loads(lines[0])
+        span = doc["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert span["name"] == "play"
+        assert {"key": "steps", "value": {"intValue": "2"}} in span["attributes"]
+        assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+
+
+class TestPlayerSpans:
+    """Tests for play -> step -> attempt -> call spans"""
+
+    def test_span_tree(self, collector):
+        """Should trace retries as separate attempts with call spans"""
+        class MockConfig:
+            servers = {}
+            source = "test"
+
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Demo"},
+            "steps": [{
+                "step": 1, "tool": "mcp__srv__echo", "params": {"q": 1},
+                "on_error": "retry", "retry": {"count": 3, "delay": 0},
+            }],
+        })
+        clients = {"srv": FlakyClient(failures=1)}
+
+        result = asyncio.run(ScenarioPlayer(scenario, MockConfig(), clients=clients).execute())
+
+        assert result.success
+        by_name = {}
+        for span in collector.spans:
+            by_name.setdefault(span.name, []).append(span)
+        play, step = by_name["play"][0], by_name["step"][0]
+        attempts, calls = by_name["attempt"], by_name["call"]
+
+        assert step.parent_span_id == play.span_id
+        assert [a.attributes["attempt"] for a in attempts] == [1, 2]
+        assert attempts[0].error == "busy"
+        assert attempts[1].error is None
+        assert [c.parent_span_id for c in calls] == [a.span_id for a in attempts]
+        assert calls[1].attributes["server"] == "srv"
+        assert calls[1].attributes["outcome"] == "success"
+        assert calls[1].attributes["bytes_received"] == len('{"ok": true}')
+        assert step.attributes["retries"] == 1
+        assert play.attributes["success"] is True
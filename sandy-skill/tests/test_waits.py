@@ -0,0 +1,222 @@
+"""
+Tests for waits.py
+"""
+
+import asyncio
+import pytest
+import time
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from scenario import Step, parse_scenario
+from player import ScenarioPlayer, PlayerOptions
+from waits import MARGIN, MIN_FRACTION, SHRINK, TunedWait, WaitTuner
+
+
+def waited_step(wait_after=2.0, step=1):
+    return Step(step=step, tool="mcp__chrome-devtools__navigate_page", params={}, wait_after=wait_after)
+
+
+class TestWaitTuner:
+    """Tests for WaitTuner"""
+
+    def test_starts_at_configured_wait(self, tmp_path):
+        """Should use the configured wait until something is learned"""
+        tuner = WaitTuner("s", tmp_path / "h.db")
+        assert tuner.wait_for(waited_step()) == 2.0
+        tuner.close()
+
+    def test_success_shrinks(self, tmp_path):
+        """Should shrink the wait after first-attempt successes"""
+        tuner = WaitTuner("s", tmp_path / "h.db")
+        step = waited_step()
+
+        tuner.observe(step, 2.0, None)
+        tuner.observe(step, tuner.wait_for(step), None)
+
+        assert tuner.wait_for(step) == pytest.approx(2.0 * SHRINK * SHRINK)
+        tuner.close()
+
+    def test_failure_backs_off(self, tmp_path):
+        """Should back off to the needed time plus margin and not shrink below it"""
+        tuner = WaitTuner("s", tmp_path / "h.db")
+        step = waited_step()
+
+        tuner.observe(step, 0.25, needed=1.0)
+        assert tuner.wait_for(step) == pytest.approx(1.0 * MARGIN)
+
+        tuner.observe(step, tuner.wait_for(step), None)
+        assert tuner.wait_for(step) == pytest.approx(1.0 * MARGIN)
+        assert tuner.waits[1].backoffs == 1
+        tuner.close()
+
+    def test_floor_before_observations(self):
+        """Should not shrink below MIN_FRACTION of the wait until something was needed"""
+        state = TunedWait(1, 2.0, 2.0)
+        assert state.floor == pytest.approx(2.0 * MIN_FRACTION)
+
+    def test_back_off(self, tmp_path):
+        """Should restore the configured wait and keep the last working one as the floor"""
+        tuner = WaitTuner("s", tmp_path / "h.db")
+        step = waited_step()
+        tuner.observe(step, 2.0, None)
+
+        tuner.back_off(step, tuner.wait_for(step))
+
+        assert tuner.wait_for(step) == 2.0
+        assert tuner.waits[1].needed == [2.0]
+        assert tuner.waits[1].backoffs == 1
+        tuner.close()
+
+    def test_persisted_per_scenario(self, tmp_path):
+        """Should reload learned waits for the same scenario only"""
+        path = tmp_path / "h.db"
+        tuner = WaitTuner("s", path)
+        tuner.observe(waited_step(), 2.0, None)
+        tuner.close()
+
+        assert WaitTuner("s", path).wait_for(waited_step()) == pytest.approx(2.0 * SHRINK)
+        assert WaitTuner("other", path).wait_for(waited_step()) == 2.0
+
+    def test_reset_on_configured_change(self, tmp_path):
+        """Should start over when the step's wait_after changes"""
+        tuner = WaitTuner("s", tmp_path / "h.db")
+        tuner.observe(waited_step(2.0), 2.0, None)
+
+        assert tuner.wait_for(waited_step(3.0)) == 3.0
+        tuner.close()
+
+
+class TestTunedPlay:
+    """Tests for ScenarioPlayer with a wait tuner"""
+
+    class MockConfig:
+        servers = {}
+        source = "test"
+
+    class MockClient:
+        def __init__(self, failures, click_fails=False):
+            self.failures = failures
+            self.click_fails = click_fails
+            self.calls = []
+
+        async def call_tool(self, tool_name, params):
+            self.calls.append(tool_name)
+            if tool_name == "wait_for":
+                ok = self.failures <= 0
+                self.failures -= 1
+            else:
+                ok = not (tool_name == "click" and self.click_fails)
+
+            class Result:
+                success = ok
+                data = {"ok": ok}
+                error = None if ok else "Not ready"
+            return Result()
+
+        async def disconnect(self):
+            pass
+
+    def play(self, tuner, failures, following="mcp__chrome-devtools__wait_for", click_fails=False, retry=False):
+        client = self.MockClient(failures, click_fails)
+        second = {"step": 2, "tool": following, "params": {"text": "Done"}}
+        if retry:
+            second.update(on_error="retry", retry={"count": 3, "delay": 0})
+        scenario = parse_scenario({
+            "version": "2.1",
+            "metadata": {"name": "Tuned"},
+            "steps": [
+                {"step": 1, "tool": "mcp__chrome-devtools__navigate_page", "params": {"url": "u"}, "wait_after": 0.6},
+                second,
+                {"step": 3, "tool": "mcp__chrome-devtools__click", "params": {"uid": "a"}},
+            ],
+        })
+
+        async def run_test():
+            player = ScenarioPlayer(scenario, self.MockConfig(), PlayerOptions(wait_tuner=tuner))
+            player._clients["chrome-devtools"] = client
+            return await player.execute()
+
+        start = time.time()
+        result = asyncio.run(run_test())
+        return result, client, time.time() - start
+
+    def tuner(self, tmp_path):
+        tuner = WaitTuner("Tuned", tmp_path / "h.db")
+        tuner.waits[1] = TunedWait(1, 0.6, 0.0)
+        return tuner
+
+    def test_shortened_wait(self, tmp_path):
+        """Should wait the learned time instead of the configured one"""
+        result, client, elapsed = self.play(self.tuner(tmp_path), failures=0)
+
+        assert result.success is True
+        assert elapsed < 0.3
+        assert client.calls == ["navigate_page", "wait_for", "click"]
+
+    def test_retried_until_ready(self, tmp_path):
+        """Should poll the next step after a too-short wait and back off"""
+        tuner = self.tuner(tmp_path)
+
+        result, client, _ = self.play(tuner, failures=1)
+
+        assert result.success is True
+        assert result.step_results[1].retries == 1
+        assert client.calls == ["navigate_page", "wait_for", "wait_for", "click"]
+        assert tuner.waits[1].backoffs == 1
+        assert tuner.wait_for(waited_step(0.6)) > 0.25
+
+    def test_never_ready_fails_at_configured_time(self, tmp_path):
+        """Should still fail the step once the configured wait has passed"""
+        tuner = self.tuner(tmp_path)
+
+        result, client, elapsed = self.play(tuner, failures=10)
+
+        assert result.success is False
+        assert result.failed_step == 2
+        assert elapsed >= 0.6
+        assert tuner.waits[1].backoffs == 0
+
+    def test_polls_skip_retry_policy(self, tmp_path):
+        """Should poll with single attempts and apply the retry policy only at the configured time"""
+        result, client, _ = self.play(self.tuner(tmp_path), failures=10, retry=True)
+
+        assert result.success is False
+        polls = client.calls.count("wait_for") - 3
+        assert 1 <= polls <= 0.6 / 0.25 + 1
+
+    def test_side_effect_step_not_tuned(self, tmp_path):
+        """Should wait the full time before steps that aren't probes"""
+        tuner = self.tuner(tmp_path)
+
+        result, client, elapsed = self.play(tuner, failures=0, following="mcp__chrome-devtools__fill")
+
+        assert result.success is True
+        assert elapsed >= 0.6
+        assert client.calls == ["navigate_page", "fill", "click"]
+        assert tuner.waits[1].runs == 0
+
+    def test_read_step_not_tuned(self, tmp_path):
+        """Should keep the wait before a read that succeeds on a page that isn't ready"""
+        tuner = self.tuner(tmp_path)
+
+        # The snapshot "succeeds" at once, with whatever the page shows so far
+        result, client, elapsed = self.play(tuner, failures=0, following="mcp__chrome-devtools__take_snapshot")
+
+        assert result.success is True
+        assert elapsed >= 0.6
+        assert client.calls == ["navigate_page", "take_snapshot", "click"]
+        assert tuner.waits[1].runs == 0
+
+    def test_later_failure_backs_off(self, tmp_path):
+        """Should restore shortened waits when a later step fails"""
+        tuner = self.tuner(tmp_path)
+
+        result, _, _ = self.play(tuner, failures=0, click_fails=True)
+
+        assert result.success is False
+        assert result.failed_step == 3
+        assert tuner.wait_for(waited_step(0.6)) == 0.6
+        assert tuner.waits[1].backoffs == 1